@@ -0,0 +1,3 @@
+"""
+场景基准测试套件
+"""
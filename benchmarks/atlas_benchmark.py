@@ -0,0 +1,132 @@
+"""
+纹理图集启动耗时基准
+
+在项目根目录下运行：
+    python -m benchmarks.atlas_benchmark
+    python -m benchmarks.atlas_benchmark --runs 7 --rebuild
+
+在独立的子进程中重复模拟启动到主菜单的过程（初始化pygame和音效、设置显示模式、创建开场动画和 Game），
+分别测量逐个加载图片和使用纹理图集时的耗时中位数。assets/atlases 不存在时先打包图集，
+测量结束后删除临时打包的图集（图集只有手动运行 build_complete.py --atlas 时才保留，游戏才会使用）。
+"""
+
+import os
+
+# 必须在导入pygame之前设置，确保使用无界面驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+from time import perf_counter
+
+import pygame
+
+from src.modules.texture_atlas import ATLAS_DIR, MANIFEST_NAME, build_atlases
+
+SCREEN_SIZE = (1920, 1280)
+
+
+def boot_to_menu(use_atlas):
+    """模拟 main.py 从启动到进入主菜单的过程
+
+    Returns:
+        dict: seconds（总耗时）/ image_seconds（其中加载图片的耗时）/ images（加载的图片数量）/
+              atlas_hits / atlas_pages
+    """
+    from src.modules.resource_manager import resource_manager
+    resource_manager.use_atlas = use_atlas
+
+    # 单独统计花在加载图片上的时间
+    load_image = resource_manager.load_image
+    image_seconds = [0.0]
+
+    def timed_load_image(name, file_path):
+        image_start = perf_counter()
+        try:
+            return load_image(name, file_path)
+        finally:
+            image_seconds[0] += perf_counter() - image_start
+
+    resource_manager.load_image = timed_load_image
+
+    start = perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        pygame.init()
+        try:
+            pygame.mixer.init()
+            resource_manager._init_resources()
+        except pygame.error:
+            pass
+        screen = pygame.display.set_mode(SCREEN_SIZE)
+
+        from src.modules.intro_animation import IntroAnimation
+        from src.modules.game import Game
+        IntroAnimation(screen)
+        Game(screen)
+    seconds = perf_counter() - start
+    atlas = resource_manager.atlas
+    return {
+        "seconds": seconds,
+        "image_seconds": image_seconds[0],
+        "images": len(resource_manager.images),
+        "atlas_hits": atlas.hits if atlas else 0,
+        "atlas_pages": atlas.pages_loaded if atlas else 0,
+    }
+
+
+def run_child(use_atlas):
+    """在新进程中测量一次启动（资源缓存是全局的，每次都需要全新的进程）"""
+    args = [sys.executable, "-m", "benchmarks.atlas_benchmark", "--child"]
+    if not use_atlas:
+        args.append("--no-atlas")
+    output = subprocess.run(args, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="测量使用纹理图集前后启动到主菜单的耗时")
+    parser.add_argument("--runs", type=int, default=5, help="每种方式的测量次数")
+    parser.add_argument("--rebuild", action="store_true", help="重新打包图集")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--no-atlas", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(boot_to_menu(not args.no_atlas)))
+        return 0
+
+    from src.modules.resource_manager import resource_manager
+    resource_dir = resource_manager.resource_dir
+    atlas_dir = os.path.join(resource_dir, ATLAS_DIR)
+    temporary = not os.path.exists(os.path.join(atlas_dir, MANIFEST_NAME))
+    if args.rebuild or temporary:
+        pygame.init()
+        summary = build_atlases(resource_dir)
+        print(f"打包图集：{summary['images']} 张图片，{summary['pages']} 张图集，跳过 {len(summary['skipped'])} 张")
+
+    print(f"{'方式':<8} {'启动中位数(ms)':>14} {'启动最短(ms)':>12} {'加载图片中位数(ms)':>18} "
+          f"{'图片':>6} {'取自图集':>8} {'图集':>6}")
+    try:
+        for label, use_atlas in (("逐个加载", False), ("纹理图集", True)):
+            results = [run_child(use_atlas) for _ in range(args.runs)]
+            samples = [result["seconds"] * 1000.0 for result in results]
+            image_samples = [result["image_seconds"] * 1000.0 for result in results]
+            last = results[-1]
+            print(f"{label:<8} {statistics.median(samples):>14.1f} {min(samples):>12.1f} "
+                  f"{statistics.median(image_samples):>18.1f} "
+                  f"{last['images']:>6} {last['atlas_hits']:>8} {last['atlas_pages']:>6}")
+    finally:
+        if temporary:
+            shutil.rmtree(atlas_dir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+视线检测微基准
+
+在项目根目录下运行：
+    python -m benchmarks.line_of_sight_benchmark
+    python -m benchmarks.line_of_sight_benchmark --maps big_maze --queries 200
+
+对比原来的武器穿墙检查（逐像素步进，每一步对所有墙格子做 collidepoint）
+与格子级DDA视线检测（不带缓存 / 带LRU缓存）的单次耗时，并检查两者结果的一致程度。
+"""
+
+import os
+
+# 必须在导入pygame之前设置，确保使用无界面驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import random
+import sys
+from time import perf_counter
+
+import pygame
+
+from src.modules.map_manager import MapManager
+from src.modules.line_of_sight import LineOfSight
+from .scenarios import SHIPPED_MAPS
+
+DEFAULT_MAPS = SHIPPED_MAPS + ["big_maze"]
+
+
+def pixel_line_clear(start_x, start_y, end_x, end_y, collision_tiles):
+    """原实现：Bresenham逐像素步进，每一步检查所有墙格子"""
+    dx = abs(end_x - start_x)
+    dy = abs(end_y - start_y)
+    x, y = start_x, start_y
+    n = 1 + dx + dy
+    x_inc = 1 if end_x > start_x else -1
+    y_inc = 1 if end_y > start_y else -1
+    error = dx - dy
+    dx *= 2
+    dy *= 2
+
+    for _ in range(n):
+        for tile in collision_tiles:
+            if tile.collidepoint(x, y):
+                return False
+        if x == end_x and y == end_y:
+            break
+        if error > 0:
+            x += x_inc
+            error -= dy
+        else:
+            y += y_inc
+            error += dx
+    return True
+
+
+def make_queries(blocked, columns, rows, tile_width, tile_height, count, rand):
+    """生成查询：起点在地面格子上，终点在起点周围 100~400 像素内（远程敌人开火、武器穿墙检查的距离）"""
+    floor = [index for index, cell in enumerate(blocked) if not cell]
+    queries = []
+    for _ in range(count):
+        index = rand.choice(floor)
+        start_x = int((index % columns + 0.5) * tile_width)
+        start_y = int((index // columns + 0.5) * tile_height)
+        distance = rand.uniform(100, 400)
+        direction_x, direction_y = rand.uniform(-1, 1), rand.uniform(-1, 1)
+        length = max(1e-6, (direction_x ** 2 + direction_y ** 2) ** 0.5)
+        queries.append((start_x, start_y,
+                        int(start_x + direction_x / length * distance),
+                        int(start_y + direction_y / length * distance)))
+    return queries
+
+
+def time_per_call(function, queries, repeat=1):
+    """平均每次查询的耗时（微秒）和结果列表"""
+    results = []
+    start = perf_counter()
+    for _ in range(repeat):
+        results = [function(*query) for query in queries]
+    elapsed = perf_counter() - start
+    return elapsed / (len(queries) * repeat) * 1e6, results
+
+
+def run(map_name, queries_per_map, rand):
+    """在一张地图上运行对比
+
+    Returns:
+        dict: 各实现的单次耗时（微秒）和结果一致率，地图加载失败或没有地面时返回None
+    """
+    map_manager = MapManager(pygame.display.get_surface())
+    if not map_manager.load_map(map_name):
+        return None
+    tmx_data = map_manager.current_map['tmx_data']
+    columns, rows = tmx_data.width, tmx_data.height
+    tile_width, tile_height = map_manager.get_tile_size()
+    blocked = map_manager.get_collision_grid()
+    if all(blocked) or not any(blocked):
+        return None
+
+    # 原实现使用的每个墙格子一个矩形
+    tiles = [pygame.Rect(index % columns * tile_width, index // columns * tile_height, tile_width, tile_height)
+             for index, cell in enumerate(blocked) if cell]
+    queries = make_queries(blocked, columns, rows, tile_width, tile_height, queries_per_map, rand)
+
+    uncached = LineOfSight(blocked, columns, rows, tile_width, tile_height, cache_size=0)
+    cached = LineOfSight(blocked, columns, rows, tile_width, tile_height)
+
+    old_us, old_results = time_per_call(lambda *q: pixel_line_clear(*q, tiles), queries)
+    dda_us, dda_results = time_per_call(uncached.is_clear, queries, repeat=20)
+    cached_us, _ = time_per_call(cached.is_clear, queries, repeat=20)
+    agree = sum(1 for a, b in zip(old_results, dda_results) if a == b) / len(queries)
+    return {"walls": len(tiles), "pixel_us": old_us, "dda_us": dda_us, "cached_us": cached_us, "agree": agree}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="对比逐像素墙体检查与格子级DDA视线检测的耗时")
+    parser.add_argument("--maps", nargs="+", default=DEFAULT_MAPS, help="要测试的地图名称")
+    parser.add_argument("--queries", type=int, default=100, help="每张地图的查询数量")
+    parser.add_argument("--seed", type=int, default=1234, help="生成查询的随机数种子")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    pygame.display.set_mode((1280, 720))
+    rand = random.Random(args.seed)
+    try:
+        print(f"{'地图':<12} {'墙格子':>6} {'逐像素(us)':>12} {'DDA(us)':>10} {'DDA+缓存(us)':>14} {'结果一致':>8}")
+        for map_name in args.maps:
+            result = run(map_name, args.queries, rand)
+            if result is None:
+                print(f"{map_name:<12} 跳过（无法加载或没有墙）")
+                continue
+            print(f"{map_name:<12} {result['walls']:>6} {result['pixel_us']:>12.1f} {result['dda_us']:>10.2f} "
+                  f"{result['cached_us']:>14.2f} {result['agree']:>8.0%}")
+    finally:
+        pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+基准测试入口
+
+在项目根目录下运行：
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --only enemies_ --frames 60
+    python -m benchmarks.run_benchmarks --save-baseline
+
+结果写入 --output 指定的JSON文件，并与 --baseline 指定的基线比较。
+任一场景的帧耗时或子系统耗时超出基线 (1 + threshold) 倍且绝对差值超过
+--min-delta 毫秒时视为性能回退，进程以非零状态码退出。
+"""
+
+import os
+
+# 必须在导入pygame之前设置，确保使用无界面驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import pygame
+
+from .scenarios import ScenarioRunner, build_scenarios
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_OUTPUT = "bench_output.json"
+
+
+def run_suite(scenarios, runner, verbose=True):
+    """运行所有场景
+
+    Returns:
+        dict: {场景名: 场景结果}
+    """
+    results = {}
+    for scenario in scenarios:
+        result = runner.run(scenario)
+        results[scenario.name] = result
+        if verbose:
+            subsystems = "  ".join(f"{name}={value:.2f}" for name, value in result["subsystems"].items())
+            print(f"{scenario.name:<24} {result['frame_ms']:7.2f} ms/帧  {subsystems}")
+    return results
+
+
+def compare(results, baseline, threshold, min_delta):
+    """与基线比较
+
+    Args:
+        results: 本次结果 {场景名: 场景结果}
+        baseline: 基线结果 {场景名: 场景结果}
+        threshold: 允许的相对增长比例
+        min_delta: 允许的绝对增长（毫秒），用于过滤噪声
+
+    Returns:
+        list: 回退列表，每项为 (场景, 指标, 基线值, 当前值)
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        metrics = [("frame_ms", base.get("frame_ms"), result["frame_ms"])]
+        for subsystem, value in result["subsystems"].items():
+            metrics.append((subsystem, base.get("subsystems", {}).get(subsystem), value))
+        for metric, old, new in metrics:
+            if old is None:
+                continue
+            if new > old * (1 + threshold) and new - old > min_delta:
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="敌人、投射物、光照和地图负载的场景基准测试")
+    parser.add_argument("--frames", type=int, default=120, help="每个场景计时的帧数")
+    parser.add_argument("--warmup", type=int, default=10, help="每个场景的预热帧数")
+    parser.add_argument("--enemies", type=int, default=50, help="敌人场景中每种敌人的数量")
+    parser.add_argument("--projectiles", type=int, default=100, help="投射物场景中每种武器的投射物数量")
+    parser.add_argument("--only", help="只运行名称以该前缀开头的场景")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="结果JSON文件路径")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线JSON文件路径")
+    parser.add_argument("--threshold", type=float, default=0.15, help="允许的相对回退比例（默认15%%）")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="允许的绝对回退（毫秒）")
+    parser.add_argument("--save-baseline", action="store_true", help="将本次结果保存为新的基线")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    scenarios = build_scenarios(args.enemies, args.projectiles)
+    if args.only:
+        scenarios = [s for s in scenarios if s.name.startswith(args.only)]
+
+    runner = ScenarioRunner(frames=args.frames, warmup=args.warmup)
+    try:
+        results = run_suite(scenarios, runner)
+    finally:
+        pygame.quit()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "frames": args.frames,
+            "enemies": args.enemies,
+            "projectiles": args.projectiles,
+        },
+        "scenarios": results,
+    }
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"结果已写入: {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"基线已更新: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"未找到基线文件 {args.baseline}，跳过比较（使用 --save-baseline 生成）")
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f).get("scenarios", {})
+
+    regressions = compare(results, baseline, args.threshold, args.min_delta)
+    if regressions:
+        print(f"发现 {len(regressions)} 项性能回退（阈值 {args.threshold:.0%}）：")
+        for name, metric, old, new in regressions:
+            print(f"  {name}.{metric}: {old:.2f} ms -> {new:.2f} ms (+{(new / old - 1):.0%})")
+        return 1
+
+    print("未发现性能回退")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
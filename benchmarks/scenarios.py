@@ -0,0 +1,246 @@
+"""
+基准测试场景
+每个场景在无界面模拟中构建一局固定负载的游戏（指定数量的敌人、投射物、光照设置和地图），
+然后逐帧运行 Game.update 和 Game.render，并通过 Game.phase_timer 统计各子系统耗时。
+"""
+
+import math
+import random
+from time import perf_counter_ns
+
+from src.modules.simulation import HeadlessSimulation
+from src.modules.enemies.enemy_config import ENEMY_CONFIGS
+from src.modules.weapons.weapon_utils import create_weapon, get_available_weapon_types
+from src.modules.weapons.weapons_data import get_weapon_config
+from src.modules.weapons.types.knife import ThrownKnife
+from src.modules.weapons.types.bullet import BulletProjectile
+from src.modules.weapons.types.fireball import FireballProjectile
+from src.modules.weapons.types.frost_nova import FrostNovaProjectile
+
+# 游戏中实际使用的关卡地图（按关卡顺序）
+SHIPPED_MAPS = ["small_map", "test2_map", "test3_map"]
+
+# 各武器类型对应的投射物类
+PROJECTILE_CLASSES = {
+    'knife': ThrownKnife,
+    'bullet': BulletProjectile,
+    'fireball': FireballProjectile,
+    'frost_nova': FrostNovaProjectile,
+}
+
+# 武器满配场景中两名角色携带的武器（WeaponManager 默认最多3把）
+MAX_LOADOUT = ("knife", "bullet", "fireball")
+
+# 子系统 -> Game.phase_timer 中的阶段
+SUBSYSTEMS = {
+    "update": ("player", "enemies", "projectiles", "items"),
+    "collision": ("collisions",),
+    "map_render": ("map",),
+    "entity_render": ("entities",),
+    "lighting": ("lighting",),
+    "ui": ("ui", "minimap"),
+}
+
+
+class Scenario:
+    """基准测试场景描述"""
+
+    def __init__(self, name, map_name="small_map", enemies=None, projectiles=None,
+                 lighting=True, dual_lights=False, loadout=None, attacking=False, mass_kill=False):
+        """
+        Args:
+            name: 场景名称
+            map_name: 地图名称
+            enemies: {敌人类型: 数量}
+            projectiles: {武器类型: 同时存在的投射物数量}
+            lighting: 是否启用光照
+            dual_lights: 是否同时开启神秘剑士的临时光源
+            loadout: 两名角色都换成这些满级武器，None表示保持默认武器
+            attacking: 是否每帧尝试近战和远程攻击（受武器攻击间隔限制）
+            mass_kill: 是否每帧让全部敌人在同一tick内死亡（模拟范围伤害清屏），测量击杀结算的开销
+        """
+        self.name = name
+        self.map_name = map_name
+        self.enemies = enemies or {}
+        self.projectiles = projectiles or {}
+        self.lighting = lighting
+        self.dual_lights = dual_lights
+        self.loadout = loadout
+        self.attacking = attacking
+        self.mass_kill = mass_kill
+
+
+def build_scenarios(enemy_count=50, projectile_count=100, maps=None):
+    """构建默认场景列表
+
+    Args:
+        enemy_count: 每种敌人场景中的敌人数量
+        projectile_count: 每种武器场景中同时存在的投射物数量
+        maps: 地图场景使用的地图列表，默认为 SHIPPED_MAPS
+
+    Returns:
+        list: Scenario列表
+    """
+    scenarios = []
+    for enemy_type in ENEMY_CONFIGS:
+        scenarios.append(Scenario(f"enemies_{enemy_type}", enemies={enemy_type: enemy_count}))
+    for weapon_type in get_available_weapon_types():
+        if weapon_type in PROJECTILE_CLASSES:
+            scenarios.append(Scenario(f"projectiles_{weapon_type}",
+                                      projectiles={weapon_type: projectile_count}))
+    scenarios.append(Scenario("weapons_max", enemies={"ghost": enemy_count, "radish": enemy_count},
+                              loadout=MAX_LOADOUT, attacking=True))
+    scenarios.append(Scenario("mass_kill", enemies={"ghost": enemy_count, "radish": enemy_count},
+                              mass_kill=True))
+    scenarios.append(Scenario("lighting_off", lighting=False))
+    scenarios.append(Scenario("lighting_on", lighting=True))
+    scenarios.append(Scenario("lighting_dual", lighting=True, dual_lights=True))
+    for map_name in (maps or SHIPPED_MAPS):
+        scenarios.append(Scenario(f"map_{map_name}", map_name=map_name))
+    return scenarios
+
+
+class ScenarioRunner:
+    """在无界面模拟中运行场景并收集各子系统耗时"""
+
+    def __init__(self, frames=120, warmup=10, fixed_dt=1.0 / 60.0, seed=1234):
+        self.frames = frames
+        self.warmup = warmup
+        self.fixed_dt = fixed_dt
+        self.seed = seed
+
+    def run(self, scenario):
+        """运行单个场景
+
+        Returns:
+            dict: 场景结果，包含平均帧耗时、子系统耗时和原始阶段耗时（毫秒）
+        """
+        simulation = HeadlessSimulation(map_name=scenario.map_name, fixed_dt=self.fixed_dt, seed=self.seed)
+        game = simulation.setup()
+        rng = random.Random(self.seed)
+
+        self._freeze_spawning(game)
+        if scenario.loadout:
+            self._equip_loadout(game, scenario.loadout)
+        game.enable_lighting = scenario.lighting
+
+        timer = game.phase_timer
+        frame_total = 0
+        with simulation._output():
+            for frame in range(self.warmup + self.frames):
+                if frame == self.warmup:
+                    timer.enabled = True
+                    timer.reset()
+                    frame_total = 0
+
+                self._prepare_frame(game, scenario, rng)
+
+                start = perf_counter_ns()
+                game.update(self.fixed_dt)
+                game.render()
+                frame_total += perf_counter_ns() - start
+
+        timer.enabled = False
+        phases = timer.averages_ms()
+        subsystems = {
+            name: sum(phases.get(phase, 0.0) for phase in members)
+            for name, members in SUBSYSTEMS.items()
+        }
+        return {
+            "map": scenario.map_name,
+            "frames": self.frames,
+            "frame_ms": frame_total / max(1, self.frames) / 1e6,
+            "subsystems": subsystems,
+            "phases": phases,
+            "enemies": len(game.enemy_manager.enemies),
+        }
+
+    @staticmethod
+    def _freeze_spawning(game):
+        """关闭波次刷怪和蝙蝠刷新，让场景负载只由脚本决定"""
+        enemy_manager = game.enemy_manager
+        enemy_manager.current_round = -1
+        enemy_manager.bat_spawn_timer = 0.1
+        enemy_manager.enemies.clear()
+
+    def _prepare_frame(self, game, scenario, rng):
+        """补齐场景负载（不计入计时）"""
+        system = game.dual_player_system
+        swordsman = system.mystic_swordsman
+
+        # 保证角色存活，避免场景中途结束
+        for player in system.get_players():
+            player.health = player.max_health
+
+        # 升级菜单会暂停游戏逻辑，直接关闭
+        if game.upgrade_menu.is_active:
+            game.upgrade_menu.hide()
+
+        # 双光源：保持神秘剑士的临时光圈
+        if scenario.dual_lights:
+            system.mystic_flashlight_active = True
+            system.mystic_flashlight_timer = system.mystic_flashlight_duration
+
+        # 补齐敌人数量
+        for enemy_type, count in scenario.enemies.items():
+            alive = sum(1 for enemy in game.enemy_manager.enemies if enemy.type == enemy_type)
+            for _ in range(count - alive):
+                angle = rng.uniform(0, 2 * math.pi)
+                distance = rng.uniform(200, 900)
+                game.enemy_manager.spawn_enemy(
+                    enemy_type,
+                    swordsman.world_x + math.cos(angle) * distance,
+                    swordsman.world_y + math.sin(angle) * distance
+                )
+
+        # 清屏：补齐的敌人全部在本tick死亡，由tick末尾的击杀结算处理；
+        # 上一帧的掉落物直接清掉，避免物品越积越多
+        if scenario.mass_kill:
+            game.item_manager.clear()
+            for enemy in game.enemy_manager.enemies:
+                enemy.health = 0
+
+        # 每帧尝试攻击，实际出手频率由武器的攻击间隔和后摇决定
+        if scenario.attacking:
+            for player in system.get_players():
+                for weapon in player.weapons:
+                    weapon.ammo = max(weapon.ammo, 6)
+                player.weapon_manager.melee_attack(game.screen)
+                player.weapon_manager.manual_attack(game.screen)
+
+        # 补齐投射物数量
+        for weapon_type, count in scenario.projectiles.items():
+            weapon = self._get_weapon(swordsman, weapon_type)
+            projectile_class = PROJECTILE_CLASSES[weapon_type]
+            for _ in range(count - len(weapon.projectiles)):
+                angle = rng.uniform(0, 2 * math.pi)
+                weapon.projectiles.add(projectile_class(
+                    swordsman.world_x, swordsman.world_y,
+                    math.cos(angle), math.sin(angle),
+                    weapon.current_stats
+                ))
+
+    @staticmethod
+    def _equip_loadout(game, loadout):
+        """把两名角色的武器换成指定的满级武器"""
+        for player in game.dual_player_system.get_players():
+            manager = player.weapon_manager
+            manager.reset()
+            for weapon_type in loadout:
+                weapon = create_weapon(weapon_type, player)
+                config = get_weapon_config(weapon_type)
+                if config:
+                    weapon.level = config['max_level']
+                    weapon.apply_effects(config['levels'][-1]['effects'])
+                manager.weapons.append(weapon)
+                manager.weapon_levels[weapon_type] = weapon.level
+
+    @staticmethod
+    def _get_weapon(player, weapon_type):
+        """获取玩家身上指定类型的武器，没有时直接挂载一把"""
+        for weapon in player.weapons:
+            if weapon.type == weapon_type:
+                return weapon
+        weapon = create_weapon(weapon_type, player)
+        player.weapons.append(weapon)
+        return weapon
@@ -0,0 +1,145 @@
+"""
+敌人分离转向基准
+
+在项目根目录下运行：
+    python -m benchmarks.separation_benchmark
+    python -m benchmarks.separation_benchmark --enemies 2000 --budget-ms 2
+
+用1000个敌人替身（位置和 ENEMY_CONFIGS 中的分离参数）测量每个tick计算分离转向的耗时，
+检查耗时中位数是否在帧时间预算内；再模拟一群敌人追向同一个玩家，对比开启前后叠在一起的程度。
+耗时超出预算时返回非0退出码。
+"""
+
+import argparse
+import math
+import random
+import statistics
+import sys
+from time import perf_counter
+
+import pygame
+
+from src.modules.enemies.enemy_config import ENEMY_CONFIGS
+from src.modules.enemies.separation import SeparationSteering
+
+# 默认预算：60 FPS一帧的四分之一，给敌人更新的其他部分和渲染留出余量
+DEFAULT_BUDGET_MS = 1000.0 / 60.0 / 4
+
+# 判断"叠在一起"时使用的格子边长（像素）
+STACK_CELL = 16
+
+
+class Agent:
+    """只保留分离转向需要的属性的敌人替身"""
+
+    def __init__(self, enemy_type, x, y):
+        config = ENEMY_CONFIGS[enemy_type]
+        self.speed = config["speed"]
+        self.separation_weight = config.get("separation_weight", 0.0)
+        self.separation_radius = config.get("separation_radius", 0)
+        self.rect = pygame.Rect(0, 0, 80, 80)
+        self.rect.center = (x, y)
+
+
+def make_agents(layout, count, rand):
+    """按布局生成敌人替身
+
+    Args:
+        layout: "stacked" 全部重叠在一点，"horde" 聚在半径300的圆内，"spread" 均匀分布在4000x4000范围
+        count: 数量
+        rand: random.Random
+    """
+    types = list(ENEMY_CONFIGS)
+    agents = []
+    for _ in range(count):
+        if layout == "stacked":
+            x, y = 2000, 2000
+        elif layout == "horde":
+            angle = rand.uniform(0, math.tau)
+            distance = 300 * math.sqrt(rand.random())
+            x, y = 2000 + math.cos(angle) * distance, 2000 + math.sin(angle) * distance
+        else:
+            x, y = rand.uniform(0, 4000), rand.uniform(0, 4000)
+        agents.append(Agent(rand.choice(types), x, y))
+    return agents
+
+
+def time_ticks(steering, agents, ticks, warmup=5):
+    """每个tick计算全部敌人分离转向耗时的中位数和最长值（毫秒）"""
+    for _ in range(warmup):
+        steering.rebuild(agents)
+    samples = []
+    for _ in range(ticks):
+        start = perf_counter()
+        steering.rebuild(agents)
+        samples.append((perf_counter() - start) * 1000.0)
+    return statistics.median(samples), max(samples)
+
+
+def max_stack(agents):
+    """落在同一个 STACK_CELL 格子里的最多敌人数量"""
+    counts = {}
+    for agent in agents:
+        key = (agent.rect.centerx // STACK_CELL, agent.rect.centery // STACK_CELL)
+        counts[key] = counts.get(key, 0) + 1
+    return max(counts.values(), default=0)
+
+
+def simulate_chase(agents, steering, ticks, dt=1.0 / 60.0, target=(2000.5, 2000.5)):
+    """模拟敌人追向同一个目标（与 Enemy.update 相同的移动方式），返回最后的最大堆叠数量
+
+    Args:
+        steering: SeparationSteering，None表示不做分离
+    """
+    for _ in range(ticks):
+        pushes = steering.compute(agents) if steering else None
+        for index, agent in enumerate(agents):
+            dx = target[0] - agent.rect.centerx
+            dy = target[1] - agent.rect.centery
+            distance = math.hypot(dx, dy)
+            if distance == 0:
+                continue
+            push_x, push_y = pushes[index] if pushes else (0.0, 0.0)
+            move_x = dx / distance + push_x
+            move_y = dy / distance + push_y
+            length = math.hypot(move_x, move_y)
+            if length > 1:
+                move_x /= length
+                move_y /= length
+            agent.rect.x += move_x * agent.speed * dt
+            agent.rect.y += move_y * agent.speed * dt
+    return max_stack(agents)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="测量敌人分离转向的单tick耗时及其对堆叠的改善")
+    parser.add_argument("--enemies", type=int, default=1000, help="敌人数量")
+    parser.add_argument("--ticks", type=int, default=60, help="计时的tick数量")
+    parser.add_argument("--chase-ticks", type=int, default=300, help="追击模拟的tick数量")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="单tick耗时预算（毫秒）")
+    parser.add_argument("--seed", type=int, default=1234, help="生成位置的随机数种子")
+    args = parser.parse_args(argv)
+
+    over_budget = False
+    print(f"{'布局':<8} {'敌人':>6} {'中位数(ms)':>10} {'最长(ms)':>10} {'预算(ms)':>10} {'检查邻居/敌人':>14}")
+    for layout in ("spread", "horde", "stacked"):
+        steering = SeparationSteering()
+        agents = make_agents(layout, args.enemies, random.Random(args.seed))
+        median_ms, worst_ms = time_ticks(steering, agents, args.ticks)
+        over_budget = over_budget or median_ms > args.budget_ms
+        pairs = steering.pairs_checked / max(1, len(agents))
+        print(f"{layout:<8} {len(agents):>6} {median_ms:>10.2f} {worst_ms:>10.2f} {args.budget_ms:>10.2f} {pairs:>14.1f}")
+
+    before = simulate_chase(make_agents("horde", args.enemies, random.Random(args.seed)), None, args.chase_ticks)
+    after = simulate_chase(make_agents("horde", args.enemies, random.Random(args.seed)), SeparationSteering(),
+                           args.chase_ticks)
+    print(f"追击 {args.chase_ticks} tick 后同一 {STACK_CELL}px 格子内最多的敌人：不分离 {before}，分离 {after}")
+
+    if over_budget:
+        print("超出预算")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+墙体几何统计
+
+在项目根目录下运行：
+    python -m benchmarks.wall_geometry_report
+    python -m benchmarks.wall_geometry_report --maps small_map big_maze
+
+对每张地图的碰撞层报告合并前后的墙体矩形数量和边界线段数量。
+"""
+
+import os
+
+# 必须在导入pygame之前设置，确保使用无界面驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import sys
+
+import pygame
+
+from src.modules.map_manager import MapManager
+from .scenarios import SHIPPED_MAPS
+
+# 默认统计的地图：关卡地图加上墙体最多的迷宫地图
+DEFAULT_MAPS = SHIPPED_MAPS + ["big_maze"]
+
+
+def collect(map_names):
+    """加载地图并统计墙体几何
+
+    Returns:
+        dict: {地图名: WallGeometry.stats()}，加载失败的地图不在结果中
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    results = {}
+    for map_name in map_names:
+        map_manager = MapManager(screen)
+        if not map_manager.load_map(map_name):
+            continue
+        results[map_name] = map_manager.get_wall_geometry().stats()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="统计各地图墙体矩形和边界线段在合并前后的数量")
+    parser.add_argument("--maps", nargs="+", default=DEFAULT_MAPS, help="要统计的地图名称")
+    args = parser.parse_args(argv)
+
+    try:
+        results = collect(args.maps)
+    finally:
+        pygame.quit()
+
+    print(f"{'地图':<12} {'矩形(合并前)':>12} {'矩形(合并后)':>12} {'边(合并前)':>10} {'线段(合并后)':>12}")
+    for map_name, stats in results.items():
+        print(f"{map_name:<12} {stats['tiles']:>12} {stats['rects']:>12} {stats['edges']:>10} {stats['segments']:>12}")
+    return 0 if len(results) == len(args.maps) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -40,6 +40,20 @@ def check_assets():
     print("assets文件夹检查通过")
     return True
 
+def build_texture_atlases():
+    """把assets/images下的小图片打包成纹理图集（assets/atlases），游戏启动时每张图集只需加载一次
+
+    需要手动运行（--atlas），生成后打包exe时会随assets一起打进去
+    """
+    import pygame
+    from src.modules.texture_atlas import build_atlases
+    
+    pygame.init()
+    summary = build_atlases("assets")
+    print(f"纹理图集打包完成：{summary['images']} 张图片，{summary['pages']} 张图集，"
+          f"跳过 {len(summary['skipped'])} 张（过大或无法读取）")
+    return True
+
 def build_exe():
     """打包游戏为exe"""
     
@@ -189,6 +203,12 @@ def create_readme():
 
 def main():
     """主函数"""
+    # 只打包纹理图集：python build_complete.py --atlas
+    # 图集需要手动生成（不在打包exe时自动生成），用真实美术资源跑过 benchmarks/atlas_benchmark.py 确认启动更快后再使用
+    if "--atlas" in sys.argv:
+        build_texture_atlases()
+        return
+    
     print("=== 完整游戏打包工具 ===")
     print("此工具将创建一个完整的可执行游戏文件")
     print("包含所有必要的资源和依赖")
@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import argparse
+
+# 必须在导入pygame之前设置，确保使用无界面驱动
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from modules.simulation import HeadlessSimulation, AutoPilotController, ScriptedController
+from modules.replay import ReplayController
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="无界面模拟：以最快速度运行游戏逻辑并报告吞吐量")
+    parser.add_argument("--map", default="small_map", help="地图名称（默认: small_map）")
+    parser.add_argument("--hero", default="ninja_frog", help="英雄ID（默认: ninja_frog）")
+    parser.add_argument("--difficulty", default="normal",
+                        choices=["easy", "normal", "hard", "nightmare"], help="难度")
+    parser.add_argument("--seconds", type=float, default=60.0, help="模拟时长（秒）")
+    parser.add_argument("--dt", type=float, default=1.0 / 60.0, help="固定步长（秒）")
+    parser.add_argument("--render-stride", type=int, default=0,
+                        help="每隔N个tick渲染一次到离屏表面，0表示不渲染")
+    parser.add_argument("--controller", default="auto", choices=["auto", "scripted"],
+                        help="输入控制器：auto为自动驾驶，scripted为脚本回放")
+    parser.add_argument("--script", help="脚本控制器使用的JSON步骤文件")
+    parser.add_argument("--seed", type=int, help="游戏随机数种子（默认随机）")
+    parser.add_argument("--record", help="把本次模拟的输入录制为录像文件")
+    parser.add_argument("--replay", help="回放录像文件（地图、英雄、难度和种子取自录像）")
+    parser.add_argument("--profile-stream",
+                        help="把逐帧性能样本写入文件（.csv 或 .jsonl），需配合 --render-stride 使用")
+    parser.add_argument("--verbose", action="store_true", help="保留游戏逻辑中的输出")
+    parser.add_argument("--json", action="store_true", help="以JSON格式输出统计结果")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    options = {
+        "map_name": args.map,
+        "hero_id": args.hero,
+        "difficulty": args.difficulty,
+        "seed": args.seed,
+    }
+    if args.replay:
+        controller = ReplayController.from_file(args.replay)
+        header = controller.header
+        options = {
+            "map_name": header["map"],
+            "hero_id": header["hero"],
+            "difficulty": header["difficulty"],
+            "screen_size": tuple(header["screen"]),
+        }
+    elif args.controller == "scripted":
+        script = None
+        if args.script:
+            with open(args.script, "r", encoding="utf-8") as f:
+                script = json.load(f)
+        controller = ScriptedController(script)
+    else:
+        controller = AutoPilotController()
+
+    simulation = HeadlessSimulation(
+        controller=controller,
+        fixed_dt=args.dt,
+        render_stride=args.render_stride,
+        quiet=not args.verbose,
+        **options
+    )
+
+    try:
+        simulation.setup()
+        if args.profile_stream:
+            simulation.game.start_profile_stream(args.profile_stream)
+        if args.record:
+            with simulation._output():
+                simulation.game.start_replay_recording(args.record)
+        # 回放时运行到录像结束
+        stats = simulation.run(None if args.replay else args.seconds)
+    finally:
+        simulation.close()
+
+    if args.replay:
+        stats["replay_ticks"] = len(controller.ticks)
+        stats["checksums_checked"] = controller.checksums_checked
+        stats["divergence_tick"] = controller.divergence_tick
+
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+    else:
+        print(f"地图: {stats['map']}  难度: {stats['difficulty']}")
+        print(f"模拟时长: {stats['sim_seconds']:.1f}s  实际耗时: {stats['wall_seconds']:.2f}s")
+        print(f"tick数: {stats['ticks']}  吞吐量: {stats['ticks_per_second']:.1f} ticks/s "
+              f"({stats['realtime_factor']:.1f}x 实时)")
+        print(f"渲染次数: {stats['renders']}  存活敌人: {stats['enemies']}  击杀: {stats['kills']}")
+        sounds = stats["sounds"]
+        print(f"音效: 请求 {sounds['requested']}  播放 {sounds['played']}  "
+              f"合并 {sounds['coalesced']}  放弃 {sounds['dropped']}")
+        if stats["game_over"]:
+            print("对局已提前结束")
+        if args.replay:
+            if controller.divergence_tick is None:
+                print(f"回放一致：校验 {controller.checksums_checked} 次，未发现偏差")
+            else:
+                print(f"回放在第 {controller.divergence_tick} tick 出现偏差")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
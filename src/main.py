@@ -1,6 +1,8 @@
 import pygame
+import os
 import sys
 from modules.game import Game
+from modules.core import display
 from modules.intro_animation import IntroAnimation
 
 def main():
@@ -26,7 +28,15 @@ def main():
     
     screen_width = 1920
     screen_height = 1280
-    screen = pygame.display.set_mode((screen_width, screen_height))
+    # 设置 RENDER_RESOLUTION（如 1280x853）时在该分辨率的离屏表面上渲染，每帧缩放一次到窗口；
+    # RENDER_INTEGER_SCALE=1 时只按整数倍最近邻缩放
+    output = display.ScaledDisplay(
+        (screen_width, screen_height),
+        display.parse_resolution(os.environ.get("RENDER_RESOLUTION")),
+        integer_scale=os.environ.get("RENDER_INTEGER_SCALE") == "1",
+    )
+    display.set_display(output)
+    screen = output.surface
     pygame.display.set_caption("像素生存")
     
     clock = pygame.time.Clock()
@@ -56,7 +66,7 @@ def main():
         
         intro_animation.update(dt)
         intro_animation.render()
-        pygame.display.flip()
+        display.present()
     
     
     
@@ -65,12 +75,14 @@ def main():
     
     # 主游戏循环
     while game.running:
-        dt = clock.tick(120) / 1000.0  # 转换为秒
+        # 菜单、暂停等静态界面降低目标帧率
+        dt = clock.tick(game.target_fps()) / 1000.0  # 转换为秒
         
         # 完全清空事件队列，确保没有事件堆积
         events = pygame.event.get()
         for event in events:
             if event.type == pygame.QUIT:
+                game.close_diagnostics()
                 pygame.quit()
                 sys.exit()
             game.handle_event(event)
@@ -80,10 +92,12 @@ def main():
             pygame.event.clear()  # 额外清空事件队列
         
         game.update(dt)
-        game.render()
-        pygame.display.flip()
+        # 静态界面没有输入或变化时跳过渲染，Game.render 内部负责显示画面
+        if game.should_render(dt):
+            game.render()
     
     # 如果游戏结束，退出
+    game.close_diagnostics()
     pygame.quit()
     sys.exit()
 
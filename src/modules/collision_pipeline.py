@@ -0,0 +1,189 @@
+"""
+碰撞检测流水线
+每个tick对 武器投射物-敌人、敌人-玩家、敌人子弹-玩家 三类组合各检测一遍：
+投射物的宽相位用敌人空间索引筛选候选，窄相位做圆形（接触为矩形）相交判断，
+只有配置了 mask_collision 的敌人类型才再做像素级遮罩检测。
+检测结果以命中事件列表输出，由武器、计分、掉落和音效等系统依次消费。
+"""
+
+import math
+import pygame
+
+# 命中事件类型
+PROJECTILE_HIT = "projectile_hit"              # 武器投射物击中敌人
+ENEMY_CONTACT = "enemy_contact"                # 敌人与玩家接触
+ENEMY_PROJECTILE_HIT = "enemy_projectile_hit"  # 敌人子弹击中玩家
+
+
+class HitEvent:
+    """一次命中
+
+    Attributes:
+        kind: 事件类型
+        source: 发起方（武器投射物、敌人或敌人子弹）
+        target: 被击中的一方（敌人或玩家）
+        weapon: 投射物所属的武器（仅 PROJECTILE_HIT）
+        destroy_source: 武器处理后投射物是否被销毁（仅 PROJECTILE_HIT）
+        killed: 被击中的敌人是否因此死亡（仅 PROJECTILE_HIT）
+    """
+
+    __slots__ = ("kind", "source", "target", "weapon", "destroy_source", "killed")
+
+    def __init__(self, kind, source, target, weapon=None):
+        self.kind = kind
+        self.source = source
+        self.target = target
+        self.weapon = weapon
+        self.destroy_source = False
+        self.killed = False
+
+    def __repr__(self):
+        return f"HitEvent({self.kind}, {self.source!r} -> {self.target!r})"
+
+
+def world_position(entity):
+    """获取实体的世界坐标（投射物有的用 world_x/world_y，有的用 x/y）"""
+    try:
+        return entity.world_x, entity.world_y
+    except AttributeError:
+        return entity.x, entity.y
+
+
+def _get_mask(sprite):
+    """获取精灵的遮罩，没有时按图像创建并缓存"""
+    mask = getattr(sprite, 'mask', None)
+    if mask is None:
+        mask = pygame.mask.from_surface(sprite.image, 127)
+        sprite.mask = mask
+    return mask
+
+
+def _masks_overlap(sprite1, left1, top1, sprite2, left2, top2):
+    """按给定的左上角位置检测两个精灵的遮罩是否重叠（不修改精灵的rect）"""
+    offset = (int(left2 - left1), int(top2 - top1))
+    return _get_mask(sprite1).overlap(_get_mask(sprite2), offset) is not None
+
+
+class CollisionPipeline:
+    """单趟碰撞检测
+
+    每对实体每个tick最多检查一次。武器是投射物命中事件的第一个消费者：
+    命中时立即调用 weapon.handle_collision，因为穿透与否决定了同一投射物后续还能否命中。
+    """
+
+    def __init__(self, enemy_projectile_radius=80):
+        """
+        Args:
+            enemy_projectile_radius: 敌人子弹与玩家中心的命中距离（像素）
+        """
+        self.enemy_projectile_radius = enemy_projectile_radius
+        self._mask_by_type = {}
+
+    def uses_mask(self, enemy):
+        """敌人类型是否配置了像素级遮罩检测（按类型缓存）"""
+        enemy_type = enemy.type
+        uses = self._mask_by_type.get(enemy_type)
+        if uses is None:
+            uses = bool(getattr(enemy, 'config', {}).get('mask_collision', False))
+            self._mask_by_type[enemy_type] = uses
+        return uses
+
+    def run(self, enemy_manager, players, weapons):
+        """检测本tick的所有碰撞
+
+        Args:
+            enemy_manager: 敌人管理器（提供 enemies、query 和 enemy_projectiles）
+            players: 玩家列表，敌人和敌人子弹总是针对最近的玩家
+            weapons: 会发射投射物的武器列表
+
+        Returns:
+            list: HitEvent 列表，按 投射物命中、敌人接触、敌人子弹命中 的顺序排列
+        """
+        events = []
+        if enemy_manager.enemies:
+            self._projectile_hits(enemy_manager, weapons, events)
+            self._enemy_contacts(enemy_manager, players, events)
+        self._enemy_projectile_hits(enemy_manager, players, events)
+        return events
+
+    def _projectile_hits(self, enemy_manager, weapons, events):
+        """武器投射物 -> 敌人"""
+        query = enemy_manager.query
+        enemies = enemy_manager.enemies
+        for weapon in weapons:
+            for projectile in weapon.get_projectiles():
+                x, y = world_position(projectile)
+                width, height = projectile.rect.size
+                radius = getattr(projectile, 'collision_radius', None) or width / 2
+                left, top = int(x) - width // 2, int(y) - height // 2
+
+                for enemy in query.near(x, y, radius):
+                    if enemy.health <= 0:
+                        continue  # 本tick已经被击杀
+                    rect = enemy.rect
+                    reach = rect.width / 2 + radius
+                    dx = rect.centerx - x
+                    dy = rect.centery - y
+                    if dx * dx + dy * dy >= reach * reach:
+                        continue
+                    if self.uses_mask(enemy) and not _masks_overlap(enemy, rect.x, rect.y,
+                                                                    projectile, left, top):
+                        continue
+
+                    event = HitEvent(PROJECTILE_HIT, projectile, enemy, weapon)
+                    event.destroy_source = weapon.handle_collision(projectile, enemy, enemies)
+                    event.killed = enemy.health <= 0
+                    events.append(event)
+                    if event.destroy_source:
+                        projectile.kill()
+                        break
+
+    def nearest_player(self, players, x, y):
+        """获取离 (x, y) 最近的玩家（距离相同时取列表中靠前的玩家）"""
+        return self._nearest_player(players, x, y)[0]
+
+    def _nearest_player(self, players, x, y):
+        """获取离 (x, y) 最近的玩家和距离"""
+        nearest, nearest_distance = None, math.inf
+        for player in players:
+            distance = math.hypot(x - player.world_x, y - player.world_y)
+            if distance < nearest_distance:
+                nearest, nearest_distance = player, distance
+        return nearest, nearest_distance
+
+    def _enemy_contacts(self, enemy_manager, players, events):
+        """敌人 -> 玩家（只检查每个敌人离它最近的玩家）
+
+        玩家最多两个，直接按敌人列表顺序做矩形判断比查询空间索引更快。
+        """
+        player_rects = []
+        for player in players:
+            player_rect = player.rect.copy()
+            player_rect.center = (player.world_x, player.world_y)
+            player_rects.append(player_rect)
+
+        single = len(players) == 1
+        for enemy in enemy_manager.enemies:
+            if enemy.health <= 0:
+                continue  # 已死亡，等待tick末尾移除
+            rect = enemy.rect
+            index = 0
+            if not single:
+                target, _ = self._nearest_player(players, rect.x + rect.width / 2, rect.y + rect.height / 2)
+                index = players.index(target)
+            player, player_rect = players[index], player_rects[index]
+            if player.invincible or not player_rect.colliderect(rect):
+                continue
+            if self.uses_mask(enemy) and not _masks_overlap(player, player_rect.x, player_rect.y,
+                                                            enemy, rect.x, rect.y):
+                continue
+            events.append(HitEvent(ENEMY_CONTACT, enemy, player))
+
+    def _enemy_projectile_hits(self, enemy_manager, players, events):
+        """敌人子弹 -> 玩家"""
+        radius = self.enemy_projectile_radius
+        for projectile in getattr(enemy_manager, 'enemy_projectiles', ()):
+            x, y = world_position(projectile)
+            target, distance = self._nearest_player(players, x, y)
+            if target is not None and distance < radius:
+                events.append(HitEvent(ENEMY_PROJECTILE_HIT, projectile, target))
@@ -5,6 +5,7 @@
 
 import pygame
 from .base_component import Component
+from ..core import input_source, display
 
 class MovementComponent(Component):
     """移动组件，处理实体的移动逻辑"""
@@ -160,7 +161,7 @@ class MovementComponent(Component):
             return
             
         # 根据角色类型使用不同的按键配置
-        keys = pygame.key.get_pressed()
+        keys = input_source.get_pressed()
         
         # 检查角色类型
         hero_type = getattr(self.owner, 'hero_type', 'ninja_frog')
@@ -250,11 +251,10 @@ class MovementComponent(Component):
     def _update_mouse_direction(self):
         """更新鼠标朝向"""
         # 获取鼠标位置
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = input_source.get_mouse_pos()
         
-        # 获取屏幕中心（假设游戏窗口居中）
-        screen_width = pygame.display.get_surface().get_width()
-        screen_height = pygame.display.get_surface().get_height()
+        # 获取屏幕中心（内部渲染分辨率，假设玩家位于画面中央）
+        screen_width, screen_height = display.get_render_size()
         screen_center_x = screen_width // 2
         screen_center_y = screen_height // 2
         
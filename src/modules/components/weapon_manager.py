@@ -27,6 +27,30 @@ class WeaponManager(Component):
         
         # 可用武器类型
         self.available_weapons = {}  # 将在player类中初始化
+        
+        # 每把武器的更新调用方式 {weapon: (update方法, 是否传入敌人)}，添加武器时确定一次
+        self._dispatch = {}
+    
+    def _bind(self, weapon):
+        """
+        确定武器的更新调用方式并缓存
+        
+        Weapon 子类通过类属性 targets_enemies 声明是否需要敌人查询句柄；
+        其他对象只在绑定时检查一次 update 的参数个数。
+        
+        Args:
+            weapon: 武器实例
+            
+        Returns:
+            tuple: (update方法, 是否传入敌人)
+        """
+        update = weapon.update
+        wants_enemies = getattr(weapon, 'targets_enemies', None)
+        if wants_enemies is None:
+            wants_enemies = len(inspect.signature(update).parameters) == 2  # update(dt, enemies)
+        binding = (update, bool(wants_enemies))
+        self._dispatch[weapon] = binding
+        return binding
     
     def add_weapon(self, weapon_type):
         """
@@ -53,6 +77,7 @@ class WeaponManager(Component):
                 
             if weapon:
                 self.weapons.append(weapon)
+                self._bind(weapon)
                 self.weapon_levels[weapon_type] = 1
                 
                 # 应用玩家的攻击力加成
@@ -75,6 +100,7 @@ class WeaponManager(Component):
         for i, weapon in enumerate(self.weapons):
             if weapon.type == weapon_type:
                 self.weapons.pop(i)
+                self._dispatch.pop(weapon, None)
                 if weapon_type in self.weapon_levels:
                     del self.weapon_levels[weapon_type]
                 return True
@@ -86,26 +112,22 @@ class WeaponManager(Component):
         
         Args:
             dt: 时间增量
-            enemies: 敌人列表，用于武器追踪（现在主要用于获取敌人列表）
+            enemies: 敌人空间查询句柄（EnemyQuery）或敌人列表，只传给需要查找敌人的武器
         """
         if not self.enabled:
             return
-            
-        if not enemies:
-            enemies = []
         
+        dispatch = self._dispatch
         for weapon in self.weapons:
-            # 检查weapon.update方法所需的参数数量
-            update_signature = inspect.signature(weapon.update)
-            
-            # 根据方法签名调用update
-            if len(update_signature.parameters) == 2:  # update(self, dt)
-                weapon.update(dt)
-            elif len(update_signature.parameters) == 3:  # update(self, dt, enemies)
-                weapon.update(dt, enemies)
+            binding = dispatch.get(weapon)
+            if binding is None:
+                # 直接加入 weapons 列表的武器在第一次更新时绑定
+                binding = self._bind(weapon)
+            update, wants_enemies = binding
+            if wants_enemies:
+                update(dt, enemies)
             else:
-                # 默认调用方式
-                weapon.update(dt)
+                update(dt)
     
     def manual_attack(self, screen):
         """远程攻击（鼠标左键触发）
@@ -262,6 +284,7 @@ class WeaponManager(Component):
         """
         self.weapons.clear()
         self.weapon_levels.clear()
+        self._dispatch.clear()
         
     def enable_weapons(self):
         """
@@ -276,4 +299,5 @@ class WeaponManager(Component):
         """重置武器管理器状态"""
         self.weapons.clear()
         self.weapon_levels.clear()
+        self._dispatch.clear()
        
\ No newline at end of file
@@ -7,5 +7,9 @@ from .game_state import GameState
 from .scene_manager import SceneManager
 from .input_manager import InputManager
 from .render_manager import RenderManager
+from .frame_pacer import FramePacer
+from .quality_governor import QualityGovernor
+from .input_source import InputSource, ScriptedInputSource, KeyState
 
-__all__ = ['GameState', 'SceneManager', 'InputManager', 'RenderManager'] 
\ No newline at end of file
+__all__ = ['GameState', 'SceneManager', 'InputManager', 'RenderManager', 'FramePacer',
+           'QualityGovernor', 'InputSource', 'ScriptedInputSource', 'KeyState'] 
\ No newline at end of file
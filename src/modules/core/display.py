@@ -0,0 +1,164 @@
+"""
+显示输出
+游戏固定在内部渲染分辨率的离屏表面上绘制，每帧最近邻缩放一次到窗口（保持宽高比，多余部分留黑边），
+可选只按整数倍缩放以保持像素画清晰。内部分辨率等于窗口尺寸时直接在窗口上绘制，没有额外开销。
+鼠标坐标通过 to_render_pos / to_window_pos 在窗口坐标和内部渲染坐标之间换算。
+"""
+
+from typing import List, Optional, Tuple
+import pygame
+
+
+class ScaledDisplay:
+    """窗口和内部渲染表面"""
+
+    def __init__(self, window_size: Tuple[int, int], render_size: Optional[Tuple[int, int]] = None,
+                 integer_scale: bool = False, window: Optional[pygame.Surface] = None):
+        """
+        Args:
+            window_size: 窗口尺寸
+            render_size: 内部渲染分辨率，None表示与窗口相同
+            integer_scale: 是否只按整数倍缩放（内部分辨率大于窗口时按1倍居中裁剪显示）
+            window: 已创建的窗口表面，None时调用 set_mode 创建
+        """
+        self.window = window if window is not None else pygame.display.set_mode(window_size)
+        self.render_size = tuple(render_size or self.window.get_size())
+        self.integer_scale = integer_scale
+
+        if self.render_size == self.window.get_size():
+            self.surface = self.window
+            self.dest_rect = self.window.get_rect()
+            self._target = None
+        else:
+            self.surface = pygame.Surface(self.render_size).convert(self.window)
+            self.dest_rect = self._fit_rect()
+            self.window.fill((0, 0, 0))
+            self._target = self.window.subsurface(self.dest_rect.clip(self.window.get_rect()))
+
+    @property
+    def scaled(self) -> bool:
+        """是否需要缩放显示"""
+        return self.surface is not self.window
+
+    @property
+    def scale(self) -> float:
+        """内部渲染坐标到窗口坐标的缩放倍数"""
+        return self.dest_rect.width / self.render_size[0]
+
+    def _fit_rect(self) -> pygame.Rect:
+        """计算缩放后的画面在窗口中的位置（保持宽高比，居中）"""
+        window_width, window_height = self.window.get_size()
+        render_width, render_height = self.render_size
+        scale = min(window_width / render_width, window_height / render_height)
+        if self.integer_scale:
+            scale = max(1, int(scale))
+        rect = pygame.Rect(0, 0, round(render_width * scale), round(render_height * scale))
+        rect.center = (window_width // 2, window_height // 2)
+        return rect
+
+    def present(self, rects: Optional[List[pygame.Rect]] = None):
+        """把内部渲染表面显示到窗口
+
+        Args:
+            rects: 内部渲染坐标下需要更新的区域，为None时整屏刷新
+        """
+        if not self.scaled:
+            if rects is not None:
+                pygame.display.update(rects)
+            else:
+                pygame.display.flip()
+            return
+
+        if self.dest_rect.size == self._target.get_size():
+            pygame.transform.scale(self.surface, self.dest_rect.size, self._target)
+        else:
+            # 整数倍放大后超出窗口：居中裁剪
+            scaled = pygame.transform.scale(self.surface, self.dest_rect.size)
+            offset = self._target.get_offset()
+            self._target.blit(scaled, (self.dest_rect.x - offset[0], self.dest_rect.y - offset[1]))
+        if rects is not None:
+            pygame.display.update([self.to_window_rect(rect) for rect in rects])
+        else:
+            pygame.display.flip()
+
+    def to_render_pos(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        """窗口坐标 -> 内部渲染坐标（黑边区域会被限制到画面边缘）"""
+        if not self.scaled:
+            return pos
+        scale = self.scale
+        x = int((pos[0] - self.dest_rect.x) / scale)
+        y = int((pos[1] - self.dest_rect.y) / scale)
+        return (min(max(x, 0), self.render_size[0] - 1), min(max(y, 0), self.render_size[1] - 1))
+
+    def to_window_pos(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        """内部渲染坐标 -> 窗口坐标"""
+        if not self.scaled:
+            return pos
+        scale = self.scale
+        return (int(self.dest_rect.x + pos[0] * scale), int(self.dest_rect.y + pos[1] * scale))
+
+    def to_window_rect(self, rect: pygame.Rect) -> pygame.Rect:
+        """内部渲染坐标的矩形 -> 覆盖它的窗口矩形"""
+        scale = self.scale
+        left = self.dest_rect.x + int(rect.left * scale)
+        top = self.dest_rect.y + int(rect.top * scale)
+        right = self.dest_rect.x + int(rect.right * scale + 0.999)
+        bottom = self.dest_rect.y + int(rect.bottom * scale + 0.999)
+        return pygame.Rect(left, top, right - left, bottom - top).clip(self.window.get_rect())
+
+
+def parse_resolution(text: Optional[str]) -> Optional[Tuple[int, int]]:
+    """解析 "宽x高" 形式的分辨率字符串，无法解析时返回None"""
+    if not text:
+        return None
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        print(f"无法解析分辨率: {text}")
+        return None
+    if width <= 0 or height <= 0:
+        print(f"无法解析分辨率: {text}")
+        return None
+    return width, height
+
+
+# 当前生效的显示输出，None表示直接使用pygame窗口（未缩放）
+_current_display: Optional[ScaledDisplay] = None
+
+
+def set_display(display: Optional[ScaledDisplay]):
+    """设置当前显示输出"""
+    global _current_display
+    _current_display = display
+
+
+def get_display() -> Optional[ScaledDisplay]:
+    """获取当前显示输出"""
+    return _current_display
+
+
+def present(rects: Optional[List[pygame.Rect]] = None):
+    """显示一帧（未设置显示输出时直接 flip / update）"""
+    if _current_display is not None:
+        _current_display.present(rects)
+    elif rects is not None:
+        pygame.display.update(rects)
+    else:
+        pygame.display.flip()
+
+
+def to_render_pos(pos: Tuple[int, int]) -> Tuple[int, int]:
+    """窗口坐标 -> 内部渲染坐标"""
+    return _current_display.to_render_pos(pos) if _current_display is not None else pos
+
+
+def to_window_pos(pos: Tuple[int, int]) -> Tuple[int, int]:
+    """内部渲染坐标 -> 窗口坐标"""
+    return _current_display.to_window_pos(pos) if _current_display is not None else pos
+
+
+def get_render_size() -> Tuple[int, int]:
+    """内部渲染分辨率（未设置显示输出时为窗口尺寸）"""
+    if _current_display is not None:
+        return _current_display.render_size
+    return pygame.display.get_surface().get_size()
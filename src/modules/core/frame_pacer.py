@@ -0,0 +1,61 @@
+"""
+帧节奏控制
+战斗进行时按满帧率渲染；菜单、暂停、升级选择、结算等静态界面降低目标帧率，
+并且只在收到输入、界面状态变化或到达保活间隔时才重新渲染，空闲时几乎不占用CPU。
+"""
+
+
+class FramePacer:
+    """决定每帧的目标帧率以及是否需要渲染"""
+
+    def __init__(self, active_fps=120, idle_fps=30, keepalive_interval=1.0):
+        """
+        Args:
+            active_fps: 战斗进行时的目标帧率
+            idle_fps: 静态界面的目标帧率（只影响输入响应的延迟）
+            keepalive_interval: 静态界面即使没有变化也至少每隔多少秒重绘一次
+        """
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.keepalive_interval = keepalive_interval
+
+        self._redraw_requested = True
+        self._last_state = None
+        self._since_render = 0.0
+
+        # 统计
+        self.rendered_frames = 0
+        self.skipped_frames = 0
+
+    def target_fps(self, idle_state):
+        """获取目标帧率
+
+        Args:
+            idle_state: 当前静态界面的状态，None表示正在战斗或播放动画
+        """
+        return self.active_fps if idle_state is None else self.idle_fps
+
+    def request_redraw(self):
+        """请求下一帧重新渲染（收到输入事件时调用）"""
+        self._redraw_requested = True
+
+    def should_render(self, dt, idle_state):
+        """判断本帧是否需要渲染
+
+        Args:
+            dt: 距上一帧的时间（秒）
+            idle_state: 描述静态界面内容的值，None表示画面每帧都在变化
+
+        Returns:
+            bool: 是否渲染
+        """
+        self._since_render += dt
+        if (idle_state is None or self._redraw_requested or idle_state != self._last_state or
+                self._since_render >= self.keepalive_interval):
+            self._redraw_requested = False
+            self._last_state = idle_state
+            self._since_render = 0.0
+            self.rendered_frames += 1
+            return True
+        self.skipped_frames += 1
+        return False
@@ -0,0 +1,26 @@
+"""
+游戏随机数源
+所有影响游戏逻辑的随机数都从这里的 rng 获取，开局时统一设置种子，
+同样的种子加同样的输入就能复现同一局游戏（录像回放依赖这一点）。
+开场动画、伤害数字抖动等纯表现用的随机数仍使用全局 random 模块。
+"""
+
+import random
+
+# 游戏逻辑共用的随机数生成器
+rng = random.Random()
+
+
+def seed(value=None):
+    """设置游戏随机数种子
+
+    Args:
+        value: 种子，为None时随机生成一个
+
+    Returns:
+        int: 实际使用的种子
+    """
+    if value is None:
+        value = random.getrandbits(32)
+    rng.seed(value)
+    return value
@@ -7,6 +7,8 @@ from typing import Dict, Set, Callable, Optional, Tuple, List
 import pygame
 import time
 
+from . import display
+
 class InputAction:
     """输入动作类"""
     
@@ -225,7 +227,7 @@ class InputManager:
                 self.mouse_buttons = tuple(new_buttons)
         elif event.type == pygame.MOUSEMOTION:
             self.last_mouse_position = self.mouse_position
-            self.mouse_position = event.pos
+            self.mouse_position = display.to_render_pos(event.pos)  # 换算到内部渲染坐标
             self.mouse_delta = (
                 self.mouse_position[0] - self.last_mouse_position[0],
                 self.mouse_position[1] - self.last_mouse_position[1]
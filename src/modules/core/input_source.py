@@ -0,0 +1,101 @@
+"""
+输入源
+为游戏逻辑提供按键状态和鼠标位置的统一读取入口。
+默认直接读取pygame的实时输入，无界面模拟等场景可以替换为脚本化输入源。
+"""
+
+from typing import Iterable, Tuple
+import pygame
+
+from . import display
+
+
+class KeyState:
+    """按键状态集合，支持与 pygame.key.get_pressed() 相同的下标访问方式"""
+
+    def __init__(self, keys: Iterable[int] = ()):
+        self._keys = frozenset(keys)
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class InputSource:
+    """实时输入源，直接读取pygame的键盘和鼠标状态"""
+
+    def get_pressed(self):
+        """获取当前按键状态"""
+        return pygame.key.get_pressed()
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        """获取当前鼠标位置（内部渲染坐标）"""
+        return display.to_render_pos(pygame.mouse.get_pos())
+
+    def set_mouse_pos(self, x: int, y: int):
+        """设置鼠标位置（内部渲染坐标）"""
+        pygame.mouse.set_pos(display.to_window_pos((x, y)))
+
+
+class ScriptedInputSource(InputSource):
+    """脚本化输入源，按键和鼠标状态由外部代码直接设置"""
+
+    def __init__(self, mouse_pos: Tuple[int, int] = (0, 0)):
+        self.pressed_keys = set()
+        self.mouse_pos = (int(mouse_pos[0]), int(mouse_pos[1]))
+
+    def press(self, key: int):
+        """按下按键"""
+        self.pressed_keys.add(key)
+
+    def release(self, key: int):
+        """释放按键"""
+        self.pressed_keys.discard(key)
+
+    def set_pressed(self, keys: Iterable[int]):
+        """整体替换当前按下的按键"""
+        self.pressed_keys = set(keys)
+
+    def get_pressed(self) -> KeyState:
+        return KeyState(self.pressed_keys)
+
+    def get_mouse_pos(self) -> Tuple[int, int]:
+        return self.mouse_pos
+
+    def set_mouse_pos(self, x: int, y: int):
+        self.mouse_pos = (int(x), int(y))
+
+
+# 当前生效的输入源
+_current_source = InputSource()
+
+
+def set_input_source(source: InputSource):
+    """设置当前输入源，传入None时恢复为实时输入"""
+    global _current_source
+    _current_source = source if source is not None else InputSource()
+
+
+def get_input_source() -> InputSource:
+    """获取当前输入源"""
+    return _current_source
+
+
+def get_pressed():
+    """获取当前输入源的按键状态"""
+    return _current_source.get_pressed()
+
+
+def get_mouse_pos() -> Tuple[int, int]:
+    """获取当前输入源的鼠标位置"""
+    return _current_source.get_mouse_pos()
+
+
+def set_mouse_pos(x: int, y: int):
+    """通过当前输入源设置鼠标位置"""
+    _current_source.set_mouse_pos(x, y)
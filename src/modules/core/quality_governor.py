@@ -0,0 +1,159 @@
+"""
+画质调节器
+根据战斗中的滚动平均帧时间自动升降画质档位：持续慢于目标帧时间一段时间后降一档，
+持续明显快于目标一段时间后升一档；升降使用不同的阈值和持续时间（滞后），避免在两档之间来回抖动。
+只根据每帧的dt做决定，录像回放时会得到完全相同的档位变化。
+"""
+
+from collections import deque
+
+
+# 画质档位，从高到低
+QUALITY_TIERS = (
+    {
+        "name": "高",
+        "lighting_scale": 1.0,           # 黑暗遮罩分辨率比例
+        "ray_scale": 1.0,                # 视野光线数量比例
+        "damage_number_limit": None,     # 同时显示的伤害数字上限，None表示不限
+        "offscreen_update_interval": 1,  # 屏幕外敌人每隔几帧更新一次
+        "enemy_details": True,           # 是否绘制敌人轮廓和血量文字
+        "minimap_refresh_interval": 1,   # 小地图每隔几帧重绘一次
+    },
+    {
+        "name": "中",
+        "lighting_scale": 0.5,
+        "ray_scale": 0.75,
+        "damage_number_limit": 40,
+        "offscreen_update_interval": 2,
+        "enemy_details": True,
+        "minimap_refresh_interval": 2,
+    },
+    {
+        "name": "低",
+        "lighting_scale": 0.5,
+        "ray_scale": 0.5,
+        "damage_number_limit": 20,
+        "offscreen_update_interval": 3,
+        "enemy_details": False,
+        "minimap_refresh_interval": 4,
+    },
+    {
+        "name": "最低",
+        "lighting_scale": 0.5,
+        "ray_scale": 0.25,
+        "damage_number_limit": 10,
+        "offscreen_update_interval": 4,
+        "enemy_details": False,
+        "minimap_refresh_interval": 8,
+    },
+)
+
+
+class QualityGovernor:
+    """根据滚动帧时间选择画质档位"""
+
+    def __init__(self, target_fps=60, window=60, degrade_ratio=1.15, upgrade_ratio=0.8,
+                 degrade_hold=1.0, upgrade_hold=3.0, max_frame_time=0.1, tiers=QUALITY_TIERS):
+        """
+        Args:
+            target_fps: 目标帧率
+            window: 滚动平均使用的帧数
+            degrade_ratio: 平均帧时间超过目标的多少倍时开始计时降档
+            upgrade_ratio: 平均帧时间低于目标的多少倍时开始计时升档
+            degrade_hold: 需要持续超标多少秒才降一档
+            upgrade_hold: 需要持续富余多少秒才升一档
+            max_frame_time: 单帧样本上限（秒），避免加载地图等长帧一次性拉高平均值
+            tiers: 画质档位列表，从高到低
+        """
+        self.target_frame_time = 1.0 / target_fps
+        self.degrade_threshold = self.target_frame_time * degrade_ratio
+        self.upgrade_threshold = self.target_frame_time * upgrade_ratio
+        self.degrade_hold = degrade_hold
+        self.upgrade_hold = upgrade_hold
+        self.max_frame_time = max_frame_time
+        self.tiers = tiers
+        self.enabled = True
+
+        self._samples = deque(maxlen=window)
+        self._total = 0.0
+        self.tier = 0
+        self._over_time = 0.0
+        self._under_time = 0.0
+
+        # 档位变化记录 [(旧档位, 新档位, 平均帧时间)]
+        self.changes = []
+
+    @property
+    def settings(self):
+        """当前档位的各项画质设置"""
+        return self.tiers[self.tier]
+
+    @property
+    def tier_name(self):
+        """当前档位名称"""
+        return self.tiers[self.tier]["name"]
+
+    @property
+    def average_frame_time(self):
+        """滚动平均帧时间（秒）"""
+        return self._total / len(self._samples) if self._samples else 0.0
+
+    def reset(self):
+        """恢复最高画质并清空样本（每局开始时调用）"""
+        self._samples.clear()
+        self._total = 0.0
+        self.tier = 0
+        self._over_time = 0.0
+        self._under_time = 0.0
+
+    def record_frame(self, dt):
+        """记录一帧的帧时间，必要时升降一档
+
+        Args:
+            dt: 帧时间（秒）
+
+        Returns:
+            bool: 本帧档位是否发生变化
+        """
+        if not self.enabled:
+            return False
+        dt = min(dt, self.max_frame_time)
+        if len(self._samples) == self._samples.maxlen:
+            self._total -= self._samples[0]
+        self._samples.append(dt)
+        self._total += dt
+        # 样本不足一个窗口时不做判断
+        if len(self._samples) < self._samples.maxlen:
+            return False
+
+        average = self._total / len(self._samples)
+        if average > self.degrade_threshold:
+            self._over_time += dt
+            self._under_time = 0.0
+            if self._over_time >= self.degrade_hold and self.tier < len(self.tiers) - 1:
+                return self._change_tier(self.tier + 1, average)
+        elif average < self.upgrade_threshold:
+            self._under_time += dt
+            self._over_time = 0.0
+            if self._under_time >= self.upgrade_hold and self.tier > 0:
+                return self._change_tier(self.tier - 1, average)
+        else:
+            # 处于两个阈值之间：保持当前档位
+            self._over_time = 0.0
+            self._under_time = 0.0
+        return False
+
+    def _change_tier(self, tier, average):
+        """切换档位并记录日志"""
+        old_tier = self.tier
+        self.tier = tier
+        self._over_time = 0.0
+        self._under_time = 0.0
+        # 新档位生效后重新采样，旧样本不再代表当前开销
+        self._samples.clear()
+        self._total = 0.0
+        self.changes.append((old_tier, tier, average))
+        direction = "降低" if tier > old_tier else "提高"
+        print(f"画质{direction}: {self.tiers[old_tier]['name']} -> {self.tiers[tier]['name']}"
+              f"（平均帧时间 {average * 1000:.1f}ms，目标 {self.target_frame_time * 1000:.1f}ms）")
+        return True
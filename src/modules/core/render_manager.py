@@ -1,20 +1,31 @@
 """
 渲染管理器
 负责管理渲染层和渲染顺序，提供统一的渲染接口
+
+作为帧合成器使用时（render_frame），每帧记录各层绘制过的脏矩形，并且只显示一次：
+整屏重绘时 flip，画面大部分冻结（暂停、升级选择、结算界面）时复用静态层快照，
+只重绘动态层并用 pygame.display.update(rects) 局部更新。
 """
 
 from typing import List, Dict, Callable, Optional, Tuple
 import pygame
 
+from . import display
+
 
 class RenderLayer:
     """渲染层类"""
     
-    def __init__(self, name: str, priority: int = 0):
+    def __init__(self, name: str, priority: int = 0, static: bool = False):
         self.name = name
         self.priority = priority  # 优先级，数字越小越先渲染
+        self.static = static  # 静态层：画面冻结时可以直接复用上一次的绘制结果
         self.renderables: List[Callable] = []
         
+        # 最近一次渲染绘制过的区域
+        self.dirty_rects: List[pygame.Rect] = []
+        self.full_dirty = False  # 是否可能改动了整个屏幕
+        
     def add_renderable(self, render_func: Callable):
         """添加可渲染对象"""
         self.renderables.append(render_func)
@@ -25,12 +36,24 @@ class RenderLayer:
             self.renderables.remove(render_func)
             
     def render(self, screen: pygame.Surface, camera_x: float = 0, camera_y: float = 0):
-        """渲染该层的所有对象"""
+        """渲染该层的所有对象
+        
+        渲染函数可以返回它绘制过的 Rect 或 Rect 列表；返回 None 视为可能改动了整个屏幕。
+        """
+        self.dirty_rects = []
+        self.full_dirty = False
         for render_func in self.renderables:
             try:
-                render_func(screen, camera_x, camera_y)
+                touched = render_func(screen, camera_x, camera_y)
             except Exception as e:
                 print(f"渲染错误 in layer {self.name}: {e}")
+                touched = None
+            if touched is None:
+                self.full_dirty = True
+            elif isinstance(touched, pygame.Rect):
+                self.dirty_rects.append(touched)
+            else:
+                self.dirty_rects.extend(rect for rect in touched if rect)
                 
     def clear(self):
         """清空该层的所有渲染对象"""
@@ -40,7 +63,7 @@ class RenderLayer:
 class RenderManager:
     """渲染管理器"""
     
-    def __init__(self, screen: pygame.Surface):
+    def __init__(self, screen: pygame.Surface, default_layers: bool = True):
         self.screen = screen
         self.layers: Dict[str, RenderLayer] = {}
         self.layer_order: List[str] = []
@@ -64,8 +87,20 @@ class RenderManager:
         self.camera2_x = 0.0
         self.camera2_y = 0.0
         
+        # 帧合成状态
+        self._backdrop: Optional[pygame.Surface] = None  # 静态层快照
+        self._backdrop_key = None  # 快照对应的冻结状态
+        self._dynamic_rects: List[pygame.Rect] = []  # 上一帧动态层绘制过的区域
+        self.partial_area_limit = 0.5  # 脏区域超过屏幕面积的这个比例时直接整屏刷新
+        
+        # 显示统计
+        self.presents = 0  # 已显示的帧数
+        self.full_presents = 0  # 其中整屏刷新的帧数
+        self.last_present_rects: List[pygame.Rect] = []  # 最近一帧局部更新的矩形，整屏刷新时为空
+        
         # 初始化默认层
-        self._setup_default_layers()
+        if default_layers:
+            self._setup_default_layers()
         
     def _setup_default_layers(self):
         """设置默认渲染层"""
@@ -79,10 +114,17 @@ class RenderManager:
         self.add_layer("ui", 7)              # UI层
         self.add_layer("overlay", 8)         # 覆盖层
         
-    def add_layer(self, name: str, priority: int = 0):
-        """添加渲染层"""
-        self.layers[name] = RenderLayer(name, priority)
+    def add_layer(self, name: str, priority: int = 0, static: bool = False):
+        """添加渲染层
+        
+        Args:
+            name: 层名称
+            priority: 优先级，数字越小越先渲染
+            static: 是否为静态层（静态层必须排在所有动态层之前）
+        """
+        self.layers[name] = RenderLayer(name, priority, static)
         self._update_layer_order()
+        self.invalidate()
         
     def remove_layer(self, name: str):
         """移除渲染层"""
@@ -189,6 +231,91 @@ class RenderManager:
         if self.enable_grid:
             self._render_grid(sub_surface2, self.camera2_x, self.camera2_y)
             
+    def render_frame(self, freeze_key=None) -> List[pygame.Rect]:
+        """合成并显示一帧（每帧只调用一次，内部恰好显示一次）
+        
+        Args:
+            freeze_key: 静态层内容冻结时传入描述冻结状态的值（如当前打开的菜单），
+                为None表示画面在变化。连续帧的freeze_key相同时复用静态层快照，
+                只重绘动态层覆盖过的区域。
+                
+        Returns:
+            list: 本帧局部更新的矩形，整屏刷新时返回空列表
+        """
+        screen = self.screen
+        reuse = (freeze_key is not None and freeze_key == self._backdrop_key
+                 and self._backdrop is not None and self._backdrop.get_size() == screen.get_size())
+        
+        dirty: Optional[List[pygame.Rect]]
+        if reuse:
+            # 用静态层快照擦除上一帧动态层画过的区域
+            dirty = self._dynamic_rects
+            for rect in dirty:
+                screen.blit(self._backdrop, rect, rect)
+        else:
+            dirty = None
+            screen.fill(self.clear_color)
+            for layer_name in self.layer_order:
+                layer = self.layers[layer_name]
+                if layer.static:
+                    layer.render(screen, self.camera_x, self.camera_y)
+            if freeze_key is not None:
+                self._capture_backdrop()
+            self._backdrop_key = freeze_key
+        
+        # 动态层每帧都重绘
+        screen_rect = screen.get_rect()
+        dynamic_rects = []
+        full = dirty is None
+        for layer_name in self.layer_order:
+            layer = self.layers[layer_name]
+            if layer.static:
+                continue
+            layer.render(screen, self.camera_x, self.camera_y)
+            if layer.full_dirty:
+                full = True
+            dynamic_rects.extend(rect.clip(screen_rect) for rect in layer.dirty_rects)
+        self._dynamic_rects = [rect for rect in dynamic_rects if rect.width and rect.height]
+        
+        if full:
+            self.present()
+            return []
+        return self.present(dirty + self._dynamic_rects)
+        
+    def present(self, rects: Optional[List[pygame.Rect]] = None) -> List[pygame.Rect]:
+        """把画面显示到窗口（每帧一次）
+        
+        Args:
+            rects: 需要更新的区域，为None时整屏刷新
+            
+        Returns:
+            list: 实际局部更新的矩形，整屏刷新时返回空列表
+        """
+        self.presents += 1
+        if rects is not None:
+            rects = _merge_rects(rects)
+            screen_area = self.screen.get_width() * self.screen.get_height()
+            if sum(rect.width * rect.height for rect in rects) <= screen_area * self.partial_area_limit:
+                display.present(rects)
+                self.last_present_rects = rects
+                return rects
+        display.present()
+        self.full_presents += 1
+        self.last_present_rects = []
+        return []
+        
+    def invalidate(self):
+        """丢弃静态层快照，下一帧整屏重绘"""
+        self._backdrop_key = None
+        self._dynamic_rects = []
+        
+    def _capture_backdrop(self):
+        """保存静态层绘制结果"""
+        if self._backdrop is None or self._backdrop.get_size() != self.screen.get_size():
+            self._backdrop = self.screen.copy()
+        else:
+            self._backdrop.blit(self.screen, (0, 0))
+            
     def _render_grid(self, surface: pygame.Surface, camera_x: float, camera_y: float):
         """渲染网格"""
         width, height = surface.get_size()
@@ -220,4 +347,19 @@ class RenderManager:
         """屏幕坐标转世界坐标"""
         world_x = screen_x + self.camera_x
         world_y = screen_y + self.camera_y
-        return world_x, world_y 
\ No newline at end of file
+        return world_x, world_y
+
+
+def _merge_rects(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    """合并相交的矩形，减少局部更新的矩形数量"""
+    merged: List[pygame.Rect] = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        if not rect.width or not rect.height:
+            continue
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
@@ -94,6 +94,9 @@ class DamageNumberManager:
         """初始化伤害数字管理器"""
         self.damage_numbers = []
         
+        # 同时显示的伤害数字上限（画质调节器设置），None表示不限
+        self.max_numbers = None
+        
         # 不同伤害类型的颜色配置
         self.damage_colors = {
             'normal': (255, 255, 255),    # 普通伤害 - 白色
@@ -115,6 +118,11 @@ class DamageNumberManager:
             damage_type: 伤害类型，用于确定颜色
             font_size: 字体大小
         """
+        # 达到上限时丢弃新的伤害数字（暴击仍然显示）
+        if (self.max_numbers is not None and len(self.damage_numbers) >= self.max_numbers
+                and damage_type != 'critical'):
+            return
+        
         # 获取颜色
         color = self.damage_colors.get(damage_type, self.damage_colors['normal'])
         
@@ -0,0 +1,92 @@
+"""
+死亡队列
+击杀不在碰撞处理过程中立即结算，而是先登记到队列，在tick末尾统一处理：
+经验值汇总后每名玩家只添加一次，掉落物批量生成，敌人列表只压缩一次，
+每种敌人的死亡音效每tick最多播放一次。
+"""
+
+
+class DeathSummary:
+    """一次结算的结果
+
+    Attributes:
+        count: 本次结算的死亡敌人数量
+        experience: 死亡敌人的经验值总和
+        enemy_types: 出现过的敌人类型（按首次死亡的顺序，不重复），用于播放死亡音效
+    """
+
+    __slots__ = ("count", "experience", "enemy_types")
+
+    def __init__(self, count=0, experience=0, enemy_types=()):
+        self.count = count
+        self.experience = experience
+        self.enemy_types = list(enemy_types)
+
+
+class DeathQueue:
+    """本tick死亡的敌人（按登记顺序，同一个敌人只登记一次）"""
+
+    def __init__(self):
+        self._pending = []
+        self._pending_ids = set()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def push(self, enemy):
+        """登记一个死亡的敌人
+
+        Returns:
+            bool: 是否是新登记的（重复登记返回False）
+        """
+        key = id(enemy)
+        if key in self._pending_ids:
+            return False
+        self._pending_ids.add(key)
+        self._pending.append(enemy)
+        return True
+
+    def collect(self, enemies):
+        """登记列表中所有已经死亡的敌人（范围伤害、燃烧等不经过命中事件的击杀）"""
+        for enemy in enemies:
+            if not enemy.alive():
+                self.push(enemy)
+
+    def clear(self):
+        """丢弃所有未结算的死亡"""
+        self._pending = []
+        self._pending_ids.clear()
+
+    def flush(self, enemy_manager, item_manager=None, drop_target=None):
+        """结算所有登记的死亡：批量生成掉落物，并一次性从敌人列表中移除
+
+        经验值和死亡音效交给调用方按游戏模式处理。
+
+        Args:
+            enemy_manager: 敌人管理器
+            item_manager: 物品管理器，为None时不生成掉落物
+            drop_target: 掉落物和幸运值加成对应的玩家
+
+        Returns:
+            DeathSummary: 结算结果
+        """
+        if not self._pending:
+            return DeathSummary()
+        dead = self._pending
+        self.clear()
+
+        experience = 0
+        enemy_types = {}
+        drops = []
+        for enemy in dead:
+            config = getattr(enemy, 'config', None)
+            if config:
+                experience += config.get('exp_value', 0)
+            enemy_types.setdefault(enemy.type, None)
+            drops.append((enemy.rect.x, enemy.rect.y, enemy.type))
+
+        # 在敌人死亡位置生成物品，按死亡顺序抽取随机数
+        if item_manager:
+            item_manager.spawn_items(drops, drop_target)
+        enemy_manager.remove_enemies(dead)
+        return DeathSummary(len(dead), experience, enemy_types)
@@ -2,6 +2,10 @@ import pygame
 import math
 from .player import Player
 from .lighting_manager import LightingManager
+from .core import input_source
+from .resource_manager import resource_manager
+from .hud_widgets import (TextLabel, PanelBackground, EnergyBarWidget,
+                          BulletShotsWidget, DashedLineWidget)
 
 class DualPlayerSystem:
     """双角色系统，管理两个玩家的独立控制和距离限制"""
@@ -59,7 +63,7 @@ class DualPlayerSystem:
         
         # 光照方向追踪（解决摄像机移动时光照方向变化的问题）
         self.lighting_direction = 0  # 光照方向（弧度）
-        self.last_mouse_pos = pygame.mouse.get_pos()  # 上次鼠标位置
+        self.last_mouse_pos = input_source.get_mouse_pos()  # 上次鼠标位置
         
         # 初始化光照方向（指向屏幕中心稍微偏右，避免开始时的零向量问题）
         initial_mouse_x, initial_mouse_y = self.last_mouse_pos
@@ -84,6 +88,20 @@ class DualPlayerSystem:
         self.lighting_manager = None
         self._init_lighting_system()
         
+        # HUD控件（图标、背景和文字缓存，数值变化时才重新绘制）
+        self.energy_bar_widget = EnergyBarWidget(
+            lambda: resource_manager.load_image('light_icon', 'images/ui/light_icon.png'))
+        self.bullet_shots_widget = BulletShotsWidget(
+            lambda: resource_manager.load_image('bullet_icon', 'images/weapons/bullet_icon.png'))
+        self.connection_line_widget = DashedLineWidget()
+        self.ammo_label = TextLabel(20)
+        self.light_mode_panel = PanelBackground((180, 60))
+        self.light_mode_labels = (TextLabel(16), TextLabel(16))
+        self.energy_panel = PanelBackground((100, 80))
+        self.energy_labels = (TextLabel(20), TextLabel(20))
+        self.teleport_panel = PanelBackground((100, 60))
+        self.teleport_labels = (TextLabel(16), TextLabel(16))
+        
         # 鼠标显示状态管理
         self.mouse_hidden = False  # 记录鼠标是否被我们隐藏了
         self.last_game_active_state = None  # 记录上次的游戏活跃状态
@@ -529,9 +547,10 @@ class DualPlayerSystem:
         if self.lighting_manager:
             # 更新光照管理器的墙壁数据
             if self.game.map_manager:
-                walls = self.game.map_manager.get_collision_tiles()
-                tile_width, tile_height = self.game.map_manager.get_tile_size()
-                self.lighting_manager.set_walls(walls, tile_width)
+                geometry = self.game.map_manager.get_wall_geometry()
+                if geometry:
+                    tile_width, tile_height = self.game.map_manager.get_tile_size()
+                    self.lighting_manager.set_walls(geometry.rects, tile_width)
             
             # 只有在游戏活跃时才进行光照控制
             is_game_active = (not self.game.paused and 
@@ -540,7 +559,7 @@ class DualPlayerSystem:
             
             if is_game_active:
                 # 检测鼠标移动并更新光照方向
-                current_mouse_pos = pygame.mouse.get_pos()
+                current_mouse_pos = input_source.get_mouse_pos()
                 if current_mouse_pos != self.last_mouse_pos:
                     old_mouse_x, old_mouse_y = self.last_mouse_pos
                     new_mouse_x, new_mouse_y = current_mouse_pos
@@ -590,7 +609,7 @@ class DualPlayerSystem:
                         target_mouse_y = screen_center_y + int(mouse_distance * math.sin(self.lighting_direction))
                         
                         # 强制设置鼠标位置
-                        pygame.mouse.set_pos(target_mouse_x, target_mouse_y)
+                        input_source.set_mouse_pos(target_mouse_x, target_mouse_y)
                         self.last_mouse_pos = (target_mouse_x, target_mouse_y)
                     else:
                         # 如果鼠标限制被禁用，只更新last_mouse_pos为当前鼠标位置
@@ -627,7 +646,8 @@ class DualPlayerSystem:
         # 渲染神秘剑士头上的子弹射击次数显示
         self.render_bullet_shots_display(screen, camera_x, camera_y)
         
-        # 渲染光照效果（基于忍者蛙的位置，使用固定的光照方向）
+    def render_lighting(self, screen, camera_x, camera_y):
+        """渲染光照效果（基于忍者蛙的位置，使用固定的光照方向）"""
         if self.lighting_manager:
             # 计算忍者蛙在屏幕上的位置
             ninja_screen_x = self.ninja_frog.world_x - camera_x + screen.get_width() // 2
@@ -749,9 +769,8 @@ class DualPlayerSystem:
         # screen.blit(bordered_icon, (x - 2, y - 2))
         
         # 渲染子弹数量（中文）
-        font = pygame.font.SysFont('simHei', 20)
         ammo_text = f"子弹: {bullet_weapon.ammo}/{bullet_weapon.max_ammo}"
-        text_surface = font.render(ammo_text, True, (255, 255, 255))
+        text_surface = self.ammo_label.get(ammo_text)
         text_rect = text_surface.get_rect(center=(x + icon_size // 2, y + icon_size + 15))
         screen.blit(text_surface, text_rect)
         
@@ -764,15 +783,8 @@ class DualPlayerSystem:
         x = screen.get_width() - 200
         y = screen.get_height() - 120  # 距离底部120像素
         
-        # 创建背景
-        bg_surface = pygame.Surface((180, 60), pygame.SRCALPHA)
-        bg_surface.fill((0, 0, 0, 150))  # 半透明黑色背景
-        
-        # 渲染背景
-        screen.blit(bg_surface, (x, y))
-        
-        # 渲染文本（使用中文字体）
-        font = pygame.font.SysFont('simHei', 16)
+        # 渲染背景（半透明黑色）
+        screen.blit(self.light_mode_panel.get(), (x, y))
         
         # 模式名称（中文）
         mode_name_map = {
@@ -783,13 +795,13 @@ class DualPlayerSystem:
         }
         mode_name = mode_name_map.get(current_mode['name'], current_mode['name'])
         mode_text = f"模式: {mode_name}"
-        mode_surface = font.render(mode_text, True, (255, 255, 255))
+        mode_surface = self.light_mode_labels[0].get(mode_text)
         mode_rect = mode_surface.get_rect(topleft=(x + 10, y + 10))
         screen.blit(mode_surface, mode_rect)
         
         # 参数信息（中文）
         param_text = f"范围: {current_mode['radius']}px, 角度: {current_mode['angle']}°"
-        param_surface = font.render(param_text, True, (200, 200, 200))
+        param_surface = self.light_mode_labels[1].get(param_text, (200, 200, 200))
         param_rect = param_surface.get_rect(topleft=(x + 10, y + 35))
         screen.blit(param_surface, param_rect)
         
@@ -800,19 +812,11 @@ class DualPlayerSystem:
         x = screen.get_width() - 120
         y = screen.get_height() // 2 - 50
         
-        # 创建背景
-        bg_surface = pygame.Surface((100, 80), pygame.SRCALPHA)
-        bg_surface.fill((0, 0, 0, 150))  # 半透明黑色背景
-        
-        # 渲染背景
-        screen.blit(bg_surface, (x, y))
-        
-        # 渲染文本（使用中文字体）
-        font = pygame.font.SysFont('simHei', 20)
+        # 渲染背景（半透明黑色）
+        screen.blit(self.energy_panel.get(), (x, y))
         
         # 电量标题（中文）
-        energy_title = "电量"
-        title_surface = font.render(energy_title, True, (255, 255, 255))
+        title_surface = self.energy_labels[0].get("电量")
         title_rect = title_surface.get_rect(center=(x + 50, y + 20))
         screen.blit(title_surface, title_rect)
         
@@ -826,7 +830,7 @@ class DualPlayerSystem:
         else:
             energy_color = (255, 0, 0)  # 红色
             
-        energy_surface = font.render(energy_text, True, energy_color)
+        energy_surface = self.energy_labels[1].get(energy_text, energy_color)
         energy_rect = energy_surface.get_rect(center=(x + 50, y + 50))
         screen.blit(energy_surface, energy_rect)
         
@@ -837,73 +841,15 @@ class DualPlayerSystem:
         ninja_screen_y = self.ninja_frog.world_y - camera_y + screen.get_height() // 2
         
         # 进度条参数
-        bar_width = 50  # 进度条宽度
-        bar_height = 8  # 进度条高度
+        bar_width = EnergyBarWidget.BAR_WIDTH  # 进度条宽度
         bar_offset_y = -35  # 距离角色头顶的偏移
-        icon_size = 16  # 图标大小
         
         # 计算进度条位置（居中于角色头顶）
         bar_x = ninja_screen_x - bar_width // 2 + 10
         bar_y = ninja_screen_y + bar_offset_y
         
-        # 计算图标位置（在进度条左边）
-        icon_x = bar_x - icon_size - 5  # 进度条左边5像素
-        icon_y = bar_y - (icon_size - bar_height) // 2  # 垂直居中对齐
-        
-        # 加载light_icon图标
-        try:
-            from .resource_manager import resource_manager
-            light_icon = resource_manager.load_image('light_icon', 'images/ui/light_icon.png')
-            # 缩放图标到合适大小
-            light_icon = pygame.transform.scale(light_icon, (icon_size, icon_size))
-            # 渲染图标
-            screen.blit(light_icon, (icon_x, icon_y))
-        except Exception as e:
-            print(f"加载light_icon失败: {e}")
-            # 如果加载失败，创建一个默认的绿色圆形图标
-            fallback_surface = pygame.Surface((icon_size, icon_size), pygame.SRCALPHA)
-            pygame.draw.circle(fallback_surface, (0, 255, 0, 200), (icon_size // 2, icon_size // 2), icon_size // 2)
-            screen.blit(fallback_surface, (icon_x, icon_y))
-        
-        # 绘制进度条背景（深色）
-        background_color = (50, 50, 50, 180)  # 半透明深灰色
-        background_surface = pygame.Surface((bar_width, bar_height), pygame.SRCALPHA)
-        pygame.draw.rect(background_surface, background_color, (0, 0, bar_width, bar_height))
-        screen.blit(background_surface, (bar_x, bar_y))
-        
-        # 计算电量百分比
-        energy_ratio = self.energy / 100.0
-        energy_width = int(bar_width * energy_ratio)
-        
-        # 根据电量选择颜色
-        if energy_ratio > 0.6:
-            energy_color = (0, 255, 0, 200)  # 绿色（电量充足）
-        elif energy_ratio > 0.3:
-            energy_color = (255, 255, 0, 200)  # 黄色（电量中等）
-        else:
-            energy_color = (255, 0, 0, 200)  # 红色（电量不足）
-        
-        # 绘制电量进度条
-        if energy_width > 0:
-            energy_surface = pygame.Surface((energy_width, bar_height), pygame.SRCALPHA)
-            pygame.draw.rect(energy_surface, energy_color, (0, 0, energy_width, bar_height))
-            screen.blit(energy_surface, (bar_x, bar_y))
-        
-        # 绘制进度条边框
-        border_color = (255, 255, 255, 150)  # 半透明白色边框
-        border_surface = pygame.Surface((bar_width, bar_height), pygame.SRCALPHA)
-        pygame.draw.rect(border_surface, border_color, (0, 0, bar_width, bar_height), 1)
-        screen.blit(border_surface, (bar_x, bar_y))
-        
-        # 可选：显示电量百分比文字
-        if energy_ratio < 0.5:  # 只在电量低于50%时显示文字
-            font = pygame.font.SysFont('simHei', 12)
-            energy_text = f"{int(self.energy)}%"
-            text_surface = font.render(energy_text, True, (255, 255, 255))
-            text_rect = text_surface.get_rect()
-            text_rect.centerx = ninja_screen_x
-            text_rect.bottom = bar_y - 2
-            screen.blit(text_surface, text_rect)
+        # 图标、背景、电量条、边框和低电量文字由控件缓存
+        self.energy_bar_widget.render(screen, bar_x, bar_y, ninja_screen_x, self.energy)
         
     def render_teleport_display(self, screen):
         """渲染传送道具数量显示"""
@@ -916,19 +862,11 @@ class DualPlayerSystem:
         x = screen.get_width() - 120
         y = screen.get_height() // 2 + 50  # 电量显示下方
         
-        # 创建背景
-        bg_surface = pygame.Surface((100, 60), pygame.SRCALPHA)
-        bg_surface.fill((0, 0, 0, 150))  # 半透明黑色背景
-        
-        # 渲染背景
-        screen.blit(bg_surface, (x, y))
-        
-        # 渲染文本（使用中文字体）
-        font = pygame.font.SysFont('simHei', 16)
+        # 渲染背景（半透明黑色）
+        screen.blit(self.teleport_panel.get(), (x, y))
         
         # 传送道具标题（中文）
-        teleport_title = "传送道具"
-        title_surface = font.render(teleport_title, True, (255, 255, 255))
+        title_surface = self.teleport_labels[0].get("传送道具")
         title_rect = title_surface.get_rect(center=(x + 50, y + 15))
         screen.blit(title_surface, title_rect)
         
@@ -936,7 +874,7 @@ class DualPlayerSystem:
         teleport_text = f"{self.ninja_frog.teleport_items}"
         teleport_color = (0, 255, 255) if self.ninja_frog.teleport_items > 0 else (128, 128, 128)
         
-        teleport_surface = font.render(teleport_text, True, teleport_color)
+        teleport_surface = self.teleport_labels[1].get(teleport_text, teleport_color)
         teleport_rect = teleport_surface.get_rect(center=(x + 50, y + 35))
         screen.blit(teleport_surface, teleport_rect)
     
@@ -949,45 +887,7 @@ class DualPlayerSystem:
             x1, y1: 忍者蛙的屏幕坐标
             x2, y2: 神秘剑士的屏幕坐标
         """
-        # 计算距离
-        dx = x2 - x1
-        dy = y2 - y1
-        distance = math.sqrt(dx * dx + dy * dy)
-        
-        if distance == 0:
-            return
-            
-        # 归一化方向向量
-        dx /= distance
-        dy /= distance
-        
-        # 虚线参数
-        dash_length = 10  # 虚线长度
-        gap_length = 5    # 间隙长度
-        total_segment = dash_length + gap_length
-        
-        # 计算需要多少个虚线段
-        num_segments = int(distance / total_segment)
-        
-        # 绘制虚线
-        for i in range(num_segments):
-            # 计算当前段的起始和结束位置
-            start_x = x1 + dx * (i * total_segment)
-            start_y = y1 + dy * (i * total_segment)
-            end_x = x1 + dx * (i * total_segment + dash_length)
-            end_y = y1 + dy * (i * total_segment + dash_length)
-            
-            # 绘制虚线段
-            pygame.draw.line(screen, (255, 255, 0), (start_x, start_y), (end_x, end_y), 2)
-        
-        # 绘制最后一个虚线段（如果距离不够一个完整的段）
-        remaining_distance = distance - (num_segments * total_segment)
-        if remaining_distance > 0:
-            start_x = x1 + dx * (num_segments * total_segment)
-            start_y = y1 + dy * (num_segments * total_segment)
-            end_x = x2
-            end_y = y2
-            pygame.draw.line(screen, (255, 255, 0), (start_x, start_y), (end_x, end_y), 2)
+        self.connection_line_widget.render(screen, x1, y1, x2, y2)
     
     def render_bullet_shots_display(self, screen, camera_x, camera_y):
         """在神秘剑士头上渲染子弹射击次数显示"""
@@ -1007,51 +907,12 @@ class DualPlayerSystem:
         if not bullet_weapon:
             return
         
-        shots_per_magazine = 6  # 30 / 5 = 6次射击
-        # 计算剩余射击次数（基于当前弹夹）
+        # 计算剩余射击次数（基于当前弹夹，每次射击消耗5发）
         remaining_shots = (bullet_weapon.shots_before_reload - bullet_weapon.shots_fired) // 5
         if bullet_weapon.is_reloading:
             remaining_shots = 0
         
-        icon_size = 16  # 增加图标高度
-        icon_spacing = 0  # 减少图标之间的间距
-        total_width = shots_per_magazine * (icon_size-8) + (shots_per_magazine - 1) * icon_spacing
-        start_x = mystic_screen_x - total_width // 2
-        icon_y = mystic_screen_y - 35 - icon_size // 2
-        
-        # 加载子弹图标
-        try:
-            from .resource_manager import resource_manager
-            bullet_icon = resource_manager.load_image('bullet_icon', 'images/weapons/bullet_icon.png')
-            bullet_icon = pygame.transform.scale(bullet_icon, (icon_size, icon_size))
-        except Exception as e:
-            print(f"加载bullet_icon失败: {e}")
-            bullet_icon = pygame.Surface((icon_size, icon_size), pygame.SRCALPHA)
-            pygame.draw.circle(bullet_icon, (255, 255, 0, 200), (icon_size // 2, icon_size // 2), icon_size // 2)
-        
-        # 添加调试信息
-        
-        # 渲染6个子弹图标
-        for i in range(shots_per_magazine):
-            icon_x = start_x + i * (icon_size-8 + icon_spacing)
-            
-            # 如果剩余射击次数大于等于当前图标索引，则显示图标
-            if i < remaining_shots:
-                screen.blit(bullet_icon, (icon_x, icon_y))
-            else:
-                # 否则显示灰色（已用完的子弹）
-                gray_icon = bullet_icon.copy()
-                gray_icon.fill((100, 100, 100, 100), special_flags=pygame.BLEND_RGBA_MULT)
-                screen.blit(gray_icon, (icon_x, icon_y))
-        
-        # 如果正在装弹，显示"装弹中"文本
-        if bullet_weapon.is_reloading:
-            font = pygame.font.SysFont('simHei', 12)
-            reload_text = "装弹中"
-            text_surface = font.render(reload_text, True, (255, 255, 255))
-            text_rect = text_surface.get_rect()
-            text_rect.centerx = mystic_screen_x
-            text_rect.top = icon_y + icon_size + 2
-            screen.blit(text_surface, text_rect)
-             
- 
\ No newline at end of file
+        # 6个子弹图标（30 / 5 = 6次射击），已用完的显示为灰色
+        icon_y = mystic_screen_y - 35 - BulletShotsWidget.ICON_SIZE // 2
+        self.bullet_shots_widget.render(screen, mystic_screen_x, icon_y, remaining_shots,
+                                        bullet_weapon.is_reloading)
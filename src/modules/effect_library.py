@@ -0,0 +1,131 @@
+"""
+特效库
+爆炸、冰霜爆炸、刀光等特效以前每次生成都要重新切分精灵表，每次换帧还要把当前帧缩放一次；
+出生点标记在淡出期间每次更新都重新画一遍圆圈。这里把特效用到的帧集中缓存：
+切分和缩放只在第一次使用时做一次，淡出效果按固定的透明度档位预先画好；
+播放完的特效实例放回对象池，下次生成时直接重置复用，生成特效不再创建新的Surface和对象。
+"""
+
+import pygame
+
+from .resource_manager import resource_manager
+
+# 淡出效果预先绘制的透明度档位数量
+DEFAULT_ALPHA_STEPS = 32
+
+# 每种特效类型在池中最多保留的空闲实例数量
+DEFAULT_POOL_LIMIT = 64
+
+
+class EffectLibrary:
+    """特效帧缓存和特效对象池
+
+    放入对象池的特效类需要实现 reset()，参数与 __init__ 相同，用于把复用的实例恢复为新建时的状态。
+    """
+
+    def __init__(self, alpha_steps=DEFAULT_ALPHA_STEPS, pool_limit=DEFAULT_POOL_LIMIT):
+        """
+        Args:
+            alpha_steps: 淡出效果的透明度档位数量
+            pool_limit: 每种特效类型在池中最多保留的空闲实例数量
+        """
+        self.alpha_steps = alpha_steps
+        self.pool_limit = pool_limit
+        self._frames = {}
+        self._fades = {}
+        self._pools = {}
+
+        # 统计：新建和复用的特效实例数量
+        self.created = 0
+        self.reused = 0
+
+    def frames(self, name, file_path, frame_width, frame_height, frame_count, row=0, size=None):
+        """获取精灵表中一行动画帧（已缩放）
+
+        Args:
+            name: 精灵表的资源名称
+            file_path: 相对于assets目录的文件路径
+            frame_width: 每帧宽度
+            frame_height: 每帧高度
+            frame_count: 帧数量
+            row: 精灵表中的行号(从0开始)
+            size: 缩放后的尺寸 (宽, 高)，None表示不缩放
+
+        Returns:
+            tuple: 共享的帧Surface，调用方不能修改
+        """
+        key = (file_path, frame_width, frame_height, frame_count, row, size)
+        frames = self._frames.get(key)
+        if frames is None:
+            spritesheet = resource_manager.load_spritesheet(name, file_path)
+            frames = [spritesheet.get_sprite(i * frame_width, row * frame_height, frame_width, frame_height)
+                      for i in range(frame_count)]
+            if size is not None:
+                frames = [pygame.transform.scale(frame, size) for frame in frames]
+            frames = tuple(frames)
+            self._frames[key] = frames
+        return frames
+
+    def fade_frames(self, key, draw):
+        """获取按透明度档位预先绘制好的帧
+
+        Args:
+            key: 缓存键（特效名称和影响外观的参数）
+            draw: 绘制函数 draw(alpha) -> pygame.Surface
+
+        Returns:
+            tuple: 第i个元素的透明度为 round(i * 255 / (alpha_steps - 1))
+        """
+        frames = self._fades.get(key)
+        if frames is None:
+            last = self.alpha_steps - 1
+            frames = tuple(draw(round(step * 255 / last)) for step in range(self.alpha_steps))
+            self._fades[key] = frames
+        return frames
+
+    def fade_step(self, alpha):
+        """透明度（0-255）对应的档位"""
+        return round(min(max(alpha, 0), 255) * (self.alpha_steps - 1) / 255)
+
+    def spawn(self, effect_class, *args):
+        """生成特效：池中有空闲实例时重置后复用，否则新建
+
+        Args:
+            effect_class: 特效类
+            *args: 传给 __init__ / reset 的参数
+
+        Returns:
+            特效实例
+        """
+        pool = self._pools.get(effect_class)
+        if pool:
+            effect = pool.pop()
+            effect.in_pool = False
+            effect.reset(*args)
+            self.reused += 1
+            return effect
+        self.created += 1
+        return effect_class(*args)
+
+    def release(self, effect):
+        """把播放完的特效放回对象池（重复放回会被忽略）"""
+        if getattr(effect, 'in_pool', False):
+            return
+        pool = self._pools.setdefault(type(effect), [])
+        if len(pool) < self.pool_limit:
+            effect.in_pool = True
+            pool.append(effect)
+
+    def pooled(self, effect_class):
+        """池中某种特效的空闲实例数量"""
+        return len(self._pools.get(effect_class, ()))
+
+    def clear(self):
+        """清空帧缓存和对象池（切换显示模式后帧需要重新生成时调用）"""
+        self._frames.clear()
+        self._fades.clear()
+        self._pools.clear()
+
+
+# 全局特效库
+effect_library = EffectLibrary()
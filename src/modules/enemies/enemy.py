@@ -1,10 +1,17 @@
 import pygame
 import math
-import random
+from ..core.game_random import rng
 from ..resource_manager import resource_manager
-from ..utils import create_outlined_sprite
+from ..outline import outline_cache
+from ..hud_widgets import new_surface, text_cache
 from abc import ABC, abstractmethod
 from .enemy_config import get_enemy_config
+from .status_effects import StatusEffectSystem
+
+# 帧变体缓存（所有敌人共用）：(敌人类型, 动画, 帧序号, 缩放, 朝向) -> (变换后的图像, 遮罩)
+# 同类型敌人共用同一组图像，轮廓层（按图像缓存）也只需为每个不同的帧生成一次
+_frame_variants = {}
+
 
 class Enemy(pygame.sprite.Sprite, ABC):
     def __init__(self, x, y, enemy_type, difficulty="normal", level=1, scale=None):
@@ -53,8 +60,10 @@ class Enemy(pygame.sprite.Sprite, ABC):
         self.invincible_timer = 0
         self.invincible_duration = 0.15  # 受伤后的无敌时间（秒）
         
-        # 状态效果系统
-        self.status_effects = {}  # 格式: {'burn': {...}, 'slow': {...}}
+        # 状态效果系统：燃烧、减速等效果存放在StatusEffectSystem的数组中，由EnemyManager在生成时设置
+        self.status_system = None
+        self._owns_status_system = False
+        self.slowed = False  # 是否处于减速状态（由状态效果系统维护，用于显示）
         self.original_speed = self.speed  # 保存原始速度值
         
         # 特效相关
@@ -66,9 +75,25 @@ class Enemy(pygame.sprite.Sprite, ABC):
         self.outline_color = (0, 255, 0)  # 默认绿色轮廓
         self.outline_thickness = 1
         
+        # 当前帧的变体（来自共用的帧变体缓存）
+        self.base_image = None  # 未叠加状态效果的当前帧变体
+        
         # 视野相关
         self.has_been_seen = False  # 是否曾经被玩家看到过
         
+        # 血条缓存：(宽, 高, 填充宽度, 颜色) -> 血条表面，血量变化时才重新绘制
+        self._health_bar_key = None
+        self._health_bar_surface = None
+        
+        # 屏幕外降频更新：累积的未更新时间和跳过的帧数
+        self._pending_dt = 0.0
+        self._skipped_frames = 0
+        
+        # 分离转向：与周围敌人保持距离，避免成群时叠在一起
+        self.separation_weight = self.config.get("separation_weight", 0.0)
+        self.separation_radius = self.config.get("separation_radius", 0)
+        self.separation_push = (0.0, 0.0)  # 由EnemyManager每个tick设置的排斥方向
+        
         # 创建遮罩
         self.mask = None
         
@@ -85,24 +110,7 @@ class Enemy(pygame.sprite.Sprite, ABC):
             damage_per_second: 每秒造成的伤害值
             duration: 效果持续时间（秒）
         """
-        # 如果已有燃烧效果，延长持续时间而不是重置
-        if 'burn' in self.status_effects:
-            self.status_effects['burn']['duration'] = max(
-                self.status_effects['burn']['duration'],
-                duration
-            )
-            # 更新伤害值为较高者
-            self.status_effects['burn']['damage_per_sec'] = max(
-                self.status_effects['burn']['damage_per_sec'],
-                damage_per_second
-            )
-        else:
-            self.status_effects['burn'] = {
-                'duration': duration,
-                'damage_per_sec': damage_per_second,
-                'timer': 0.0,  # 用于计时何时造成伤害
-                'total_timer': 0.0  # 总计时器
-            }
+        self._get_status_system().apply_burn(self, damage_per_second, duration)
             
     def apply_slow_effect(self, slow_percent, duration):
         """
@@ -112,31 +120,39 @@ class Enemy(pygame.sprite.Sprite, ABC):
             slow_percent: 减速百分比（0.0-1.0）
             duration: 效果持续时间（秒）
         """
-        # 如果已有减速效果，选择较强的减速效果和较长的持续时间
-        if 'slow' in self.status_effects:
-            self.status_effects['slow']['duration'] = max(
-                self.status_effects['slow']['duration'],
-                duration
-            )
-            if slow_percent > self.status_effects['slow']['slow_percent']:
-                self.status_effects['slow']['slow_percent'] = slow_percent
-                # 更新减速值
-                self.speed = self.original_speed * (1 - slow_percent)
-        else:
-            # 只有在未减速状态才保存原始速度
-            self.original_speed = self.speed
-            
-            self.status_effects['slow'] = {
-                'duration': duration,
-                'slow_percent': slow_percent,
-                'timer': 0.0  # 总计时器
-            }
-            # 立即应用减速
-            self.speed = self.original_speed * (1 - slow_percent)
+        self._get_status_system().apply_slow(self, slow_percent, duration)
+        
+    def _get_status_system(self):
+        """获取记录本敌人状态效果的系统
+        
+        由EnemyManager生成的敌人共用管理器的系统（由管理器统一计时）；
+        单独创建的敌人第一次获得效果时创建自己的系统，在 update_status_effects 中计时。
+        """
+        if self.status_system is None:
+            self.status_system = StatusEffectSystem(capacity=2)
+            self._owns_status_system = True
+        return self.status_system
+        
+    def take_status_damage(self, damage):
+        """受到持续伤害（燃烧），直接扣除生命值，不触发无敌状态和受伤动画
+        
+        Args:
+            damage: 伤害值
+        """
+        self.health -= damage
+        
+        # 触发燃烧闪烁效果
+        self.burn_flash_timer = self.burn_flash_duration
+        
+        # 检查敌人是否死亡
+        if self.health <= 0:
+            # 标记敌人为死亡状态
+            self._alive = False
+            # 注意：计分、掉落、死亡音效和移除敌人在tick末尾由游戏的死亡队列统一处理
             
     def update_status_effects(self, dt):
         """
-        更新所有状态效果
+        更新状态效果的表现（燃烧闪烁）；效果本身的计时由状态效果系统统一处理
         
         Args:
             dt: 时间增量（秒）
@@ -147,43 +163,9 @@ class Enemy(pygame.sprite.Sprite, ABC):
             if self.burn_flash_timer <= 0:
                 self.burn_flash_timer = 0
         
-        # 处理燃烧效果
-        if 'burn' in self.status_effects:
-            effect = self.status_effects['burn']
-            effect['total_timer'] += dt
-            effect['timer'] += dt
-            
-            # 每0.5秒造成一次伤害
-            if effect['timer'] >= 0.5:
-                damage = effect['damage_per_sec'] * 0.5
-                self.health -= damage  # 直接扣除生命值，不触发无敌状态
-                effect['timer'] = 0.0
-                
-                # 触发燃烧闪烁效果
-                self.burn_flash_timer = self.burn_flash_duration
-                
-                # 检查敌人是否死亡
-                if self.health <= 0:
-                    # 标记敌人为死亡状态
-                    self._alive = False
-                    # 播放死亡音效
-                    resource_manager.play_sound("enemy_death")
-                    # 注意：实际移除敌人的操作是在EnemyManager中进行的
-                
-            # 检查是否结束
-            if effect['total_timer'] >= effect['duration']:
-                del self.status_effects['burn']
-        
-        # 处理减速效果
-        if 'slow' in self.status_effects:
-            effect = self.status_effects['slow']
-            effect['timer'] += dt
-            
-            # 检查是否结束
-            if effect['timer'] >= effect['duration']:
-                # 恢复速度
-                self.speed = self.original_speed
-                del self.status_effects['slow']
+        # 单独创建的敌人自己推进效果计时
+        if self._owns_status_system:
+            self.status_system.update(dt)
         
     def _get_nearest_player(self, player1, player2=None):
         """
@@ -228,7 +210,15 @@ class Enemy(pygame.sprite.Sprite, ABC):
         target_player = self._get_nearest_player(player, second_player)
         return self.melee_attack(target_player) 
         
-    def update(self, dt, player, second_player=None):
+    def update(self, dt, player, second_player=None, animate=True):
+        """更新敌人状态
+        
+        Args:
+            dt: 时间增量（秒）
+            player: 玩家
+            second_player: 第二个玩家（可选）
+            animate: 是否推进动画并更新图像，远处看不见的敌人可以跳过
+        """
         # 更新状态效果
         self.update_status_effects(dt)
         
@@ -240,7 +230,7 @@ class Enemy(pygame.sprite.Sprite, ABC):
                 self.invincible_timer = 0
         
         # 更新当前动画
-        if self.current_animation in self.animations:
+        if animate and self.current_animation in self.animations:
             self.animations[self.current_animation].update(dt)
         
         # 更新动画状态
@@ -270,6 +260,15 @@ class Enemy(pygame.sprite.Sprite, ABC):
             dx = dx / distance
             dy = dy / distance
             
+            # 追击方向叠加分离转向，合成后的速度不超过移动速度
+            push_x, push_y = self.separation_push
+            dx += push_x
+            dy += push_y
+            length = math.sqrt(dx * dx + dy * dy)
+            if length > 1:
+                dx /= length
+                dy /= length
+            
             # 更新位置（朝着偏移后的目标移动）
             self.rect.x += dx * self.speed * dt
             self.rect.y += dy * self.speed * dt
@@ -288,34 +287,59 @@ class Enemy(pygame.sprite.Sprite, ABC):
                     self.animations[self.current_animation].reset()
                     
         # 更新当前图像
-        self.update_image()
+        if animate:
+            self.update_image()
             
-    def update_image(self):
-        """更新敌人的当前图像"""
-        if self.current_animation in self.animations:
-            current_frame = self.animations[self.current_animation].get_current_frame()
+    def _get_frame_variant(self, animation_name):
+        """获取动画当前帧经过缩放和翻转后的变体（同类型敌人共用缓存）
+        
+        每个敌人的动画帧是从精灵表单独切出的表面，以帧序号而不是表面作为缓存键，
+        同类型的敌人才能共用变体图像和它的轮廓层。
+        
+        Args:
+            animation_name: 动画名称
             
+        Returns:
+            tuple: (变换后的图像, 遮罩)
+        """
+        animation = self.animations[animation_name]
+        key = (self.type, animation_name, animation.current_frame, self.scale, self.facing_right)
+        variant = _frame_variants.get(key)
+        if variant is None:
+            frame = animation.get_current_frame()
             # 缩放图像
-            original_size = current_frame.get_size()
+            original_size = frame.get_size()
             new_size = (int(original_size[0] * self.scale), int(original_size[1] * self.scale))
-            current_frame = pygame.transform.scale(current_frame, new_size)
+            image = pygame.transform.scale(frame, new_size)
             
-            # 总是翻转当前帧
-            current_frame = pygame.transform.flip(current_frame, True, False)
+            # 精灵图默认朝左，朝右时水平翻转
+            if self.facing_right:
+                image = pygame.transform.flip(image, True, False)
             
-            # 根据朝向再次翻转图像
-            if not self.facing_right:
-                current_frame = pygame.transform.flip(current_frame, True, False)
+            variant = (image, pygame.mask.from_surface(image))
+            _frame_variants[key] = variant
+        return variant
+    
+    def update_image(self):
+        """更新敌人的当前图像"""
+        if self.current_animation in self.animations:
+            current_frame, mask = self._get_frame_variant(self.current_animation)
+            self.base_image = current_frame
+            
+            # 没有状态效果时直接使用缓存的变体
+            if not self.slowed and self.burn_flash_timer <= 0:
+                self.image = current_frame
+                self.mask = mask
+                return
             
             # 应用状态效果的视觉变化
             modified_frame = current_frame.copy()
             
-            # 创建遮罩以获取实际边缘和区域
-            mask = pygame.mask.from_surface(current_frame)
+            # 获取实际边缘
             mask_outline = mask.outline()
             
             # 如果有减速效果
-            if 'slow' in self.status_effects:
+            if self.slowed:
                 # 创建与原图大小相同的透明表面
                 slow_effect = pygame.Surface(modified_frame.get_size(), pygame.SRCALPHA)
                 
@@ -375,7 +399,27 @@ class Enemy(pygame.sprite.Sprite, ABC):
         if thickness is not None:
             self.outline_thickness = thickness
     
+    def get_outline_layer(self):
+        """获取当前帧的轮廓层（按帧变体缓存）"""
+        source = self.base_image if self.base_image is not None else self.image
+        return outline_cache.get_layer(source, self.outline_color, self.outline_thickness)
+    
     def render(self, screen, screen_x, screen_y, show_health_bar=True):
+        screen.blits(self.render_items(screen_x, screen_y, show_health_bar), False)
+        
+    def render_items(self, screen_x, screen_y, show_health_bar=True, show_details=True):
+        """获取按绘制顺序排列的绘制项，供 render 或渲染队列使用
+        
+        Args:
+            screen_x: 敌人左上角的屏幕X坐标
+            screen_y: 敌人左上角的屏幕Y坐标
+            show_health_bar: 是否绘制血条
+            show_details: 是否绘制轮廓和血量文字（低画质时关闭）
+            
+        Returns:
+            list: [(surface, dest), ...]
+        """
+        items = []
         # 创建一个临时的rect用于绘制
         draw_rect = self.rect.copy()
         draw_rect.x = screen_x
@@ -383,70 +427,75 @@ class Enemy(pygame.sprite.Sprite, ABC):
         
         # 绘制敌人
         if hasattr(self, 'image'):
-            if self.show_outline:
-                # 创建带轮廓的图像
-                outlined_image = create_outlined_sprite(
-                    self,
-                    outline_color=self.outline_color,
-                    outline_thickness=self.outline_thickness
-                )
-                screen.blit(outlined_image, draw_rect)
-            else:
-                screen.blit(self.image, draw_rect)
+            if self.show_outline and show_details:
+                # 先绘制缓存的轮廓层，再绘制敌人图像
+                items.append((self.get_outline_layer(), draw_rect))
+            items.append((self.image, draw_rect))
         
         # 绘制血条（仅在show_health_bar为True时）
         if show_health_bar:
-            health_bar_width = 32 * self.scale
-            health_bar_height = 5 * self.scale
-            health_ratio = max(0, self.health / self.max_health)  # 确保比例不为负数
-            
-            # 调整血条位置，使其位于敌人正上方
-            bar_x = screen_x - health_bar_width // 2+20  # 居中显示
-            bar_y = screen_y - 20 * self.scale  # 稍微高一点，确保在敌人正上方
-            
-            # 根据血量百分比选择颜色
-            if health_ratio > 0.8:
-                health_color = (0, 255, 0)  # 绿色 (>80%)
-            elif health_ratio > 0.2:
-                health_color = (255, 255, 0)  # 黄色 (>20%)
-            else:
-                health_color = (255, 0, 0)  # 红色 (<20%)
-            
-            # 绘制血条背景（深红色）
-            pygame.draw.rect(screen, (100, 0, 0),  # 深红色背景
-                            (bar_x, bar_y,
-                             health_bar_width, health_bar_height))
-            
-            # 绘制血条（根据血量百分比选择颜色）
-            if health_ratio > 0:
-                pygame.draw.rect(screen, health_color,
-                                (bar_x, bar_y,
-                                 health_bar_width * health_ratio, health_bar_height))
-            
-            # 绘制血条边框（白色）
-            pygame.draw.rect(screen, (255, 255, 255),  # 白色边框
-                            (bar_x, bar_y,
-                             health_bar_width, health_bar_height), 1)
-            
-            # 显示血量数值（在血条中央）
-            health_text = f"{int(self.health)}/{int(self.max_health)}"
-            # 创建字体（根据缩放调整大小）
-            font_size = max(8, int(10 * self.scale))
-            health_font = pygame.font.SysFont('simHei', font_size)
-            health_text_surface = health_font.render(health_text, True, (255, 255, 255))  # 白色文字
-            health_text_rect = health_text_surface.get_rect()
-            health_text_rect.centerx = bar_x + health_bar_width // 2
-            health_text_rect.centery = bar_y + health_bar_height // 2
-            
-            # 渲染文字阴影（略微偏移）
-            shadow_surface = health_font.render(health_text, True, (0, 0, 0))
-            shadow_rect = shadow_surface.get_rect()
-            shadow_rect.centerx = health_text_rect.centerx + 1
-            shadow_rect.centery = health_text_rect.centery + 1
-            screen.blit(shadow_surface, shadow_rect)
-            
-            # 渲染主文字
-            screen.blit(health_text_surface, health_text_rect)
+            items.extend(self._health_bar_items(screen_x, screen_y, show_details))
+        return items
+        
+    def _health_bar_geometry(self, screen_x, screen_y):
+        """计算血条位置和尺寸
+        
+        Returns:
+            tuple: (bar_x, bar_y, 宽, 高)
+        """
+        health_bar_width = 32 * self.scale
+        health_bar_height = 5 * self.scale
+        # 调整血条位置，使其位于敌人正上方
+        bar_x = screen_x - health_bar_width // 2+20  # 居中显示
+        bar_y = screen_y - 20 * self.scale  # 稍微高一点，确保在敌人正上方
+        return bar_x, bar_y, health_bar_width, health_bar_height
+        
+    def _health_bar_items(self, screen_x, screen_y, show_text=True):
+        """血条和血量数值的绘制项（show_text为False时只有血条）"""
+        bar_x, bar_y, health_bar_width, health_bar_height = self._health_bar_geometry(screen_x, screen_y)
+        health_ratio = max(0, self.health / self.max_health)  # 确保比例不为负数
+        
+        # 根据血量百分比选择颜色
+        if health_ratio > 0.8:
+            health_color = (0, 255, 0)  # 绿色 (>80%)
+        elif health_ratio > 0.2:
+            health_color = (255, 255, 0)  # 黄色 (>20%)
+        else:
+            health_color = (255, 0, 0)  # 红色 (<20%)
+        
+        # 血条（背景 + 血量 + 边框）只在血量变化时重新绘制
+        width = int(health_bar_width)
+        height = int(health_bar_height)
+        fill_width = int(health_bar_width * health_ratio) if health_ratio > 0 else 0
+        key = (width, height, fill_width, health_color)
+        if key != self._health_bar_key:
+            bar = new_surface((max(width, fill_width), height))
+            pygame.draw.rect(bar, (100, 0, 0), (0, 0, width, height))  # 深红色背景
+            if fill_width > 0:
+                pygame.draw.rect(bar, health_color, (0, 0, fill_width, height))
+            pygame.draw.rect(bar, (255, 255, 255), (0, 0, width, height), 1)  # 白色边框
+            self._health_bar_key = key
+            self._health_bar_surface = bar
+        items = [(self._health_bar_surface, (bar_x, bar_y))]
+        if not show_text:
+            return items
+        
+        # 显示血量数值（在血条中央），字号随缩放调整，文字表面在所有敌人间共享
+        health_text = f"{int(self.health)}/{int(self.max_health)}"
+        font_size = max(8, int(10 * self.scale))
+        health_text_surface = text_cache.get(health_text, font_size, (255, 255, 255))  # 白色文字
+        health_text_rect = health_text_surface.get_rect()
+        health_text_rect.centerx = bar_x + health_bar_width // 2
+        health_text_rect.centery = bar_y + health_bar_height // 2
+        
+        # 文字阴影（略微偏移）
+        shadow_surface = text_cache.get(health_text, font_size, (0, 0, 0))
+        shadow_rect = shadow_surface.get_rect()
+        shadow_rect.centerx = health_text_rect.centerx + 1
+        shadow_rect.centery = health_text_rect.centery + 1
+        items.append((shadow_surface, shadow_rect))
+        items.append((health_text_surface, health_text_rect))
+        return items
         
     def take_damage(self, amount):
         """受到伤害
@@ -464,11 +513,11 @@ class Enemy(pygame.sprite.Sprite, ABC):
         # 计算随机伤害区间：基础伤害的70%-130%
         damage_min = int(amount * 0.7)
         damage_max = int(amount * 1.3)
-        actual_damage = random.randint(damage_min, damage_max)
+        actual_damage = rng.randint(damage_min, damage_max)
         
         # 30%概率翻倍伤害
         is_critical = False
-        if random.random() < 0.3:
+        if rng.random() < 0.3:
             actual_damage *= 2
             is_critical = True
         
@@ -544,6 +593,23 @@ class Enemy(pygame.sprite.Sprite, ABC):
         # 这里可以添加其他获取游戏实例的逻辑
         return None
         
+    def has_line_of_sight(self, x, y):
+        """从敌人中心到 (x, y) 之间是否没有被墙挡住（没有游戏实例或地图时视为没有遮挡）
+        
+        Args:
+            x: 目标世界坐标X
+            y: 目标世界坐标Y
+            
+        Returns:
+            bool: 没有被挡住返回True
+        """
+        game = self._get_game_instance()
+        map_manager = getattr(game, 'map_manager', None) if game else None
+        line_of_sight = map_manager.get_line_of_sight() if map_manager else None
+        if line_of_sight is None:
+            return True
+        return line_of_sight.is_clear(self.rect.centerx, self.rect.centery, x, y)
+        
     def melee_attack(self, player):
         """
         近战碰撞攻击逻辑
@@ -43,6 +43,9 @@ ENEMY_CONFIGS = {
         "exp_value": 5,        # 击败后获得的经验值（5个敌人升一级）
         "animation_speed": 0.0333, # 动画速度
         "scale": 1.0,           # 缩放大小
+        "mask_collision": True, # 圆形判断命中后再做像素级遮罩检测（精灵比碰撞箱小很多）
+        "separation_weight": 3.0,  # 与周围敌人分开的转向强度（相对追击方向），0表示不分离
+        "separation_radius": 48,   # 分离检测半径（像素）
     },
     
     # 萝卜 - 较慢但更健壮的敌人
@@ -54,6 +57,9 @@ ENEMY_CONFIGS = {
         "exp_value": 5,        # 击败后获得的经验值（5个敌人升一级）
         "animation_speed": 0.0333,
         "scale": 1.0,
+        "mask_collision": True,
+        "separation_weight": 3.0,
+        "separation_radius": 48,
     },
     
     # 蝙蝠 - 快速但脆弱的敌人
@@ -65,6 +71,9 @@ ENEMY_CONFIGS = {
         "exp_value": 5,        # 击败后获得的经验值（5个敌人升一级）
         "animation_speed": 0.0333,
         "scale": 2.0,
+        "mask_collision": True,
+        "separation_weight": 3.0,
+        "separation_radius": 64,
     },
     
     # 史莱姆 - 远程攻击敌人
@@ -76,6 +85,9 @@ ENEMY_CONFIGS = {
         "exp_value": 5,        # 击败后获得的经验值（5个敌人升一级）
         "animation_speed": 0.0333,
         "scale": 1.0,
+        "mask_collision": True,
+        "separation_weight": 3.0,
+        "separation_radius": 48,
         "attack_range": 800,    # 攻击范围
         "min_attack_range": 300, # 最小攻击距离
         "attack_cooldown": 2.0,  # 攻击冷却时间(秒)
@@ -91,6 +103,9 @@ ENEMY_CONFIGS = {
         "exp_value": 200,        
         "animation_speed": 0.0333,
         "scale": 1.0,
+        "mask_collision": True,
+        "separation_weight": 2.0,
+        "separation_radius": 64,
         "attack_range": 1800,    # 攻击范围
         "min_attack_range": 0, # 最小攻击距离
         "attack_cooldown": 0.5,  # 攻击冷却时间(秒)
@@ -1,13 +1,91 @@
 import pygame
-import random
+from ..core.game_random import rng
 import math
 from .types import Ghost, Radish, Bat, Slime, Soul
 from .spawn_marker import SpawnMarker
+from ..effect_library import effect_library
+from ..spatial import SpatialHash
+from .separation import SeparationSteering
+from .status_effects import StatusEffectSystem
+from ..spawn_sampler import REGION_CORNER, REGION_MIDDLE, REGION_ANY
+from ..render_queue import (RenderQueue, LAYER_ROUND_MESSAGES,
+                            LAYER_ENEMIES, LAYER_ENEMY_PROJECTILES)
+from ..hud_widgets import get_font, new_surface
 import time
 
+
+# 敌人模拟的细节层级：近处（屏幕内及边缘）完整更新，中距离半速更新，远处降频且不更新动画和图像
+LOD_TIERS = ("near", "mid", "far")
+
+_fallback_projectile = None
+
+
+def _fallback_projectile_image():
+    """没有图像的敌人子弹使用的红色圆形（只创建一次）"""
+    global _fallback_projectile
+    if _fallback_projectile is None:
+        _fallback_projectile = new_surface((10, 10), pygame.SRCALPHA)
+        pygame.draw.circle(_fallback_projectile, (255, 0, 0), (5, 5), 5)
+    return _fallback_projectile
+
+
+class EnemyQuery:
+    """敌人空间查询句柄
+
+    交给需要按范围查找敌人的武器使用，代替直接遍历敌人列表。
+    网格索引在敌人列表或位置发生变化后的第一次查询时才重建。
+    返回的是候选敌人（按敌人列表顺序），调用方仍需做精确的距离判断。
+    """
+
+    def __init__(self, manager, cell_size=128, margin=32):
+        """
+        Args:
+            manager: EnemyManager实例
+            cell_size: 网格边长
+            margin: 查询时额外扩大的范围，用于容纳按左上角计算距离等误差
+        """
+        self.manager = manager
+        self.margin = margin
+        self.grid = SpatialHash(cell_size)
+        self._built_key = None
+
+    def _index(self):
+        enemies = self.manager.enemies
+        key = (self.manager.version, len(enemies))
+        if key != self._built_key:
+            self.grid.rebuild(enemies)
+            self._built_key = key
+        return self.grid
+
+    def near(self, x, y, radius):
+        """获取 (x, y) 周围 radius 范围内的候选敌人"""
+        return self._index().query_radius(x, y, radius + self.margin)
+
+    def in_rect(self, rect):
+        """获取与矩形区域相交的候选敌人"""
+        return self._index().query_rect(rect.inflate(self.margin * 2, self.margin * 2))
+
+    def __iter__(self):
+        return iter(self.manager.enemies)
+
+    def __len__(self):
+        return len(self.manager.enemies)
+
+    def __bool__(self):
+        return bool(self.manager.enemies)
+
+
 class EnemyManager:
     def __init__(self):
         self.enemies = []
+        # 敌人列表或位置发生变化时递增，空间查询据此判断是否需要重建索引
+        self.version = 0
+        self.query = EnemyQuery(self)
+        # 分离转向：每个tick基于敌人位置快照计算排斥方向，避免成群时叠成一团
+        self.separation = SeparationSteering()
+        # 状态效果（燃烧、减速）：所有敌人的效果存放在同一组数组中，每个tick统一计时
+        self.status_effects = StatusEffectSystem()
+        self.status_events = []  # 本tick产生的持续伤害（StatusDamage），由游戏显示伤害数字
         self.spawn_timer = 0
         self.spawn_interval = 1.5  # 每1.5秒生成一个敌人（加快生成速度）
         self.difficulty = "normal"  # 默认难度为normal
@@ -30,6 +108,8 @@ class EnemyManager:
         
         # 地图边界相关
         self.map_boundaries = None  # (min_x, min_y, max_x, max_y)
+        self.spawn_sampler = None   # 可通行格子采样器，为None时按边界生成出生点
+        self.min_spawn_distance = 300  # 出生点离玩家的最小距离
         
         # 敌人子弹列表
         self.enemy_projectiles = []
@@ -40,6 +120,16 @@ class EnemyManager:
         # 跟踪是否已经生成过soul敌人
         self.soul_spawned = False
         
+        # 画质设置（由画质调节器设置）
+        self.offscreen_update_interval = 1  # 屏幕外敌人每隔几帧更新一次，1表示每帧更新
+        self.view_half_size = (960, 640)    # 以玩家为中心判断是否在屏幕内的半宽、半高
+        self.show_enemy_details = True      # 是否绘制敌人轮廓和血量文字
+        
+        # 细节层级（LOD）：中距离和远处的敌人每隔几帧更新一次，跳过的时间累积到下一次更新
+        self.lod_mid_interval = 2
+        self.lod_far_interval = 4
+        self.lod_counts = dict.fromkeys(LOD_TIERS, 0)  # 上一帧各层级的敌人数量
+        
     def set_map_boundaries(self, min_x, min_y, max_x, max_y):
         """设置地图边界
         
@@ -51,6 +141,14 @@ class EnemyManager:
         """
         self.map_boundaries = (min_x, min_y, max_x, max_y)
         
+    def set_spawn_sampler(self, spawn_sampler):
+        """设置出生点采样器
+        
+        Args:
+            spawn_sampler: SpawnSampler实例，为None时退回到按地图边界生成出生点
+        """
+        self.spawn_sampler = spawn_sampler
+        
     def spawn_enemy(self, enemy_type, x, y, health=None):
         """在指定位置生成指定类型和生命值的敌人
         
@@ -116,8 +214,9 @@ class EnemyManager:
             # 设置敌人的game属性，以便访问游戏对象
             if hasattr(self, 'game'):
                 enemy.game = self.game
+            enemy.status_system = self.status_effects
             self.enemies.append(enemy)
-            
+            self.version += 1
             
         return enemy
         
@@ -149,47 +248,109 @@ class EnemyManager:
                 else:
                     if self.spawn_timer >= self.spawn_interval:
                         self.spawn_timer = 0
-                        if self.random_spawn_enemy(player):
+                        if self.random_spawn_enemy(player, second_player=second_player):
                             # 成功生成敌人，增加计数
                             if hasattr(self, 'enemies_spawned_this_round'):
                                 self.enemies_spawned_this_round += 1
             else:
                 if self.spawn_timer >= self.spawn_interval:
                     self.spawn_timer = 0
-                    if self.random_spawn_enemy(player):
+                    if self.random_spawn_enemy(player, second_player=second_player):
                         # 成功生成敌人，增加计数
                         if hasattr(self, 'enemies_spawned_this_round'):
                             self.enemies_spawned_this_round += 1
         elif self.current_round == 0:  # 休息期，持续生成少量敌人
             # 休息期使用较慢的生成速度，并且有一定随机性
-            rest_spawn_interval = 3.0 + random.uniform(0, 2.0)  # 3-5秒随机间隔
+            rest_spawn_interval = 3.0 + rng.uniform(0, 2.0)  # 3-5秒随机间隔
             if self.spawn_timer >= rest_spawn_interval:
                 self.spawn_timer = 0
                 # 休息期主要生成较弱的敌人
                 enemy_types = ['ghost', 'radish']  # 休息期只生成幽灵和萝卜
-                if random.random() < 0.3:  # 30%概率生成敌人
-                    self.random_spawn_enemy(player, preferred_types=enemy_types)
+                if rng.random() < 0.3:  # 30%概率生成敌人
+                    self.random_spawn_enemy(player, preferred_types=enemy_types, second_player=second_player)
             
         # 如果玩家等级达到1级，更新蝙蝠生成计时器
         if player.level >= 1:
             # 如果是刚达到1级,立即生成一只蝙蝠
             if self.bat_spawn_timer == 0:
-                self.spawn_bat(player)
+                self.spawn_bat(player, second_player)
                 self.bat_spawn_timer = 0.1  # 设置一个很小的值,避免重复触发初始生成
             
             self.bat_spawn_timer += dt
             if self.bat_spawn_timer >= 60:  # 每60秒生成一只蝙蝠
                 self.bat_spawn_timer = 0.1  # 重置为0.1而不是0
-                self.spawn_bat(player)
+                self.spawn_bat(player, second_player)
             
         # 更新出生点标记
         for marker in self.spawn_markers[:]:
             if not marker.update(dt):
                 self.spawn_markers.remove(marker)
+                effect_library.release(marker)
+        
+        # 统一推进所有敌人的状态效果，结算燃烧伤害
+        self.status_events = self.status_effects.update(dt)
         
         # 更新所有敌人
-        for enemy in self.enemies[:]:  # 使用切片创建副本以避免在迭代时修改列表
-            enemy.update(dt, player, second_player)
+        self._update_enemies(dt, player, second_player)
+        self.version += 1
+        
+    def _update_enemies(self, dt, player, second_player=None):
+        """按到屏幕的距离分层更新敌人，远处的敌人降频更新，跳过的时间累积到下一次更新
+        
+        移动时叠加基于本tick开始时位置快照计算的分离转向。
+        """
+        view = self._update_view_rect(player, second_player)
+        mid_view = view.inflate(view.width, view.height)
+        # 画质调节器降档时进一步拉长屏幕外敌人的更新间隔
+        intervals = {
+            "near": 1,
+            "mid": max(self.lod_mid_interval, self.offscreen_update_interval),
+            "far": max(self.lod_far_interval, self.offscreen_update_interval * 2),
+        }
+        lod_counts = dict.fromkeys(LOD_TIERS, 0)
+        enemies = self.enemies[:]  # 使用切片创建副本以避免在迭代时修改列表
+        separation = self.separation
+        separation.rebuild(enemies)
+        for index, enemy in enumerate(enemies):
+            lod = self._get_enemy_lod(enemy, view, mid_view)
+            lod_counts[lod] += 1
+            enemy._pending_dt += dt
+            enemy._skipped_frames += 1
+            if enemy._skipped_frames < intervals[lod]:
+                continue
+            enemy_dt = enemy._pending_dt
+            enemy._pending_dt = 0.0
+            enemy._skipped_frames = 0
+            enemy.separation_push = separation.push(index)
+            enemy.update(enemy_dt, player, second_player, animate=lod != "far")
+        self.lod_counts = lod_counts
+        
+    def _get_enemy_lod(self, enemy, view, mid_view):
+        """获取敌人本帧的细节层级
+        
+        Args:
+            enemy: 敌人
+            view: 屏幕对应的世界矩形
+            mid_view: 中距离范围的世界矩形
+            
+        Returns:
+            str: LOD_TIERS 中的一项
+        """
+        # 有飞行中投射物的敌人保持完整更新，避免投射物一次移动过远穿过玩家
+        if view.colliderect(enemy.rect) or getattr(enemy, 'projectiles', None):
+            return "near"
+        if mid_view.colliderect(enemy.rect):
+            return "mid"
+        return "far"
+        
+    def _update_view_rect(self, player, second_player=None):
+        """估算屏幕对应的世界矩形（相机跟随玩家，双人时跟随两人中点）"""
+        center_x, center_y = player.world_x, player.world_y
+        if second_player:
+            center_x = (center_x + second_player.world_x) / 2
+            center_y = (center_y + second_player.world_y) / 2
+        half_width, half_height = self.view_half_size
+        return pygame.Rect(center_x - half_width, center_y - half_height, half_width * 2, half_height * 2)
             
     def _update_round_system(self, dt, player):
         """更新波次系统，根据关卡数调整怪物生成速度"""
@@ -293,8 +454,8 @@ class EnemyManager:
         })
         
         
-    def _render_round_messages(self, screen):
-        """渲染波次消息"""
+    def _render_round_messages(self, screen, queue):
+        """渲染波次消息（提交到渲染队列）"""
         # 更新消息计时器
         for message in self.round_messages[:]:
             message['timer'] += 0.016  # 假设60FPS
@@ -305,7 +466,7 @@ class EnemyManager:
                 continue
                 
             # 渲染消息
-            font = pygame.font.SysFont('simHei', 48)
+            font = get_font(48)
             text_surface = font.render(message['text'], True, message['color'])
             
             # 计算消息位置（屏幕中央）
@@ -322,7 +483,7 @@ class EnemyManager:
             if alpha < 255:
                 text_surface.set_alpha(alpha)
             
-            screen.blit(text_surface, text_rect)
+            queue.submit(text_surface, text_rect, LAYER_ROUND_MESSAGES)
             
             # 添加阴影效果
             shadow_surface = font.render(message['text'], True, (0, 0, 0))
@@ -331,100 +492,166 @@ class EnemyManager:
             shadow_rect.centery = text_rect.centery + 2
             if alpha < 255:
                 shadow_surface.set_alpha(alpha)
-            screen.blit(shadow_surface, shadow_rect)
+            queue.submit(shadow_surface, shadow_rect, LAYER_ROUND_MESSAGES)
             
-    def render(self, screen, camera_x, camera_y, screen_center_x, screen_center_y, lighting_manager=None):
+    def render(self, screen, camera_x, camera_y, screen_center_x, screen_center_y, lighting_manager=None,
+               render_queue=None):
+        """渲染出生点标记、波次消息、敌人和敌人子弹
+        
+        Args:
+            render_queue: 共享的渲染队列，为None时在本方法内创建并立即绘制
+        """
+        queue = render_queue if render_queue is not None else RenderQueue.started(screen, camera_x, camera_y)
+        
         # 渲染出生点标记
         for marker in self.spawn_markers[:]:  # 使用切片复制避免在迭代时修改
             marker.update(0.016)  # 假设60FPS
             if marker.timer >= marker.duration:  # 修复：检查timer而不是duration
                 self.spawn_markers.remove(marker)
+                effect_library.release(marker)
             else:
-                marker.render(screen, camera_x, camera_y, screen_center_x, screen_center_y)
+                marker.submit_render(queue, camera_x, camera_y, screen_center_x, screen_center_y)
         
         # 渲染波次消息
-        self._render_round_messages(screen)
+        self._render_round_messages(screen, queue)
         
-        # 渲染敌人
-        for enemy in self.enemies:
+        # 渲染敌人：通过空间索引只取视野附近的敌人，再按精灵矩形做视野剔除
+        lighting_enabled = (lighting_manager and hasattr(lighting_manager, 'is_enabled')
+                            and lighting_manager.is_enabled())
+        for enemy in self.query.in_rect(queue.world_view):
             # 计算敌人在屏幕上的位置
             screen_x = screen_center_x + (enemy.rect.x - camera_x)
             screen_y = screen_center_y + (enemy.rect.y - camera_y)
             
-            # 性能优化：只渲染在屏幕范围内的敌人
-            if (screen_x > -100 and screen_x < screen.get_width() + 100 and
-                screen_y > -100 and screen_y < screen.get_height() + 100):
-                
-                # 检查敌人是否在光照范围内
-                if lighting_manager and hasattr(lighting_manager, 'is_enabled') and lighting_manager.is_enabled():
-                    # 性能优化：减少光照检测频率
-                    # 只在敌人移动或光照系统变化时检测
-                    if (not hasattr(enemy, '_last_light_check') or
-                        abs(enemy.rect.centerx - getattr(enemy, '_last_light_x', 0)) > 10 or
-                        abs(enemy.rect.centery - getattr(enemy, '_last_light_y', 0)) > 10):
-                        
-                        # 使用敌人的实际世界坐标进行光照检测
-                        enemy_world_x = enemy.rect.centerx
-                        enemy_world_y = enemy.rect.centery
-                        enemy_screen_x = screen_center_x + (enemy_world_x - camera_x)
-                        enemy_screen_y = screen_center_y + (enemy_world_y - camera_y)
-                        
-                        # 检查敌人是否在光照范围内
-                        # 注意：光照系统使用的是屏幕坐标，所以需要转换
-                        current_in_light = lighting_manager.is_in_light(enemy_screen_x, enemy_screen_y)
-                        
-                       
-                        
-                        # 临时修复：强制显示血条，直到光照系统问题解决
-                        enemy.has_been_seen = True
-                        enemy.render(screen, screen_x, screen_y, show_health_bar=True)
-                        
-                       
-                        enemy._last_light_check = time.time()
-                        enemy._last_light_x = enemy.rect.centerx
-                        enemy._last_light_y = enemy.rect.centery
-                        enemy._last_in_light = current_in_light
-                    else:
-                        # 临时修复：强制显示血条
-                        enemy.has_been_seen = True
-                        enemy.render(screen, screen_x, screen_y, show_health_bar=True)
-                        
-                        # 原始逻辑（暂时注释掉）
-                        # if enemy._last_in_light:
-                        #     # 上次在光照内，显示血条
-                        #     enemy.render(screen, screen_x, screen_y, show_health_bar=True)
-                        # elif enemy.has_been_seen:
-                        #     # 曾经被看到过但当前不在光照内，显示怪物和血条
-                        #     enemy.render(screen, screen_x, screen_y, show_health_bar=True)
-                        # else:
-                        #     # 如果从未被看到过且当前不在光照内，仍然渲染敌人（但可能半透明）
-                        #     # 这样可以避免"看不见但能攻击"的问题
-                        #     enemy.render(screen, screen_x, screen_y, show_health_bar=False)
-                else:
-                    # 如果没有光照系统或光照系统被禁用，正常渲染（包括血条）
-                    enemy.render(screen, screen_x, screen_y, show_health_bar=True)
+            image = getattr(enemy, 'image', None)
+            width, height = image.get_size() if image else enemy.rect.size
+            if not queue.is_visible(screen_x, screen_y, width, height):
+                continue
+            
+            # 检查敌人是否在光照范围内
+            # 性能优化：减少光照检测频率，只在敌人移动超过10像素时检测
+            if lighting_enabled and (
+                    not hasattr(enemy, '_last_light_check') or
+                    abs(enemy.rect.centerx - getattr(enemy, '_last_light_x', 0)) > 10 or
+                    abs(enemy.rect.centery - getattr(enemy, '_last_light_y', 0)) > 10):
+                # 使用敌人的实际世界坐标进行光照检测
+                # 注意：光照系统使用的是屏幕坐标，所以需要转换
+                enemy_screen_x = screen_center_x + (enemy.rect.centerx - camera_x)
+                enemy_screen_y = screen_center_y + (enemy.rect.centery - camera_y)
+                current_in_light = lighting_manager.is_in_light(enemy_screen_x, enemy_screen_y)
                 
-                # 显示碰撞圈（除了soul类型）
-                # if enemy.type != 'soul':
-                #     self._render_collision_circle(screen, enemy, screen_x, screen_y)
+                enemy._last_light_check = time.time()
+                enemy._last_light_x = enemy.rect.centerx
+                enemy._last_light_y = enemy.rect.centery
+                enemy._last_in_light = current_in_light
+            
+            if lighting_enabled:
+                # 临时修复：强制显示血条，直到光照系统问题解决
+                # 原始逻辑：_last_in_light 或 has_been_seen 时显示血条，
+                # 从未被看到过且不在光照内时不显示血条
+                enemy.has_been_seen = True
+            
+            # 显示碰撞圈（除了soul类型）
+            # if enemy.type != 'soul':
+            #     self._render_collision_circle(screen, enemy, screen_x, screen_y)
+            queue.submit_many(enemy.render_items(screen_x, screen_y, show_health_bar=True,
+                                                 show_details=self.show_enemy_details), LAYER_ENEMIES)
         
         # 渲染敌人子弹
-        self._render_enemy_projectiles(screen, camera_x, camera_y, screen_center_x, screen_center_y)
+        self._render_enemy_projectiles(queue, camera_x, camera_y, screen_center_x, screen_center_y)
+        
+        if render_queue is None:
+            queue.flush()
             
     def remove_enemy(self, enemy):
         if enemy in self.enemies:
             self.enemies.remove(enemy)
+            self.status_effects.remove_enemies((enemy,))
+            self.version += 1
             
-    def random_spawn_enemy(self, player, preferred_types=None):
+    def remove_enemies(self, enemies):
+        """一次性移除多个敌人，只压缩一次列表（按对象身份比较）
+        
+        Returns:
+            int: 实际移除的数量
+        """
+        removed_ids = {id(enemy) for enemy in enemies}
+        if not removed_ids:
+            return 0
+        count = len(self.enemies)
+        self.enemies[:] = [enemy for enemy in self.enemies if id(enemy) not in removed_ids]
+        count -= len(self.enemies)
+        if count:
+            self.status_effects.remove_enemies(enemies)
+            self.version += 1
+        return count
+        
+    def random_spawn_enemy(self, player, preferred_types=None, second_player=None):
         """在多个位置随机生成敌人，根据关卡数增加出生点数量
         
         Args:
             player: 玩家对象
             preferred_types: 偏好的敌人类型列表，如果为None则使用默认逻辑
+            second_player: 第二个玩家对象（双人模式），出生点同样要离它足够远
         """
         if not self.map_boundaries:
             return False  # 如果没有地图边界信息，无法生成敌人
             
+        position = None
+        if self.spawn_sampler:
+            position = self.spawn_sampler.sample(rng, self._get_spawn_region_weights(),
+                                                 self._spawn_players(player, second_player),
+                                                 self.min_spawn_distance)
+        if position:
+            spawn_x, spawn_y = position
+        else:
+            spawn_x, spawn_y = self._get_boundary_spawn_point()
+        
+        # 创建出生点标记
+        spawn_marker = effect_library.spawn(SpawnMarker, spawn_x, spawn_y, 2.0)
+        self.spawn_markers.append(spawn_marker)
+        
+        # 根据偏好类型或游戏时间决定生成什么类型的敌人
+        if preferred_types:
+            enemy_type = rng.choice(preferred_types)
+        elif self.game_time < 10:  # 游戏开始10秒内
+            enemy_type = 'slime'
+        
+        elif self.game_time>=120:
+            # 如果还没有生成过soul敌人，可以生成soul
+            available_types = ['ghost', 'radish', 'slime']
+            if not self.soul_spawned:
+                available_types.append('soul')
+            enemy_type = rng.choice(available_types)
+        else:  # 10秒后可以生成幽灵和萝卜
+            enemy_type = rng.choice(['ghost', 'radish', 'slime'])
+            
+        self.spawn_enemy(enemy_type, spawn_x, spawn_y)
+        return True  # 成功生成敌人
+    
+    @staticmethod
+    def _spawn_players(player, second_player=None):
+        """出生点采样时需要避开的玩家列表（双人模式下包含两个玩家）"""
+        return [p for p in (player, second_player) if p]
+    
+    def _get_spawn_region_weights(self):
+        """出生区域权重：第一关只在四个角落生成，之后按出生点数量增加随机位置和中间位置
+        
+        Returns:
+            dict: {区域: 权重}
+        """
+        if self.global_level >= 3:
+            return {REGION_CORNER: 4, REGION_ANY: 28, REGION_MIDDLE: 5}
+        if self.global_level >= 2:
+            return {REGION_CORNER: 4, REGION_ANY: 8, REGION_MIDDLE: 1}
+        return {REGION_CORNER: 4}
+        
+    def _get_boundary_spawn_point(self):
+        """没有出生点采样器时，按地图边界在角落、随机位置和中间位置中选择出生点
+        
+        Returns:
+            tuple: 出生点世界坐标 (x, y)
+        """
         min_x, min_y, max_x, max_y = self.map_boundaries
         
         # 基础四个角落的生成区域
@@ -454,37 +681,16 @@ class EnemyManager:
             spawn_points.extend(middle_points)
         
         # 随机选择一个出生点
-        spawn_x, spawn_y = random.choice(spawn_points)
+        spawn_x, spawn_y = rng.choice(spawn_points)
         
         # 在选定的位置周围添加一些随机偏移（±50像素）
-        spawn_x += random.uniform(-50, 50)
-        spawn_y += random.uniform(-50, 50)
+        spawn_x += rng.uniform(-50, 50)
+        spawn_y += rng.uniform(-50, 50)
         
         # 确保生成位置在地图边界内
         spawn_x = max(min_x, min(spawn_x, max_x))
         spawn_y = max(min_y, min(spawn_y, max_y))
-        
-        # 创建出生点标记
-        spawn_marker = SpawnMarker(spawn_x, spawn_y, duration=2.0)
-        self.spawn_markers.append(spawn_marker)
-        
-        # 根据偏好类型或游戏时间决定生成什么类型的敌人
-        if preferred_types:
-            enemy_type = random.choice(preferred_types)
-        elif self.game_time < 10:  # 游戏开始10秒内
-            enemy_type = 'slime'
-        
-        elif self.game_time>=120:
-            # 如果还没有生成过soul敌人，可以生成soul
-            available_types = ['ghost', 'radish', 'slime']
-            if not self.soul_spawned:
-                available_types.append('soul')
-            enemy_type = random.choice(available_types)
-        else:  # 10秒后可以生成幽灵和萝卜
-            enemy_type = random.choice(['ghost', 'radish', 'slime'])
-            
-        self.spawn_enemy(enemy_type, spawn_x, spawn_y)
-        return True  # 成功生成敌人
+        return spawn_x, spawn_y
     
     def _generate_additional_spawn_points(self, count, min_x, min_y, max_x, max_y):
         """生成额外的随机出生点（边缘区域）
@@ -501,8 +707,8 @@ class EnemyManager:
         
         for _ in range(count):
             # 在地图边缘区域随机生成位置
-            x = random.uniform(min_x + margin, max_x - margin)
-            y = random.uniform(min_y + margin, max_y - margin)
+            x = rng.uniform(min_x + margin, max_x - margin)
+            y = rng.uniform(min_y + margin, max_y - margin)
             spawn_points.append((x, y))
             
         return spawn_points
@@ -535,8 +741,8 @@ class EnemyManager:
         
         for _ in range(count):
             # 在中心区域随机生成位置
-            x = random.uniform(center_min_x, center_max_x)
-            y = random.uniform(center_min_y, center_max_y)
+            x = rng.uniform(center_min_x, center_max_x)
+            y = rng.uniform(center_min_y, center_max_y)
             spawn_points.append((x, y))
             
         return spawn_points
@@ -567,35 +773,43 @@ class EnemyManager:
         """重置soul生成标志，用于重新开始游戏时"""
         self.soul_spawned = False
             
-    def spawn_bat(self, player):
+    def spawn_bat(self, player, second_player=None):
         """在四个角落随机位置生成一个蝙蝠，确保在地图边界内"""
         if not self.map_boundaries:
             return  # 如果没有地图边界信息，无法生成蝙蝠
             
         min_x, min_y, max_x, max_y = self.map_boundaries
         
-        # 定义四个角落的生成区域（距离边界100像素，调整为1倍缩放）
-        corner_offset = 100
-        corners = [
-            (min_x + corner_offset, min_y + corner_offset),  # 左上角
-            (max_x - corner_offset, min_y + corner_offset),  # 右上角
-            (min_x + corner_offset, max_y - corner_offset),  # 左下角
-            (max_x - corner_offset, max_y - corner_offset)   # 右下角
-        ]
-        
-        # 随机选择一个角落
-        spawn_x, spawn_y = random.choice(corners)
-        
-        # 在选定的角落周围添加一些随机偏移（±50像素）
-        spawn_x += random.uniform(-50, 50)
-        spawn_y += random.uniform(-50, 50)
-        
-        # 确保生成位置在地图边界内
-        spawn_x = max(min_x, min(spawn_x, max_x))
-        spawn_y = max(min_y, min(spawn_y, max_y))
+        # 优先从采样器的角落区域中选择可通行的位置
+        position = None
+        if self.spawn_sampler:
+            position = self.spawn_sampler.sample(rng, {REGION_CORNER: 1}, self._spawn_players(player, second_player),
+                                                 self.min_spawn_distance)
+        if position:
+            spawn_x, spawn_y = position
+        else:
+            # 定义四个角落的生成区域（距离边界100像素，调整为1倍缩放）
+            corner_offset = 100
+            corners = [
+                (min_x + corner_offset, min_y + corner_offset),  # 左上角
+                (max_x - corner_offset, min_y + corner_offset),  # 右上角
+                (min_x + corner_offset, max_y - corner_offset),  # 左下角
+                (max_x - corner_offset, max_y - corner_offset)   # 右下角
+            ]
+            
+            # 随机选择一个角落
+            spawn_x, spawn_y = rng.choice(corners)
+            
+            # 在选定的角落周围添加一些随机偏移（±50像素）
+            spawn_x += rng.uniform(-50, 50)
+            spawn_y += rng.uniform(-50, 50)
+            
+            # 确保生成位置在地图边界内
+            spawn_x = max(min_x, min(spawn_x, max_x))
+            spawn_y = max(min_y, min(spawn_y, max_y))
         
         # 创建出生点标记
-        spawn_marker = SpawnMarker(spawn_x, spawn_y, duration=2.0)
+        spawn_marker = effect_library.spawn(SpawnMarker, spawn_x, spawn_y, 2.0)
         self.spawn_markers.append(spawn_marker)
         
         self.spawn_enemy('bat', spawn_x, spawn_y)
@@ -704,8 +918,8 @@ class EnemyManager:
                 # 将光圈绘制到屏幕上
                 screen.blit(aura_surface, (circle_center_x - radius, circle_center_y - radius))
     
-    def _render_enemy_projectiles(self, screen, camera_x, camera_y, screen_center_x, screen_center_y):
-        """渲染敌人子弹"""
+    def _render_enemy_projectiles(self, queue, camera_x, camera_y, screen_center_x, screen_center_y):
+        """渲染敌人子弹（提交到渲染队列）"""
         for projectile in self.enemy_projectiles:
             # 计算子弹在屏幕上的位置
             # 使用正确的属性名（x, y 而不是 world_x, world_y）
@@ -718,7 +932,9 @@ class EnemyManager:
             # 渲染子弹
             if hasattr(projectile, 'image'):
                 projectile.rect.center = (screen_x, screen_y)
-                screen.blit(projectile.image, projectile.rect)
+                queue.submit_culled(projectile.image, projectile.rect.x, projectile.rect.y,
+                                    LAYER_ENEMY_PROJECTILES)
             else:
                 # 如果没有图像，绘制一个简单的圆形
-                pygame.draw.circle(screen, (255, 0, 0), (int(screen_x), int(screen_y)), 5) 
\ No newline at end of file
+                queue.submit_culled(_fallback_projectile_image(), int(screen_x) - 5, int(screen_y) - 5,
+                                    LAYER_ENEMY_PROJECTILES)
@@ -0,0 +1,178 @@
+"""
+敌人分离转向
+敌人只会朝玩家直线追击，成群时会叠成一个点：范围伤害一次命中大量敌人，叠在一起的精灵也白白重复绘制。
+这里在每个tick开始时把敌人中心登记到均匀网格中（网格边长为分离半径的两倍），
+每个敌人只在离自己最近的2x2个网格里找邻居，每个网格最多取固定数量的候选、
+总共最多取固定数量的邻居计算排斥方向，总开销与敌人数量成线性关系。
+整个计算用numpy一次完成，不按敌人逐个调用Python代码。
+排斥强度和范围按敌人类型在 ENEMY_CONFIGS 中配置（separation_weight / separation_radius）。
+"""
+
+import math
+
+import numpy as np
+
+# 每个敌人最多参与排斥计算的邻居数量
+DEFAULT_MAX_NEIGHBORS = 6
+# 每个邻居网格最多检查的候选数量（网格里可能挤着很多敌人）
+DEFAULT_MAX_PER_CELL = 4
+
+# 网格坐标编码为一个整数：(列 + 偏移) * 跨度 + (行 + 偏移)
+_KEY_OFFSET = 1 << 20
+_KEY_STRIDE = 1 << 21
+
+# 敌人位于网格的哪个象限 -> 要检查的2x2个网格（相对自己所在网格的偏移，自己的网格在最前）
+_QUADRANT_OFFSETS = np.array((
+    ((0, 0), (-1, 0), (0, -1), (-1, -1)),  # 左上
+    ((0, 0), (-1, 0), (0, 1), (-1, 1)),    # 左下
+    ((0, 0), (1, 0), (0, -1), (1, -1)),    # 右上
+    ((0, 0), (1, 0), (0, 1), (1, 1)),      # 右下
+), dtype=np.int64)
+
+# 网格内再细分为 8x8 个小格，按Z序（Morton序）编号，使编号相近的小格在空间上也相近
+_SUBDIVISIONS = 8
+_CELL_CODES = _SUBDIVISIONS * _SUBDIVISIONS
+_MORTON = np.array([[sum(((x >> bit) & 1) << (2 * bit + 1) | ((y >> bit) & 1) << (2 * bit) for bit in range(3))
+                     for y in range(_SUBDIVISIONS)] for x in range(_SUBDIVISIONS)], dtype=np.int64)
+
+# 完全重合的敌人按下标乘以黄金角散开，相邻下标的方向差别最大
+_GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))
+
+
+class SeparationSteering:
+    """基于均匀网格的分离转向
+
+    rebuild 记录所有敌人本tick开始时的位置并一次性算出全部排斥方向，之后用 push 按下标读取。
+    所有敌人都基于同一份位置快照计算，结果与更新顺序无关；候选按敌人列表顺序选取，保证回放的确定性。
+    """
+
+    def __init__(self, max_neighbors=DEFAULT_MAX_NEIGHBORS, max_per_cell=DEFAULT_MAX_PER_CELL):
+        """
+        Args:
+            max_neighbors: 每个敌人最多参与计算的邻居数量
+            max_per_cell: 每个邻居网格最多检查的候选数量，保证单个敌人的开销有上限
+        """
+        self.max_neighbors = max_neighbors
+        self.max_per_cell = max_per_cell
+        self.push_x = np.zeros(0)
+        self.push_y = np.zeros(0)
+
+        # 统计：上一次 rebuild 检查过的候选数量
+        self.pairs_checked = 0
+
+    def rebuild(self, enemies):
+        """记录敌人位置并计算全部排斥方向
+
+        Args:
+            enemies: 敌人列表，push 的下标与此列表对应
+        """
+        count = len(enemies)
+        self.pairs_checked = 0
+        if count < 2:
+            self.push_x = np.zeros(count)
+            self.push_y = np.zeros(count)
+            return
+
+        xs = np.fromiter((enemy.rect.centerx for enemy in enemies), dtype=np.float64, count=count)
+        ys = np.fromiter((enemy.rect.centery for enemy in enemies), dtype=np.float64, count=count)
+        radii = np.fromiter((enemy.separation_radius for enemy in enemies), dtype=np.float64, count=count)
+        weights = np.fromiter((enemy.separation_weight for enemy in enemies), dtype=np.float64, count=count)
+        self.push_x, self.push_y = self._solve(xs, ys, radii, weights)
+
+    def _solve(self, xs, ys, radii, weights):
+        count = len(xs)
+        # 网格边长取最大分离半径的两倍：半径内的邻居一定在离自己最近的2x2个网格里
+        size = max(float(radii.max()) * 2, 1.0)
+        grid_x = xs / size
+        grid_y = ys / size
+        cell_x = np.floor(grid_x)
+        cell_y = np.floor(grid_y)
+        cells = ((cell_x.astype(np.int64) + _KEY_OFFSET) * _KEY_STRIDE
+                 + cell_y.astype(np.int64) + _KEY_OFFSET)
+        sub_x = np.minimum(((grid_x - cell_x) * _SUBDIVISIONS).astype(np.int64), _SUBDIVISIONS - 1)
+        sub_y = np.minimum(((grid_y - cell_y) * _SUBDIVISIONS).astype(np.int64), _SUBDIVISIONS - 1)
+        quadrant = (sub_x >= _SUBDIVISIONS // 2) * 2 + (sub_y >= _SUBDIVISIONS // 2)
+
+        # 按 (网格, 网格内的Z序) 稳定排序：同一网格内位置相近的敌人在排序后的数组中也相邻。
+        # 之后的计算都在排序后的顺序上进行，查找邻居网格时的查询也基本有序
+        keys = cells * _CELL_CODES + _MORTON[sub_x, sub_y]
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        cells = cells[order]
+        sub_x = sub_x[order]
+        sub_y = sub_y[order]
+        xs = xs[order]
+        ys = ys[order]
+        radii = radii[order]
+        sorted_index = np.arange(count)
+
+        # 每个敌人在要检查的4个网格中各取一段连续的候选窗口：
+        # 自己的网格以自己为中心，相邻网格以靠近自己的那条边上的位置为中心
+        window = self.max_per_cell
+        offsets = _QUADRANT_OFFSETS[quadrant[order]]
+        first = np.empty((count, 4), dtype=np.int64)
+        lengths = np.empty((count, 4), dtype=np.int64)
+        for column in range(4):
+            offset_x = offsets[:, column, 0]
+            offset_y = offsets[:, column, 1]
+            base = (cells + offset_x * _KEY_STRIDE + offset_y) * _CELL_CODES
+            low = np.searchsorted(keys, base)
+            high = np.searchsorted(keys, base + _CELL_CODES)
+            if column == 0:
+                anchor = sorted_index
+            else:
+                edge_x = np.where(offset_x == 0, sub_x, np.where(offset_x > 0, 0, _SUBDIVISIONS - 1))
+                edge_y = np.where(offset_y == 0, sub_y, np.where(offset_y > 0, 0, _SUBDIVISIONS - 1))
+                anchor = np.searchsorted(keys, base + _MORTON[edge_x, edge_y])
+            length = np.minimum(high - low, window)
+            first[:, column] = np.clip(anchor - window // 2, low, high - length)
+            lengths[:, column] = length
+        self.pairs_checked = int(lengths.sum())
+
+        slots = np.arange(window)
+        other = np.minimum(first[:, :, None] + slots, count - 1).reshape(count, -1)
+        valid = (slots < lengths[:, :, None]).reshape(count, -1)
+
+        dx = xs[:, None] - xs[other]
+        dy = ys[:, None] - ys[other]
+        distance_sq = dx * dx + dy * dy
+        radius = radii[:, None]
+        # 每个敌人只取前 max_neighbors 个半径内的邻居（窗口里可能包含自己）
+        inside = valid & (distance_sq < radius * radius) & (other != sorted_index[:, None])
+        keep = inside & (np.cumsum(inside, axis=1) <= self.max_neighbors)
+
+        # 远离邻居的单位向量，随距离线性衰减；完全重合时沿按原下标确定的固定方向推开
+        distance = np.sqrt(distance_sq)
+        overlapping = keep & (distance == 0)
+        strength = np.where(keep, 1.0 / np.maximum(distance, 1e-9) - 1.0 / radius, 0.0)
+        angle = order * _GOLDEN_ANGLE
+        sorted_x = np.where(overlapping, np.cos(angle)[:, None], dx * strength).sum(axis=1)
+        sorted_y = np.where(overlapping, np.sin(angle)[:, None], dy * strength).sum(axis=1)
+
+        # 恢复为敌人列表顺序；合力长度不超过1，再乘以各自的分离权重
+        push_x = np.empty(count)
+        push_y = np.empty(count)
+        push_x[order] = sorted_x
+        push_y[order] = sorted_y
+        scale = weights / np.maximum(np.sqrt(push_x * push_x + push_y * push_y), 1.0)
+        return push_x * scale, push_y * scale
+
+    def push(self, index):
+        """获取敌人的排斥方向
+
+        Args:
+            index: 敌人在 rebuild 时列表中的下标
+
+        Returns:
+            tuple: (x, y) 排斥方向乘以分离权重，长度不超过分离权重
+        """
+        return float(self.push_x[index]), float(self.push_y[index])
+
+    def compute(self, enemies):
+        """重建并返回所有敌人的排斥方向
+
+        Returns:
+            list: 与 enemies 一一对应的 (x, y)
+        """
+        self.rebuild(enemies)
+        return list(zip(self.push_x.tolist(), self.push_y.tolist()))
@@ -1,5 +1,43 @@
 import pygame
 import math
+from ..render_queue import LAYER_SPAWN_MARKERS
+from ..effect_library import effect_library
+
+def draw_marker(size, alpha):
+    """绘制红色出生点标记
+    
+    Args:
+        size: 标记大小
+        alpha: 透明度
+        
+    Returns:
+        pygame.Surface: 标记表面
+    """
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    
+    # 绘制红色圆圈
+    center = (size // 2, size // 2)
+    radius = size // 2 - 2
+    
+    # 外圈（深红色）
+    pygame.draw.circle(surface, (139, 0, 0, alpha), center, radius)
+    
+    # 内圈（亮红色）
+    inner_radius = radius - 4
+    pygame.draw.circle(surface, (255, 0, 0, alpha), center, inner_radius)
+    
+    # 中心点（白色）
+    center_radius = 3
+    pygame.draw.circle(surface, (255, 255, 255, alpha), center, center_radius)
+    
+    # 添加一些装饰性的小点
+    for i in range(8):
+        angle = i * math.pi / 4
+        dot_x = center[0] + (radius - 8) * math.cos(angle)
+        dot_y = center[1] + (radius - 8) * math.sin(angle)
+        pygame.draw.circle(surface, (255, 255, 255, alpha), 
+                         (int(dot_x), int(dot_y)), 2)
+    return surface
 
 class SpawnMarker:
     def __init__(self, x, y, duration=2.0):
@@ -10,41 +48,21 @@ class SpawnMarker:
             y: 世界坐标系中的y坐标
             duration: 标记显示时间（秒）
         """
+        self.size = 40  # 标记大小
+        
+        # 各透明度档位的标记表面由特效库预先画好，所有标记共享
+        self.fade_frames = effect_library.fade_frames(('spawn_marker', self.size),
+                                                      lambda alpha: draw_marker(self.size, alpha))
+        self.reset(x, y, duration)
+        
+    def reset(self, x, y, duration=2.0):
+        """重置为刚生成的状态（从特效库的对象池复用时调用）"""
         self.world_x = x
         self.world_y = y
         self.duration = duration
         self.timer = 0
         self.alpha = 255  # 透明度
-        self.size = 40  # 标记大小
-        
-        # 创建标记表面
-        self.surface = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-        self._draw_marker()
-        
-    def _draw_marker(self):
-        """绘制红色出生点标记"""
-        # 绘制红色圆圈
-        center = (self.size // 2, self.size // 2)
-        radius = self.size // 2 - 2
-        
-        # 外圈（深红色）
-        pygame.draw.circle(self.surface, (139, 0, 0, self.alpha), center, radius)
-        
-        # 内圈（亮红色）
-        inner_radius = radius - 4
-        pygame.draw.circle(self.surface, (255, 0, 0, self.alpha), center, inner_radius)
-        
-        # 中心点（白色）
-        center_radius = 3
-        pygame.draw.circle(self.surface, (255, 255, 255, self.alpha), center, center_radius)
-        
-        # 添加一些装饰性的小点
-        for i in range(8):
-            angle = i * math.pi / 4
-            dot_x = center[0] + (radius - 8) * math.cos(angle)
-            dot_y = center[1] + (radius - 8) * math.sin(angle)
-            pygame.draw.circle(self.surface, (255, 255, 255, self.alpha), 
-                             (int(dot_x), int(dot_y)), 2)
+        self.surface = self.fade_frames[-1]
     
     def update(self, dt):
         """更新标记状态"""
@@ -56,7 +74,8 @@ class SpawnMarker:
             fade_duration = self.duration * 0.3
             self.alpha = int(255 * (1 - fade_time / fade_duration))
             self.alpha = max(0, self.alpha)
-            self._draw_marker()  # 重新绘制以更新透明度
+            # 切换到对应透明度档位的预绘制表面
+            self.surface = self.fade_frames[effect_library.fade_step(self.alpha)]
         
         return self.timer < self.duration
     
@@ -69,4 +88,9 @@ class SpawnMarker:
         # 只渲染在屏幕范围内的标记
         if -self.size <= screen_x <= screen.get_width() + self.size and \
            -self.size <= screen_y <= screen.get_height() + self.size:
-            screen.blit(self.surface, (screen_x, screen_y)) 
\ No newline at end of file
+            screen.blit(self.surface, (screen_x, screen_y))     
+    def submit_render(self, render_queue, camera_x, camera_y, screen_center_x, screen_center_y):
+        """把出生点标记提交到渲染队列（由队列统一做视野剔除）"""
+        screen_x = screen_center_x + (self.world_x - camera_x) - self.size // 2
+        screen_y = screen_center_y + (self.world_y - camera_y) - self.size // 2
+        render_queue.submit_culled(self.surface, screen_x, screen_y, LAYER_SPAWN_MARKERS)
@@ -0,0 +1,239 @@
+"""
+敌人状态效果
+燃烧和减速不再存放在每个敌人的字典里逐个计时，而是集中存放在几组数组中
+（敌人槽位、效果类型、剩余时间、已持续时间、强度、伤害计时），每个tick用numpy一次完成计时、
+燃烧伤害结算和到期清理，只有本tick真正受到燃烧伤害或效果到期的敌人才会执行Python代码。
+燃烧伤害以事件的形式返回，由游戏交给伤害数字显示。
+"""
+
+import numpy as np
+
+# 效果类型
+EFFECT_BURN = 0
+EFFECT_SLOW = 1
+
+# 燃烧每隔多少秒造成一次伤害
+BURN_TICK_INTERVAL = 0.5
+
+# 每行效果的各列（同一行号在各数组中对应同一个效果）
+_COLUMNS = ("slots", "kinds", "remaining", "elapsed", "magnitude", "accumulator")
+
+
+class StatusDamage:
+    """一次持续伤害结算
+
+    Attributes:
+        enemy: 受到伤害的敌人
+        kind: 效果类型（EFFECT_BURN）
+        damage: 伤害值
+    """
+
+    __slots__ = ("enemy", "kind", "damage")
+
+    def __init__(self, enemy, kind, damage):
+        self.enemy = enemy
+        self.kind = kind
+        self.damage = damage
+
+    def __repr__(self):
+        return f"StatusDamage({self.kind}, {self.enemy!r}, {self.damage})"
+
+
+class StatusEffectSystem:
+    """以数组存储的状态效果
+
+    每个敌人在第一次获得效果时分配一个槽位，每个 (槽位, 效果类型) 最多一行。
+    同类效果重复施加时不重新计时：持续时间（从第一次施加算起）和强度都取较大者，燃烧的伤害计时也不重置。
+    行按施加顺序排列，伤害事件也按这个顺序产生，保证回放的确定性。
+    """
+
+    def __init__(self, capacity=64):
+        """
+        Args:
+            capacity: 数组初始容量，不够时自动翻倍
+        """
+        self.count = 0
+        self.slots = np.zeros(capacity, dtype=np.int32)
+        self.kinds = np.zeros(capacity, dtype=np.int8)
+        self.remaining = np.zeros(capacity, dtype=np.float64)
+        self.elapsed = np.zeros(capacity, dtype=np.float64)
+        self.magnitude = np.zeros(capacity, dtype=np.float64)
+        self.accumulator = np.zeros(capacity, dtype=np.float64)
+
+        # 槽位 -> 敌人，空闲槽位为None
+        self._enemies = []
+        self._slot_of = {}
+        self._free_slots = []
+        # (槽位, 效果类型) -> 行号
+        self._rows = {}
+
+    def __len__(self):
+        return self.count
+
+    def _reserve(self, extra):
+        needed = self.count + extra
+        capacity = len(self.slots)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in _COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def _slot(self, enemy):
+        slot = self._slot_of.get(id(enemy))
+        if slot is None:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+                self._enemies[slot] = enemy
+            else:
+                slot = len(self._enemies)
+                self._enemies.append(enemy)
+            self._slot_of[id(enemy)] = slot
+        return slot
+
+    def _row(self, enemy, kind):
+        """获取敌人某种效果所在的行，没有时新增一行
+
+        Returns:
+            tuple: (行号, 是否新增)
+        """
+        slot = self._slot(enemy)
+        row = self._rows.get((slot, kind))
+        if row is not None:
+            return row, False
+        self._reserve(1)
+        row = self.count
+        self.slots[row] = slot
+        self.kinds[row] = kind
+        self.remaining[row] = 0.0
+        self.elapsed[row] = 0.0
+        self.magnitude[row] = 0.0
+        self.accumulator[row] = 0.0
+        self.count += 1
+        self._rows[(slot, kind)] = row
+        return row, True
+
+    def apply_burn(self, enemy, damage_per_second, duration):
+        """施加燃烧：每 BURN_TICK_INTERVAL 秒造成一次伤害
+
+        Args:
+            enemy: 敌人
+            damage_per_second: 每秒伤害
+            duration: 持续时间（秒）
+        """
+        row, _ = self._row(enemy, EFFECT_BURN)
+        self._extend(row, duration)
+        self.magnitude[row] = max(self.magnitude[row], damage_per_second)
+
+    def apply_slow(self, enemy, slow_percent, duration):
+        """施加减速，立即降低敌人的移动速度，到期后恢复
+
+        Args:
+            enemy: 敌人
+            slow_percent: 减速百分比（0.0-1.0）
+            duration: 持续时间（秒）
+        """
+        slow_percent = min(max(slow_percent, 0.0), 1.0)
+        row, added = self._row(enemy, EFFECT_SLOW)
+        if added:
+            # 只有在未减速状态才保存原始速度
+            enemy.original_speed = enemy.speed
+            enemy.slowed = True
+        self._extend(row, duration)
+        if added or slow_percent > self.magnitude[row]:
+            self.magnitude[row] = slow_percent
+            enemy.speed = enemy.original_speed * (1 - slow_percent)
+
+    def _extend(self, row, duration):
+        """持续时间从第一次施加算起取较大者"""
+        self.remaining[row] = max(self.remaining[row], duration - self.elapsed[row])
+
+    def has_effect(self, enemy, kind):
+        """敌人当前是否有某种效果"""
+        slot = self._slot_of.get(id(enemy))
+        return slot is not None and (slot, kind) in self._rows
+
+    def update(self, dt):
+        """推进所有效果的计时，结算燃烧伤害并清理到期的效果
+
+        Args:
+            dt: 时间增量（秒）
+
+        Returns:
+            list: 本tick产生的 StatusDamage（按行顺序）
+        """
+        count = self.count
+        if count == 0:
+            return []
+        kinds = self.kinds[:count]
+        remaining = self.remaining[:count]
+        accumulator = self.accumulator[:count]
+
+        # 燃烧：累计伤害计时，到达间隔的行造成一次伤害并重新计时
+        burning = kinds == EFFECT_BURN
+        accumulator[burning] += dt
+        ticking = np.flatnonzero(burning & (accumulator >= BURN_TICK_INTERVAL))
+        accumulator[ticking] = 0.0
+        damages = self.magnitude[ticking] * BURN_TICK_INTERVAL
+
+        events = []
+        enemies = self._enemies
+        for slot, damage in zip(self.slots[ticking].tolist(), damages.tolist()):
+            enemy = enemies[slot]
+            if enemy.health <= 0:
+                continue
+            enemy.take_status_damage(damage)
+            events.append(StatusDamage(enemy, EFFECT_BURN, damage))
+
+        remaining -= dt
+        self.elapsed[:count] += dt
+        expired = remaining <= 0
+        if expired.any():
+            self._expire(np.flatnonzero(expired))
+        return events
+
+    def _expire(self, rows):
+        """移除到期的行，减速到期的敌人恢复速度"""
+        enemies = self._enemies
+        for row in rows.tolist():
+            if self.kinds[row] == EFFECT_SLOW:
+                enemy = enemies[self.slots[row]]
+                enemy.speed = enemy.original_speed
+                enemy.slowed = False
+        keep = np.ones(self.count, dtype=bool)
+        keep[rows] = False
+        self._compact(keep)
+
+    def _compact(self, keep):
+        """只保留 keep 为True的行（保持原有顺序），并重建行号索引"""
+        count = int(keep.sum())
+        for name in _COLUMNS:
+            array = getattr(self, name)
+            array[:count] = array[:self.count][keep]
+        self.count = count
+        self._rows = {(slot, kind): row for row, (slot, kind)
+                      in enumerate(zip(self.slots[:count].tolist(), self.kinds[:count].tolist()))}
+
+    def remove_enemies(self, enemies):
+        """移除敌人的所有效果并释放槽位（敌人被移出敌人列表时调用）"""
+        slots = []
+        for enemy in enemies:
+            slot = self._slot_of.pop(id(enemy), None)
+            if slot is not None:
+                self._enemies[slot] = None
+                self._free_slots.append(slot)
+                slots.append(slot)
+        if slots and self.count:
+            self._compact(~np.isin(self.slots[:self.count], slots))
+
+    def clear(self):
+        """移除所有效果（不恢复敌人速度，用于整体清空敌人时）"""
+        self.count = 0
+        self._enemies = []
+        self._slot_of = {}
+        self._free_slots = []
+        self._rows = {}
@@ -64,9 +64,9 @@ class Slime(Enemy):
             )
         }
         
-    def update(self, dt, player, second_player=None):
+    def update(self, dt, player, second_player=None, animate=True):
         # 首先调用父类更新方法
-        super().update(dt, player, second_player)
+        super().update(dt, player, second_player, animate)
         
         # 更新冷却时间
         if self.attack_cooldown > 0:
@@ -75,11 +75,11 @@ class Slime(Enemy):
         # 更新投射物
         self.projectiles.update(dt)
         
-    def render(self, screen, screen_x, screen_y, show_health_bar=True):
-        # 先调用父类渲染方法
-        super().render(screen, screen_x, screen_y, show_health_bar)
+    def render_items(self, screen_x, screen_y, show_health_bar=True, show_details=True):
+        # 先获取父类的绘制项
+        items = super().render_items(screen_x, screen_y, show_health_bar, show_details)
         
-        # 渲染投射物
+        # 投射物
         for projectile in self.projectiles:
             # 计算投射物相对于敌人的偏移
             projectile_offset_x = projectile.x - self.rect.centerx
@@ -89,10 +89,10 @@ class Slime(Enemy):
             projectile_screen_x = screen_x + projectile_offset_x
             projectile_screen_y = screen_y + projectile_offset_y
             
-            # 渲染投射物
-            screen.blit(projectile.image, 
-                      (projectile_screen_x - projectile.image.get_width()//2, 
-                       projectile_screen_y - projectile.image.get_height()//2))
+            items.append((projectile.image,
+                          (projectile_screen_x - projectile.image.get_width()//2,
+                           projectile_screen_y - projectile.image.get_height()//2)))
+        return items
         
     def attack(self, player, dt, second_player=None):
         """
@@ -124,8 +124,9 @@ class Slime(Enemy):
             dy = target_player.world_y - self.rect.centery
             distance = math.sqrt(dx * dx + dy * dy)
             
-            # 如果在攻击范围内但不是太近
-            if self.min_attack_range < distance < self.attack_range:
+            # 如果在攻击范围内但不是太近，并且没有隔着墙
+            if (self.min_attack_range < distance < self.attack_range and
+                    self.has_line_of_sight(target_player.world_x, target_player.world_y)):
                 # 计算攻击方向
                 if distance > 0:
                     direction_x = dx / distance
@@ -67,9 +67,9 @@ class Soul(Enemy):
             )
         }
         
-    def update(self, dt, player, second_player=None):
+    def update(self, dt, player, second_player=None, animate=True):
         # 首先调用父类更新方法
-        super().update(dt, player, second_player)
+        super().update(dt, player, second_player, animate)
         
         # 更新冷却时间
         if self.attack_cooldown > 0:
@@ -81,83 +81,19 @@ class Soul(Enemy):
         # 检查与玩家的碰撞伤害
         self._check_collision_damage(player, second_player)
         
-    def render(self, screen, screen_x, screen_y, show_health_bar=True):
-        # 创建一个临时的rect用于绘制
-        draw_rect = self.rect.copy()
-        draw_rect.x = screen_x
-        draw_rect.y = screen_y
-        
-        
-        # 绘制敌人
-        if hasattr(self, 'image'):
-            if self.show_outline:
-                # 创建带轮廓的图像
-                from ..enemy import create_outlined_sprite
-                outlined_image = create_outlined_sprite(
-                    self,
-                    outline_color=self.outline_color,
-                    outline_thickness=self.outline_thickness
-                )
-                screen.blit(outlined_image, draw_rect)
-            else:
-                screen.blit(self.image, draw_rect)
-        
-        # 绘制血条（仅在show_health_bar为True时）
-        if show_health_bar:
-            # Soul敌人的血条：增长6倍，增宽3倍
-            health_bar_width = 32 * self.scale * 3  # 增宽3倍
-            health_bar_height = 5 * self.scale * 6   # 增长6倍
-            health_ratio = max(0, self.health / self.max_health)  # 确保比例不为负数
-            
-            # 调整血条位置，使其位于敌人正上方，并向右移动50像素
-            bar_x = screen_x - health_bar_width // 2 + 20 + 80  # 居中显示并向右移动50像素
-            bar_y = screen_y - 20 * self.scale  # 稍微高一点，确保在敌人正上方
-            
-            # 根据血量百分比选择颜色
-            if health_ratio > 0.8:
-                health_color = (0, 255, 0)  # 绿色 (>80%)
-            elif health_ratio > 0.2:
-                health_color = (255, 255, 0)  # 黄色 (>20%)
-            else:
-                health_color = (255, 0, 0)  # 红色 (<20%)
-            
-            # 绘制血条背景（深红色）
-            pygame.draw.rect(screen, (100, 0, 0),  # 深红色背景
-                            (bar_x, bar_y,
-                             health_bar_width, health_bar_height))
-            
-            # 绘制血条（根据血量百分比选择颜色）
-            if health_ratio > 0:
-                pygame.draw.rect(screen, health_color,
-                                (bar_x, bar_y,
-                                 health_bar_width * health_ratio, health_bar_height))
-            
-            # 绘制血条边框（白色）
-            pygame.draw.rect(screen, (255, 255, 255),  # 白色边框
-                            (bar_x, bar_y,
-                             health_bar_width, health_bar_height), 1)
-            
-            # 显示血量数值（在血条中央）
-            health_text = f"{int(self.health)}/{int(self.max_health)}"
-            # 创建字体（根据缩放调整大小）
-            font_size = max(8, int(10 * self.scale))
-            health_font = pygame.font.SysFont('simHei', font_size)
-            health_text_surface = health_font.render(health_text, True, (255, 255, 255))  # 白色文字
-            health_text_rect = health_text_surface.get_rect()
-            health_text_rect.centerx = bar_x + health_bar_width // 2
-            health_text_rect.centery = bar_y + health_bar_height // 2
-            
-            # 渲染文字阴影（略微偏移）
-            shadow_surface = health_font.render(health_text, True, (0, 0, 0))
-            shadow_rect = shadow_surface.get_rect()
-            shadow_rect.centerx = health_text_rect.centerx + 1
-            shadow_rect.centery = health_text_rect.centery + 1
-            screen.blit(shadow_surface, shadow_rect)
-            
-            # 渲染主文字
-            screen.blit(health_text_surface, health_text_rect)
+    def _health_bar_geometry(self, screen_x, screen_y):
+        # Soul敌人的血条：增长6倍，增宽3倍
+        health_bar_width = 32 * self.scale * 3  # 增宽3倍
+        health_bar_height = 5 * self.scale * 6   # 增长6倍
+        # 调整血条位置，使其位于敌人正上方，并向右移动50像素
+        bar_x = screen_x - health_bar_width // 2 + 20 + 80  # 居中显示并向右移动50像素
+        bar_y = screen_y - 20 * self.scale  # 稍微高一点，确保在敌人正上方
+        return bar_x, bar_y, health_bar_width, health_bar_height
+        
+    def render_items(self, screen_x, screen_y, show_health_bar=True, show_details=True):
+        items = super().render_items(screen_x, screen_y, show_health_bar, show_details)
         
-        # 渲染投射物
+        # 投射物
         for projectile in self.projectiles:
             # 计算投射物相对于敌人的偏移
             projectile_offset_x = projectile.x - self.rect.centerx
@@ -167,10 +103,10 @@ class Soul(Enemy):
             projectile_screen_x = screen_x + projectile_offset_x
             projectile_screen_y = screen_y + projectile_offset_y
             
-            # 渲染投射物
-            screen.blit(projectile.image, 
-                      (projectile_screen_x - projectile.image.get_width()//2, 
-                       projectile_screen_y - projectile.image.get_height()//2))
+            items.append((projectile.image,
+                          (projectile_screen_x - projectile.image.get_width()//2,
+                           projectile_screen_y - projectile.image.get_height()//2)))
+        return items
         
     def _check_collision_damage(self, player, second_player=None):
         """检查与玩家的碰撞伤害"""
@@ -309,8 +245,9 @@ class Soul(Enemy):
             dy = target_player.world_y - self.rect.centery
             distance = math.sqrt(dx * dx + dy * dy)
             
-            # 如果在攻击范围内但不是太近
-            if self.min_attack_range < distance < self.attack_range:
+            # 如果在攻击范围内但不是太近，并且没有隔着墙
+            if (self.min_attack_range < distance < self.attack_range and
+                    self.has_line_of_sight(target_player.world_x, target_player.world_y)):
                 # 计算攻击方向
                 if distance > 0:
                     direction_x = dx / distance
@@ -1,5 +1,4 @@
 import pygame
-import math
 from .player import Player
 from .enemies.enemy_manager import EnemyManager
 from .items.item_manager import ItemManager
@@ -12,7 +11,6 @@ from .menus.save_menu import SaveMenu
 from .save_system import SaveSystem
 from .resource_manager import resource_manager
 from .upgrade_system import UpgradeManager, WeaponUpgradeLevel, PassiveUpgradeLevel
-from .utils import apply_mask_collision
 from .map_manager import MapManager
 from .menus.map_hero_select_menu import MapHeroSelectMenu
 from .lighting_manager import LightingManager
@@ -22,7 +20,27 @@ from .game_result_ui import GameResultUI
 from .main_menu_animation import MainMenuAnimation
 
 from .minimap import Minimap
+from .core import input_source
+from .core import game_random
+from .profiler import PhaseTimer, FrameProfiler, CaptureProfiler, AllocationTracker
+from .profiler_overlay import ProfilerOverlay
+from .hud_widgets import surface_counter
+from .render_queue import RenderQueue
+from .core import RenderManager, FramePacer, QualityGovernor, display
+from .replay import ReplayRecorder
+from .collision_pipeline import CollisionPipeline, PROJECTILE_HIT, ENEMY_CONTACT, ENEMY_PROJECTILE_HIT
+from .death_queue import DeathQueue
 import time
+import os
+
+# 各类敌人的死亡音效
+ENEMY_DEATH_SOUNDS = {
+    'bat': "bat_death",
+    'ghost': "ghost_death",
+    'slime': "slime_death",
+    'radish': "radish_death",
+    'soul': "soul_death",
+}
 
 class Game:
     def __init__(self, screen):
@@ -132,6 +150,45 @@ class Game:
         self.fps_counter = 0
         self.fps_update_interval = 1.0  # 每1秒更新一次FPS
         
+        # 分阶段计时器（基准测试和性能分析使用，默认关闭）
+        self.phase_timer = PhaseTimer()
+        # 逐帧性能采样与浮层（F10切换）
+        self.frame_profiler = FrameProfiler()
+        self.profiler_overlay = ProfilerOverlay(screen)
+        self.show_profiler = False
+        
+        # 世界层实体的渲染队列（敌人、道具、补给等按图层批量绘制）
+        self.render_queue = RenderQueue()
+        # 帧合成器：按层渲染，记录脏矩形，每帧只显示一次
+        self.render_manager = RenderManager(screen, default_layers=False)
+        self._setup_render_layers()
+        # 帧节奏：静态界面降低帧率，只在输入或状态变化时重绘
+        self.frame_pacer = FramePacer()
+        # 碰撞检测流水线：每对实体每tick只检查一次，输出命中事件
+        self.collision_pipeline = CollisionPipeline()
+        # 死亡队列：本tick的击杀在tick末尾统一结算
+        self.death_queue = DeathQueue()
+        # 画质调节器：战斗中帧时间持续超标时自动降低画质，富余时再恢复
+        self.quality_governor = QualityGovernor()
+        self._quality_targets = None
+        # 设置 PROFILE_STREAM 环境变量时把逐帧样本写入文件（.csv 或 .jsonl）
+        if os.environ.get("PROFILE_STREAM"):
+            self.start_profile_stream(os.environ["PROFILE_STREAM"])
+        # 按需采集：F8 对接下来N帧做cProfile，F7 拍tracemalloc快照并与上一张对比
+        self.capture_profiler = CaptureProfiler()
+        self.allocation_tracker = AllocationTracker()
+        # 设置 PROFILE_CAPTURE_FRAMES 环境变量时启动即开始采集
+        if os.environ.get("PROFILE_CAPTURE_FRAMES"):
+            self.start_profile_capture(int(os.environ["PROFILE_CAPTURE_FRAMES"]))
+        
+        # 录像：开局时设置随机数种子，设置 REPLAY_RECORD 环境变量时录制每局的输入
+        self.next_seed = None  # 下一局使用的种子（回放时指定），None表示随机
+        self.current_seed = None
+        self.current_hero = None
+        self.replay_recorder = None
+        self.replay_record_path = os.environ.get("REPLAY_RECORD")
+        self._replay_sessions = 0
+        
         # 鼠标光标相关
         self.light_cursor = None
         # self._load_light_cursor()
@@ -217,6 +274,71 @@ class Game:
         """切换光照系统开关"""
         self.enable_lighting = not self.enable_lighting
         
+    def toggle_profiler(self):
+        """切换性能分析浮层"""
+        self.show_profiler = not self.show_profiler
+        if self.show_profiler:
+            self.frame_profiler.reset()
+        self._sync_phase_timer()
+
+    def start_profile_stream(self, path):
+        """开始把逐帧性能样本写入文件
+
+        Args:
+            path: 输出路径，.csv 写CSV，其他扩展名写JSONL
+        """
+        self.frame_profiler.open_stream(path)
+        self._sync_phase_timer()
+
+    def stop_profile_stream(self):
+        """停止写入性能样本"""
+        self.frame_profiler.close_stream()
+        self._sync_phase_timer()
+
+    def start_profile_capture(self, frames=None):
+        """开始对接下来的N帧做cProfile采集
+
+        Args:
+            frames: 采集帧数，默认300帧
+        """
+        if self.capture_profiler.start(frames):
+            print(f"开始cProfile采集: {self.capture_profiler.remaining} 帧")
+            self.show_message("开始性能采集", 2.0)
+
+    def take_allocation_snapshot(self):
+        """拍摄tracemalloc快照，并与上一张快照对比"""
+        report = self.allocation_tracker.snapshot()
+        if report:
+            print(f"内存分配对比已写入: {report}")
+            self.show_message("内存分配对比已保存", 2.0)
+        else:
+            self.show_message("已记录内存基准快照", 2.0)
+
+    def _on_profile_frame_end(self):
+        """每帧结束时推进cProfile采集、内存分配统计和HUD表面计数"""
+        surface_counter.end_frame()
+        self.allocation_tracker.frame_end()
+        result = self.capture_profiler.frame_end()
+        if result:
+            print(f"cProfile采集完成: {result[0]}，摘要: {result[1]}")
+            self.show_message("性能采集已保存", 2.0)
+
+    def close_diagnostics(self):
+        """退出前写出未完成的性能采集和录像，并关闭输出文件"""
+        self.stop_replay_recording()
+        self.stop_profile_stream()
+        result = self.capture_profiler.stop()
+        if result:
+            print(f"cProfile采集完成: {result[0]}，摘要: {result[1]}")
+        self.allocation_tracker.stop()
+
+    def _profiling_active(self):
+        return self.show_profiler or self.frame_profiler.is_streaming
+
+    def _sync_phase_timer(self):
+        """只在需要时开启分阶段计时，避免平时的计时开销"""
+        self.phase_timer.enabled = self._profiling_active()
+
     def set_lighting_config(self, **kwargs):
         """设置光照配置"""
         if self.lighting_manager:
@@ -275,9 +397,11 @@ class Game:
             # 单人模式：设置单个玩家的边界
             self.player.movement.set_boundaries(min_x, min_y, max_x, max_y)
             
-        # 设置敌人生成边界
+        # 设置敌人生成边界和出生点采样器
         if self.enemy_manager:
             self.enemy_manager.set_map_boundaries(min_x, min_y, max_x, max_y)
+            self.enemy_manager.set_spawn_sampler(
+                self.map_manager.get_spawn_sampler((min_x, min_y, max_x, max_y)))
             
     def _set_player_boundaries(self):
         """设置玩家的移动边界
@@ -299,6 +423,12 @@ class Game:
         self.game_victory = False
         self.paused = False
         
+        # 设置本局的随机数种子（回放时使用录像中的种子）
+        self.stop_replay_recording()
+        self.current_seed = game_random.seed(self.next_seed)
+        self.next_seed = None
+        self.current_hero = hero_id
+        
         # 加载选中的地图
         self.load_map(map_id)
         
@@ -371,6 +501,10 @@ class Game:
         screen_height = self.screen.get_height()
         self.minimap = Minimap(map_width, map_height, screen_width, screen_height)
         
+        # 每局从最高画质开始（回放时才能得到相同的档位变化）
+        self.quality_governor.reset()
+        self._apply_quality_settings()
+        
         # 重置游戏状态
         self.game_time = 0
         self.kill_num = 0
@@ -390,6 +524,41 @@ class Game:
         
         # 播放背景音乐
         resource_manager.play_music("background", loops=-1)
+        
+        if self.replay_record_path:
+            self.start_replay_recording(self._next_replay_path())
+    
+    def start_replay_recording(self, path):
+        """开始录制本局的输入
+
+        Args:
+            path: 录像文件路径
+        """
+        self.stop_replay_recording()
+        self.replay_recorder = ReplayRecorder(path, {
+            "seed": self.current_seed,
+            "map": self.current_map,
+            "hero": self.current_hero,
+            "difficulty": self.enemy_manager.difficulty,
+            "global_level": self.global_level,
+            "screen": list(self.screen.get_size()),
+        })
+        print(f"开始录像: {path}（种子 {self.current_seed}）")
+    
+    def stop_replay_recording(self):
+        """结束录制"""
+        if self.replay_recorder:
+            self.replay_recorder.close()
+            print(f"录像已保存: {self.replay_recorder.path}（{self.replay_recorder.ticks} tick）")
+            self.replay_recorder = None
+    
+    def _next_replay_path(self):
+        """第一局使用 REPLAY_RECORD 指定的路径，之后的对局在文件名后追加序号"""
+        self._replay_sessions += 1
+        if self._replay_sessions == 1:
+            return self.replay_record_path
+        root, ext = os.path.splitext(self.replay_record_path)
+        return f"{root}_{self._replay_sessions}{ext}"
     
     def _on_round_start(self, round_number):
         """波次开始时的回调函数
@@ -530,6 +699,7 @@ class Game:
         # 重置敌人管理器
         if self.enemy_manager:
             self.enemy_manager.enemies.clear()
+            self.enemy_manager.status_effects.clear()
             self.enemy_manager.current_round = 0
             self.enemy_manager.game_time = 0
             # 设置新的全局关卡
@@ -540,7 +710,7 @@ class Game:
         
         # 重置物品管理器
         if self.item_manager:
-            self.item_manager.items.clear()
+            self.item_manager.clear()
             
         
         # 重置钥匙管理器
@@ -826,6 +996,11 @@ class Game:
             return False
         
     def handle_event(self, event):
+        # 录像：记录交给游戏处理的事件
+        if self.replay_recorder:
+            self.replay_recorder.record_event(event)
+        # 任何输入都可能改变静态界面（悬停、选择、光标位置）
+        self.frame_pacer.request_redraw()
         # 如果正在显示主页动画，只处理退出事件
         if self.showing_main_menu_animation:
             if event.type == pygame.QUIT:
@@ -1026,6 +1201,19 @@ class Game:
                         self.show_message(f"光照预设: {preset_info['name']}", 2.0)
                 return True
             
+            elif event.key == pygame.K_F7:
+                # 拍摄内存分配快照并与上一张对比
+                self.take_allocation_snapshot()
+                return True
+            elif event.key == pygame.K_F8:
+                # 对接下来的N帧做cProfile采集
+                self.start_profile_capture()
+                return True
+            elif event.key == pygame.K_F10:
+                # 切换性能分析浮层
+                self.toggle_profiler()
+                return True
+            
             elif event.key == pygame.K_F11:
                 # 切换视野调试模式
                 if self.enemy_manager:
@@ -1039,10 +1227,10 @@ class Game:
             
         # 更新鼠标位置（用于视野系统）
         if event.type == pygame.MOUSEMOTION:
-            self.mouse_x, self.mouse_y = event.pos
+            self.mouse_x, self.mouse_y = display.to_render_pos(event.pos)
         elif event.type == pygame.MOUSEBUTTONDOWN:
             # 确保鼠标点击时也更新位置
-            self.mouse_x, self.mouse_y = event.pos
+            self.mouse_x, self.mouse_y = display.to_render_pos(event.pos)
             
         # 处理双角色系统输入
         if self.dual_player_system:
@@ -1134,7 +1322,21 @@ class Game:
           
         
     def update(self, dt):
+        """更新游戏状态，本tick内请求的音效在tick结束时统一调度播放"""
+        sound_scheduler = resource_manager.sound_scheduler
+        # 音效调度按每帧的dt推进模拟时间；暂停时也要推进，否则正在发声的音效永远不会结束，暂停菜单的音效会被丢弃
+        sound_scheduler.begin_tick(dt)
+        try:
+            self._update(dt)
+        finally:
+            sound_scheduler.end_tick()
+            
+    def _update(self, dt):
         """更新游戏状态"""
+        # 录像：记录本tick的输入
+        if self.replay_recorder:
+            self.replay_recorder.record_tick(self, dt)
+        
         # 更新主页动画
         if self.showing_main_menu_animation:
             self.main_menu_animation.update(dt)
@@ -1156,6 +1358,7 @@ class Game:
         if self.ui and self.show_fps_display:
             self.ui.update_fps(dt)
             self.ui.set_fps(self.fps)
+            self.ui.set_quality_tier(self.quality_governor.tier_name)
             self.ui.set_fps_display(True)  # 启用UI的FPS显示
         elif self.ui:
             self.ui.set_fps_display(False)  # 禁用UI的FPS显示
@@ -1251,6 +1454,10 @@ class Game:
             
         self.game_time += dt
         
+        # 画质调节只统计战斗中的帧时间；档位变化或子系统重建后重新应用设置
+        if self.quality_governor.record_frame(dt) or self._quality_targets != self._quality_target_systems():
+            self._apply_quality_settings()
+        
         # 更新游戏按钮
         self.game_buttons.update(dt)
         
@@ -1260,6 +1467,8 @@ class Game:
         # 更新伤害数字管理器
         self.damage_number_manager.update(dt)
         
+        self.phase_timer.start()
+        
         # 确保玩家对象存在再更新
         if self.dual_player_system:
             # 更新双角色系统
@@ -1334,18 +1543,20 @@ class Game:
             # 更新光照系统
             if self.lighting_manager and self.enable_lighting:
                 # 获取当前鼠标位置
-                current_mouse_x, current_mouse_y = pygame.mouse.get_pos()
+                current_mouse_x, current_mouse_y = input_source.get_mouse_pos()
                 self.mouse_x, self.mouse_y = current_mouse_x, current_mouse_y
 
                 # 更新墙壁数据
                 if self.map_manager and self.map_manager.current_map:
-                    walls = self.map_manager.get_collision_tiles()
+                    geometry = self.map_manager.get_wall_geometry()
+                    walls = geometry.rects
                     tile_width, tile_height = self.map_manager.get_tile_size()
                     self.lighting_manager.set_walls(walls, tile_width)
                     
                     # 更新玩家移动组件的碰撞数据
                     if self.player and hasattr(self.player, 'movement'):
                         self.player.movement.set_collision_tiles(walls, tile_width, tile_height)
+        self.phase_timer.lap("player")
         
         # 更新其他游戏对象，注意检查player和enemy_manager是否存在
         if self.enemy_manager and self.player:
@@ -1353,44 +1564,31 @@ class Game:
             if self.dual_player_system:
                 # 双人模式：传递两个玩家参数
                 self.enemy_manager.update(dt, self.dual_player_system.ninja_frog, self.dual_player_system.mystic_swordsman)
+                self.phase_timer.lap("enemies")
                 self.dual_player_system.ninja_frog.update_weapons(dt)
                 self.dual_player_system.mystic_swordsman.update_weapons(dt)
             else:
                 # 单人模式：只传递一个玩家参数
                 self.enemy_manager.update(dt, self.player)
+                self.phase_timer.lap("enemies")
                 self.player.update_weapons(dt)
-            
-            # 处理死亡的敌人
-            for enemy in list(self.enemy_manager.enemies):  # 使用列表复制避免在迭代时修改
-                if enemy in self.enemy_manager.enemies and not enemy.alive():
-                    # 防止重复处理：检查敌人是否已经被标记为死亡
-                    if not hasattr(enemy, '_death_processed'):
-                        enemy._death_processed = True
-                        self.kill_num += 1
-                        # 给玩家添加经验值奖励
-                        if hasattr(enemy, 'config') and 'exp_value' in enemy.config:
-                            exp_reward = enemy.config['exp_value']
-                            self.player.add_experience(exp_reward)
-                            print(f"击杀 {enemy.type} 获得 {exp_reward} 经验值")
-                        # 在敌人死亡位置生成物品，传递player对象以应用幸运值加成
-                        if self.item_manager:
-                            self.item_manager.spawn_item(enemy.rect.x, enemy.rect.y, enemy.type, self.player)
-                        # 移除敌人
-                        self.enemy_manager.remove_enemy(enemy)
+            self.phase_timer.lap("projectiles")
+            self._show_status_damage()
             
             # 更新物品
             if self.item_manager:
                 if self.dual_player_system:
-                    # 双角色模式：检查两个角色都可以拾取物品
-                    # 先检查忍者蛙
-                    self.item_manager.update(dt, self.dual_player_system.ninja_frog)
-                    # 再检查神秘剑士
-                    self.item_manager.update(dt, self.dual_player_system.mystic_swordsman)
+                    # 双角色模式：两个角色都可以拾取物品，每个物品飞向离它最近的角色
+                    self.item_manager.update(dt, [self.dual_player_system.ninja_frog,
+                                                  self.dual_player_system.mystic_swordsman])
                 else:
                     self.item_manager.update(dt, self.player)
+            self.phase_timer.lap("items")
             
             # 检测碰撞
             self._check_collisions()
+            self._process_deaths()
+            self.phase_timer.lap("collisions")
             
             # 检查是否可以升级（双角色模式）
             if self.dual_player_system:
@@ -1410,65 +1608,178 @@ class Game:
                     self.upgrade_menu.show(self.player, self)
         
     def render(self):
-        """渲染游戏画面"""
-        # 清屏
-        self.screen.fill((0, 0, 0))  # 黑色背景
-        
+        """渲染游戏画面（每帧恰好显示一次）"""
         # 如果正在显示主页动画
         if self.showing_main_menu_animation:
+            self.screen.fill((0, 0, 0))  # 黑色背景
             self.main_menu_animation.render()
-            pygame.display.flip()
+            self.render_manager.present()
             return
         
         # 如果在主菜单
         if self.in_main_menu:
+            self.screen.fill((0, 0, 0))
             # 如果读取菜单激活，只渲染读取菜单
             if self.load_menu.is_active:
                 self.load_menu.render()
             else:
                 # 否则渲染主菜单
                 self.main_menu.render()
-            pygame.display.flip()
+            self.render_manager.present()
             return
             
         # 如果在地图和英雄选择界面
         if self.in_map_hero_select:
+            self.screen.fill((0, 0, 0))
             self.map_hero_select_menu.render()
-            pygame.display.flip()
+            self.render_manager.present()
             return
             
         # 如果正在保存游戏
         if self.save_menu.is_active:
+            self.screen.fill((0, 0, 0))
             self.save_menu.render()
+            self.render_manager.present()
             return
             
+        self.phase_timer.start()
+        
+        # 按层合成并显示：画面冻结时复用世界和HUD的快照，只局部更新菜单等动态内容
+        self.render_manager.set_camera(self.camera_x, self.camera_y)
+        self.render_manager.render_frame(self._render_freeze_key())
+        self.phase_timer.lap("present")
+        frame = self.phase_timer.end_frame()
+        if frame is not None and self._profiling_active():
+            self.frame_profiler.record(frame, self._profile_counters())
+        self._on_profile_frame_end()
+        
+    def _profile_counters(self):
+        """随性能样本记录的计数：各细节层级的敌人数量"""
+        if not self.enemy_manager:
+            return None
+        return {f"enemies_{lod}": count for lod, count in self.enemy_manager.lod_counts.items()}
+        
+    def _quality_target_systems(self):
+        """受画质设置影响的子系统（这些对象在换关、读档时会重建）"""
+        dual_lighting = self.dual_player_system.lighting_manager if self.dual_player_system else None
+        return (self.enemy_manager, self.minimap, self.lighting_manager, dual_lighting)
+    
+    def _apply_quality_settings(self):
+        """把画质调节器当前档位的设置应用到各子系统"""
+        settings = self.quality_governor.settings
+        self._quality_targets = self._quality_target_systems()
+        enemy_manager, minimap, lighting_manager, dual_lighting = self._quality_targets
+        
+        for manager in (lighting_manager, dual_lighting):
+            if manager:
+                manager.set_quality(settings["lighting_scale"], settings["ray_scale"])
+        self.damage_number_manager.max_numbers = settings["damage_number_limit"]
+        if enemy_manager:
+            enemy_manager.offscreen_update_interval = settings["offscreen_update_interval"]
+            enemy_manager.show_enemy_details = settings["enemy_details"]
+            enemy_manager.view_half_size = (self.screen.get_width() // 2 + 100,  # 留100像素边距
+                                            self.screen.get_height() // 2 + 100)
+        if minimap:
+            minimap.refresh_interval = settings["minimap_refresh_interval"]
+    
+    def target_fps(self):
+        """当前的目标帧率（静态界面降低帧率）"""
+        return self.frame_pacer.target_fps(self._idle_screen_state())
+        
+    def should_render(self, dt):
+        """本帧是否需要渲染（静态界面只在输入、状态变化或保活时渲染）
+        
+        Args:
+            dt: 距上一帧的时间（秒）
+        """
+        return self.frame_pacer.should_render(dt, self._idle_screen_state())
+        
+    def _idle_screen_state(self):
+        """描述当前静态界面的值，战斗进行或播放动画时返回None
+        
+        输入引起的变化由 handle_event 请求重绘，这里只需包含不经过输入就会改变画面的状态。
+        """
+        if self.showing_main_menu_animation:
+            return None
+        if self.in_main_menu:
+            return ("main_menu", self.load_menu.is_active, self.main_menu.options_menu.is_active)
+        if self.in_map_hero_select:
+            return ("map_hero_select",)
+        if self.save_menu.is_active:
+            return ("save_menu",)
+        freeze_key = self._render_freeze_key()
+        if freeze_key is None:
+            return None
+        return ("frozen", freeze_key, self.game_result_ui.show_buttons)
+        
+    def _setup_render_layers(self):
+        """注册战斗画面的渲染层（按顺序合成）"""
+        render_manager = self.render_manager
+        # 静态层：暂停、升级选择、结算时内容不变，冻结期间只绘制一次
+        render_manager.add_layer("world", 0, static=True)
+        render_manager.add_layer("hud", 1, static=True)
+        render_manager.add_layer("backdrop", 2, static=True)
+        # 动态层：返回绘制过的区域，冻结期间只更新这些区域
+        render_manager.add_layer("menus", 3)
+        render_manager.add_layer("overlay", 4)
+        
+        render_manager.add_to_layer("world", self._render_world_layer)
+        render_manager.add_to_layer("hud", self._render_hud_layer)
+        render_manager.add_to_layer("backdrop", self._render_backdrop_layer)
+        render_manager.add_to_layer("menus", self._render_menus_layer)
+        render_manager.add_to_layer("overlay", self._render_overlay_layer)
+        
+    def _render_freeze_key(self):
+        """画面冻结时返回描述当前界面组合的值，否则返回None
+        
+        暂停、升级选择和结算界面期间游戏状态不更新，世界和HUD画面保持不变。
+        """
+        if (self.round_ui.is_active or self.level_transition.is_active or
+                self.game_buttons.confirmation_active):
+            return None
+        frozen = (self.paused, self.upgrade_menu.is_active,
+                  self.game_over and self.game_result_ui.is_active)
+        if not any(frozen):
+            return None
+        return frozen
+        
+    def _render_world_layer(self, screen, camera_x, camera_y):
+        """渲染地图、实体和光照"""
         # 绘制地图（如果已加载）
         if self.current_map:
             self.map_manager.render(self.camera_x, self.camera_y)
         else:
             # 如果没有地图，绘制网格作为背景
             self._draw_grid()
+        self.phase_timer.lap("map")
+        
+        # 实体统一提交到渲染队列，按图层排序后一次性批量绘制
+        render_queue = self.render_queue
+        render_queue.begin(self.screen, self.camera_x, self.camera_y)
         
         # 确保游戏对象存在再渲染
         if self.enemy_manager:
             # 渲染游戏对象（考虑相机偏移）
             self.enemy_manager.render(self.screen, self.camera_x, self.camera_y, 
-                                   self.screen_center_x, self.screen_center_y, self.lighting_manager)
+                                   self.screen_center_x, self.screen_center_y, self.lighting_manager,
+                                   render_queue)
 
         # 渲染道具（在光照系统之前，确保能被黑暗遮罩覆盖）
         if self.item_manager:
             self.item_manager.render(self.screen, self.camera_x, self.camera_y, 
-                                   self.screen_center_x, self.screen_center_y, self.lighting_manager)
+                                   self.screen_center_x, self.screen_center_y, self.lighting_manager,
+                                   render_queue)
         
         # 渲染补给（在光照系统之前，确保能被黑暗遮罩覆盖）
         if self.ammo_supply_manager:
             self.ammo_supply_manager.render(self.screen, self.camera_x, self.camera_y, 
-                                          self.screen_center_x, self.screen_center_y)
+                                          self.screen_center_x, self.screen_center_y, render_queue)
         if self.health_supply_manager:
             self.health_supply_manager.render(self.screen, self.camera_x, self.camera_y,
-                                            self.screen_center_x, self.screen_center_y)
+                                            self.screen_center_x, self.screen_center_y, render_queue)
         if self.teleport_manager:
-            self.teleport_manager.render(self.screen, self.camera_x, self.camera_y)
+            self.teleport_manager.render(self.screen, self.camera_x, self.camera_y, render_queue)
+        render_queue.flush()
         
         # 渲染逃生门
         if self.escape_door:
@@ -1478,6 +1789,13 @@ class Game:
         # 渲染双角色系统
         if self.dual_player_system:
             self.dual_player_system.render(self.screen, self.camera_x, self.camera_y)
+            self.phase_timer.lap("entities")
+            
+            # 双角色模式的光照由忍者蛙控制，绘制在角色之上、武器效果之下
+            if self.enable_lighting:
+                self.dual_player_system.render_lighting(self.screen, self.camera_x, self.camera_y)
+            self.phase_timer.lap("lighting")
+            
             self.dual_player_system.render_weapons(self.screen, self.camera_x, self.camera_y)
             
             # 为神秘剑客添加绿色三角形标记
@@ -1491,6 +1809,7 @@ class Game:
             self.player.render_ultimate(self.screen)
             # self.player.render_ultimate_cooldown(self.screen)
             self.player.render_phase_cooldown(self.screen)
+        self.phase_timer.lap("entities")
             
         # 渲染光照系统（在所有游戏对象之后，UI之前）
         if self.lighting_manager and self.enable_lighting:
@@ -1498,7 +1817,7 @@ class Game:
                 # 双角色模式下，光照由双角色系统处理
                 if not self.dual_player_system and self.player:
                     # 单角色模式的光照渲染
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
+                    mouse_x, mouse_y = input_source.get_mouse_pos()
                     self.lighting_manager.render(
                         self.screen, 
                         self.player.world_x, 
@@ -1513,6 +1832,10 @@ class Game:
         
                 # 如果光照系统出错，暂时禁用它
                 self.enable_lighting = False
+        self.phase_timer.lap("lighting")
+        
+    def _render_hud_layer(self, screen, camera_x, camera_y):
+        """渲染HUD、消息、伤害数字和小地图"""
         # 渲染UI（在视野系统之后）
         if self.player:
             # 在双人模式下，传递双人系统参数给UI
@@ -1528,9 +1851,12 @@ class Game:
         
         # 渲染伤害数字（在UI之后，小地图之前）
         self.damage_number_manager.render(self.screen, self.camera_x, self.camera_y)
+        self.phase_timer.lap("ui")
         
-        # 渲染小地图（在UI之后）
-        if self.minimap and self.player:
+        # 渲染小地图（在UI之后），低画质时隔几帧才重新收集标记并重绘
+        if self.minimap and self.player and not self.minimap.needs_refresh():
+            self.minimap.render_cached(self.screen)
+        elif self.minimap and self.player:
             # 找到所有钥匙物品
             key_items = []
             if self.item_manager:
@@ -1553,47 +1879,73 @@ class Game:
                 collision_tiles = self.map_manager.get_collision_tiles()
             
             self.minimap.render(self.screen, self.player, key_items, self.escape_door, ammo_supplies, health_supplies, teleport_items, collision_tiles, self.dual_player_system)
+        self.phase_timer.lap("minimap")
             
-        # 如果游戏暂停，渲染暂停菜单
+    def _render_backdrop_layer(self, screen, camera_x, camera_y):
+        """渲染菜单的半透明背景和游戏按钮"""
         if self.paused:
-            self.pause_menu.render()
-            
-        # 如果正在保存游戏，渲染保存菜单
-        if self.save_menu.is_active:
-            self.save_menu.render()
-            
-        # 如果正在选择升级，渲染升级菜单
+            self.pause_menu.render_overlay()
         if self.upgrade_menu.is_active:
-            self.upgrade_menu.render()
+            self.upgrade_menu.render_overlay()
             
-        # 渲染游戏按钮（在所有UI之后，最后渲染，暂停时也显示）
+        # 渲染游戏按钮（在所有UI之后，暂停时也显示）
         if not self.game_over or self.game_result_ui.is_active:
             self.game_buttons.render()
             
+        if not self.round_ui.is_active and not self.level_transition.is_active:
+            self.game_result_ui.render_overlay()
+        
+    def _render_menus_layer(self, screen, camera_x, camera_y):
+        """渲染菜单本身
+        
+        Returns:
+            list: 绘制过的区域，包含全屏动画时返回None
+        """
+        rects = []
+        # 如果游戏暂停，渲染暂停菜单
+        if self.paused:
+            rects.append(self.pause_menu.render(overlay=False))
+            
+        # 如果正在选择升级，渲染升级菜单
+        if self.upgrade_menu.is_active:
+            rects.append(self.upgrade_menu.render(overlay=False))
+            
         # 如果波次UI激活，渲染波次UI（在所有UI之上）
         if self.round_ui.is_active:
             self.round_ui.render()
+            return None
         # 如果关卡过渡动画激活，渲染关卡过渡动画（在所有UI之上）
         elif self.level_transition.is_active:
             self.level_transition.render()
+            return None
         # 如果游戏结果UI激活，渲染游戏结果UI（在所有UI之上）
         elif self.game_result_ui.is_active:
-            self.game_result_ui.render()
-            
+            rects.extend(self.game_result_ui.render(overlay=False))
+        return rects
+        
+    def _render_overlay_layer(self, screen, camera_x, camera_y):
+        """渲染鼠标光标和性能分析浮层
+        
+        Returns:
+            list: 绘制过的区域
+        """
+        rects = []
         # 渲染自定义鼠标光标（在游戏进行中且不在菜单时）
         if (not self.in_main_menu and not self.in_map_hero_select and 
             not self.showing_main_menu_animation and not self.game_over and 
             self.light_cursor and not pygame.mouse.get_visible()):
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = input_source.get_mouse_pos()
             # 计算光标位置（光标中心对齐鼠标位置）
             cursor_rect = self.light_cursor.get_rect()
             cursor_rect.center = (mouse_x, mouse_y)
-            self.screen.blit(self.light_cursor, cursor_rect)
+            rects.append(self.screen.blit(self.light_cursor, cursor_rect))
         
-        # 更新显示
-        pygame.display.flip()
+        # 渲染性能分析浮层（在所有UI之上）
+        if self.show_profiler:
+            rects.append(self.profiler_overlay.render(self.frame_profiler))
+        self.phase_timer.lap("ui")
         
-
+        return rects
         
     def _draw_grid(self):
         # 计算网格偏移量（基于相机位置）
@@ -1611,376 +1963,104 @@ class Game:
             pygame.draw.line(self.screen, self.grid_color, (0, y), (self.screen.get_width(), y))
         
     def _check_collisions(self):
-        """检测碰撞"""
+        """检测碰撞：碰撞流水线输出命中事件，再由计分、掉落、伤害和音效依次消费"""
         # 确保敌人管理器存在
         if not self.enemy_manager:
             return
             
-        # 双角色模式
+        # 双角色模式：只有神秘剑士的武器会发射投射物，掉落物以神秘剑士为目标
         if self.dual_player_system:
-            self._check_dual_player_collisions()
+            ninja_frog = self.dual_player_system.ninja_frog
+            mystic_swordsman = self.dual_player_system.mystic_swordsman
+            players = [ninja_frog, mystic_swordsman]
+            weapons = mystic_swordsman.weapons
+            self.collision_pipeline.enemy_projectile_radius = 50
         # 单角色模式
         elif self.player:
-            self._check_single_player_collisions()
-            
-    def _check_dual_player_collisions(self):
-        """双角色模式的碰撞检测"""
-        # 检测武器碰撞（只有神秘剑士的武器）
-        for weapon in self.dual_player_system.mystic_swordsman.weapons:
-            for projectile in weapon.get_projectiles():
-                for enemy in self.enemy_manager.enemies:
-                    # 使用碰撞半径进行检测
-                    # 使用正确的属性名（x, y 而不是 world_x, world_y）
-                    projectile_x = getattr(projectile, 'world_x', getattr(projectile, 'x', 0))
-                    projectile_y = getattr(projectile, 'world_y', getattr(projectile, 'y', 0))
-                    
-                    dx = enemy.rect.centerx - projectile_x
-                    dy = enemy.rect.centery - projectile_y
-                    distance = (dx**2 + dy**2)**0.5
-                    
-                    # 使用敌人的碰撞半径和子弹的碰撞半径
-                    enemy_radius = enemy.rect.width / 2
-                    projectile_radius = getattr(projectile, 'collision_radius', projectile.rect.width / 2)
-                    
-                    if distance < enemy_radius + projectile_radius:
-                        # 临时更新projectile的rect位置以进行像素级碰撞检测
-                        original_projectile_rect = projectile.rect.copy()
-                        projectile.rect.centerx = projectile_x
-                        projectile.rect.centery = projectile_y
-                        
-                        # 使用像素完美碰撞检测
-                        collision_detected = apply_mask_collision(enemy, projectile)
-                        
-                        # 恢复原始rect位置
-                        projectile.rect = original_projectile_rect
-                        
-                        if collision_detected:
-                            should_destroy = weapon.handle_collision(projectile, enemy, self.enemy_manager.enemies)
-                            resource_manager.play_sound("hit")
-                            
-                            if enemy.health <= 0:
-                                self.kill_num += 1
-                                if hasattr(enemy, 'config') and 'exp_value' in enemy.config:
-                                    exp_reward = enemy.config['exp_value']
-                                    # 给两个角色都添加经验值
-                                    self.dual_player_system.add_experience_to_both(exp_reward)
-                                    print(f"击杀 {enemy.type} 获得 {exp_reward} 经验值")
-                                if self.item_manager:
-                                    # 使用神秘剑士作为物品生成的目标（因为只有他能攻击）
-                                    self.item_manager.spawn_item(enemy.rect.x, enemy.rect.y, enemy.type, self.dual_player_system.mystic_swordsman)
-                                self.enemy_manager.remove_enemy(enemy)
-                                # 根据敌人类型播放不同的死亡音效
-                                if enemy.type == 'bat':
-                                    resource_manager.play_sound("bat_death")
-                                elif enemy.type == 'ghost':
-                                    resource_manager.play_sound("ghost_death")
-                                elif enemy.type == 'slime':
-                                    resource_manager.play_sound("slime_death")
-                                elif enemy.type == 'radish':
-                                    resource_manager.play_sound("radish_death")
-                                elif enemy.type == 'soul':
-                                    resource_manager.play_sound("soul_death")
-                                else:
-                                    resource_manager.play_sound("enemy_death")  # 默认音效
-                                
-                            if should_destroy:
-                                projectile.kill()
-        
-        # 检测玩家和敌人的碰撞
-        for enemy in self.enemy_manager.enemies:
-            # 选择最近的目标（使用敌人中心坐标）
-            enemy_center_x = enemy.rect.x + enemy.rect.width / 2
-            enemy_center_y = enemy.rect.y + enemy.rect.height / 2
-            ninja_distance = math.sqrt((enemy_center_x - self.dual_player_system.ninja_frog.world_x)**2 + 
-                                     (enemy_center_y - self.dual_player_system.ninja_frog.world_y)**2)
-            mystic_distance = math.sqrt((enemy_center_x - self.dual_player_system.mystic_swordsman.world_x)**2 + 
-                                      (enemy_center_y - self.dual_player_system.mystic_swordsman.world_y)**2)
-            
-            # 选择最近的目标进行攻击
-            if ninja_distance <= mystic_distance:
-                target_player = self.dual_player_system.ninja_frog
-            else:
-                target_player = self.dual_player_system.mystic_swordsman
+            players = [self.player]
+            weapons = self.player.weapons
+            self.collision_pipeline.enemy_projectile_radius = 80
+        else:
+            return
             
-            # 检查与目标玩家的碰撞
-            if not target_player.invincible:
-                player_rect = target_player.rect.copy()
-                player_rect.centerx = target_player.world_x
-                player_rect.centery = target_player.world_y
-                
-                if hasattr(enemy, 'projectiles'):
-                    enemy.attack_player(target_player)
-                
-                if player_rect.colliderect(enemy.rect):
-                    
-                    
-                    # 临时更新玩家的rect位置以进行像素级碰撞检测
-                    original_rect = target_player.rect.copy()
-                    target_player.rect.centerx = target_player.world_x
-                    target_player.rect.centery = target_player.world_y
-                    
-                    # 进行像素级碰撞检测
-                    collision_detected = apply_mask_collision(target_player, enemy)
-                    
-                    # 恢复原始rect位置
-                    target_player.rect = original_rect
-                    
-                    if collision_detected:
-                        
-                        if enemy.attack_player(target_player):
-                            # 如果神秘剑客受到伤害，让忍者蛙扣血
-                            
-                            resource_manager.play_sound("player_hurt")
-                            break
+        events = self.collision_pipeline.run(self.enemy_manager, players, weapons)
+        self._apply_hit_events(events)
+        self._update_ranged_attacks(players)
         
-        # 检测敌人子弹和玩家的碰撞
-        if hasattr(self.enemy_manager, 'enemy_projectiles'):
-            
-            for projectile in self.enemy_manager.enemy_projectiles[:]:
-                # 计算子弹到两个玩家的距离
-                # 使用正确的属性名（x, y 而不是 world_x, world_y）
-                projectile_x = getattr(projectile, 'world_x', getattr(projectile, 'x', 0))
-                projectile_y = getattr(projectile, 'world_y', getattr(projectile, 'y', 0))
-                
-                ninja_dx = self.dual_player_system.ninja_frog.world_x - projectile_x
-                ninja_dy = self.dual_player_system.ninja_frog.world_y - projectile_y
-                ninja_distance = (ninja_dx**2 + ninja_dy**2)**0.5
-                
-                mystic_dx = self.dual_player_system.mystic_swordsman.world_x - projectile_x
-                mystic_dy = self.dual_player_system.mystic_swordsman.world_y - projectile_y
-                mystic_distance = (mystic_dx**2 + mystic_dy**2)**0.5
-                
-                
-                
-                # 选择最近的目标进行攻击
-                if ninja_distance <= mystic_distance:
-                    target_player = self.dual_player_system.ninja_frog
-                    distance = ninja_distance
-                else:
-                    target_player = self.dual_player_system.mystic_swordsman
-                    distance = mystic_distance
-                
-               
-                
-                if distance < 50:  # 减小碰撞距离到50像素
-                    
-                    if hasattr(projectile, 'damage'):
-                        # 如果神秘剑客受到伤害，让忍者蛙扣血
-                        if target_player.hero_type == "role2":  # 神秘剑客被击中
-                            self.dual_player_system.ninja_frog.take_damage(projectile.damage)
-                            
-                        else:  # 忍者蛙被击中
-                            target_player.take_damage(projectile.damage)
-                            
-                            
-                    
-                    self.enemy_manager.enemy_projectiles.remove(projectile)
+    def _apply_hit_events(self, events):
+        """消费命中事件（武器已在检测时处理了投射物命中，击杀登记到死亡队列）
+        
+        Args:
+            events: CollisionPipeline.run 返回的事件列表
+        """
+        contact_resolved = False
+        for event in events:
+            if event.kind == PROJECTILE_HIT:
+                resource_manager.play_sound("hit")
+                if event.killed:
+                    self.death_queue.push(event.target)
+            elif event.kind == ENEMY_CONTACT:
+                # 一次只处理一个接触伤害
+                if contact_resolved or event.target.invincible:
+                    continue
+                if event.source.attack_player(event.target):
                     resource_manager.play_sound("player_hurt")
+                    contact_resolved = True
+            elif event.kind == ENEMY_PROJECTILE_HIT:
+                self._on_enemy_projectile_hit(event.source, event.target)
                 
-                    
-    def _check_single_player_collisions(self):
-        """单角色模式的碰撞检测"""
-        # 确保玩家存在
-        if not self.player:
-            return
+    def _show_status_damage(self):
+        """为本tick的持续伤害（燃烧）显示伤害数字"""
+        for event in self.enemy_manager.status_events:
+            center_x, center_y = event.enemy.rect.center
+            self.damage_number_manager.add_damage_number(center_x, center_y, int(round(event.damage)), 'fire', 20)
             
-        # 检测武器碰撞
-        for weapon in self.player.weapons:
-            for projectile in weapon.get_projectiles():
-                for enemy in self.enemy_manager.enemies:
-                    # 首先使用矩形做快速检测
-                    # 计算世界坐标系中的距离
-                    # 使用正确的属性名（x, y 而不是 world_x, world_y）
-                    projectile_x = getattr(projectile, 'world_x', getattr(projectile, 'x', 0))
-                    projectile_y = getattr(projectile, 'world_y', getattr(projectile, 'y', 0))
-                    
-                    dx = enemy.rect.centerx - projectile_x
-                    dy = enemy.rect.centery - projectile_y
-                    distance = (dx**2 + dy**2)**0.5
-                    
-                    if distance < enemy.rect.width / 2 + projectile.rect.width / 2:
-                        # 进行更精确的像素级碰撞检测
-                        # 临时更新projectile的rect位置以进行像素级碰撞检测
-                        original_projectile_rect = projectile.rect.copy()
-                        projectile.rect.centerx = projectile_x
-                        projectile.rect.centery = projectile_y
-                        
-                        collision_detected = apply_mask_collision(enemy, projectile)
-                        
-                        # 恢复原始rect位置
-                        projectile.rect = original_projectile_rect
-                        
-                        if collision_detected:
-                            # 处理碰撞
-                            should_destroy = weapon.handle_collision(projectile, enemy, self.enemy_manager.enemies)
-                            # 播放击中音效
-                            resource_manager.play_sound("hit")
-                            
-                            if enemy.health <= 0:
-                                self.kill_num += 1
-                                # 给玩家添加经验值奖励
-                                if hasattr(enemy, 'config') and 'exp_value' in enemy.config:
-                                    exp_reward = enemy.config['exp_value']
-                                    self.player.add_experience(exp_reward)
-                                    print(f"击杀 {enemy.type} 获得 {exp_reward} 经验值")
-                                # 在敌人死亡位置生成物品，传递player对象以应用幸运值加成
-                                if self.item_manager:
-                                    self.item_manager.spawn_item(enemy.rect.x, enemy.rect.y, enemy.type, self.player)
-                                self.enemy_manager.remove_enemy(enemy)
-                                # 播放敌人死亡音效
-                                resource_manager.play_sound("enemy_death")
-                                
-                            if should_destroy:
-                                projectile.kill()
-        
-        # 检测玩家和敌人的碰撞
-        for enemy in self.enemy_manager.enemies:
-            if not self.player.invincible:  # 只在玩家不处于无敌状态时检测碰撞
-                # 首先进行矩形快速检测
-                player_rect = self.player.rect.copy()
-                player_rect.centerx = self.player.world_x
-                player_rect.centery = self.player.world_y
-                
-                # 对于Slime等远程攻击敌人，即使不直接碰撞也需要触发attack_player
-                # 这样才能正确生成投射物并处理碰撞逻辑
-                if hasattr(enemy, 'projectiles'):
-                    enemy.attack_player(self.player)
-                
-                # 对于直接碰撞的敌人，进行常规碰撞检测
-                if player_rect.colliderect(enemy.rect):
-                    # 临时更新玩家的rect位置以进行像素级碰撞检测
-                    original_rect = self.player.rect.copy()
-                    self.player.rect.centerx = self.player.world_x
-                    self.player.rect.centery = self.player.world_y
-                    
-                    # 进行像素级碰撞检测
-                    collision_detected = apply_mask_collision(self.player, enemy)
-                    
-                    # 恢复原始rect位置
-                    self.player.rect = original_rect
-                    
-                    if collision_detected:
-                        if enemy.attack_player(self.player):
-                            # 播放受伤音效
-                            resource_manager.play_sound("player_hurt")
-                            break  # 一次只处理一个碰撞
-        
-        # 检测敌人子弹和玩家的碰撞
-        if hasattr(self.enemy_manager, 'enemy_projectiles'):
-            for projectile in self.enemy_manager.enemy_projectiles[:]:  # 使用切片避免在迭代时修改
-                # 计算子弹和玩家的距离
-                dx = self.player.world_x - projectile.world_x
-                dy = self.player.world_y - projectile.world_y
-                distance = (dx**2 + dy**2)**0.5
-                
-                if distance < 80:  # 增大碰撞检测范围从30到80像素
-                    # 对玩家造成伤害
-                    if hasattr(projectile, 'damage'):
-                        self.player.take_damage(projectile.damage)
-                        print(f"玩家受到 {projectile.damage} 点伤害")
-                    
-                    # 移除子弹
-                    self.enemy_manager.enemy_projectiles.remove(projectile)
-                    
-                    # 播放受伤音效
-                    resource_manager.play_sound("player_hurt")
+    def _process_deaths(self):
+        """tick末尾统一结算本tick死亡的敌人：计数、经验、掉落、移除并播放死亡音效
+        
+        经验值汇总后每名玩家只添加一次，每种敌人的死亡音效只播放一次。
+        """
+        self.death_queue.collect(self.enemy_manager.enemies)
+        if not self.death_queue:
+            return
             
-        # 检测武器碰撞
-        for weapon in self.player.weapons:
-            for projectile in weapon.get_projectiles():
-                for enemy in self.enemy_manager.enemies:
-                    # 首先使用矩形做快速检测
-                    # 计算世界坐标系中的距离
-                    dx = enemy.rect.centerx - projectile.world_x
-                    dy = enemy.rect.centery - projectile.world_y
-                    distance = (dx**2 + dy**2)**0.5
-                    
-                    if distance < enemy.rect.width / 2 + projectile.rect.width / 2:
-                        # 进行更精确的像素级碰撞检测
-                        # 临时更新projectile的rect位置以进行像素级碰撞检测
-                        original_projectile_rect = projectile.rect.copy()
-                        projectile.rect.centerx = projectile.world_x
-                        projectile.rect.centery = projectile.world_y
-                        
-                        collision_detected = apply_mask_collision(enemy, projectile)
-                        
-                        # 恢复原始rect位置
-                        projectile.rect = original_projectile_rect
-                        
-                        if collision_detected:
-                            # 处理碰撞
-                            should_destroy = weapon.handle_collision(projectile, enemy, self.enemy_manager.enemies)
-                            # 播放击中音效
-                            resource_manager.play_sound("hit")
-                            
-                            if enemy.health <= 0:
-                                self.kill_num += 1
-                                # 给玩家添加经验值奖励
-                                if hasattr(enemy, 'config') and 'exp_value' in enemy.config:
-                                    exp_reward = enemy.config['exp_value']
-                                    self.player.add_experience(exp_reward)
-                                    print(f"击杀 {enemy.type} 获得 {exp_reward} 经验值")
-                                # 在敌人死亡位置生成物品，传递player对象以应用幸运值加成
-                                if self.item_manager:
-                                    self.item_manager.spawn_item(enemy.rect.x, enemy.rect.y, enemy.type, self.player)
-                                self.enemy_manager.remove_enemy(enemy)
-                                # 播放敌人死亡音效
-                                resource_manager.play_sound("enemy_death")
-                                
-                            if should_destroy:
-                                projectile.kill()
-        
-        # 检测玩家和敌人的碰撞
+        # 掉落物以会发射投射物的角色为目标，应用其幸运值加成
+        drop_target = self.dual_player_system.mystic_swordsman if self.dual_player_system else self.player
+        summary = self.death_queue.flush(self.enemy_manager, self.item_manager, drop_target)
+        self.kill_num += summary.count
+        if summary.experience:
+            if self.dual_player_system:
+                # 给两个角色都添加经验值
+                self.dual_player_system.add_experience_to_both(summary.experience)
+            else:
+                self.player.add_experience(summary.experience)
+        # 根据敌人类型播放不同的死亡音效
+        for enemy_type in summary.enemy_types:
+            resource_manager.play_sound(ENEMY_DEATH_SOUNDS.get(enemy_type, "enemy_death"))
+        
+    def _on_enemy_projectile_hit(self, projectile, player):
+        """敌人子弹击中玩家：造成伤害并移除子弹"""
+        if hasattr(projectile, 'damage'):
+            # 双人模式下神秘剑客被击中时由忍者蛙扣血
+            if self.dual_player_system and player.hero_type == "role2":
+                player = self.dual_player_system.ninja_frog
+            player.take_damage(projectile.damage)
+        if projectile in self.enemy_manager.enemy_projectiles:
+            self.enemy_manager.enemy_projectiles.remove(projectile)
+        resource_manager.play_sound("player_hurt")
+        
+    def _update_ranged_attacks(self, players):
+        """Slime等远程敌人即使不直接碰撞也需要调用attack_player，才能发射投射物并检查命中"""
         for enemy in self.enemy_manager.enemies:
-            if not self.player.invincible:  # 只在玩家不处于无敌状态时检测碰撞
-                # 首先进行矩形快速检测
-                player_rect = self.player.rect.copy()
-                player_rect.centerx = self.player.world_x
-                player_rect.centery = self.player.world_y
-                
-                # 对于Slime等远程攻击敌人，即使不直接碰撞也需要触发attack_player
-                # 这样才能正确生成投射物并处理碰撞逻辑
-                if hasattr(enemy, 'projectiles'):
-                    enemy.attack_player(self.player)
-                
-                # 对于直接碰撞的敌人，进行常规碰撞检测
-                if player_rect.colliderect(enemy.rect):
-                    # 临时更新玩家的rect位置以进行像素级碰撞检测
-                    original_rect = self.player.rect.copy()
-                    self.player.rect.centerx = self.player.world_x
-                    self.player.rect.centery = self.player.world_y
-                    
-                    # 进行像素级碰撞检测
-                    collision_detected = apply_mask_collision(self.player, enemy)
-                    
-                    # 恢复原始rect位置
-                    self.player.rect = original_rect
-                    
-                    if collision_detected:
-                        if enemy.attack_player(self.player):
-                            # 播放受伤音效
-                            resource_manager.play_sound("player_hurt")
-                            break  # 一次只处理一个碰撞
-        
-        # 检测敌人子弹和玩家的碰撞
-        if hasattr(self.enemy_manager, 'enemy_projectiles'):
-            for projectile in self.enemy_manager.enemy_projectiles[:]:  # 使用切片避免在迭代时修改
-                # 计算子弹和玩家的距离
-                dx = self.player.world_x - projectile.world_x
-                dy = self.player.world_y - projectile.world_y
-                distance = (dx**2 + dy**2)**0.5
-                
-                if distance < 30:  # 碰撞检测范围
-                    # 对玩家造成伤害
-                    if hasattr(projectile, 'damage'):
-                        self.player.take_damage(projectile.damage)
-                        print(f"玩家受到 {projectile.damage} 点伤害")
-                    
-                    # 移除子弹
-                    self.enemy_manager.enemy_projectiles.remove(projectile)
-                    
-                    # 播放受伤音效
-                    resource_manager.play_sound("player_hurt")
+            if not hasattr(enemy, 'projectiles') or enemy.health <= 0:
+                continue  # 已死亡的敌人在tick末尾才从列表中移除
+            target_player = players[0]
+            if len(players) > 1:
+                # 选择最近的目标（使用敌人中心坐标）
+                target_player = self.collision_pipeline.nearest_player(
+                    players, enemy.rect.x + enemy.rect.width / 2, enemy.rect.y + enemy.rect.height / 2)
+            if not target_player.invincible:
+                enemy.attack_player(target_player)
         
     def _update_game_state(self):
         # 获取当前等级
@@ -1,5 +1,6 @@
 import pygame
 from .resource_manager import resource_manager
+from .core import input_source
 
 class GameButtons:
     """游戏战斗界面的按钮管理器"""
@@ -97,7 +98,7 @@ class GameButtons:
         
         # 保留鼠标事件作为备选
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_source.get_mouse_pos()
             for button_name, rect in self.button_rects.items():
                 if rect.collidepoint(mouse_pos):
                     return self._handle_button_click(button_name)
@@ -128,7 +129,7 @@ class GameButtons:
     def _handle_confirmation(self, event):
         """处理确认对话框"""
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_source.get_mouse_pos()
             if hasattr(self, 'confirmation_buttons'):
                 for button_name, button_rect in self.confirmation_buttons.items():
                     if button_rect.collidepoint(mouse_pos):
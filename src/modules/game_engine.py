@@ -9,6 +9,7 @@ from typing import Optional
 
 from .core import GameState, SceneManager, InputManager, RenderManager
 from .core.game_state import GameMode
+from .profiler import CaptureProfiler, AllocationTracker
 from .scenes import MainMenuScene, GameScene, SplitScreenScene
 from .managers import ResourceManager, SaveManager, UpgradeManager
 
@@ -36,6 +37,10 @@ class GameEngine:
         self.frame_count = 0
         self.last_fps_update = time.time()
         
+        # 按需性能采集（F8: cProfile，F7: tracemalloc对比）
+        self.capture_profiler = CaptureProfiler()
+        self.allocation_tracker = AllocationTracker()
+        
         # 初始化场景
         self._setup_scenes()
         
@@ -68,6 +73,12 @@ class GameEngine:
             elif event.key == pygame.K_F1:
                 self.game_state.debug_mode = not self.game_state.debug_mode
                 self.render_manager.enable_grid = self.game_state.debug_mode
+            elif event.key == pygame.K_F7:
+                report = self.allocation_tracker.snapshot()
+                if report:
+                    print(f"内存分配对比已写入: {report}")
+            elif event.key == pygame.K_F8:
+                self.capture_profiler.start()
                 
         # 将事件传递给场景管理器
         self.scene_manager.handle_event(event)
@@ -98,6 +109,12 @@ class GameEngine:
         # 更新显示
         pygame.display.flip()
         
+        # 推进性能采集
+        self.allocation_tracker.frame_end()
+        result = self.capture_profiler.frame_end()
+        if result:
+            print(f"cProfile采集完成: {result[0]}，摘要: {result[1]}")
+        
     def _update_performance(self, dt: float):
         """更新性能监控"""
         self.frame_count += 1
@@ -1,5 +1,6 @@
 import pygame
 from .resource_manager import resource_manager
+from .core import input_source
 
 class GameResultUI:
     """游戏结果UI类，用于显示胜利或失败界面"""
@@ -16,6 +17,7 @@ class GameResultUI:
         self.button_rects = {}
         self.selected_button = 0  # 0: 重新开始, 1: 回到主页
         self.hovered_button = None  # 鼠标悬停的按钮
+        self._overlay = None  # 缓存的半透明覆盖层
         
         # 关卡进阶相关
         self.current_map = None  # 当前地图
@@ -128,7 +130,7 @@ class GameResultUI:
         
         # 鼠标控制
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_source.get_mouse_pos()
             
             
             for button_name, rect in self.button_rects.items():
@@ -159,16 +161,31 @@ class GameResultUI:
                 return "main_menu"
         return None
     
-    def render(self):
-        """渲染游戏结果UI"""
+    def render_overlay(self):
+        """只绘制半透明覆盖层（画面冻结时覆盖层会被缓存，之后只重绘图片和按钮）"""
         if not self.is_active:
             return
+        if self._overlay is None or self._overlay.get_size() != self.screen.get_size():
+            self._overlay = pygame.Surface(self.screen.get_size())
+            self._overlay.set_alpha(128)
+            self._overlay.fill((0, 0, 0))
+        self.screen.blit(self._overlay, (0, 0))
+    
+    def render(self, overlay=True):
+        """渲染游戏结果UI
+        
+        Args:
+            overlay: 是否绘制半透明覆盖层
+            
+        Returns:
+            list: 绘制过的区域（不含覆盖层），未激活时为None
+        """
+        if not self.is_active:
+            return None
         
         # 创建半透明覆盖层
-        overlay = pygame.Surface((self.screen.get_width(), self.screen.get_height()))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+        if overlay:
+            self.render_overlay()
         
         # 选择要显示的图片
         image = self.win_image if self.is_victory else self.lost_image
@@ -177,7 +194,7 @@ class GameResultUI:
                     # 计算图片位置（居中显示，向右移动70像素）
             image_rect = image.get_rect()
             image_rect.center = (self.screen.get_width() // 2 + 60, self.screen.get_height() // 2-20)
-            self.screen.blit(image, image_rect)
+            rects = [self.screen.blit(image, image_rect)]
         else:
             # 如果图片加载失败，显示文字
             font = pygame.font.SysFont('simHei', 72)
@@ -187,11 +204,12 @@ class GameResultUI:
                 text = font.render("失败！", True, (255, 0, 0))  # 红色
             
             text_rect = text.get_rect(center=(self.screen.get_width() // 2 + 70, self.screen.get_height() // 2))
-            self.screen.blit(text, text_rect)
+            rects = [self.screen.blit(text, text_rect)]
         
         # 渲染按钮弹窗
         if self.show_buttons:
-            self._render_button_popup()
+            rects.append(self._render_button_popup())
+        return rects
     
     def _render_button_popup(self):
         """渲染按钮弹窗"""
@@ -206,6 +224,7 @@ class GameResultUI:
         
         # 绘制弹窗背景
         popup_rect = pygame.Rect(popup_x, popup_y, popup_width, popup_height)
+        dirty_rect = popup_rect.copy()
         pygame.draw.rect(self.screen, (50, 50, 50), popup_rect)
         pygame.draw.rect(self.screen, (100, 100, 100), popup_rect, 3)
         
@@ -219,7 +238,7 @@ class GameResultUI:
         button_start_y = popup_y + 50  # 距离弹窗顶部50像素
         
         # 更新鼠标悬停状态
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = input_source.get_mouse_pos()
         self.hovered_button = None
         
         # 根据关卡状态确定按钮
@@ -284,4 +303,6 @@ class GameResultUI:
                 text_rect = text_surface.get_rect(center=button_rect.center)
                 self.screen.blit(text_surface, text_rect)
                 self.button_rects[button_name] = button_rect
-               
\ No newline at end of file
+                
+            dirty_rect.union_ip(button_rect)
+        return dirty_rect
@@ -0,0 +1,406 @@
+"""
+HUD控件
+保留模式的HUD控件：图标只缩放一次，静态背景只创建一次，
+文字和进度条只在绑定的数值（电量、射击次数、冷却时间等）变化时重新绘制，
+其余帧直接blit缓存的表面。
+
+所有控件新建表面都经过 new_surface / render_text / scale_surface，
+由 surface_counter 统计每帧新建的表面数量，用来验证缓存是否生效。
+"""
+
+import math
+from collections import OrderedDict
+
+import pygame
+
+
+class SurfaceCounter:
+    """统计HUD每帧新建的Surface数量"""
+
+    def __init__(self):
+        self.current = 0      # 当前帧已新建的数量
+        self.last_frame = 0   # 上一帧新建的数量
+        self.total = 0        # 累计新建的数量
+
+    def add(self, count=1):
+        self.current += count
+        self.total += count
+
+    def end_frame(self):
+        """帧结束时调用，保存本帧计数并清零"""
+        self.last_frame = self.current
+        self.current = 0
+        return self.last_frame
+
+    def reset(self):
+        self.current = 0
+        self.last_frame = 0
+        self.total = 0
+
+
+# 全局计数器（Game 在每帧结束时调用 end_frame）
+surface_counter = SurfaceCounter()
+
+
+def new_surface(size, flags=pygame.SRCALPHA):
+    """新建表面并计数"""
+    surface_counter.add()
+    return pygame.Surface(size, flags)
+
+
+def render_text(font, text, color):
+    """渲染文字并计数"""
+    surface_counter.add()
+    return font.render(text, True, color)
+
+
+def scale_surface(surface, size):
+    """缩放表面并计数"""
+    surface_counter.add()
+    return pygame.transform.scale(surface, size)
+
+
+_fonts = {}
+
+
+def get_font(size, name='simHei'):
+    """获取缓存的系统字体（SysFont 查找字体文件的开销很大，不应每帧创建）"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    """共享的文字表面缓存（LRU），用于大量实体显示相同文字的场合（如敌人血量）"""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+
+    def get(self, text, font_size, color=(255, 255, 255)):
+        """获取文字表面
+
+        Args:
+            text: 文字内容
+            font_size: 字号
+            color: 文字颜色
+
+        Returns:
+            pygame.Surface: 缓存的文字表面
+        """
+        key = (text, font_size, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        surface = render_text(get_font(font_size), text, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+# 全局文字缓存
+text_cache = TextCache()
+
+
+class HudWidget:
+    """HUD控件基类
+
+    cached(name, value, build) 按名称保存上一次的绑定值和绘制结果，
+    绑定值不变时直接返回缓存的表面，变化时才调用 build(value) 重新绘制。
+    """
+
+    def __init__(self):
+        self._cache = {}
+        self.rebuilds = 0
+
+    def cached(self, name, value, build):
+        entry = self._cache.get(name)
+        if entry is not None and entry[0] == value:
+            return entry[1]
+        surface = build(value)
+        self._cache[name] = (value, surface)
+        self.rebuilds += 1
+        return surface
+
+    def invalidate(self):
+        """丢弃所有缓存（例如图标资源被替换后）"""
+        self._cache.clear()
+
+
+class TextLabel(HudWidget):
+    """文字标签：字体只创建一次，文字或颜色变化时才重新渲染"""
+
+    def __init__(self, font_size, font_name='simHei'):
+        super().__init__()
+        self.font_name = font_name
+        self.font_size = font_size
+
+    @property
+    def font(self):
+        return get_font(self.font_size, self.font_name)
+
+    def get(self, text, color=(255, 255, 255)):
+        """获取文字表面
+
+        Args:
+            text: 文字内容
+            color: 文字颜色
+
+        Returns:
+            pygame.Surface: 缓存的文字表面
+        """
+        return self.cached("text", (text, tuple(color)),
+                           lambda value: render_text(self.font, value[0], value[1]))
+
+
+class PanelBackground(HudWidget):
+    """半透明面板背景，只创建一次"""
+
+    def __init__(self, size, color=(0, 0, 0, 150)):
+        super().__init__()
+        self.size = size
+        self.color = color
+
+    def get(self):
+        def build(_):
+            surface = new_surface(self.size)
+            surface.fill(self.color)
+            return surface
+        return self.cached("background", None, build)
+
+
+class EnergyBarWidget(HudWidget):
+    """忍者蛙头顶的电量进度条（图标 + 背景 + 电量条 + 边框 + 低电量文字）"""
+
+    BAR_WIDTH = 50
+    BAR_HEIGHT = 8
+    ICON_SIZE = 16
+
+    def __init__(self, icon_loader):
+        """
+        Args:
+            icon_loader: 返回原始图标Surface的函数，只在第一次绘制时调用
+        """
+        super().__init__()
+        self.icon_loader = icon_loader
+        self.label = TextLabel(12)
+
+    def _build_icon(self, _):
+        size = self.ICON_SIZE
+        try:
+            return scale_surface(self.icon_loader(), (size, size))
+        except Exception as e:
+            print(f"加载light_icon失败: {e}")
+            # 如果加载失败，创建一个默认的绿色圆形图标
+            icon = new_surface((size, size))
+            pygame.draw.circle(icon, (0, 255, 0, 200), (size // 2, size // 2), size // 2)
+            return icon
+
+    def _build_rect(self, value):
+        width, color, border = value
+        surface = new_surface((width, self.BAR_HEIGHT))
+        pygame.draw.rect(surface, color, (0, 0, width, self.BAR_HEIGHT), 1 if border else 0)
+        return surface
+
+    def render(self, screen, bar_x, bar_y, center_x, energy):
+        """绘制电量进度条
+
+        Args:
+            screen: 目标表面
+            bar_x: 进度条左上角X（屏幕坐标）
+            bar_y: 进度条左上角Y（屏幕坐标）
+            center_x: 角色中心X，低电量文字以此居中
+            energy: 当前电量（0-100）
+        """
+        icon_size = self.ICON_SIZE
+        bar_width = self.BAR_WIDTH
+        bar_height = self.BAR_HEIGHT
+
+        # 图标在进度条左边5像素，垂直居中对齐
+        icon = self.cached("icon", None, self._build_icon)
+        screen.blit(icon, (bar_x - icon_size - 5, bar_y - (icon_size - bar_height) // 2))
+
+        # 进度条背景（半透明深灰色）
+        screen.blit(self.cached("background", (bar_width, (50, 50, 50, 180), False), self._build_rect),
+                    (bar_x, bar_y))
+
+        energy_ratio = energy / 100.0
+        energy_width = int(bar_width * energy_ratio)
+        if energy_ratio > 0.6:
+            energy_color = (0, 255, 0, 200)  # 绿色（电量充足）
+        elif energy_ratio > 0.3:
+            energy_color = (255, 255, 0, 200)  # 黄色（电量中等）
+        else:
+            energy_color = (255, 0, 0, 200)  # 红色（电量不足）
+
+        if energy_width > 0:
+            screen.blit(self.cached("fill", (energy_width, energy_color, False), self._build_rect),
+                        (bar_x, bar_y))
+
+        # 进度条边框（半透明白色）
+        screen.blit(self.cached("border", (bar_width, (255, 255, 255, 150), True), self._build_rect),
+                    (bar_x, bar_y))
+
+        # 只在电量低于50%时显示百分比文字
+        if energy_ratio < 0.5:
+            text_surface = self.label.get(f"{int(energy)}%")
+            text_rect = text_surface.get_rect()
+            text_rect.centerx = center_x
+            text_rect.bottom = bar_y - 2
+            screen.blit(text_surface, text_rect)
+
+
+class BulletShotsWidget(HudWidget):
+    """神秘剑士头顶的剩余射击次数（一排子弹图标，用完的显示为灰色）"""
+
+    ICON_SIZE = 16
+
+    def __init__(self, icon_loader, slots=6, icon_step=8):
+        """
+        Args:
+            icon_loader: 返回原始子弹图标Surface的函数
+            slots: 图标数量（每个弹夹可射击的次数）
+            icon_step: 相邻图标的水平间隔
+        """
+        super().__init__()
+        self.icon_loader = icon_loader
+        self.slots = slots
+        self.icon_step = icon_step
+        self.label = TextLabel(12)
+
+    def _build_icon(self, _):
+        size = self.ICON_SIZE
+        try:
+            return scale_surface(self.icon_loader(), (size, size))
+        except Exception as e:
+            print(f"加载bullet_icon失败: {e}")
+            icon = new_surface((size, size))
+            pygame.draw.circle(icon, (255, 255, 0, 200), (size // 2, size // 2), size // 2)
+            return icon
+
+    def _build_gray_icon(self, _):
+        surface_counter.add()
+        gray_icon = self.cached("icon", None, self._build_icon).copy()
+        gray_icon.fill((100, 100, 100, 100), special_flags=pygame.BLEND_RGBA_MULT)
+        return gray_icon
+
+    def render(self, screen, center_x, icon_y, remaining_shots, is_reloading):
+        """绘制射击次数
+
+        Args:
+            screen: 目标表面
+            center_x: 角色中心X（屏幕坐标）
+            icon_y: 图标顶部Y（屏幕坐标）
+            remaining_shots: 剩余射击次数
+            is_reloading: 是否正在装弹
+        """
+        icon = self.cached("icon", None, self._build_icon)
+        gray_icon = self.cached("gray_icon", None, self._build_gray_icon)
+
+        total_width = self.slots * self.icon_step
+        start_x = center_x - total_width // 2
+        screen.blits([
+            (icon if i < remaining_shots else gray_icon, (start_x + i * self.icon_step, icon_y))
+            for i in range(self.slots)
+        ], False)
+
+        # 正在装弹时显示"装弹中"
+        if is_reloading:
+            text_surface = self.label.get("装弹中")
+            text_rect = text_surface.get_rect()
+            text_rect.centerx = center_x
+            text_rect.top = icon_y + self.ICON_SIZE + 2
+            screen.blit(text_surface, text_rect)
+
+
+class CooldownIconWidget(HudWidget):
+    """带边框的技能图标和冷却遮罩、冷却时间"""
+
+    def __init__(self, icon_size=48, border_color=(255, 255, 0)):
+        super().__init__()
+        self.icon_size = icon_size
+        self.border_color = border_color
+        self.label = TextLabel(24)
+
+    def render(self, screen, x, y, icon, cooldown):
+        """绘制技能图标
+
+        Args:
+            screen: 目标表面
+            x: 图标左上角X
+            y: 图标左上角Y
+            icon: 技能图标（同一个Surface对象会复用缓存的边框图标）
+            cooldown: 剩余冷却时间（秒），0表示可用
+        """
+        size = self.icon_size
+
+        def build_bordered(source):
+            bordered = new_surface((size + 4, size + 4))
+            pygame.draw.rect(bordered, self.border_color, (0, 0, size + 4, size + 4), 2)
+            bordered.blit(source, (2, 2))
+            return bordered
+
+        screen.blit(self.cached("bordered", icon, build_bordered), (x - 2, y - 2))
+
+        if cooldown > 0:
+            def build_overlay(_):
+                overlay = new_surface((size, size))
+                overlay.fill((0, 0, 0, 128))  # 半透明黑色
+                return overlay
+
+            screen.blit(self.cached("overlay", None, build_overlay), (x, y))
+            text_surface = self.label.get(f"{cooldown:.1f}")
+            screen.blit(text_surface, text_surface.get_rect(center=(x + size // 2, y + size // 2)))
+
+
+class DashedLineWidget(HudWidget):
+    """虚线：端点不变时复用上次计算的线段"""
+
+    def __init__(self, color=(255, 255, 0), width=2, dash_length=10, gap_length=5):
+        super().__init__()
+        self.color = color
+        self.width = width
+        self.dash_length = dash_length
+        self.gap_length = gap_length
+        self._endpoints = None
+        self._segments = []
+
+    def _compute_segments(self, x1, y1, x2, y2):
+        dx = x2 - x1
+        dy = y2 - y1
+        distance = math.sqrt(dx * dx + dy * dy)
+        if distance == 0:
+            return []
+        dx /= distance
+        dy /= distance
+
+        total_segment = self.dash_length + self.gap_length
+        num_segments = int(distance / total_segment)
+        segments = []
+        for i in range(num_segments):
+            start = i * total_segment
+            end = start + self.dash_length
+            segments.append(((x1 + dx * start, y1 + dy * start), (x1 + dx * end, y1 + dy * end)))
+
+        # 最后一段（不足一个完整虚线段时画到终点）
+        if distance - num_segments * total_segment > 0:
+            start = num_segments * total_segment
+            segments.append(((x1 + dx * start, y1 + dy * start), (x2, y2)))
+        return segments
+
+    def render(self, screen, x1, y1, x2, y2):
+        endpoints = (x1, y1, x2, y2)
+        if endpoints != self._endpoints:
+            self._segments = self._compute_segments(x1, y1, x2, y2)
+            self._endpoints = endpoints
+            self.rebuilds += 1
+        for start, end in self._segments:
+            pygame.draw.line(screen, self.color, start, end, self.width)
@@ -8,9 +8,12 @@ import random
 import math
 from .item import Item
 from ..resource_manager import resource_manager
+from ..render_queue import RenderQueue, LAYER_SUPPLIES
+from ..hud_widgets import text_cache
 
 class AmmoSupply(Item):
     """远程攻击补给物品"""
+    render_layer = LAYER_SUPPLIES
     
     def __init__(self, x, y):
         # 先设置图像，再调用父类构造函数
@@ -85,6 +88,12 @@ class AmmoSupply(Item):
     
     def render(self, screen, camera_x, camera_y, screen_center_x=None, screen_center_y=None):
         """渲染补给物品"""
+        queue = RenderQueue.started(screen, camera_x, camera_y, margin=50)
+        self.submit_render(queue, camera_x, camera_y, screen_center_x, screen_center_y)
+        queue.flush()
+        
+    def submit_render(self, render_queue, camera_x, camera_y, screen_center_x=None, screen_center_y=None):
+        """把补给物品和倒计时提交到渲染队列"""
         if not self.visible:
             return
             
@@ -102,21 +111,16 @@ class AmmoSupply(Item):
         bob_offset = math.sin(self.bob_timer) * self.bob_amount
         screen_y += int(bob_offset)
         
-        # 检查是否在屏幕范围内
-        if (screen_x < -50 or screen_x > screen.get_width() + 50 or
-            screen_y < -50 or screen_y > screen.get_height() + 50):
+        # 绘制补给物品（屏幕外时连同倒计时一起跳过）
+        if not render_queue.submit_culled(self.image, screen_x - self.rect.width // 2,
+                                          screen_y - self.rect.height // 2, self.render_layer):
             return
         
-        # 绘制补给物品
-        screen.blit(self.image, (screen_x - self.rect.width // 2, 
-                                screen_y - self.rect.height // 2))
-        
         # 绘制剩余时间指示器
         remaining_time = max(0, self.lifetime - self.spawn_timer)
         if remaining_time <= 10.0:  # 最后10秒显示倒计时
-            font = pygame.font.SysFont('simHei', 20)
-            time_text = font.render(f"{remaining_time:.1f}s", True, (255, 255, 255))
+            time_text = text_cache.get(f"{remaining_time:.1f}s", 20, (255, 255, 255))
             text_rect = time_text.get_rect()
             text_rect.centerx = screen_x
             text_rect.bottom = screen_y - 20
-            screen.blit(time_text, text_rect) 
\ No newline at end of file
+            render_queue.submit(time_text, text_rect, self.render_layer) 
\ No newline at end of file
@@ -7,9 +7,11 @@ import pygame
 import math
 from .item import Item
 from ..resource_manager import resource_manager
+from ..render_queue import RenderQueue, LAYER_SUPPLIES
 
 class HealthSupply(Item):
     """生命补给物品"""
+    render_layer = LAYER_SUPPLIES
     
     def __init__(self, x, y):
         """
@@ -45,6 +47,7 @@ class HealthSupply(Item):
         # 闪烁效果（最后10秒开始闪烁）
         self.blink_start_time = 50.0  # 开始闪烁的时间
         self.blink_speed = 5.0  # 闪烁速度
+        self._blink_image = None  # 闪烁时使用的图像副本
         
     def update(self, dt):
         """更新生命补给状态
@@ -107,6 +110,12 @@ class HealthSupply(Item):
             screen_center_x: 屏幕中心X坐标
             screen_center_y: 屏幕中心Y坐标
         """
+        queue = RenderQueue.started(screen, camera_x, camera_y, margin=50)
+        self.submit_render(queue, camera_x, camera_y, screen_center_x, screen_center_y)
+        queue.flush()
+        
+    def submit_render(self, render_queue, camera_x, camera_y, screen_center_x=None, screen_center_y=None):
+        """把生命补给提交到渲染队列"""
         # 计算屏幕坐标（使用与门相同的坐标系统）
         if screen_center_x is not None and screen_center_y is not None:
             screen_x = screen_center_x + (self.world_x - camera_x)
@@ -120,15 +129,15 @@ class HealthSupply(Item):
         screen_y += int(bob_offset)
         
         # 检查是否应该闪烁（最后10秒）
+        image = self.image
         if self.time_alive >= self.blink_start_time:
             blink_alpha = int(255 * (0.5 + 0.5 * math.sin(self.bob_timer * self.blink_speed)))
-            # 创建带透明度的表面
-            alpha_surface = self.image.copy()
-            alpha_surface.set_alpha(blink_alpha)
-            screen.blit(alpha_surface, (screen_x - 16, screen_y - 16))
-        else:
-            # 正常渲染
-            screen.blit(self.image, (screen_x - 16, screen_y - 16))
+            # 闪烁用的半透明副本只复制一次，之后每帧只修改透明度
+            if self._blink_image is None:
+                self._blink_image = self.image.copy()
+            image = self._blink_image
+            image.set_alpha(blink_alpha)
+        render_queue.submit_culled(image, screen_x - 16, screen_y - 16, self.render_layer)
             
         # 调试：绘制红色边框（可选）
         # pygame.draw.rect(screen, (255, 0, 0), (screen_x - 16, screen_y - 16, 32, 32), 1)
\ No newline at end of file
@@ -4,9 +4,10 @@
 """
 
 import pygame
-import random
+from ..core.game_random import rng
 import math
 from .health_supply import HealthSupply
+from ..render_queue import RenderQueue
 
 class HealthSupplyManager:
     """生命补给管理器"""
@@ -72,8 +73,8 @@ class HealthSupplyManager:
         # 尝试生成补给，最多尝试100次
         for attempt in range(100):
             # 随机生成位置
-            x = random.randint(self.spawn_margin, map_width - self.spawn_margin)
-            y = random.randint(self.spawn_margin, map_height - self.spawn_margin)
+            x = rng.randint(self.spawn_margin, map_width - self.spawn_margin)
+            y = rng.randint(self.spawn_margin, map_height - self.spawn_margin)
             
             # 检查位置是否有效
             if self._is_valid_spawn_position(x, y):
@@ -192,7 +193,8 @@ class HealthSupplyManager:
                               
                                 return
                     
-    def render(self, screen, camera_x, camera_y, screen_center_x=None, screen_center_y=None):
+    def render(self, screen, camera_x, camera_y, screen_center_x=None, screen_center_y=None,
+               render_queue=None):
         """渲染所有补给物品
         
         Args:
@@ -201,9 +203,13 @@ class HealthSupplyManager:
             camera_y: 相机Y坐标
             screen_center_x: 屏幕中心X坐标
             screen_center_y: 屏幕中心Y坐标
+            render_queue: 共享的渲染队列，为None时在本方法内创建并立即绘制
         """
+        queue = render_queue if render_queue is not None else RenderQueue.started(screen, camera_x, camera_y)
         for supply in self.supplies:
-            supply.render(screen, camera_x, camera_y, screen_center_x, screen_center_y)
+            supply.submit_render(queue, camera_x, camera_y, screen_center_x, screen_center_y)
+        if render_queue is None:
+            queue.flush()
             
     def get_supplies_for_minimap(self):
         """获取补给物品列表用于小地图显示
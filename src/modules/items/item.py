@@ -1,7 +1,10 @@
 import pygame
 from ..resource_manager import resource_manager
+from ..render_queue import LAYER_ITEMS
 
 class Item(pygame.sprite.Sprite):
+    render_layer = LAYER_ITEMS  # 在渲染队列中的图层
+    
     def __init__(self, x, y, item_type):
         super().__init__()
         self.world_x = x
@@ -142,4 +145,15 @@ class Item(pygame.sprite.Sprite):
         screen_y = screen_center_y + (self.world_y - camera_y)
         self.rect.center = (screen_x, screen_y)
         
-        screen.blit(self.image, self.rect) 
\ No newline at end of file
+        screen.blit(self.image, self.rect)
+        
+    def submit_render(self, render_queue, camera_x, camera_y, screen_center_x, screen_center_y):
+        """把物品提交到渲染队列（由队列统一做视野剔除）"""
+        if self.collected:
+            return
+            
+        screen_x = screen_center_x + (self.world_x - camera_x)
+        screen_y = screen_center_y + (self.world_y - camera_y)
+        self.rect.center = (screen_x, screen_y)
+        
+        render_queue.submit_culled(self.image, self.rect.x, self.rect.y, self.render_layer)
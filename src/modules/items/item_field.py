@@ -0,0 +1,169 @@
+"""
+经验球场
+经验球是数量最多的掉落物，不再为每个经验球创建 Item 精灵，而是把位置、经验值和合并数量
+保存在 numpy 数组中：每个tick对所有玩家做一次向量化的吸附和拾取判断，
+数量超过阈值时把相邻的经验球合并成更高价值的经验球，总经验值保持不变。
+"""
+
+import numpy as np
+
+# 经验球数量超过该值时合并相邻的经验球
+DEFAULT_MERGE_THRESHOLD = 150
+# 合并时的网格边长（像素），同一格子内的经验球合并为一个
+DEFAULT_MERGE_RADIUS = 64
+
+
+class ItemField:
+    """经验球集合（数组容量按需翻倍，前 count 个元素有效）"""
+
+    def __init__(self, merge_threshold=DEFAULT_MERGE_THRESHOLD, merge_radius=DEFAULT_MERGE_RADIUS,
+                 attract_speed=350, pickup_distance=10, capacity=64):
+        """
+        Args:
+            merge_threshold: 经验球数量超过该值时触发合并，None表示不合并
+            merge_radius: 合并网格的初始边长（像素），一次合并后仍超过阈值时边长翻倍再合并
+            attract_speed: 在玩家拾取范围内时飞向玩家的速度（像素/秒）
+            pickup_distance: 离玩家小于该距离时被拾取（像素）
+            capacity: 数组初始容量
+        """
+        self.merge_threshold = merge_threshold
+        self.merge_radius = merge_radius
+        self.attract_speed = attract_speed
+        self.pickup_distance = pickup_distance
+        self.count = 0
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.value = np.zeros(capacity)
+        self.merged = np.zeros(capacity, dtype=np.int32)  # 每个经验球由多少个原始经验球合并而成
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """移除所有经验球"""
+        self.count = 0
+
+    def total_value(self):
+        """场上经验球的经验值总和"""
+        return float(self.value[:self.count].sum())
+
+    def spawn(self, x, y, value=0):
+        """生成一个经验球"""
+        self.spawn_many((x,), (y,), (value,))
+
+    def spawn_many(self, xs, ys, values):
+        """批量生成经验球
+
+        Args:
+            xs: X坐标序列
+            ys: Y坐标序列
+            values: 经验值序列
+        """
+        added = len(xs)
+        if not added:
+            return
+        start, end = self.count, self.count + added
+        self._reserve(end)
+        self.x[start:end] = xs
+        self.y[start:end] = ys
+        self.value[start:end] = values
+        self.merged[start:end] = 1
+        self.count = end
+
+    def _reserve(self, size):
+        """保证数组容量不小于 size"""
+        capacity = len(self.x)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("x", "y", "value", "merged"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def update(self, dt, players):
+        """对所有玩家做一次吸附和拾取判断
+
+        每个经验球只受离它最近的玩家影响：在该玩家的拾取范围内时飞向玩家，
+        距离小于 pickup_distance 时被该玩家拾取。
+
+        Args:
+            dt: 时间增量
+            players: 玩家列表（需要 world_x、world_y 和 pickup_range）
+
+        Returns:
+            list: 每名玩家本tick拾取的 (数量, 经验值总和)，与 players 一一对应
+        """
+        n = self.count
+        collected = [(0, 0.0)] * len(players)
+        if not n or not players:
+            return collected
+
+        x, y = self.x[:n], self.y[:n]
+        player_x = np.array([player.world_x for player in players], dtype=float)[:, None]
+        player_y = np.array([player.world_y for player in players], dtype=float)[:, None]
+        dx = player_x - x
+        dy = player_y - y
+        distances = np.hypot(dx, dy)
+
+        nearest = distances.argmin(axis=0)
+        columns = np.arange(n)
+        distance = distances[nearest, columns]
+        pickup_range = np.array([player.pickup_range for player in players], dtype=float)[nearest]
+
+        # 在拾取范围内的经验球飞向最近的玩家
+        moving = (distance < pickup_range) & (distance > 0)
+        if moving.any():
+            step = np.zeros(n)
+            step[moving] = self.attract_speed * dt / distance[moving]
+            x += dx[nearest, columns] * step
+            y += dy[nearest, columns] * step
+
+        # 拾取（按移动前的距离判断）
+        picked = distance < self.pickup_distance
+        if picked.any():
+            owners = nearest[picked]
+            counts = np.bincount(owners, minlength=len(players))
+            values = np.bincount(owners, weights=self.value[:n][picked], minlength=len(players))
+            collected = [(int(counts[i]), float(values[i])) for i in range(len(players))]
+            self._keep(~picked)
+
+        self._merge_if_crowded()
+        return collected
+
+    def _keep(self, mask):
+        """只保留 mask 为True的经验球（一次压缩）"""
+        kept = int(mask.sum())
+        for array in (self.x, self.y, self.value, self.merged):
+            array[:kept] = array[:self.count][mask]
+        self.count = kept
+
+    def _merge_if_crowded(self):
+        """数量超过阈值时按网格合并经验球，合并后的位置取格子内经验球的平均位置"""
+        threshold = self.merge_threshold
+        if threshold is None:
+            return
+        radius = self.merge_radius
+        while self.count > max(1, threshold):
+            n = self.count
+            x, y = self.x[:n], self.y[:n]
+            # 以最左上的经验球为网格原点，网格足够大时所有经验球都会落在同一格
+            cells = np.stack((np.floor((x - x.min()) / radius), np.floor((y - y.min()) / radius)), axis=1)
+            _, inverse = np.unique(cells, axis=0, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            groups = int(inverse.max()) + 1
+            if groups < n:
+                sizes = np.bincount(inverse, minlength=groups)
+                merged_x = np.bincount(inverse, weights=x, minlength=groups) / sizes
+                merged_y = np.bincount(inverse, weights=y, minlength=groups) / sizes
+                merged_value = np.bincount(inverse, weights=self.value[:n], minlength=groups)
+                merged_count = np.bincount(inverse, weights=self.merged[:n], minlength=groups)
+                self.x[:groups] = merged_x
+                self.y[:groups] = merged_y
+                self.value[:groups] = merged_value
+                self.merged[:groups] = merged_count
+                self.count = groups
+            # 仍然太多时扩大网格
+            radius *= 2
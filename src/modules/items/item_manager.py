@@ -1,58 +1,156 @@
-import random
+import numpy as np
+import pygame
+from ..core.game_random import rng
+from ..resource_manager import resource_manager
 from .item import Item
+from .item_field import ItemField, DEFAULT_MERGE_THRESHOLD
+from ..render_queue import RenderQueue, LAYER_ITEMS
+
+# 经验球按合并数量显示的大小：(至少合并了多少个, 边长像素)
+EXP_ORB_SIZES = ((16, 72), (4, 60), (1, 48))
 
 class ItemManager:
-    def __init__(self):
+    def __init__(self, exp_merge_threshold=DEFAULT_MERGE_THRESHOLD):
+        """
+        Args:
+            exp_merge_threshold: 场上经验球数量超过该值时合并相邻的经验球，None表示不合并
+        """
         self.items = []
+        # 经验球保存在数组中，不创建精灵
+        self.exp_orbs = ItemField(merge_threshold=exp_merge_threshold)
+        self.exp_orb_value = 0  # 经验球的经验值（击杀时已经直接获得经验值）
+        self._exp_orb_images = {}
         
         # 基础掉落概率
         self.base_coin_drop_rate = 0.1  # 10%概率掉落金币
         self.base_health_drop_rate = 0.05  # 5%概率掉落医疗包
         
     def spawn_item(self, x, y, enemy_type=None, player=None):
-        # 必定掉落经验球
-        self.items.append(Item(x, y, 'exp'))
-
-
-        
         # 如果没有提供player参数，使用基础掉落概率
         luck_multiplier = player.luck if player else 1.0
+        self._roll_drops(x, y, luck_multiplier, self.items)
+        
+    def spawn_items(self, drops, player=None):
+        """批量生成掉落物（同一tick内多个敌人死亡时使用）
+        
+        Args:
+            drops: (x, y, 敌人类型) 列表，按顺序抽取随机数，与逐个调用 spawn_item 的结果相同
+            player: 玩家对象，用于应用幸运值加成
+        """
+        luck_multiplier = player.luck if player else 1.0
+        new_items = []
+        for x, y, _ in drops:
+            self._roll_drops(x, y, luck_multiplier, new_items, spawn_exp=False)
+        self.items.extend(new_items)
+        # 必定掉落经验球
+        self.exp_orbs.spawn_many([x for x, _, _ in drops], [y for _, y, _ in drops],
+                                 [self.exp_orb_value] * len(drops))
+        
+    def _roll_drops(self, x, y, luck_multiplier, items, spawn_exp=True):
+        """在 (x, y) 生成一个敌人的掉落物，经验球放入经验球场，其他物品追加到 items"""
+        # 必定掉落经验球
+        if spawn_exp:
+            self.exp_orbs.spawn(x, y, self.exp_orb_value)
         
         # 随机掉落其他物品，受幸运值影响
-        if random.random() < self.base_coin_drop_rate * luck_multiplier:  # 受幸运值加成的金币掉落概率
-            self.items.append(Item(x + random.randint(-10, 10), y + random.randint(-10, 10), 'coin'))
+        if rng.random() < self.base_coin_drop_rate * luck_multiplier:  # 受幸运值加成的金币掉落概率
+            items.append(Item(x + rng.randint(-10, 10), y + rng.randint(-10, 10), 'coin'))
             
-        if random.random() < self.base_health_drop_rate * luck_multiplier:  # 受幸运值加成的医疗包掉落概率
-            self.items.append(Item(x + random.randint(-10, 10), y + random.randint(-10, 10), 'health'))
+        if rng.random() < self.base_health_drop_rate * luck_multiplier:  # 受幸运值加成的医疗包掉落概率
+            items.append(Item(x + rng.randint(-10, 10), y + rng.randint(-10, 10), 'health'))
             
-    def update(self, dt, player):
-        for item in self.items[:]:  # 使用切片创建副本以避免在迭代时修改列表
+    def clear(self):
+        """移除所有物品和经验球"""
+        self.items.clear()
+        self.exp_orbs.clear()
+        
+    def update(self, dt, players):
+        """更新物品的吸附和拾取
+        
+        Args:
+            dt: 时间增量
+            players: 玩家列表（也可以只传一个玩家），每个物品只飞向离它最近的玩家
+        """
+        if not isinstance(players, (list, tuple)):
+            players = [players]
+        if not players:
+            return
+            
+        # 经验球：所有玩家一次向量化判断，每名玩家的经验只添加一次
+        for player, (count, value) in zip(players, self.exp_orbs.update(dt, players)):
+            if count:
+                player.add_experience(value)
+        
+        if not self.items:
+            return
+        collected = False
+        for item in list(self.items):  # 复制列表：拾取钥匙时钥匙管理器会从列表中移除钥匙
+            player = players[0]
+            if len(players) > 1:
+                player = min(players, key=lambda p: (p.world_x - item.world_x) ** 2 + (p.world_y - item.world_y) ** 2)
             item.update(dt, player)
-            if item.collected:
-                try:
-                    self.items.remove(item)
-                except ValueError:
-                    # 物品可能已经被其他系统移除，忽略错误
-                    pass
-                
-    def render(self, screen, camera_x, camera_y, screen_center_x, screen_center_y, lighting_manager=None):
+            collected = collected or item.collected
+        if collected:
+            # 一次压缩列表，代替逐个 list.remove
+            self.items[:] = [item for item in self.items if not item.collected]
+            
+    def _get_exp_orb_image(self, merged):
+        """获取经验球图像，合并得越多显示得越大（按大小缓存）"""
+        size = next(size for minimum, size in EXP_ORB_SIZES if merged >= minimum)
+        image = self._exp_orb_images.get(size)
+        if image is None:
+            # 加载宝石精灵表并获取第一个宝石
+            spritesheet = resource_manager.load_spritesheet('gems_spritesheet', 'images/items/gems.png')
+            frame = resource_manager.create_animation('exp_gem', spritesheet,
+                                                      frame_width=16, frame_height=16,
+                                                      frame_count=1, row=0,
+                                                      frame_duration=0.1).get_current_frame()
+            image = pygame.transform.scale(frame, (size, size))
+            self._exp_orb_images[size] = image
+        return image
+        
+    def render(self, screen, camera_x, camera_y, screen_center_x, screen_center_y, lighting_manager=None,
+               render_queue=None):
+        """渲染物品
+        
+        Args:
+            render_queue: 共享的渲染队列，为None时在本方法内创建并立即绘制
+        """
+        queue = render_queue if render_queue is not None else RenderQueue.started(screen, camera_x, camera_y)
+        lighting_enabled = (lighting_manager and hasattr(lighting_manager, 'is_enabled')
+                            and lighting_manager.is_enabled())
+        
+        # 经验球：先用数组一次剔除屏幕外的经验球，只对可见的做光照检测
+        orbs = self.exp_orbs
+        if orbs.count:
+            orb_screen_x = orbs.x[:orbs.count] + (screen_center_x - camera_x)
+            orb_screen_y = orbs.y[:orbs.count] + (screen_center_y - camera_y)
+            view = queue.view
+            half_size = EXP_ORB_SIZES[0][1] / 2
+            visible = np.flatnonzero((orb_screen_x > view.left - half_size) & (orb_screen_x < view.right + half_size) &
+                                     (orb_screen_y > view.top - half_size) & (orb_screen_y < view.bottom + half_size))
+            for index in visible:
+                x, y = float(orb_screen_x[index]), float(orb_screen_y[index])
+                if lighting_enabled and not lighting_manager.is_in_light(x, y):
+                    continue
+                image = self._get_exp_orb_image(orbs.merged[index])
+                width, height = image.get_size()
+                queue.submit(image, (int(x - width / 2), int(y - height / 2)), LAYER_ITEMS)
+        
         for item in self.items:
-            # 钥匙始终可见，不受光照影响
-            if item.item_type == 'key':
-                item.render(screen, camera_x, camera_y, screen_center_x, screen_center_y)
+            # 将物品的世界坐标转换为屏幕坐标
+            item_screen_x = screen_center_x + (item.world_x - camera_x)
+            item_screen_y = screen_center_y + (item.world_y - camera_y)
+            
+            # 先做视野剔除，屏幕外的物品不再做光照检测
+            width, height = item.image.get_size()
+            if not queue.is_visible(item_screen_x - width / 2, item_screen_y - height / 2, width, height):
                 continue
-                
-            # 检查其他物品是否在光照范围内
-            if lighting_manager and hasattr(lighting_manager, 'is_enabled') and lighting_manager.is_enabled():
-                # 将物品的世界坐标转换为屏幕坐标进行检查
-                item_world_x = item.world_x
-                item_world_y = item.world_y
-                item_screen_x = screen_center_x + (item_world_x - camera_x)
-                item_screen_y = screen_center_y + (item_world_y - camera_y)
-                
-                # 检查物品是否在光照范围内
-                if lighting_manager.is_in_light(item_screen_x, item_screen_y):
-                    item.render(screen, camera_x, camera_y, screen_center_x, screen_center_y)
-            else:
-                # 如果没有光照系统或光照系统被禁用，正常渲染
-                item.render(screen, camera_x, camera_y, screen_center_x, screen_center_y) 
\ No newline at end of file
+            
+            # 钥匙始终可见，不受光照影响；其他物品只在光照范围内显示
+            if (item.item_type == 'key' or not lighting_enabled or
+                    lighting_manager.is_in_light(item_screen_x, item_screen_y)):
+                item.submit_render(queue, camera_x, camera_y, screen_center_x, screen_center_y)
+        
+        if render_queue is None:
+            queue.flush()
@@ -1,5 +1,5 @@
 import pygame
-import random
+from ..core.game_random import rng
 from .item import Item
 
 class KeyManager:
@@ -49,8 +49,8 @@ class KeyManager:
         for attempt in range(max_attempts):
             # 随机生成位置（避开边缘）
             margin = 50
-            x = random.randint(margin, map_width - margin)
-            y = random.randint(margin, map_height - margin)
+            x = rng.randint(margin, map_width - margin)
+            y = rng.randint(margin, map_height - margin)
             
             # 检查位置是否有效（不与墙壁碰撞）
             if self._is_valid_position(x, y, collision_tiles):
@@ -1,9 +1,11 @@
 import pygame
 from .item import Item
 from ..resource_manager import resource_manager
+from ..render_queue import LAYER_TELEPORT_ITEMS
 
 class TeleportItem(Item):
     """传送道具，可以将神秘剑客传送到忍者蛙身边"""
+    render_layer = LAYER_TELEPORT_ITEMS
     
     def __init__(self, x, y):
         # 先创建图像，然后再调用父类初始化
@@ -1,6 +1,7 @@
-import random
+from ..core.game_random import rng
 import pygame
 from .teleport_item import TeleportItem
+from ..render_queue import RenderQueue
 
 class TeleportManager:
     """传送道具管理器"""
@@ -32,8 +33,8 @@ class TeleportManager:
         max_attempts = 50
         
         while attempts < max_attempts:
-            x = random.randint(100, map_width - 100)
-            y = random.randint(100, map_height - 100)
+            x = rng.randint(100, map_width - 100)
+            y = rng.randint(100, map_height - 100)
             
             # 检查位置是否合适（不在墙壁内）
             if not self._is_position_blocked(x, y):
@@ -96,12 +97,19 @@ class TeleportManager:
                 self.teleport_items.remove(teleport_item)
                 
             
-    def render(self, screen, camera_x, camera_y):
-        """渲染传送道具"""
+    def render(self, screen, camera_x, camera_y, render_queue=None):
+        """渲染传送道具
+        
+        Args:
+            render_queue: 共享的渲染队列，为None时在本方法内创建并立即绘制
+        """
         screen_center_x = screen.get_width() // 2
         screen_center_y = screen.get_height() // 2
+        queue = render_queue if render_queue is not None else RenderQueue.started(screen, camera_x, camera_y)
         for teleport_item in self.teleport_items:
-            teleport_item.render(screen, camera_x, camera_y, screen_center_x, screen_center_y)
+            teleport_item.submit_render(queue, camera_x, camera_y, screen_center_x, screen_center_y)
+        if render_queue is None:
+            queue.flush()
             
     def get_items(self):
         """获取所有传送道具"""
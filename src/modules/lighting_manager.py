@@ -1,6 +1,6 @@
 import pygame
 import math
-from .vision_system import VisionSystem, DarkOverlay
+from .vision_system import VisionSystem, DarkOverlay, DEFAULT_RAY_COUNT
 from .vision_config import get_vision_config, get_vision_presets, apply_preset, validate_config
 
 class LightingManager:
@@ -10,6 +10,10 @@ class LightingManager:
         self.screen_width = screen_width
         self.screen_height = screen_height
         
+        # 画质：遮罩分辨率比例和光线数量比例，由画质调节器设置
+        self.resolution_scale = 1.0
+        self.ray_scale = 1.0
+        
         # 加载配置
         self.config = get_vision_config()
         self.presets = get_vision_presets()
@@ -70,18 +74,8 @@ class LightingManager:
                 self.vision_system.set_color(self.config["sector"]["color"])
                 self.vision_system.set_circle_radius(self.config["circle"]["radius"])
                 self.vision_system.set_circle_color(self.config["circle"]["color"])
-                # 更新光线数量（需要重新创建视野系统）
-                ray_count = self.config["sector"].get("ray_count", 24)
-                if hasattr(self.vision_system, 'ray_count') and self.vision_system.ray_count != ray_count:
-                    # 重新创建视野系统以应用新的光线数量
-                    self.vision_system = VisionSystem(
-                        radius=self.config["sector"]["radius"],
-                        angle=self.config["sector"]["angle"],
-                        color=self.config["sector"]["color"],
-                        circle_radius=self.config["circle"]["radius"],
-                        circle_color=self.config["circle"]["color"],
-                        ray_count=ray_count
-                    )
+                # 更新光线数量（保留墙壁数据，按当前画质缩放）
+                self.vision_system.set_ray_count(self._scaled_ray_count())
             
             # 如果黑暗遮罩已创建，更新其配置
             if hasattr(self, 'dark_overlay'):
@@ -106,7 +100,15 @@ class LightingManager:
         return None
 
     def set_walls(self, walls, tile_size=32):
-        """设置墙壁数据"""
+        """设置墙壁数据
+        
+        Args:
+            walls: 墙壁矩形列表（世界坐标）
+            tile_size: 图块大小
+        """
+        # 墙体几何每张地图只编译一次，同一份数据重复设置时不必清空视野缓存
+        if walls is self.walls and tile_size == self.tile_size:
+            return
         self.walls = walls
         self.tile_size = tile_size
         
@@ -157,21 +159,7 @@ class LightingManager:
         # 更新视野系统
         self.vision_system.update(screen_player_x, screen_player_y, mouse_x, mouse_y)
         
-        # 重新创建黑暗遮罩，确保每次渲染都是干净的
-        self.dark_overlay._create_overlay()
-        
-        # 创建最终的黑暗遮罩
-        final_overlay = self.dark_overlay.get_overlay().copy()
-        
-        # 渲染主视野系统（忍者蛙的光照）到最终遮罩
-        self._render_main_vision(final_overlay)
-        
-        # 渲染额外光源（神秘剑士的光源）到最终遮罩
-        if additional_lights:
-            self._render_additional_lights(final_overlay, additional_lights)
-        
-        # 将最终遮罩渲染到屏幕
-        screen.blit(final_overlay, (0, 0))
+        self._render_overlay(screen, additional_lights)
         
     def render_with_independent_direction(self, screen, player_x, player_y, absolute_direction, camera_x=0, camera_y=0, additional_lights=None):
         """
@@ -204,6 +192,37 @@ class LightingManager:
         # 更新视野系统（使用独立方向）
         self.vision_system.update_with_independent_direction(screen_player_x, screen_player_y, absolute_direction)
         
+        self._render_overlay(screen, additional_lights)
+
+    def set_quality(self, resolution_scale=1.0, ray_scale=1.0):
+        """设置光照画质
+        
+        Args:
+            resolution_scale: 黑暗遮罩的分辨率比例，小于1时在缩小的表面上合成后放大到屏幕
+            ray_scale: 光线数量相对默认值的比例
+        """
+        self.resolution_scale = resolution_scale
+        self.ray_scale = ray_scale
+        self.vision_system.set_ray_count(self._scaled_ray_count())
+        
+    def _scaled_ray_count(self):
+        """按画质比例缩放后的光线数量"""
+        return max(4, round(DEFAULT_RAY_COUNT * self.ray_scale))
+        
+    def _render_overlay(self, screen, additional_lights):
+        """合成黑暗遮罩（主视野和额外光源处透明）并绘制到屏幕"""
+        if self.resolution_scale < 1.0:
+            # 低画质：在缩小的表面上合成，最后用最近邻放大一次
+            scale = self.resolution_scale
+            final_overlay = pygame.Surface(
+                (int(self.screen_width * scale), int(self.screen_height * scale)), pygame.SRCALPHA)
+            final_overlay.fill((0, 0, 0, self.dark_overlay.darkness_alpha))
+            self._render_main_vision(final_overlay, scale)
+            if additional_lights:
+                self._render_additional_lights(final_overlay, additional_lights, scale)
+            screen.blit(pygame.transform.scale(final_overlay, (self.screen_width, self.screen_height)), (0, 0))
+            return
+        
         # 重新创建黑暗遮罩，确保每次渲染都是干净的
         self.dark_overlay._create_overlay()
         
@@ -284,35 +303,38 @@ class LightingManager:
         """检查指定点是否在光照范围内"""
         return self.vision_system.is_in_vision(x, y)
         
-    def _render_main_vision(self, final_overlay):
+    def _render_main_vision(self, final_overlay, scale=1.0):
         """
         渲染主视野系统（忍者蛙的光照）到最终遮罩
         
         Args:
             final_overlay: 最终的黑暗遮罩
+            scale: 遮罩分辨率比例
         """
         # 创建视野遮罩
         vision_mask = self.vision_system.create_vision_mask(
-            self.screen_width, self.screen_height
+            self.screen_width, self.screen_height, scale
         )
         
         # 在视野区域清除黑暗（使用减法混合模式）
         final_overlay.blit(vision_mask, (0, 0), special_flags=pygame.BLEND_RGBA_SUB)
         
-    def _render_additional_lights(self, final_overlay, additional_lights):
+    def _render_additional_lights(self, final_overlay, additional_lights, scale=1.0):
         """
         渲染额外光源到最终遮罩
         
         Args:
             final_overlay: 最终的黑暗遮罩
             additional_lights: 额外光源列表，每个元素为 (x, y, intensity, radius)
+            scale: 遮罩分辨率比例
         """
         if not additional_lights:
             return
             
         for light_x, light_y, intensity, radius in additional_lights:
+            light_x, light_y, radius = light_x * scale, light_y * scale, radius * scale
             # 创建光源遮罩（用于清除黑暗）
-            light_mask = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+            light_mask = pygame.Surface(final_overlay.get_size(), pygame.SRCALPHA)
             
             # 绘制圆形光源遮罩（白色，用于清除黑暗）
             # 使用统一的透明度，不搞渐进效果
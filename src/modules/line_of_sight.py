@@ -0,0 +1,125 @@
+"""
+视线检测
+在碰撞层的格子上做格子级遍历（DDA），判断两点之间是否被墙挡住：
+每次检测只访问线段经过的格子，与墙的数量无关。结果按 (起点格子, 终点格子)
+缓存在一个小的LRU缓存里，站着不动对射的敌人和玩家不会重复遍历。
+武器的穿墙检查、远程敌人的开火判断和近战挥砍的命中判断共用这一个服务。
+"""
+
+from collections import OrderedDict
+
+
+class LineOfSight:
+    """格子级视线检测
+
+    检测的是两个格子中心之间的连线：线段经过的格子（不含起点格子）中有墙即视为被挡住。
+    线段恰好穿过格子角点时，角点两侧的格子只要有一个是墙就视为被挡住（不能从墙角缝隙穿过）。
+    """
+
+    def __init__(self, blocked, columns, rows, tile_width, tile_height, cache_size=1024):
+        """
+        Args:
+            blocked: 每个格子是否被阻挡，长度为 columns * rows 的序列（按行存储）
+            columns: 格子列数
+            rows: 格子行数
+            tile_width: 格子宽度（像素）
+            tile_height: 格子高度（像素）
+            cache_size: LRU缓存的最大条目数，0表示不缓存
+        """
+        self.columns = columns
+        self.rows = rows
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.blocked = bytearray(1 if cell else 0 for cell in blocked)
+        if len(self.blocked) != columns * rows:
+            raise ValueError(f"格子数量不匹配: {len(self.blocked)} != {columns} x {rows}")
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+        # 统计
+        self.hits = 0
+        self.misses = 0
+
+    def tile_at(self, x, y):
+        """世界坐标所在的格子 (列, 行)"""
+        return int(x // self.tile_width), int(y // self.tile_height)
+
+    def is_blocked_tile(self, col, row):
+        """格子是否是墙（地图外视为墙）"""
+        if not (0 <= col < self.columns and 0 <= row < self.rows):
+            return True
+        return bool(self.blocked[row * self.columns + col])
+
+    def is_clear(self, start_x, start_y, end_x, end_y):
+        """两点之间是否没有被墙挡住
+
+        Args:
+            start_x, start_y: 起点世界坐标（所在格子本身不参与判断，贴墙站立时也能开火）
+            end_x, end_y: 终点世界坐标
+
+        Returns:
+            bool: 没有被挡住返回True
+        """
+        return self.is_clear_tiles(self.tile_at(start_x, start_y), self.tile_at(end_x, end_y))
+
+    def is_clear_tiles(self, start, end):
+        """两个格子之间是否没有被墙挡住（带LRU缓存）
+
+        Args:
+            start: 起点格子 (列, 行)
+            end: 终点格子 (列, 行)
+        """
+        if not self.cache_size:
+            return self._traverse(start, end)
+
+        key = (start, end)
+        cache = self._cache
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = self._traverse(start, end)
+        cache[key] = result
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return result
+
+    def _traverse(self, start, end):
+        """沿格子中心连线逐格遍历，经过墙时返回False"""
+        col, row = start
+        end_col, end_row = end
+        dx = abs(end_col - col)
+        dy = abs(end_row - row)
+        step_x = 1 if end_col > col else -1
+        step_y = 1 if end_row > row else -1
+        # 误差项为正时下一步先跨过竖直格线，为负时先跨过水平格线，为0时恰好穿过角点
+        error = dx - dy
+        dx *= 2
+        dy *= 2
+
+        blocked = self.is_blocked_tile
+        while col != end_col or row != end_row:
+            if error > 0:
+                col += step_x
+                error -= dy
+            elif error < 0:
+                row += step_y
+                error += dx
+            else:
+                if blocked(col + step_x, row) or blocked(col, row + step_y):
+                    return False
+                col += step_x
+                row += step_y
+                error += dx - dy
+            if blocked(col, row):
+                return False
+        return True
+
+    def clear_cache(self):
+        """清空缓存和统计"""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
@@ -4,6 +4,9 @@ import pytmx
 import pyscroll
 from pytmx.util_pygame import load_pygame
 from .resource_manager import resource_manager
+from .spawn_sampler import SpawnSampler
+from .wall_geometry import WallGeometry
+from .line_of_sight import LineOfSight
 
 class MapManager:
     """地图管理器类，用于加载和渲染TMX地图文件"""
@@ -112,9 +115,15 @@ class MapManager:
                 # 存储地图数据
                 self.current_map = {
                     'name': map_name,
-                    'tmx_data': self.tmx_data
+                    'tmx_data': self.tmx_data,
+                    'spawn_samplers': {},  # 按出生边界缓存的出生点采样器
+                    'wall_geometry': {},  # 按碰撞层缓存的墙体几何
+                    'line_of_sight': None  # 视线检测服务
                 }
                 
+                # 墙体几何每张地图只编译一次
+                self.get_wall_geometry()
+                
                 # 性能优化：预缓存所有图块
                 self._cache_all_tiles()
                 
@@ -284,48 +293,96 @@ class MapManager:
         return (self.tile_width, self.tile_height)
     
     def get_collision_tiles(self, layer_name="collision"):
-        """获取指定层上的碰撞图块
+        """获取指定层上的碰撞矩形
+        
+        Args:
+            layer_name: 碰撞层的名称
+            
+        Returns:
+            list: 覆盖所有碰撞图块的矩形列表（相邻图块已合并成最大矩形）
+        """
+        geometry = self.get_wall_geometry(layer_name)
+        return geometry.rects if geometry else []
+    
+    def get_wall_geometry(self, layer_name="collision"):
+        """获取指定碰撞层的墙体几何（每张地图、每个层只编译一次）
         
         Args:
             layer_name: 碰撞层的名称
             
         Returns:
-            list: 包含所有碰撞图块的矩形列表
+            WallGeometry: 合并后的墙体矩形和边界线段，没有当前地图时返回None
         """
         if not self.current_map:
-            # print("get_collision_tiles: 没有当前地图")
-            return []
+            return None
             
-        tmx_data = self.current_map['tmx_data']
-        collision_rects = []
-        
-
+        cache = self.current_map.setdefault('wall_geometry', {})
+        if layer_name not in cache:
+            tmx_data = self.current_map['tmx_data']
+            geometry = WallGeometry(self.get_collision_grid(layer_name), tmx_data.width, tmx_data.height,
+                                    self.tile_width, self.tile_height)
+            if not geometry.rects:
+                print(f"get_collision_tiles: 警告: 没有找到碰撞图块数据")
+            cache[layer_name] = geometry
+        return cache[layer_name]
+    
+    def get_collision_grid(self, layer_name="collision"):
+        """获取按格子存储的阻挡标记
         
-        # 查找指定的碰撞层
+        Args:
+            layer_name: 碰撞层的名称
+            
+        Returns:
+            bytearray: 长度为 列数*行数（按行存储），被阻挡的格子为1；没有当前地图时返回None
+        """
+        if not self.current_map:
+            return None
+            
+        tmx_data = self.current_map['tmx_data']
+        columns = tmx_data.width
+        blocked = bytearray(columns * tmx_data.height)
         for layer in tmx_data.visible_layers:
-            layer_name_actual = getattr(layer, 'name', 'unnamed')
-           
-            if hasattr(layer, 'name') and layer.name == layer_name:
-                
-                # 这是一个图块层
-                if hasattr(layer, 'data'):                  
-                    for x, y, gid in layer.iter_data():
-                        if gid:  # 如果图块ID不为0
-                            collision_rects.append(
-                                pygame.Rect(
-                                    x * self.tile_width,
-                                    y * self.tile_height,
-                                    self.tile_width,
-                                    self.tile_height
-                                )
-                            )
-                    
+            if getattr(layer, 'name', None) == layer_name and hasattr(layer, 'data'):
+                for x, y, gid in layer.iter_data():
+                    if gid:
+                        blocked[y * columns + x] = 1
                 break
-
-        if not collision_rects:
-            print(f"get_collision_tiles: 警告: 没有找到碰撞图块数据")
+        return blocked
+    
+    def get_spawn_sampler(self, bounds=None):
+        """获取当前地图的出生点采样器（每张地图、每组边界只计算一次）
+        
+        Args:
+            bounds: 允许出生的世界坐标范围 (min_x, min_y, max_x, max_y)
             
-        return collision_rects
+        Returns:
+            SpawnSampler: 采样器，没有当前地图时返回None
+        """
+        if not self.current_map:
+            return None
+            
+        samplers = self.current_map.setdefault('spawn_samplers', {})
+        key = tuple(bounds) if bounds else None
+        if key not in samplers:
+            tmx_data = self.current_map['tmx_data']
+            samplers[key] = SpawnSampler(self.get_collision_grid(), tmx_data.width, tmx_data.height,
+                                         self.tile_width, self.tile_height, bounds)
+        return samplers[key]
+    
+    def get_line_of_sight(self):
+        """获取当前地图的视线检测服务（每张地图只创建一次，缓存随地图一起丢弃）
+        
+        Returns:
+            LineOfSight: 视线检测服务，没有当前地图时返回None
+        """
+        if not self.current_map:
+            return None
+            
+        if self.current_map.get('line_of_sight') is None:
+            tmx_data = self.current_map['tmx_data']
+            self.current_map['line_of_sight'] = LineOfSight(self.get_collision_grid(), tmx_data.width,
+                                                            tmx_data.height, self.tile_width, self.tile_height)
+        return self.current_map['line_of_sight']
     
     def get_objects(self, layer_name):
         """获取指定对象层上的所有对象
@@ -2,6 +2,21 @@ import pygame
 from .utils import FontManager
 from .upgrade_system import UpgradeManager, UpgradeType, WeaponUpgradeLevel
 from .resource_manager import resource_manager
+from .core import input_source
+
+_overlays = {}
+
+
+def _overlay_surface(size):
+    """获取指定尺寸的半透明黑色背景（所有菜单共用，只创建一次）"""
+    overlay = _overlays.get(size)
+    if overlay is None:
+        overlay = pygame.Surface(size)
+        overlay.fill((0, 0, 0))
+        overlay.set_alpha(128)
+        _overlays[size] = overlay
+    return overlay
+
 
 class Button:
     def __init__(self, x, y, width, height, text, font, color=(200, 200, 200), hover_color=(255, 255, 255)):
@@ -62,11 +77,22 @@ class Menu:
         
     def _create_overlay(self):
         """创建半透明背景"""
-        overlay = pygame.Surface((self.screen.get_width(), self.screen.get_height()))
-        overlay.fill((0, 0, 0))
-        overlay.set_alpha(128)
+        overlay = _overlay_surface(self.screen.get_size())
         self.screen.blit(overlay, (0, 0))
         
+    def render_overlay(self):
+        """只绘制半透明背景（画面冻结时背景会被缓存，之后只重绘菜单本身）"""
+        if self.is_active:
+            self._create_overlay()
+            
+    def content_rect(self):
+        """菜单本身（不含半透明背景）占用的屏幕区域"""
+        rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        for rects in (getattr(self, 'option_rects', None), getattr(self, 'text_rects', None)):
+            if rects:
+                rect.unionall_ip(rects)
+        return rect
+        
     def _draw_menu_background(self):
         """绘制菜单背景"""
         pygame.draw.rect(self.screen, self.bg_color, 
@@ -103,7 +129,7 @@ class PauseMenu(Menu):
                 
         # 鼠标控制
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_source.get_mouse_pos()
             for i, rect in enumerate(self.option_rects):
                 if rect.collidepoint(mouse_pos):
                     resource_manager.play_sound("menu_select")
@@ -111,7 +137,7 @@ class PauseMenu(Menu):
                     
         # 更新鼠标悬停状态
         elif event.type == pygame.MOUSEMOTION:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_source.get_mouse_pos()
             for i, rect in enumerate(self.option_rects):
                 if rect.collidepoint(mouse_pos):
                     if self.selected_index != i:
@@ -136,11 +162,20 @@ class PauseMenu(Menu):
             return "exit"
         return None
         
-    def render(self):
+    def render(self, overlay=True):
+        """渲染菜单
+        
+        Args:
+            overlay: 是否绘制半透明背景
+            
+        Returns:
+            pygame.Rect: 菜单本身占用的区域，未激活时为None
+        """
         if not self.is_active:
-            return
+            return None
             
-        self._create_overlay()
+        if overlay:
+            self._create_overlay()
         self._draw_menu_background()
         
         # 绘制标题
@@ -165,6 +200,8 @@ class PauseMenu(Menu):
                 
             self.screen.blit(text, text_rect)
             self.option_rects.append(text_rect.inflate(20, 10))
+            
+        return self.content_rect()
 
 class GameOverMenu(Menu):
     def __init__(self, screen):
@@ -215,7 +252,7 @@ class GameOverMenu(Menu):
                 
         # 鼠标控制
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_source.get_mouse_pos()
             for i, rect in enumerate(self.option_rects):
                 if rect.collidepoint(mouse_pos):
                     resource_manager.play_sound("menu_select")
@@ -233,11 +270,20 @@ class GameOverMenu(Menu):
             return "exit"
         return None
         
-    def render(self):
+    def render(self, overlay=True):
+        """渲染菜单
+        
+        Args:
+            overlay: 是否绘制半透明背景
+            
+        Returns:
+            pygame.Rect: 菜单本身占用的区域，未激活时为None
+        """
         if not self.is_active:
-            return
+            return None
             
-        self._create_overlay()
+        if overlay:
+            self._create_overlay()
         self._draw_menu_background()
         
         # 根据胜利状态绘制不同的标题
@@ -265,6 +311,8 @@ class GameOverMenu(Menu):
                 
             self.screen.blit(text, text_rect)
             self.option_rects.append(text_rect.inflate(20, 10))
+            
+        return self.content_rect()
 
 class UpgradeMenu(Menu):
     def __init__(self, screen):
@@ -357,7 +405,7 @@ class UpgradeMenu(Menu):
                 
         # 鼠标控制
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_source.get_mouse_pos()
             for i, rect in enumerate(self.option_rects):
                 if rect.collidepoint(mouse_pos):
                     selected_upgrade = self.options[i]
@@ -366,7 +414,7 @@ class UpgradeMenu(Menu):
                     
         # 更新鼠标悬停状态
         elif event.type == pygame.MOUSEMOTION:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_source.get_mouse_pos()
             for i, rect in enumerate(self.option_rects):
                 if rect.collidepoint(mouse_pos):
                     self.selected_index = i
@@ -374,11 +422,20 @@ class UpgradeMenu(Menu):
                     
         return None
         
-    def render(self):
+    def render(self, overlay=True):
+        """渲染菜单
+        
+        Args:
+            overlay: 是否绘制半透明背景
+            
+        Returns:
+            pygame.Rect: 菜单本身占用的区域，未激活时为None
+        """
         if not self.is_active:
-            return
+            return None
             
-        self._create_overlay()
+        if overlay:
+            self._create_overlay()
         self._draw_menu_background()
         
         # 绘制标题
@@ -388,6 +445,7 @@ class UpgradeMenu(Menu):
         
         # 清空并重新计算选项矩形
         self.option_rects = []
+        self.text_rects = []  # 选项文字可能超出选项背景，单独记录
         
         # 绘制选项
         for i, upgrade in enumerate(self.options):
@@ -425,12 +483,12 @@ class UpgradeMenu(Menu):
             # 绘制名称和等级
             name = self.option_font.render(f"{upgrade_type}: {upgrade.name}", True, name_color)
             level = self.desc_font.render(level_text, True, self.level_color)
-            self.screen.blit(name, (self.x + 100, option_y + 15))
-            self.screen.blit(level, (self.x + 100, option_y + 45))
+            self.text_rects.append(self.screen.blit(name, (self.x + 100, option_y + 15)))
+            self.text_rects.append(self.screen.blit(level, (self.x + 100, option_y + 45)))
             
             # 绘制效果描述
             desc = self.desc_font.render(upgrade.description, True, self.text_color)
-            self.screen.blit(desc, (self.x + 100, option_y + 70))
+            self.text_rects.append(self.screen.blit(desc, (self.x + 100, option_y + 70)))
             
             # 绘制具体效果变化
             effects_text = []
@@ -444,7 +502,9 @@ class UpgradeMenu(Menu):
                     effects_text.append(f"{stat}: {value}")
                     
             effects = self.desc_font.render("效果: " + ", ".join(effects_text), True, self.effect_color)
-            self.screen.blit(effects, (self.x + 100, option_y + 95))
+            self.text_rects.append(self.screen.blit(effects, (self.x + 100, option_y + 95)))
             
             # 保存选项矩形
-            self.option_rects.append(option_rect) 
\ No newline at end of file
+            self.option_rects.append(option_rect)
+            
+        return self.content_rect()
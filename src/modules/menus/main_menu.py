@@ -1,5 +1,6 @@
 import pygame
 from ..resource_manager import resource_manager
+from ..core import input_source
 from ..utils import FontManager
 from .options_menu import OptionsMenu
 
@@ -89,14 +90,14 @@ class MainMenu:
                 return self.actions[self.selected_index]
                 
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_source.get_mouse_pos()
             for i, rect in enumerate(self.button_rects):
                 if rect.collidepoint(mouse_pos):
                     resource_manager.play_sound("menu_select")
                     return self.actions[i]
                     
         elif event.type == pygame.MOUSEMOTION:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_source.get_mouse_pos()
             for i, rect in enumerate(self.button_rects):
                 if rect.collidepoint(mouse_pos):
                     if self.selected_index != i:
@@ -149,6 +150,3 @@ class MainMenu:
             logo_rect.centerx = self.screen_center_x - 700 # 向左移动600像素
             logo_rect.y = 50  # 距离顶部150像素（向下移动100像素）
             self.screen.blit(self.logo, logo_rect)
-            
-        # 更新显示
-        pygame.display.flip() 
\ No newline at end of file
@@ -1,5 +1,6 @@
 import pygame
 from ..resource_manager import resource_manager
+from ..core import input_source
 from ..utils import FontManager
 
 class MapHeroSelectMenu:
@@ -107,7 +108,7 @@ class MapHeroSelectMenu:
             return None
             
         # 更新按钮悬停状态
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = input_source.get_mouse_pos()
         old_hover = self.button_hovered
         old_back_hover = self.back_button_hovered
         self.button_hovered = self.button_rect.collidepoint(mouse_pos)
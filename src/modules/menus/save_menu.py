@@ -1,5 +1,6 @@
 import pygame
 from ..resource_manager import resource_manager
+from ..core import input_source
 from ..save_system import SaveSystem
 from ..utils import FontManager
 
@@ -67,7 +68,7 @@ class SaveMenu:
         if self.show_confirm:
             return self._handle_confirm_event(event)
             
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = input_source.get_mouse_pos()
         
         # 更新返回按钮悬停状态
         self.back_button_hover = self.back_button_rect.collidepoint(mouse_pos)
@@ -127,7 +128,7 @@ class SaveMenu:
                 self.show_confirm = False
                 
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            mouse_pos = pygame.mouse.get_pos()
+            mouse_pos = input_source.get_mouse_pos()
             # TODO: 添加确认按钮的点击检测
             
         return None
@@ -43,6 +43,10 @@ class Minimap:
         # 标记大小（放大1.5倍）
         self.marker_size = 6  # 4 * 1.5 = 6
         
+        # 每隔几帧重绘一次小地图内容（画质调节器设置），其余帧复用上次的表面
+        self.refresh_interval = 1
+        self._frames_since_refresh = None  # None表示还没有绘制过
+        
         # 加载小地图图标
         self._load_minimap_icons()
         
@@ -264,6 +268,22 @@ class Minimap:
         
 
         
+        self._frames_since_refresh = 0
+        self.render_cached(screen)
+        
+    def needs_refresh(self):
+        """本帧是否需要重绘小地图内容（每帧调用一次）
+        
+        Returns:
+            bool: True 时调用 render 重绘，否则调用 render_cached
+        """
+        if self._frames_since_refresh is None:
+            return True
+        self._frames_since_refresh += 1
+        return self._frames_since_refresh >= self.refresh_interval
+        
+    def render_cached(self, screen):
+        """绘制上次生成的小地图表面、标题和图例"""
         # 将小地图绘制到屏幕上
         screen.blit(self.surface, (self.minimap_x, self.minimap_y))
         
@@ -0,0 +1,115 @@
+"""
+精灵轮廓
+用遮罩卷积（pygame C实现）膨胀精灵遮罩来生成轮廓层，并按
+（源帧, 颜色, 粗细, 是否翻转）缓存，开启轮廓后每帧只需要多一次blit。
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+def dilate_mask(mask, thickness):
+    """膨胀遮罩
+
+    Args:
+        mask: pygame.mask.Mask
+        thickness: 膨胀半径（像素），使用 (2t+1)x(2t+1) 的方形结构元素
+
+    Returns:
+        pygame.mask.Mask: 与原遮罩同尺寸的膨胀结果（超出边界的部分被裁掉）
+    """
+    if thickness <= 0:
+        return mask.copy()
+    size = 2 * thickness + 1
+    kernel = pygame.mask.Mask((size, size), fill=True)
+    # 卷积结果比原遮罩大 2t，坐标 (x+t, y+t) 对应原遮罩的 (x, y)
+    convolved = mask.convolve(kernel)
+    dilated = pygame.mask.Mask(mask.get_size())
+    dilated.draw(convolved, (-thickness, -thickness))
+    return dilated
+
+
+def build_outline_layer(surface, outline_color=(255, 0, 0), outline_thickness=1):
+    """生成只包含轮廓的透明图层
+
+    Args:
+        surface: 源Surface
+        outline_color: 轮廓颜色(R,G,B)
+        outline_thickness: 轮廓粗细（像素）
+
+    Returns:
+        pygame.Surface: 与源图同尺寸的SRCALPHA图层，只有轮廓像素不透明
+    """
+    mask = pygame.mask.from_surface(surface)
+    outline_mask = dilate_mask(mask, outline_thickness)
+    # 去掉原始形状区域，只保留外圈
+    outline_mask.erase(mask, (0, 0))
+    return outline_mask.to_surface(setcolor=tuple(outline_color[:3]) + (255,),
+                                   unsetcolor=(0, 0, 0, 0))
+
+
+class OutlineCache:
+    """轮廓图层缓存（LRU）
+
+    以源帧对象本身为键，因此要求传入的帧是稳定的对象（动画帧、缓存的变体），
+    不能是每帧新建的Surface。缓存持有源帧的引用，达到上限后淘汰最久未用的条目。
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._layers = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_layer(self, surface, outline_color=(255, 0, 0), outline_thickness=1, flip_x=False):
+        """获取轮廓图层
+
+        Args:
+            surface: 源帧
+            outline_color: 轮廓颜色
+            outline_thickness: 轮廓粗细
+            flip_x: 是否返回水平翻转后的图层（源帧未翻转、绘制时翻转的情况）
+
+        Returns:
+            pygame.Surface: 轮廓图层
+        """
+        key = (surface, tuple(outline_color), outline_thickness, flip_x)
+        layer = self._layers.get(key)
+        if layer is not None:
+            self._layers.move_to_end(key)
+            self.hits += 1
+            return layer
+
+        self.misses += 1
+        layer = build_outline_layer(surface, outline_color, outline_thickness)
+        if flip_x:
+            layer = pygame.transform.flip(layer, True, False)
+        self._layers[key] = layer
+        if len(self._layers) > self.max_entries:
+            self._layers.popitem(last=False)
+        return layer
+
+    def get_outlined(self, surface, outline_color=(255, 0, 0), outline_thickness=1):
+        """获取带轮廓的完整图像（轮廓在下，原图在上）"""
+        key = (surface, tuple(outline_color), outline_thickness, "composite")
+        outlined = self._layers.get(key)
+        if outlined is not None:
+            self._layers.move_to_end(key)
+            self.hits += 1
+            return outlined
+
+        outlined = self.get_layer(surface, outline_color, outline_thickness).copy()
+        outlined.blit(surface, (0, 0))
+        self._layers[key] = outlined
+        if len(self._layers) > self.max_entries:
+            self._layers.popitem(last=False)
+        return outlined
+
+    def clear(self):
+        """清空缓存"""
+        self._layers.clear()
+
+
+# 全局轮廓缓存
+outline_cache = OutlineCache()
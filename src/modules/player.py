@@ -1,13 +1,15 @@
 import pygame
 import math
 from .resource_manager import resource_manager
+from .core import input_source
 from .weapons.types.knife import Knife
 # from .weapons.types.fireball import Fireball
 # from .weapons.types.frost_nova import FrostNova
 from .weapons.types.bullet import BulletWeapon
 from .upgrade_system import UpgradeType, WeaponUpgradeLevel, PassiveUpgradeLevel
 from .hero_config import get_hero_config
-from .utils import create_outlined_sprite
+from .outline import outline_cache
+from .hud_widgets import CooldownIconWidget
 from .components.components import (
     MovementComponent,
     AnimationComponent,
@@ -35,6 +37,9 @@ class Player(pygame.sprite.Sprite):
         self.keys_collected = 0  # 收集的钥匙数量
         self.total_keys_needed = 3  # 需要收集的总钥匙数量
         
+        # 跑步动画计时
+        self.run_cycle_time = 0.0
+        
         # 初始化各组件
         self._init_components()
         
@@ -79,6 +84,7 @@ class Player(pygame.sprite.Sprite):
         self.phase_cooldown = 15.0  # 穿墙CD时间
         self.phase_cooldown_timer = 0  # 穿墙CD计时器
         self.phase_icon = None  # 穿墙技能图标
+        self.phase_cooldown_widget = CooldownIconWidget(48)  # 穿墙技能CD显示控件
         
         # 武器切换相关（仅对神秘剑士）
         self.is_ranged_mode = True  # True为远程模式，False为近战模式
@@ -277,6 +283,9 @@ class Player(pygame.sprite.Sprite):
             if self.phase_cooldown_timer < 0:
                 self.phase_cooldown_timer = 0
         
+        # 跑步动画轮播使用游戏时间，保证回放时动画帧（以及遮罩）一致
+        self.run_cycle_time += dt
+        
         # 更新各组件（始终更新）
         self.movement.update(dt)
         self.animation.update(dt)
@@ -332,25 +341,30 @@ class Player(pygame.sprite.Sprite):
         """渲染玩家"""
         if not self.health_component.invincible or self.animation.visible:
             # 如果在穿墙状态，使用特殊动画
+            flip_x = False
             if hasattr(self, 'phase_through_walls') and self.phase_through_walls and hasattr(self, 'phase_animation_image') and self.phase_animation_image:
                 # 使用穿墙动画图片
                 current_frame = self.phase_animation_image
+                source_frame = current_frame
             else:
                 # 获取当前动画帧
-                current_frame = self.animation.get_current_frame(not self.movement.facing_right)
+                flip_x = not self.movement.facing_right
+                current_frame = self.animation.get_current_frame(flip_x)
+                # 未翻转的原始帧是稳定对象，用作轮廓缓存的键
+                source_frame = self.animation.get_current_frame()
             
             if current_frame:
                 # 图像已经是64x64像素，不需要缩放
                 if self.show_outline:
-                    # 创建带轮廓的图像
-                    outlined_image = create_outlined_sprite(
-                        current_frame,
+                    # 先绘制缓存的轮廓层
+                    outline_layer = outline_cache.get_layer(
+                        source_frame,
                         outline_color=self.outline_color,
-                        outline_thickness=self.outline_thickness
+                        outline_thickness=self.outline_thickness,
+                        flip_x=flip_x
                     )
-                    screen.blit(outlined_image, self.rect)
-                else:
-                    screen.blit(current_frame, self.rect)
+                    screen.blit(outline_layer, self.rect)
+                screen.blit(current_frame, self.rect)
             
     def _update_animation_state(self):
         """更新动画状态"""
@@ -363,8 +377,7 @@ class Player(pygame.sprite.Sprite):
             # 根据移动状态切换动画
             if self.movement.is_moving():
                 # 行走时在4个run动画之间轮播
-                current_time = pygame.time.get_ticks() / 1000.0
-                run_cycle = int(current_time * 10) % 4  # 每0.1秒切换一次
+                run_cycle = int(self.run_cycle_time * 10) % 4  # 每0.1秒切换一次
                 
                 if run_cycle == 0:
                     self.animation.set_animation('run')
@@ -407,7 +420,8 @@ class Player(pygame.sprite.Sprite):
         
     def update_weapons(self, dt):
         """更新所有武器状态"""
-        self.weapon_manager.update(dt)
+        enemy_manager = getattr(self.game, 'enemy_manager', None) if self.game else None
+        self.weapon_manager.update(dt, enemy_manager.query if enemy_manager else None)
         
     def render_weapons(self, screen, camera_x, camera_y, attack_direction_x=None, attack_direction_y=None):
         """渲染所有武器"""
@@ -448,7 +462,7 @@ class Player(pygame.sprite.Sprite):
         
         # 获取鼠标方向
         if self.game and hasattr(self.game, 'screen'):
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = input_source.get_mouse_pos()
             screen_center_x = self.game.screen.get_width() // 2
             screen_center_y = self.game.screen.get_height() // 2
             
@@ -625,29 +639,8 @@ class Player(pygame.sprite.Sprite):
             pygame.draw.circle(self.phase_icon, (0, 255, 255), (icon_size // 2, icon_size // 2), icon_size // 2)
             
         
-        # 创建带黄色边框的图标
-        bordered_icon = pygame.Surface((icon_size + 4, icon_size + 4), pygame.SRCALPHA)
-        # 绘制黄色边框
-        pygame.draw.rect(bordered_icon, (255, 255, 0), (0, 0, icon_size + 4, icon_size + 4), 2)
-        # 绘制图标
-        bordered_icon.blit(self.phase_icon, (2, 2))
-        
-        # 渲染图标
-        screen.blit(bordered_icon, (x - 2, y - 2))
-        
-        # 如果CD中，渲染半透明遮罩和CD时间
-        if self.phase_cooldown_timer > 0:
-            # 创建半透明遮罩
-            overlay = pygame.Surface((icon_size, icon_size), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 128))  # 半透明黑色
-            screen.blit(overlay, (x, y))
-            
-            # 渲染CD时间
-            font = pygame.font.SysFont('simHei', 24)
-            cd_text = f"{self.phase_cooldown_timer:.1f}"
-            text_surface = font.render(cd_text, True, (255, 255, 255))
-            text_rect = text_surface.get_rect(center=(x + icon_size // 2, y + icon_size // 2))
-            screen.blit(text_surface, text_rect)
+        # 边框图标、冷却遮罩和冷却文字由控件缓存
+        self.phase_cooldown_widget.render(screen, x, y, self.phase_icon, self.phase_cooldown_timer)
     
     def _load_phase_animation(self):
         """加载穿墙时的特殊动画"""
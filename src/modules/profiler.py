@@ -0,0 +1,378 @@
+"""
+性能分析工具
+按阶段累计 Game.update / Game.render 各子系统的耗时（纳秒），
+并在滚动窗口中保存逐帧样本，用于百分位统计和离线分析；
+另外提供按需的 cProfile 采集和 tracemalloc 内存分配对比
+"""
+
+import cProfile
+import csv
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from collections import deque
+from time import perf_counter_ns
+
+# 采集结果默认输出目录
+DEFAULT_PROFILE_DIR = "profiles"
+
+# 更新阶段
+UPDATE_PHASES = ("player", "enemies", "projectiles", "items", "collisions")
+# 渲染阶段
+RENDER_PHASES = ("map", "entities", "lighting", "ui", "minimap", "present")
+# 随样本一起记录的计数（非耗时）
+COUNTERS = ("enemies_near", "enemies_mid", "enemies_far")
+
+
+class PhaseTimer:
+    """分阶段计时器
+
+    采用"分圈"方式计时：start() 记下起点，之后每次 lap(name) 把距上一次
+    打点的耗时记到 name 阶段上。同一阶段可以多次打点，耗时会累加。
+    未启用时所有方法直接返回，几乎没有开销。
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._last = 0
+        self.frame = {}    # 当前帧各阶段耗时
+        self.totals = {}   # 所有帧累计耗时
+        self.frames = 0
+
+    def start(self):
+        """开始一段连续计时"""
+        if self.enabled:
+            self._last = perf_counter_ns()
+
+    def lap(self, name):
+        """把距上一次打点的耗时记到指定阶段"""
+        if not self.enabled:
+            return
+        now = perf_counter_ns()
+        self.frame[name] = self.frame.get(name, 0) + now - self._last
+        self._last = now
+
+    def end_frame(self):
+        """结束当前帧，累计并返回本帧各阶段耗时"""
+        if not self.enabled:
+            return None
+        frame = self.frame
+        for name, value in frame.items():
+            self.totals[name] = self.totals.get(name, 0) + value
+        self.frames += 1
+        self.frame = {}
+        return frame
+
+    def reset(self):
+        """清空所有统计"""
+        self.frame = {}
+        self.totals = {}
+        self.frames = 0
+
+    def averages_ms(self):
+        """获取各阶段的平均每帧耗时（毫秒）"""
+        if self.frames == 0:
+            return {}
+        return {name: total / self.frames / 1e6 for name, total in self.totals.items()}
+
+
+class FrameProfiler:
+    """逐帧性能采样器
+
+    每帧记录一个样本：帧间隔（两次 record 之间的墙钟时间，包含等待垂直同步等开销）
+    以及 PhaseTimer 给出的各阶段耗时。样本保存在固定长度的滚动窗口中，
+    也可以同时写入CSV或JSONL文件供离线分析。
+    """
+
+    def __init__(self, window=300):
+        """
+        Args:
+            window: 滚动窗口保存的样本帧数
+        """
+        self.samples = deque(maxlen=window)
+        self.frame_index = 0
+        self._last_ns = None
+        self._stream = None
+        self._stream_format = None
+        self._csv_writer = None
+        self.stream_path = None
+
+    def record(self, phases, counters=None):
+        """记录一帧样本
+
+        Args:
+            phases: {阶段名: 耗时纳秒}，通常是 PhaseTimer.end_frame() 的返回值
+            counters: {计数名: 数值}，原样写入样本，如各LOD层级的敌人数量
+
+        Returns:
+            dict: 本帧样本 {"frame": 帧序号, "frame_ms": 帧间隔, 阶段名: 毫秒..., 计数名: 数值...}
+        """
+        now = perf_counter_ns()
+        phases_ms = {name: value / 1e6 for name, value in (phases or {}).items()}
+        if self._last_ns is None:
+            # 第一帧没有间隔，用各阶段耗时之和代替
+            frame_ms = sum(phases_ms.values())
+        else:
+            frame_ms = (now - self._last_ns) / 1e6
+        self._last_ns = now
+
+        sample = {"frame": self.frame_index, "frame_ms": frame_ms}
+        sample.update(phases_ms)
+        if counters:
+            sample.update(counters)
+        self.samples.append(sample)
+        self.frame_index += 1
+
+        if self._stream:
+            self._write_sample(sample)
+        return sample
+
+    def reset(self):
+        """清空滚动窗口（不影响正在写入的文件）"""
+        self.samples.clear()
+        self._last_ns = None
+
+    def percentiles(self, ranks=(50, 95, 99)):
+        """计算滚动窗口内帧间隔的百分位数（最近秩法）
+
+        Returns:
+            dict: {百分位: 毫秒}，窗口为空时返回空字典
+        """
+        if not self.samples:
+            return {}
+        values = sorted(sample["frame_ms"] for sample in self.samples)
+        count = len(values)
+        result = {}
+        for rank in ranks:
+            index = max(0, min(count - 1, -(-rank * count // 100) - 1))
+            result[rank] = values[index]
+        return result
+
+    def phase_averages_ms(self, phases=UPDATE_PHASES + RENDER_PHASES):
+        """计算滚动窗口内各阶段的平均耗时（毫秒）"""
+        if not self.samples:
+            return {}
+        count = len(self.samples)
+        return {
+            name: sum(sample.get(name, 0.0) for sample in self.samples) / count
+            for name in phases
+        }
+
+    @property
+    def is_streaming(self):
+        return self._stream is not None
+
+    def open_stream(self, path):
+        """开始把样本写入文件
+
+        Args:
+            path: 输出路径，扩展名为 .csv 时写CSV，否则写JSONL（每行一个JSON对象）
+        """
+        self.close_stream()
+        self._stream = open(path, "w", encoding="utf-8", newline="")
+        self.stream_path = path
+        if path.lower().endswith(".csv"):
+            self._stream_format = "csv"
+            self._csv_writer = csv.DictWriter(
+                self._stream,
+                fieldnames=["frame", "frame_ms"] + list(UPDATE_PHASES) + list(RENDER_PHASES) + list(COUNTERS),
+                extrasaction="ignore",
+                restval=0.0,
+            )
+            self._csv_writer.writeheader()
+        else:
+            self._stream_format = "jsonl"
+
+    def close_stream(self):
+        """停止写入并关闭文件"""
+        if self._stream:
+            self._stream.close()
+        self._stream = None
+        self._stream_format = None
+        self._csv_writer = None
+        self.stream_path = None
+
+    def _write_sample(self, sample):
+        if self._stream_format == "csv":
+            self._csv_writer.writerow(sample)
+        else:
+            self._stream.write(json.dumps(sample) + "\n")
+
+
+class CaptureProfiler:
+    """按需的 cProfile 采集
+
+    start() 之后对接下来的N帧做函数级采样，每帧结束时调用 frame_end()，
+    到达帧数后自动停止，写出 .prof 文件（可用 snakeviz / pstats 查看）
+    和一份按累计耗时、自身耗时排序的前N项文本摘要。
+    """
+
+    def __init__(self, output_dir=DEFAULT_PROFILE_DIR, frames=300, top_n=30):
+        """
+        Args:
+            output_dir: 输出目录
+            frames: 默认采集帧数
+            top_n: 文本摘要中列出的函数数量
+        """
+        self.output_dir = output_dir
+        self.frames = frames
+        self.top_n = top_n
+        self._profile = None
+        self._remaining = 0
+        self._captured = 0
+        self.last_result = None  # (prof路径, 摘要路径)
+
+    @property
+    def is_active(self):
+        return self._profile is not None
+
+    @property
+    def remaining(self):
+        """本次采集还剩的帧数"""
+        return self._remaining
+
+    def start(self, frames=None):
+        """开始采集
+
+        Args:
+            frames: 采集帧数，默认使用构造时的设置
+
+        Returns:
+            bool: 是否成功开始（已有采集进行中时返回False）
+        """
+        if self._profile is not None:
+            return False
+        self._remaining = max(1, int(frames or self.frames))
+        self._captured = 0
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        return True
+
+    def frame_end(self):
+        """通知一帧结束
+
+        Returns:
+            tuple: 采集完成时返回 (prof路径, 摘要路径)，否则返回None
+        """
+        if self._profile is None:
+            return None
+        self._captured += 1
+        self._remaining -= 1
+        if self._remaining > 0:
+            return None
+        return self.stop()
+
+    def stop(self):
+        """立即结束采集并写出结果
+
+        Returns:
+            tuple: (prof路径, 摘要路径)，没有进行中的采集时返回None
+        """
+        if self._profile is None:
+            return None
+        profile = self._profile
+        profile.disable()
+        self._profile = None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"cprofile_{time.strftime('%Y%m%d_%H%M%S')}_{self._captured}f")
+        prof_path = base + ".prof"
+        summary_path = base + ".txt"
+        profile.dump_stats(prof_path)
+
+        stream = io.StringIO()
+        stream.write(f"cProfile 采集: {self._captured} 帧\n\n")
+        stats = pstats.Stats(profile, stream=stream)
+        stats.strip_dirs()
+        stream.write(f"== 按累计耗时排序（前{self.top_n}项）==\n")
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+        stream.write(f"== 按自身耗时排序（前{self.top_n}项）==\n")
+        stats.sort_stats("tottime").print_stats(self.top_n)
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write(stream.getvalue())
+
+        self.last_result = (prof_path, summary_path)
+        return self.last_result
+
+
+class AllocationTracker:
+    """tracemalloc 内存分配对比
+
+    每次 snapshot() 拍一张快照，并与上一张比较，按模块（文件）和代码行
+    列出增长最多的分配，同时给出两次快照之间平均每帧的增长量。
+    第一次调用时才开始跟踪，因此第一张快照只作为基准。
+    """
+
+    # 不参与统计的分配来源
+    IGNORED_FILES = ("<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>",
+                     "<unknown>", tracemalloc.__file__)
+
+    def __init__(self, output_dir=DEFAULT_PROFILE_DIR, top_n=20, frames=25):
+        """
+        Args:
+            output_dir: 输出目录
+            top_n: 报告中列出的条目数量
+            frames: 调用栈记录的深度
+        """
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.stack_frames = frames
+        self._previous = None
+        self._frames_since = 0
+        self._started_tracing = False
+        self.last_report = None
+
+    @property
+    def is_tracing(self):
+        return tracemalloc.is_tracing()
+
+    def frame_end(self):
+        """通知一帧结束（用于换算每帧分配量）"""
+        if self._previous is not None:
+            self._frames_since += 1
+
+    def snapshot(self):
+        """拍摄快照并与上一张比较
+
+        Returns:
+            str: 对比报告文件路径；只有基准快照时返回None
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.stack_frames)
+            self._started_tracing = True
+
+        current = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, pattern) for pattern in self.IGNORED_FILES]
+        )
+        previous, frames = self._previous, self._frames_since
+        self._previous = current
+        self._frames_since = 0
+        if previous is None:
+            return None
+
+        stream = io.StringIO()
+        stream.write(f"tracemalloc 对比: 间隔 {frames} 帧\n\n")
+        for title, key_type in (("按模块", "filename"), ("按代码行", "lineno")):
+            stream.write(f"== {title}（前{self.top_n}项）==\n")
+            for stat in current.compare_to(previous, key_type)[:self.top_n]:
+                per_frame = stat.size_diff / frames if frames else 0
+                stream.write(f"{stat}  每帧 {per_frame / 1024:+.2f} KiB\n")
+            stream.write("\n")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"tracemalloc_{time.strftime('%Y%m%d_%H%M%S')}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(stream.getvalue())
+        self.last_report = path
+        return path
+
+    def stop(self):
+        """停止跟踪并丢弃快照（只停止由本对象开启的跟踪）"""
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started_tracing = False
+        self._previous = None
+        self._frames_since = 0
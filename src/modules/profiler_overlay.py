@@ -0,0 +1,122 @@
+import pygame
+from .profiler import UPDATE_PHASES, RENDER_PHASES, COUNTERS
+from .hud_widgets import surface_counter
+
+# 各阶段在柱状图中的颜色
+PHASE_COLORS = {
+    "player": (100, 200, 255),
+    "enemies": (255, 120, 120),
+    "projectiles": (255, 200, 80),
+    "items": (150, 230, 120),
+    "collisions": (220, 130, 255),
+    "map": (80, 160, 120),
+    "entities": (255, 160, 60),
+    "lighting": (240, 240, 140),
+    "ui": (140, 180, 255),
+    "minimap": (180, 140, 220),
+    "present": (160, 160, 160),
+}
+
+
+class ProfilerOverlay:
+    """性能分析浮层
+
+    显示滚动窗口内帧间隔的 p50/p95/p99，以及各阶段平均耗时的柱状图。
+    柱长以一帧的预算（默认60FPS即16.7ms）为满格。
+    """
+
+    def __init__(self, screen, frame_budget_ms=1000.0 / 60.0):
+        self.screen = screen
+        self.frame_budget_ms = frame_budget_ms
+        self.font = pygame.font.SysFont('simHei', 16)
+        self.title_font = pygame.font.SysFont('simHei', 18)
+
+        self.padding = 10
+        self.line_height = 20
+        self.label_width = 90
+        self.bar_width = 160
+        self.value_width = 70
+
+        phase_count = len(UPDATE_PHASES) + len(RENDER_PHASES)
+        self.width = self.padding * 2 + self.label_width + self.bar_width + self.value_width
+        # 标题 + 百分位 + HUD表面计数 + 敌人LOD分布 + 两个分组标题 + 各阶段
+        self.height = self.padding * 2 + self.line_height * (phase_count + 6)
+
+        # 背景只创建一次，避免每帧分配表面
+        self.background = pygame.Surface((self.width, self.height))
+        self.background.set_alpha(170)
+        self.background.fill((0, 0, 0))
+
+    def render(self, frame_profiler):
+        """渲染浮层
+
+        Args:
+            frame_profiler: FrameProfiler实例
+
+        Returns:
+            pygame.Rect: 浮层占用的区域
+        """
+        x = self.padding
+        y = (self.screen.get_height() - self.height) // 2
+
+        self.screen.blit(self.background, (x, y))
+        pygame.draw.rect(self.screen, (100, 100, 100), (x, y, self.width, self.height), 1)
+
+        text_x = x + self.padding
+        line_y = y + self.padding
+
+        samples = len(frame_profiler.samples)
+        title = self.title_font.render(f"性能分析 ({samples}帧)", True, (255, 255, 255))
+        self.screen.blit(title, (text_x, line_y))
+        line_y += self.line_height
+
+        percentiles = frame_profiler.percentiles()
+        if percentiles:
+            text = "  ".join(f"p{rank}: {value:.1f}ms" for rank, value in percentiles.items())
+        else:
+            text = "等待样本..."
+        color = (255, 255, 255)
+        if percentiles and percentiles[99] > self.frame_budget_ms:
+            color = (255, 160, 100)
+        self.screen.blit(self.font.render(text, True, color), (text_x, line_y))
+        line_y += self.line_height
+
+        # 上一帧HUD控件新建的表面数量，数值不变时应为0
+        allocations = surface_counter.last_frame
+        text = f"HUD新建表面: {allocations}/帧"
+        color = (255, 160, 100) if allocations else (200, 200, 200)
+        self.screen.blit(self.font.render(text, True, color), (text_x, line_y))
+        line_y += self.line_height
+
+        # 最近一帧各细节层级的敌人数量
+        latest = frame_profiler.samples[-1] if frame_profiler.samples else {}
+        text = "敌人LOD 近/中/远: " + "/".join(str(latest.get(name, 0)) for name in COUNTERS)
+        self.screen.blit(self.font.render(text, True, (200, 200, 200)), (text_x, line_y))
+        line_y += self.line_height
+
+        averages = frame_profiler.phase_averages_ms()
+        for group_name, phases in (("更新", UPDATE_PHASES), ("渲染", RENDER_PHASES)):
+            self.screen.blit(self.font.render(group_name, True, (200, 200, 200)), (text_x, line_y))
+            line_y += self.line_height
+            for phase in phases:
+                self._render_phase_bar(phase, averages.get(phase, 0.0), text_x, line_y)
+                line_y += self.line_height
+
+        return pygame.Rect(x, y, self.width, self.height)
+
+    def _render_phase_bar(self, phase, value_ms, x, y):
+        """渲染单个阶段的柱条"""
+        self.screen.blit(self.font.render(phase, True, (220, 220, 220)), (x, y))
+
+        bar_x = x + self.label_width
+        bar_height = self.line_height - 6
+        pygame.draw.rect(self.screen, (60, 60, 60), (bar_x, y + 3, self.bar_width, bar_height), 1)
+
+        ratio = min(1.0, value_ms / self.frame_budget_ms) if self.frame_budget_ms > 0 else 0.0
+        fill_width = int(self.bar_width * ratio)
+        if fill_width > 0:
+            color = PHASE_COLORS.get(phase, (200, 200, 200))
+            pygame.draw.rect(self.screen, color, (bar_x, y + 3, fill_width, bar_height))
+
+        value = self.font.render(f"{value_ms:.2f}ms", True, (255, 255, 255))
+        self.screen.blit(value, (bar_x + self.bar_width + 8, y))
@@ -0,0 +1,136 @@
+"""
+渲染队列
+各子系统不再各自判断屏幕范围并逐个 screen.blit，而是把 (表面, 屏幕坐标, 图层)
+提交到队列：提交时统一用相机矩形做一次视野剔除，帧内按图层排序后用
+Surface.blits 一次性绘制，把实体绘制合并成少数几次C层调用。
+
+同一图层内保持提交顺序，因此只要子系统按原来的先后顺序提交，
+绘制结果与逐个blit完全一致。
+"""
+
+import pygame
+
+# 世界层图层（数值越小越先绘制），顺序与原来各子系统的绘制顺序一致
+LAYER_SPAWN_MARKERS = 0
+LAYER_ROUND_MESSAGES = 5
+LAYER_ENEMIES = 10
+LAYER_ENEMY_PROJECTILES = 20
+LAYER_ITEMS = 30
+LAYER_SUPPLIES = 40
+LAYER_TELEPORT_ITEMS = 50
+LAYER_PROJECTILES = 60
+
+
+class RenderQueue:
+    """按图层收集并批量绘制的渲染队列"""
+
+    def __init__(self, margin=100):
+        """
+        Args:
+            margin: 视野剔除时屏幕四周额外保留的像素（血条、文字等会超出精灵范围）
+        """
+        self.margin = margin
+        self.target = None
+        self.origin_x = 0
+        self.origin_y = 0
+        self.view = pygame.Rect(0, 0, 0, 0)
+        self._items = []
+
+        # 统计（最近一次flush）
+        self.submitted = 0
+        self.culled = 0
+        self.drawn = 0
+
+    @classmethod
+    def started(cls, screen, camera_x, camera_y, margin=100):
+        """创建并开始一个队列（供没有传入共享队列的调用方使用）"""
+        queue = cls(margin)
+        queue.begin(screen, camera_x, camera_y)
+        return queue
+
+    def begin(self, screen, camera_x, camera_y):
+        """开始新的一帧
+
+        Args:
+            screen: 绘制目标
+            camera_x: 相机X坐标（屏幕中心对应的世界坐标）
+            camera_y: 相机Y坐标
+        """
+        self.target = screen
+        width, height = screen.get_size()
+        # 屏幕坐标 = 世界坐标 + origin
+        self.origin_x = width // 2 - camera_x
+        self.origin_y = height // 2 - camera_y
+        self.view = pygame.Rect(-self.margin, -self.margin,
+                                width + self.margin * 2, height + self.margin * 2)
+        self._items.clear()
+        self.submitted = 0
+        self.culled = 0
+
+    @property
+    def world_view(self):
+        """视野剔除矩形对应的世界坐标矩形（用于空间索引查询）"""
+        return self.view.move(-self.origin_x, -self.origin_y)
+
+    def to_screen(self, world_x, world_y):
+        """世界坐标转换为屏幕坐标"""
+        return world_x + self.origin_x, world_y + self.origin_y
+
+    def is_visible(self, x, y, width, height):
+        """判断屏幕坐标下的矩形是否在视野内"""
+        view = self.view
+        return (x + width > view.left and x < view.right and
+                y + height > view.top and y < view.bottom)
+
+    def submit(self, surface, dest, layer=0):
+        """提交一个绘制项（不做剔除）
+
+        Args:
+            surface: 要绘制的表面
+            dest: 屏幕坐标（左上角）或Rect
+            layer: 图层
+        """
+        self._items.append((layer, surface, dest))
+        self.submitted += 1
+
+    def submit_culled(self, surface, x, y, layer=0):
+        """提交一个绘制项，完全在视野外时丢弃
+
+        Returns:
+            bool: 是否被提交
+        """
+        self.submitted += 1
+        width, height = surface.get_size()
+        if not self.is_visible(x, y, width, height):
+            self.culled += 1
+            return False
+        self._items.append((layer, surface, (x, y)))
+        return True
+
+    def submit_many(self, items, layer=0):
+        """按顺序提交多个 (surface, dest) 绘制项"""
+        append = self._items.append
+        for surface, dest in items:
+            append((layer, surface, dest))
+        self.submitted += len(items)
+
+    def flush(self):
+        """按图层排序并绘制所有绘制项
+
+        Returns:
+            int: 绘制的数量
+        """
+        items = self._items
+        if items:
+            items.sort(key=_layer_of)  # 稳定排序，同层保持提交顺序
+            self.target.blits([(surface, dest) for _, surface, dest in items], False)
+        self.drawn = len(items)
+        items.clear()
+        return self.drawn
+
+    def __len__(self):
+        return len(self._items)
+
+
+def _layer_of(item):
+    return item[0]
@@ -0,0 +1,243 @@
+"""
+录像与回放
+录制一局游戏的随机数种子和逐tick输入（按住的按键、鼠标位置、事件、dt），
+回放时以相同种子重新开局并逐tick注入同样的输入，从而复现同一局游戏。
+适合在改动前后重跑同一段高负载的后期对局，对比帧耗时曲线。
+
+文件格式为gzip压缩的JSON Lines：第一行是头信息，之后每行一个tick，
+只记录与上一tick相比发生变化的字段。
+"""
+
+import gzip
+import json
+import zlib
+
+import pygame
+
+from .core import input_source
+from .core.game_random import rng
+from .simulation import InputController
+from .weapons.weapons_data import WEAPONS_CONFIG
+from .weapons.weapon_stats import WeaponStatType
+
+REPLAY_VERSION = 1
+
+# 每隔多少tick记录一次状态校验值
+CHECKSUM_INTERVAL = 60
+
+# 录制按键状态时检查的按键（pygame中所有K_常量）
+KEY_CODES = sorted({getattr(pygame, name) for name in dir(pygame) if name.startswith("K_")})
+
+# 录制事件时保留的属性（其余属性如window对象无法序列化，游戏逻辑也不使用）
+EVENT_FIELDS = ("key", "mod", "unicode", "scancode", "pos", "rel", "button", "buttons", "x", "y")
+
+
+def state_checksum(game):
+    """计算当前对局状态的校验值，用于发现回放偏差
+
+    Args:
+        game: Game实例
+
+    Returns:
+        int: CRC32校验值
+    """
+    values = [game.game_time, game.kill_num, rng.getstate()]
+    if game.dual_player_system:
+        for player in game.dual_player_system.get_players():
+            values.extend((player.world_x, player.world_y, player.health))
+    elif game.player:
+        values.extend((game.player.world_x, game.player.world_y, game.player.health))
+    if game.enemy_manager:
+        for enemy in game.enemy_manager.enemies:
+            values.extend((enemy.rect.centerx, enemy.rect.centery, enemy.health))
+    return zlib.crc32(repr(values).encode("utf-8"))
+
+
+def _weapon_rolls():
+    """获取武器配置中导入时随机生成的伤害值
+
+    weapons_data 在模块导入时用全局 random 生成部分伤害值，早于开局设置种子，
+    所以录像需要把它们保存下来，回放时原样恢复。
+    """
+    return {
+        weapon_type: [level["effects"].get(WeaponStatType.DAMAGE) for level in config["levels"]]
+        for weapon_type, config in WEAPONS_CONFIG.items()
+    }
+
+
+def _restore_weapon_rolls(rolls):
+    for weapon_type, damages in rolls.items():
+        config = WEAPONS_CONFIG.get(weapon_type)
+        if not config:
+            continue
+        for level, damage in zip(config["levels"], damages):
+            if damage is not None:
+                level["effects"][WeaponStatType.DAMAGE] = damage
+
+
+def _serialize_event(event):
+    attrs = {}
+    for field in EVENT_FIELDS:
+        if hasattr(event, field):
+            value = getattr(event, field)
+            attrs[field] = list(value) if isinstance(value, tuple) else value
+    return [event.type, attrs]
+
+
+def _deserialize_event(data):
+    event_type, attrs = data
+    attrs = {key: tuple(value) if isinstance(value, list) else value for key, value in attrs.items()}
+    return pygame.event.Event(event_type, attrs)
+
+
+class ReplayRecorder:
+    """录像录制器
+
+    开局时由 Game 创建，之后 Game.handle_event 把交给游戏的事件传进来，
+    Game.update 在每个tick开始时调用 record_tick()。
+    """
+
+    def __init__(self, path, header):
+        """
+        Args:
+            path: 输出文件路径
+            header: 头信息（种子、地图、英雄等）
+        """
+        self.path = path
+        self.header = dict(header, version=REPLAY_VERSION, weapon_rolls=_weapon_rolls())
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._file.write(json.dumps(self.header, ensure_ascii=False) + "\n")
+        self._pending_events = []
+        self._last_dt = None
+        self._last_keys = []
+        self._last_mouse = None
+        self.ticks = 0
+
+    def record_event(self, event):
+        """记录一个交给游戏处理的事件"""
+        self._pending_events.append(_serialize_event(event))
+
+    def record_tick(self, game, dt):
+        """记录一个tick的输入
+
+        Args:
+            game: Game实例（用于计算状态校验值）
+            dt: 本tick的时间步长
+        """
+        record = {}
+        if dt != self._last_dt:
+            record["d"] = dt
+            self._last_dt = dt
+
+        pressed = input_source.get_pressed()
+        keys = [key for key in KEY_CODES if pressed[key]]
+        if keys != self._last_keys:
+            record["k"] = keys
+            self._last_keys = keys
+
+        mouse = list(input_source.get_mouse_pos())
+        if mouse != self._last_mouse:
+            record["m"] = mouse
+            self._last_mouse = mouse
+
+        if self._pending_events:
+            record["e"] = self._pending_events
+            self._pending_events = []
+
+        if self.ticks % CHECKSUM_INTERVAL == 0:
+            record["c"] = state_checksum(game)
+
+        self._file.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n")
+        self.ticks += 1
+
+    def close(self):
+        """结束录制"""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def load_replay(path):
+    """读取录像文件
+
+    Returns:
+        tuple: (头信息, tick列表)
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        ticks = [json.loads(line) for line in f if line.strip()]
+    if header.get("version") != REPLAY_VERSION:
+        raise ValueError(f"不支持的录像版本: {header.get('version')}")
+    return header, ticks
+
+
+class ReplayController(InputController):
+    """回放控制器
+
+    作为 HeadlessSimulation 的控制器使用：每个tick把录制的按键、鼠标和事件
+    注入游戏，并返回录制的dt。遇到校验值不一致时记录第一次出现偏差的tick。
+    """
+
+    def __init__(self, header, ticks):
+        super().__init__()
+        self.header = header
+        self.ticks = ticks
+        self.index = 0
+        self.dt = None
+        self.keys = []
+        self.mouse = None
+        self.checksums_checked = 0
+        self.divergence_tick = None
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(*load_replay(path))
+
+    @property
+    def finished(self):
+        return self.index >= len(self.ticks)
+
+    @property
+    def duration(self):
+        """录像的总时长（秒）"""
+        total = 0.0
+        dt = 0.0
+        for record in self.ticks:
+            dt = record.get("d", dt)
+            total += dt
+        return total
+
+    def prepare(self, game):
+        """开局前恢复录制时的环境（在 Game._start_game_with_selection 之前调用）"""
+        _restore_weapon_rolls(self.header.get("weapon_rolls", {}))
+        game.next_seed = self.header["seed"]
+        game.global_level = self.header.get("global_level", 1)
+
+    def step(self, game, source, dt):
+        """注入下一个tick的输入
+
+        Returns:
+            float: 录制的dt，录像结束时返回None
+        """
+        if self.finished:
+            return None
+        record = self.ticks[self.index]
+
+        self.dt = record.get("d", self.dt)
+        if "k" in record:
+            self.keys = record["k"]
+            source.set_pressed(self.keys)
+        if "m" in record:
+            self.mouse = record["m"]
+            source.set_mouse_pos(*self.mouse)
+
+        for data in record.get("e", ()):
+            game.handle_event(_deserialize_event(data))
+
+        if "c" in record:
+            self.checksums_checked += 1
+            if self.divergence_tick is None and state_checksum(game) != record["c"]:
+                self.divergence_tick = self.index
+
+        self.index += 1
+        return self.dt
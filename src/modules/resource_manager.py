@@ -1,6 +1,8 @@
 import os
 import sys
 import pygame
+from .sound_scheduler import SoundScheduler
+from .texture_atlas import TextureAtlas
 
 class SpriteSheet:
     """精灵表类，用于管理包含多帧动画的图片"""
@@ -78,6 +80,8 @@ class ResourceManager:
         self.music = {}   # 存储音乐资源
         self.fonts = {}   # 存储字体资源
         self.animations = {}  # 存储动画资源
+        # 音效调度：合并同一tick的重复请求，按优先级、间隔和同时发声数量限制播放
+        self.sound_scheduler = SoundScheduler(self.get_sound)
         
         # 资源根目录，使用规范化的路径
         # 支持PyInstaller打包后的环境
@@ -91,6 +95,11 @@ class ResourceManager:
             src_dir = os.path.dirname(os.path.dirname(os.path.dirname(current_file)))
             self.resource_dir = os.path.normpath(os.path.join(src_dir, "assets"))
         
+        # 纹理图集（需手动运行 python build_complete.py --atlas 生成，不存在时逐个加载图片）
+        self.use_atlas = True
+        self.atlas = None
+        self._atlas_checked = False
+        
     def load_image(self, name: str, file_path: str) -> pygame.Surface:
         """加载图片资源
         
@@ -106,6 +115,13 @@ class ResourceManager:
             
         # 规范化路径，确保在所有操作系统上都能正确工作
         full_path = os.path.normpath(os.path.join(self.resource_dir, file_path))
+        
+        # 优先从图集中取子表面，省去单独打开和解码文件
+        image = self._load_from_atlas(full_path)
+        if image is not None:
+            self.images[name] = image
+            return image
+            
         try:
             image = pygame.image.load(full_path).convert_alpha()
             self.images[name] = image
@@ -117,6 +133,28 @@ class ResourceManager:
             surface.fill((255, 0, 255))
             return surface
             
+    def _load_from_atlas(self, full_path):
+        """从纹理图集获取图片
+        
+        Args:
+            full_path: 图片文件的完整路径
+            
+        Returns:
+            pygame.Surface: 图集的子表面，图集不可用或不包含该图片时返回None
+        """
+        if not self.use_atlas:
+            return None
+        if not self._atlas_checked:
+            self.atlas = TextureAtlas.load(self.resource_dir)
+            self._atlas_checked = True
+        if self.atlas is None:
+            return None
+        try:
+            return self.atlas.get(full_path)
+        except (pygame.error, OSError):
+            # 还没有设置显示模式或图集文件损坏、缺失，回退为单独加载
+            return None
+            
     def load_sound(self, name: str, file_path: str) -> pygame.mixer.Sound:
         """加载音效资源
         
@@ -137,7 +175,7 @@ class ResourceManager:
             sound = pygame.mixer.Sound(full_path)
             self.sounds[name] = sound
             return sound
-        except pygame.error as e:
+        except (pygame.error, FileNotFoundError) as e:
             print(f"无法加载音效 {full_path}: {e}")
             return None
             
@@ -212,16 +250,13 @@ class ResourceManager:
         return self.music[name]
         
     def play_sound(self, name: str):
-        """播放音效
+        """播放音效（交给音效调度器，在游戏tick内的请求到tick结束时统一播放）
         
         Args:
             name: 音效资源名称
         """
         try:
-            sound = self.get_sound(name)
-            if sound:
-                
-                sound.play()
+            self.sound_scheduler.request(name)
         except pygame.error as e:
             
             # 音频系统未初始化或播放失败，静默忽略
@@ -367,6 +402,8 @@ class ResourceManager:
         self.music.clear()
         self.fonts.clear()
         self.animations.clear()
+        self.atlas = None
+        self._atlas_checked = False
 
     def _init_resources(self):
         """初始化游戏所需的资源"""
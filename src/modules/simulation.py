@@ -0,0 +1,358 @@
+"""
+无界面模拟
+使用SDL的dummy视频/音频驱动运行游戏逻辑，跳过开场和主页动画，
+由脚本或自动驾驶控制器提供输入，以CPU允许的最快速度推进固定步长的模拟。
+用于没有显示器的CI机器上进行吞吐量测试。
+"""
+
+import contextlib
+import io
+import math
+import os
+import time
+
+import pygame
+
+from .core import input_source
+from .core.input_source import ScriptedInputSource
+
+
+class _NullOutput(io.TextIOBase):
+    """丢弃所有写入内容的输出流"""
+
+    def write(self, s):
+        return len(s)
+
+
+def _key_code(name):
+    """将按键名称（如 'w'、'up'）转换为pygame键码"""
+    return pygame.key.key_code(name)
+
+
+def _post_key(game, key):
+    """向游戏发送一次完整的按下/松开事件"""
+    game.handle_event(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode='', scancode=0))
+    game.handle_event(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode='', scancode=0))
+
+
+class InputController:
+    """输入控制器基类，每个模拟tick写入一次输入源"""
+
+    def __init__(self, tap_interval=0.35):
+        """
+        Args:
+            tap_interval: 攻击按键的最小触发间隔（秒）
+        """
+        self.tap_interval = tap_interval
+        self.time = 0.0
+        self.tap_timer = 0.0
+
+    # 控制器是否已经没有更多输入（回放结束）
+    finished = False
+
+    def prepare(self, game):
+        """开局前调用，子类可在此调整游戏设置"""
+        pass
+
+    def step(self, game, source, dt):
+        """推进一个tick的输入
+
+        Args:
+            game: Game实例
+            source: ScriptedInputSource实例
+            dt: 时间增量（秒）
+
+        Returns:
+            float: 本tick使用的时间增量，返回None时使用模拟的固定步长
+        """
+        self.time += dt
+        self.tap_timer += dt
+
+        # 升级菜单弹出时直接选择当前高亮的选项
+        if game.upgrade_menu.is_active:
+            source.set_pressed(())
+            _post_key(game, pygame.K_RETURN)
+            return
+
+        self._drive(game, source, dt)
+
+    def _drive(self, game, source, dt):
+        """由子类实现的具体输入逻辑"""
+        raise NotImplementedError
+
+    def _consume_tap(self):
+        """检查攻击按键是否可以触发"""
+        if self.tap_timer >= self.tap_interval:
+            self.tap_timer = 0.0
+            return True
+        return False
+
+
+class ScriptedController(InputController):
+    """按时间轴循环回放固定按键序列的控制器
+
+    脚本为步骤列表，每一步形如：
+        {"duration": 2.0, "hold": ["d", "right"], "tap": ["l"]}
+    hold 为该步骤内持续按住的按键，tap 为按 tap_interval 间隔重复点按的按键。
+    """
+
+    DEFAULT_SCRIPT = [
+        {"duration": 2.0, "hold": ["d", "right"], "tap": ["l"]},
+        {"duration": 2.0, "hold": ["s", "down"], "tap": ["k"]},
+        {"duration": 2.0, "hold": ["a", "left"], "tap": ["j"]},
+        {"duration": 2.0, "hold": ["w", "up"], "tap": ["i"]},
+    ]
+
+    def __init__(self, script=None, tap_interval=0.35):
+        super().__init__(tap_interval)
+        self.script = script or self.DEFAULT_SCRIPT
+        self.total_duration = sum(step["duration"] for step in self.script)
+        self._compiled = None
+
+    def _compile(self):
+        """将按键名称转换为键码（需要在pygame初始化后调用）"""
+        self._compiled = [
+            (step["duration"],
+             [_key_code(name) for name in step.get("hold", [])],
+             [_key_code(name) for name in step.get("tap", [])])
+            for step in self.script
+        ]
+
+    def _drive(self, game, source, dt):
+        if self._compiled is None:
+            self._compile()
+
+        # 找到当前时间所在的步骤
+        t = self.time % self.total_duration if self.total_duration > 0 else 0
+        for duration, hold, tap in self._compiled:
+            if t < duration:
+                break
+            t -= duration
+
+        source.set_pressed(hold)
+        if tap and self._consume_tap():
+            for key in tap:
+                _post_key(game, key)
+
+
+class AutoPilotController(InputController):
+    """简单的自动驾驶控制器
+
+    神秘剑士与最近的敌人保持距离并朝其攻击，忍者蛙跟随神秘剑士，
+    鼠标绕屏幕中心缓慢旋转以驱动光照方向。
+    """
+
+    def __init__(self, tap_interval=0.35, engage_distance=250, retreat_distance=150,
+                 follow_distance=150):
+        super().__init__(tap_interval)
+        self.engage_distance = engage_distance
+        self.retreat_distance = retreat_distance
+        self.follow_distance = follow_distance
+        self.mouse_angle = 0.0
+
+    @staticmethod
+    def _direction_keys(dx, dy, keys):
+        """根据方向向量选择按键，keys 顺序为 (上, 下, 左, 右)"""
+        up, down, left, right = keys
+        pressed = []
+        if dx > 1:
+            pressed.append(right)
+        elif dx < -1:
+            pressed.append(left)
+        if dy > 1:
+            pressed.append(down)
+        elif dy < -1:
+            pressed.append(up)
+        return pressed
+
+    def _drive(self, game, source, dt):
+        system = game.dual_player_system
+        if not system:
+            return
+
+        swordsman = system.mystic_swordsman
+        frog = system.ninja_frog
+        pressed = []
+
+        # 神秘剑士：寻找最近的敌人
+        target = None
+        best = None
+        for enemy in game.enemy_manager.enemies:
+            dx = enemy.rect.centerx - swordsman.world_x
+            dy = enemy.rect.centery - swordsman.world_y
+            dist_sq = dx * dx + dy * dy
+            if best is None or dist_sq < best:
+                best = dist_sq
+                target = (dx, dy)
+
+        if target:
+            dx, dy = target
+            distance = math.sqrt(best)
+            if distance > self.engage_distance:
+                pressed += self._direction_keys(dx, dy, (pygame.K_w, pygame.K_s, pygame.K_a, pygame.K_d))
+            elif distance < self.retreat_distance:
+                pressed += self._direction_keys(-dx, -dy, (pygame.K_w, pygame.K_s, pygame.K_a, pygame.K_d))
+
+            if self._consume_tap():
+                if abs(dx) >= abs(dy):
+                    _post_key(game, pygame.K_l if dx > 0 else pygame.K_j)
+                else:
+                    _post_key(game, pygame.K_k if dy > 0 else pygame.K_i)
+
+        # 忍者蛙：跟随神秘剑士
+        fdx = swordsman.world_x - frog.world_x
+        fdy = swordsman.world_y - frog.world_y
+        if fdx * fdx + fdy * fdy > self.follow_distance * self.follow_distance:
+            pressed += self._direction_keys(fdx, fdy, (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT))
+
+        source.set_pressed(pressed)
+
+        # 鼠标绕屏幕中心旋转
+        self.mouse_angle = (self.mouse_angle + dt * 1.5) % (2 * math.pi)
+        source.set_mouse_pos(
+            game.screen_center_x + 200 * math.cos(self.mouse_angle),
+            game.screen_center_y + 200 * math.sin(self.mouse_angle)
+        )
+
+
+class HeadlessSimulation:
+    """无界面模拟器，以固定步长驱动 Game.update"""
+
+    def __init__(self, map_name="small_map", hero_id="ninja_frog", difficulty="normal",
+                 controller=None, fixed_dt=1.0 / 60.0, render_stride=0,
+                 screen_size=(1920, 1280), quiet=True, seed=None):
+        """
+        Args:
+            map_name: 地图名称
+            hero_id: 英雄ID
+            difficulty: 难度（'easy', 'normal', 'hard', 'nightmare'）
+            controller: 输入控制器，默认使用 AutoPilotController
+            fixed_dt: 每个tick的模拟时间（秒）
+            render_stride: 每隔多少tick渲染一次到离屏表面，0表示完全不渲染
+            screen_size: 逻辑屏幕尺寸
+            quiet: 是否屏蔽游戏逻辑中的print输出
+            seed: 游戏随机数种子，None表示随机
+        """
+        self.map_name = map_name
+        self.hero_id = hero_id
+        self.difficulty = difficulty
+        self.controller = controller or AutoPilotController()
+        self.fixed_dt = fixed_dt
+        self.render_stride = render_stride
+        self.screen_size = screen_size
+        self.quiet = quiet
+        self.seed = seed
+
+        self.game = None
+        self.source = None
+        self.ticks = 0
+        self.sim_time = 0.0
+        self.renders = 0
+
+    def setup(self):
+        """初始化pygame和游戏实例，直接进入对局"""
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+        with self._output():
+            pygame.init()
+            try:
+                pygame.mixer.init()
+                from .resource_manager import resource_manager
+                resource_manager._init_resources()
+            except pygame.error as e:
+                print(f"音频系统初始化失败: {e}")
+
+            screen = pygame.display.set_mode(self.screen_size)
+
+            self.source = ScriptedInputSource(
+                (self.screen_size[0] // 2 + 200, self.screen_size[1] // 2)
+            )
+            input_source.set_input_source(self.source)
+
+            from .game import Game
+            self.game = Game(screen)
+
+            # 跳过主页动画和菜单，直接开始对局
+            self.game.showing_main_menu_animation = False
+            self.game.in_main_menu = False
+            self.game.next_seed = self.seed
+            self.controller.prepare(self.game)
+            self.game._start_game_with_selection(self.map_name, self.hero_id)
+            self.game.enemy_manager.set_difficulty(self.difficulty)
+        return self.game
+
+    def is_finished(self):
+        """模拟是否应该停止（对局结束或控制器没有更多输入）"""
+        return self.is_game_over() or self.controller.finished
+
+    def is_game_over(self):
+        """对局是否已经结束（失败或通关后的结算界面）"""
+        game = self.game
+        return (not game.running or
+                (game.game_over and not game.level_transition.is_active))
+
+    def step(self):
+        """推进一个tick"""
+        dt = self.controller.step(self.game, self.source, self.fixed_dt) or self.fixed_dt
+        self.game.update(dt)
+        self.ticks += 1
+        self.sim_time += dt
+
+        if self.render_stride and self.ticks % self.render_stride == 0:
+            self.game.render()
+            self.renders += 1
+
+    def run(self, sim_seconds=None):
+        """运行指定的模拟时长
+
+        Args:
+            sim_seconds: 模拟时长（秒），None表示一直运行到控制器结束或对局结束
+
+        Returns:
+            dict: 运行统计
+        """
+        if self.game is None:
+            self.setup()
+
+        total_ticks = None if sim_seconds is None else int(round(sim_seconds / self.fixed_dt))
+        start_ticks = self.ticks
+        start_time = self.sim_time
+        start = time.perf_counter()
+        with self._output():
+            while total_ticks is None or self.ticks - start_ticks < total_ticks:
+                self.step()
+                if self.is_finished():
+                    break
+        wall = time.perf_counter() - start
+
+        ticks = self.ticks - start_ticks
+        simulated = self.sim_time - start_time
+        from .resource_manager import resource_manager
+        return {
+            "map": self.game.current_map,
+            "difficulty": self.difficulty,
+            "ticks": ticks,
+            "sim_seconds": simulated,
+            "wall_seconds": wall,
+            "ticks_per_second": ticks / wall if wall > 0 else 0.0,
+            "realtime_factor": simulated / wall if wall > 0 else 0.0,
+            "renders": self.renders,
+            "enemies": len(self.game.enemy_manager.enemies),
+            "kills": self.game.kill_num,
+            "game_over": self.is_game_over(),
+            "sounds": resource_manager.sound_scheduler.stats(),
+        }
+
+    def close(self):
+        """恢复实时输入源并退出pygame"""
+        if self.game:
+            self.game.close_diagnostics()
+        input_source.set_input_source(None)
+        pygame.quit()
+
+    def _output(self):
+        """根据quiet设置屏蔽标准输出"""
+        if self.quiet:
+            return contextlib.redirect_stdout(_NullOutput())
+        return contextlib.nullcontext()
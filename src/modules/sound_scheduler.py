@@ -0,0 +1,201 @@
+"""
+音效调度
+大规模战斗中每次碰撞都会播放一次"hit"、"enemy_hit"或死亡音效，一帧可能有几十次播放请求，
+每次都要争抢混音器声道。这里在tick内只记录请求，同一音效的多次请求合并为一次，
+tick结束时按优先级（玩家受伤 > 升级 > 普通 > 命中）统一播放，并按音效限制播放间隔和同时发声数量。
+混音器的前几个声道保留给关键音效（玩家受伤、死亡），不会被命中音效占满。
+不在tick内的请求（菜单等）立即按同样的规则播放。
+播放间隔和同时发声数量按模拟时间（每个tick累加的dt）计算，与主机速度无关，
+无界面模拟和录像回放的统计可以复现，卡顿时也不会因为墙钟时间流逝而改变调度结果。
+"""
+
+import pygame
+
+# 优先级（数值越小越优先）
+PRIORITY_CRITICAL = 0  # 玩家受伤、死亡：可以使用保留声道，没有空闲声道时抢占
+PRIORITY_HIGH = 1      # 升级、胜负结果
+PRIORITY_NORMAL = 2    # 武器、拾取、菜单
+PRIORITY_LOW = 3       # 命中、敌人死亡等大量重复的音效
+
+# 保留给关键音效的声道数量
+DEFAULT_RESERVED_CHANNELS = 2
+
+
+class SoundRule:
+    """单个音效的调度规则
+
+    Attributes:
+        priority: 优先级
+        min_interval: 两次播放之间的最短间隔（秒）
+        max_voices: 同时发声的最大数量
+    """
+
+    __slots__ = ("priority", "min_interval", "max_voices")
+
+    def __init__(self, priority=PRIORITY_NORMAL, min_interval=0.0, max_voices=4):
+        self.priority = priority
+        self.min_interval = min_interval
+        self.max_voices = max_voices
+
+
+DEFAULT_RULE = SoundRule()
+
+SOUND_RULES = {
+    "player_hurt": SoundRule(PRIORITY_CRITICAL, 0.1, 2),
+    "player_death": SoundRule(PRIORITY_CRITICAL, 0.5, 1),
+    "level_up": SoundRule(PRIORITY_HIGH, 0.2, 1),
+    "victory": SoundRule(PRIORITY_HIGH, 1.0, 1),
+    "defeat": SoundRule(PRIORITY_HIGH, 1.0, 1),
+    "gun_shot": SoundRule(PRIORITY_NORMAL, 0.03, 4),
+    "melee_attack": SoundRule(PRIORITY_NORMAL, 0.05, 2),
+    "hit": SoundRule(PRIORITY_LOW, 0.05, 3),
+    "enemy_hit": SoundRule(PRIORITY_LOW, 0.05, 3),
+    "collect_exp": SoundRule(PRIORITY_LOW, 0.05, 2),
+    "enemy_death": SoundRule(PRIORITY_LOW, 0.06, 3),
+    "bat_death": SoundRule(PRIORITY_LOW, 0.06, 3),
+    "ghost_death": SoundRule(PRIORITY_LOW, 0.06, 3),
+    "slime_death": SoundRule(PRIORITY_LOW, 0.06, 3),
+    "radish_death": SoundRule(PRIORITY_LOW, 0.06, 3),
+    "soul_death": SoundRule(PRIORITY_LOW, 0.06, 3),
+}
+
+
+class SoundScheduler:
+    """音效调度器
+
+    统计（累计值，可用 reset_stats 清零）：
+        requested: 播放请求数量
+        played: 实际播放数量
+        coalesced: 同一tick内被合并的重复请求数量
+        dropped: 因间隔限制、同时发声数量或没有空闲声道而放弃的数量，dropped_by_sound 按音效细分
+    """
+
+    def __init__(self, get_sound, rules=None, reserved_channels=DEFAULT_RESERVED_CHANNELS, mixer=pygame.mixer):
+        """
+        Args:
+            get_sound: 按名称获取已加载音效的函数，未加载时返回None
+            rules: 音效名称 -> SoundRule，默认使用 SOUND_RULES
+            reserved_channels: 保留给关键音效的声道数量
+            mixer: 混音器模块（pygame.mixer），用于保留和选择关键音效的声道
+        """
+        self.get_sound = get_sound
+        self.rules = SOUND_RULES if rules is None else rules
+        self.reserved_channels = reserved_channels
+        self.mixer = mixer
+
+        self.time = 0.0  # 模拟时间（秒），由 begin_tick 推进
+        self._in_tick = False
+        self._pending = {}  # 音效名称 -> 本tick的请求次数（保持首次请求的顺序）
+        self._last_played = {}
+        self._voices = {}  # 音效名称 -> 正在发声的各次播放的结束时间（模拟时间）
+        self._reserved = False
+
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.requested = 0
+        self.played = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.dropped_by_sound = {}
+
+    def stats(self):
+        """获取统计信息
+
+        Returns:
+            dict: requested / played / coalesced / dropped / dropped_by_sound
+        """
+        return {
+            "requested": self.requested,
+            "played": self.played,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "dropped_by_sound": dict(self.dropped_by_sound),
+        }
+
+    def begin_tick(self, dt=0.0):
+        """开始一个tick：之后的请求先记录，到 end_tick 时统一播放
+
+        Args:
+            dt: 本tick推进的模拟时间（秒），暂停时也要传入，菜单音效的发声数量按它到期
+        """
+        self.time += dt
+        self._in_tick = True
+
+    def end_tick(self):
+        """结束tick，按优先级播放本tick记录的音效"""
+        self._in_tick = False
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = {}
+        rules = self.rules
+        # 稳定排序：同一优先级按首次请求的顺序播放
+        for name in sorted(pending, key=lambda name: rules.get(name, DEFAULT_RULE).priority):
+            try:
+                self._play(name)
+            except pygame.error:
+                # 音频系统未初始化或播放失败，静默忽略
+                pass
+
+    def request(self, name):
+        """请求播放音效
+
+        Args:
+            name: 音效资源名称
+        """
+        if self.get_sound(name) is None:
+            return
+        self.requested += 1
+        if not self._in_tick:
+            self._play(name)
+            return
+        count = self._pending.get(name, 0)
+        if count:
+            self.coalesced += 1
+        self._pending[name] = count + 1
+
+    def _play(self, name):
+        sound = self.get_sound(name)
+        if sound is None:
+            return
+        rule = self.rules.get(name, DEFAULT_RULE)
+        now = self.time
+        last = self._last_played.get(name)
+        voices = [end for end in self._voices.get(name, ()) if end > now]
+        if (last is not None and now - last < rule.min_interval) or len(voices) >= rule.max_voices:
+            self._voices[name] = voices
+            self._drop(name)
+            return
+
+        channel = self._critical_channel() if rule.priority == PRIORITY_CRITICAL else None
+        if channel is not None:
+            channel.play(sound)
+        else:
+            channel = sound.play()
+        if channel is None:
+            self._drop(name)
+            return
+        self._last_played[name] = now
+        voices.append(now + sound.get_length())
+        self._voices[name] = voices
+        self.played += 1
+
+    def _critical_channel(self):
+        """为关键音效选择声道：空闲的保留声道 > 任意空闲声道 > 抢占播放最久的声道"""
+        mixer = self.mixer
+        if not mixer.get_init():
+            return None
+        if not self._reserved:
+            # 保留的声道不会被 Sound.play() 自动选中
+            mixer.set_reserved(self.reserved_channels)
+            self._reserved = True
+        for index in range(min(self.reserved_channels, mixer.get_num_channels())):
+            channel = mixer.Channel(index)
+            if not channel.get_busy():
+                return channel
+        return mixer.find_channel(True)
+
+    def _drop(self, name):
+        self.dropped += 1
+        self.dropped_by_sound[name] = self.dropped_by_sound.get(name, 0) + 1
@@ -0,0 +1,89 @@
+"""
+空间索引
+均匀网格空间哈希，用于按区域快速筛选附近的实体（敌人、投射物等），
+避免每次查询都遍历全部实体。查询结果是候选集合（矩形所在网格与查询范围相交），
+调用方仍需做精确的距离或碰撞判断。
+"""
+
+
+class SpatialHash:
+    """均匀网格空间哈希
+
+    实体按其矩形覆盖的所有网格登记。查询结果按实体插入顺序返回，
+    保证与直接遍历实体列表时的处理顺序一致（回放的确定性依赖这一点）。
+    """
+
+    def __init__(self, cell_size=128):
+        """
+        Args:
+            cell_size: 网格边长（像素），一般取实体尺寸的1~2倍
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+        self.entities = []
+
+    def clear(self):
+        """清空索引"""
+        self.cells.clear()
+        self.entities = []
+
+    def insert(self, entity, rect):
+        """登记一个实体
+
+        Args:
+            entity: 实体对象
+            rect: 实体的矩形（世界坐标）
+        """
+        index = len(self.entities)
+        self.entities.append(entity)
+        size = self.cell_size
+        cells = self.cells
+        for cx in range(int(rect.left // size), int((rect.right - 1) // size) + 1):
+            for cy in range(int(rect.top // size), int((rect.bottom - 1) // size) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [index]
+                else:
+                    bucket.append(index)
+
+    def rebuild(self, entities, rect_of=lambda entity: entity.rect):
+        """用实体列表重建索引
+
+        Args:
+            entities: 实体列表
+            rect_of: 获取实体矩形的函数，默认取 entity.rect
+        """
+        self.clear()
+        for entity in entities:
+            self.insert(entity, rect_of(entity))
+
+    def query_area(self, left, top, right, bottom):
+        """查询与给定区域所在网格相交的实体
+
+        Args:
+            left, top, right, bottom: 查询区域边界（世界坐标）
+
+        Returns:
+            list: 候选实体（按插入顺序）
+        """
+        size = self.cell_size
+        cells = self.cells
+        found = set()
+        for cx in range(int(left // size), int(right // size) + 1):
+            for cy in range(int(top // size), int(bottom // size) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        entities = self.entities
+        return [entities[index] for index in sorted(found)]
+
+    def query_rect(self, rect):
+        """查询与矩形所在网格相交的实体"""
+        return self.query_area(rect.left, rect.top, rect.right, rect.bottom)
+
+    def query_radius(self, x, y, radius):
+        """查询与圆形外接矩形所在网格相交的实体"""
+        return self.query_area(x - radius, y - radius, x + radius, y + radius)
+
+    def __len__(self):
+        return len(self.entities)
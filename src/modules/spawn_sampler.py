@@ -0,0 +1,176 @@
+"""
+出生点采样
+按地图碰撞层预先计算可通行的地面格子，按出生区域和连通分量分组保存为紧凑的 array 数组。
+生成敌人时按区域权重抽取一个格子，期望 O(1)：出生点不会落在墙里，
+与玩家处在同一个连通区域（走得过去），并且离玩家足够远。
+"""
+
+from array import array
+from collections import deque
+import math
+
+# 出生区域
+REGION_CORNER = "corner"   # 地图四个角落
+REGION_MIDDLE = "middle"   # 地图中央（宽高各三分之一）
+REGION_ANY = "any"         # 边界内任意位置
+
+
+class SpawnSampler:
+    """可通行格子采样器
+
+    格子按行存储，索引为 row * columns + col。每个可出生的格子按所属区域和连通分量
+    登记到 (区域, 分量) 分组中，另外按 (区域, None) 登记一份不区分分量的分组。
+    """
+
+    def __init__(self, blocked, columns, rows, tile_width, tile_height, bounds=None,
+                 spawn_size=80, corner_fraction=1 / 6):
+        """
+        Args:
+            blocked: 每个格子是否被阻挡，长度为 columns * rows 的序列（按行存储）
+            columns: 格子列数
+            rows: 格子行数
+            tile_width: 格子宽度（像素）
+            tile_height: 格子高度（像素）
+            bounds: 允许出生的世界坐标范围 (min_x, min_y, max_x, max_y)，None表示整张地图
+            spawn_size: 出生实体的边长（像素），出生点为实体矩形左上角，只在格子内剩余的空间里随机偏移
+            corner_fraction: 角落区域占地图宽、高的比例
+        """
+        self.columns = columns
+        self.rows = rows
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.spawn_size = spawn_size
+        self.blocked = bytearray(1 if cell else 0 for cell in blocked)
+        if len(self.blocked) != columns * rows:
+            raise ValueError(f"格子数量不匹配: {len(self.blocked)} != {columns} x {rows}")
+
+        self.components = self._label_components()
+        self._groups = self._build_groups(bounds, corner_fraction)
+
+    def __len__(self):
+        """可出生的格子数量"""
+        group = self._groups.get((REGION_ANY, None))
+        return len(group) if group else 0
+
+    def _label_components(self):
+        """按4邻接标记可通行格子的连通分量，阻挡格子为-1"""
+        columns, rows = self.columns, self.rows
+        labels = array('i', [-1]) * (columns * rows)
+        label = 0
+        for start in range(columns * rows):
+            if self.blocked[start] or labels[start] != -1:
+                continue
+            labels[start] = label
+            pending = deque([start])
+            while pending:
+                index = pending.popleft()
+                col = index % columns
+                neighbours = []
+                if col > 0:
+                    neighbours.append(index - 1)
+                if col < columns - 1:
+                    neighbours.append(index + 1)
+                if index >= columns:
+                    neighbours.append(index - columns)
+                if index < (rows - 1) * columns:
+                    neighbours.append(index + columns)
+                for neighbour in neighbours:
+                    if not self.blocked[neighbour] and labels[neighbour] == -1:
+                        labels[neighbour] = label
+                        pending.append(neighbour)
+            label += 1
+        return labels
+
+    def _build_groups(self, bounds, corner_fraction):
+        """把可出生的格子按 (区域, 分量) 分组"""
+        map_width = self.columns * self.tile_width
+        map_height = self.rows * self.tile_height
+        min_x, min_y, max_x, max_y = bounds or (0, 0, map_width, map_height)
+
+        corner_width = map_width * corner_fraction
+        corner_height = map_height * corner_fraction
+        middle_left, middle_right = map_width / 3, map_width * 2 / 3
+        middle_top, middle_bottom = map_height / 3, map_height * 2 / 3
+
+        groups = {}
+        for row in range(self.rows):
+            top = row * self.tile_height
+            if top < min_y or top + self.tile_height > max_y:
+                continue
+            center_y = top + self.tile_height / 2
+            near_edge_y = center_y < corner_height or center_y > map_height - corner_height
+            for col in range(self.columns):
+                left = col * self.tile_width
+                if left < min_x or left + self.tile_width > max_x:
+                    continue
+                index = row * self.columns + col
+                if self.blocked[index]:
+                    continue
+                center_x = left + self.tile_width / 2
+
+                regions = [REGION_ANY]
+                if near_edge_y and (center_x < corner_width or center_x > map_width - corner_width):
+                    regions.append(REGION_CORNER)
+                if middle_left <= center_x <= middle_right and middle_top <= center_y <= middle_bottom:
+                    regions.append(REGION_MIDDLE)
+                for region in regions:
+                    groups.setdefault((region, self.components[index]), []).append(index)
+                    groups.setdefault((region, None), []).append(index)
+
+        return {key: array('i', cells) for key, cells in groups.items()}
+
+    def component_at(self, x, y):
+        """获取世界坐标所在格子的连通分量，阻挡或超出地图时返回None"""
+        col = int(x // self.tile_width)
+        row = int(y // self.tile_height)
+        if not (0 <= col < self.columns and 0 <= row < self.rows):
+            return None
+        label = self.components[row * self.columns + col]
+        return label if label >= 0 else None
+
+    def sample(self, rand, weights, players=(), min_distance=0.0, attempts=8):
+        """按区域权重抽取一个出生点
+
+        Args:
+            rand: 随机数生成器（random.Random）
+            weights: {区域: 权重}，没有可出生格子的区域会被忽略
+            players: 玩家列表，出生点与第一个站在可通行格子上的玩家处于同一连通分量
+            min_distance: 出生点离每个玩家的最小距离（像素）
+            attempts: 离玩家太近时的重抽次数，都不满足时返回离玩家最远的候选点
+
+        Returns:
+            tuple: 出生点世界坐标 (x, y)，没有任何可出生格子时返回None
+        """
+        component = None
+        for player in players:
+            component = self.component_at(player.world_x, player.world_y)
+            if component is not None:
+                break
+
+        candidates = [(region, weight) for region, weight in weights.items()
+                      if weight > 0 and self._groups.get((region, component))]
+        if not candidates:
+            # 指定区域都不可达时退回到可达范围内的任意位置
+            candidates = [(REGION_ANY, 1)] if self._groups.get((REGION_ANY, component)) else []
+        if not candidates:
+            return None
+        regions = [region for region, _ in candidates]
+        region_weights = [weight for _, weight in candidates]
+
+        slack_x = max(0, self.tile_width - self.spawn_size)
+        slack_y = max(0, self.tile_height - self.spawn_size)
+        best, best_distance = None, -1.0
+        for _ in range(max(1, attempts)):
+            region = rand.choices(regions, region_weights)[0] if len(regions) > 1 else regions[0]
+            cells = self._groups[(region, component)]
+            index = cells[rand.randrange(len(cells))]
+            x = (index % self.columns) * self.tile_width + rand.uniform(0, slack_x)
+            y = (index // self.columns) * self.tile_height + rand.uniform(0, slack_y)
+
+            distance = min((math.hypot(x - player.world_x, y - player.world_y) for player in players),
+                           default=math.inf)
+            if distance >= min_distance:
+                return x, y
+            if distance > best_distance:
+                best, best_distance = (x, y), distance
+        return best
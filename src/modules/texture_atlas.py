@@ -0,0 +1,205 @@
+"""
+纹理图集
+图片分散在 assets/images 下的上百个PNG中（角色逐帧图片、敌人精灵表、图标、界面和特效），
+启动时每张都要单独打开文件、解码并 convert_alpha。打包时用 build_atlases 把这些图片
+装进几张大图集并写出记录子区域的清单；运行时 ResourceManager 通过 TextureAtlas
+每张图集只加载和 convert_alpha 一次，按原来的文件路径返回图集的子表面。
+清单中记录了每张源图片的文件大小，源文件被修改过时回退为单独加载，避免使用过期的图集。
+"""
+
+import json
+import os
+
+import pygame
+
+# 图集和清单相对于assets目录的位置
+ATLAS_DIR = "atlases"
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# 单张图集的最大尺寸
+DEFAULT_PAGE_SIZE = 2048
+# 宽或高超过此值的图片（地图背景等）不放进图集
+DEFAULT_MAX_IMAGE_SIZE = 512
+
+
+def image_key(resource_dir, full_path):
+    """图片在清单中的键：相对于assets目录、以 / 分隔的路径"""
+    return os.path.relpath(os.path.normpath(full_path), resource_dir).replace(os.sep, "/")
+
+
+def pack_rects(sizes, page_size=DEFAULT_PAGE_SIZE):
+    """用货架算法把矩形装进若干张图集
+
+    按高度从高到低依次放置，当前行放不下时换行，当前图集放不下时换一张新图集。
+    子表面的绘制和缩放不会采样到子区域以外的像素，所以图片之间不需要留间隔。
+
+    Args:
+        sizes: [(宽, 高)]，每个都不能超过 page_size
+        page_size: 图集边长
+
+    Returns:
+        list: 与 sizes 一一对应的 (图集序号, x, y)
+    """
+    order = sorted(range(len(sizes)), key=lambda index: (-sizes[index][1], -sizes[index][0], index))
+    placements = [None] * len(sizes)
+    page = 0
+    x = y = shelf_height = 0
+    for index in order:
+        width, height = sizes[index]
+        if x + width > page_size:
+            # 换行
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        if y + height > page_size:
+            # 换一张图集
+            page += 1
+            x = y = shelf_height = 0
+        placements[index] = (page, x, y)
+        x += width
+        shelf_height = max(shelf_height, height)
+    return placements
+
+
+def build_atlases(resource_dir, folders=("images",), page_size=DEFAULT_PAGE_SIZE,
+                  max_image_size=DEFAULT_MAX_IMAGE_SIZE):
+    """离线打包图集（打包发布前运行，不需要显示窗口），写入 resource_dir/atlases
+
+    Args:
+        resource_dir: assets目录
+        folders: 要打包的子目录
+        page_size: 单张图集的最大尺寸
+        max_image_size: 宽或高超过此值的图片不放进图集
+
+    Returns:
+        dict: images（打包的图片数量）/ pages（图集数量）/ skipped（跳过的图片路径）
+    """
+    images = []
+    skipped = []
+    for folder in folders:
+        for root, dirs, files in os.walk(os.path.join(resource_dir, folder)):
+            dirs.sort()
+            for file_name in sorted(files):
+                if not file_name.lower().endswith(".png"):
+                    continue
+                full_path = os.path.join(root, file_name)
+                key = image_key(resource_dir, full_path)
+                try:
+                    image = pygame.image.load(full_path)
+                except pygame.error:
+                    skipped.append(key)
+                    continue
+                width, height = image.get_size()
+                if width > max_image_size or height > max_image_size:
+                    skipped.append(key)
+                    continue
+                images.append((key, image, os.path.getsize(full_path)))
+
+    # 同一目录的图片（通常一起加载）单独装箱，启动时没用到的目录的图集不会被加载
+    groups = {}
+    for index, (key, _, _) in enumerate(images):
+        groups.setdefault(os.path.dirname(key), []).append(index)
+    placements = [None] * len(images)
+    page_count = 0
+    for indices in groups.values():
+        group_placements = pack_rects([images[index][1].get_size() for index in indices], page_size)
+        for index, (page, x, y) in zip(indices, group_placements):
+            placements[index] = (page_count + page, x, y)
+        page_count += max(page for page, _, _ in group_placements) + 1
+
+    # 每张图集只保留实际用到的范围
+    extents = [[0, 0] for _ in range(page_count)]
+    for (_, image, _), (page, x, y) in zip(images, placements):
+        extents[page][0] = max(extents[page][0], x + image.get_width())
+        extents[page][1] = max(extents[page][1], y + image.get_height())
+    pages = [pygame.Surface(extent, pygame.SRCALPHA) for extent in extents]
+
+    entries = {}
+    for (key, image, size), (page, x, y) in zip(images, placements):
+        if image.get_flags() & pygame.SRCALPHA:
+            # 图集初始全透明，取各通道最大值等于原样复制像素（普通blit会按透明度混合半透明像素）
+            pages[page].blit(image, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        else:
+            pages[page].blit(image, (x, y))
+        entries[key] = [page, x, y, image.get_width(), image.get_height(), size]
+
+    atlas_dir = os.path.join(resource_dir, ATLAS_DIR)
+    os.makedirs(atlas_dir, exist_ok=True)
+    page_names = []
+    for page, surface in enumerate(pages):
+        page_name = f"atlas_{page}.png"
+        pygame.image.save(surface, os.path.join(atlas_dir, page_name))
+        page_names.append(page_name)
+
+    manifest = {"version": MANIFEST_VERSION, "pages": page_names, "images": entries}
+    with open(os.path.join(atlas_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    return {"images": len(entries), "pages": len(page_names), "skipped": skipped}
+
+
+class TextureAtlas:
+    """运行时图集：按原来的文件路径返回图集中的子表面
+
+    图集在第一次用到时加载并 convert_alpha（需要已经设置显示模式），之后常驻内存。
+    """
+
+    def __init__(self, resource_dir, manifest):
+        """
+        Args:
+            resource_dir: assets目录
+            manifest: build_atlases 写出的清单内容
+        """
+        self.resource_dir = resource_dir
+        self.atlas_dir = os.path.join(resource_dir, ATLAS_DIR)
+        self.page_names = manifest["pages"]
+        self.entries = manifest["images"]
+        self._pages = [None] * len(self.page_names)
+
+        # 统计：从图集取出的图片数量和加载过的图集数量
+        self.hits = 0
+        self.pages_loaded = 0
+
+    @classmethod
+    def load(cls, resource_dir):
+        """读取清单
+
+        Returns:
+            TextureAtlas: 没有清单或清单版本不符时返回None
+        """
+        path = os.path.join(resource_dir, ATLAS_DIR, MANIFEST_NAME)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != MANIFEST_VERSION:
+            return None
+        return cls(resource_dir, manifest)
+
+    def get(self, full_path):
+        """获取图片对应的子表面
+
+        Args:
+            full_path: 图片文件的完整路径
+
+        Returns:
+            pygame.Surface: 图集的子表面；图片不在图集中或源文件已被修改时返回None
+        """
+        entry = self.entries.get(image_key(self.resource_dir, full_path))
+        if entry is None:
+            return None
+        page, x, y, width, height, size = entry
+        # 源文件存在且大小变化时说明图集已过期
+        try:
+            if os.path.getsize(full_path) != size:
+                return None
+        except OSError:
+            pass
+        surface = self._pages[page]
+        if surface is None:
+            surface = pygame.image.load(os.path.join(self.atlas_dir, self.page_names[page])).convert_alpha()
+            self._pages[page] = surface
+            self.pages_loaded += 1
+        self.hits += 1
+        return surface.subsurface((x, y, width, height))
@@ -82,11 +82,16 @@ class UI:
         self.fps = 0
         self.fps_font = pygame.font.SysFont('simHei', 20)  # 较小的字体用于FPS显示
         self.show_fps_display = True  # FPS显示开关，默认开启
+        self.quality_tier = None  # 当前画质档位名称，显示在FPS下方
         
     def set_fps(self, fps):
         """设置FPS值"""
         self.fps = fps
         
+    def set_quality_tier(self, tier_name):
+        """设置当前画质档位名称"""
+        self.quality_tier = tier_name
+        
     def set_fps_display(self, show):
         """设置FPS显示开关"""
         self.show_fps_display = show
@@ -114,17 +119,18 @@ class UI:
         fps_x = minimap_x - 120  # 距离小地图左侧120像素
         fps_y = minimap_y + 10   # 与小地图顶部对齐，稍微下移10像素
         
-        # 创建FPS文本
-        fps_text = f"FPS: {self.fps}"
+        # 创建FPS文本（有画质档位时在下一行显示）
+        lines = [f"FPS: {self.fps}"]
+        if self.quality_tier:
+            lines.append(f"画质: {self.quality_tier}")
         
         # 渲染FPS文本
-        fps_surface = self.fps_font.render(fps_text, True, (255, 255, 255))  # 白色文字
-        fps_rect = fps_surface.get_rect()
-        fps_rect.topleft = (fps_x, fps_y)
+        text_surfaces = [self.fps_font.render(line, True, (255, 255, 255)) for line in lines]  # 白色文字
+        line_height = self.fps_font.get_linesize()
         
         # 绘制半透明背景
-        bg_width = fps_rect.width + 10
-        bg_height = fps_rect.height + 6
+        bg_width = max(surface.get_width() for surface in text_surfaces) + 10
+        bg_height = line_height * len(text_surfaces) + 6
         bg_surface = pygame.Surface((bg_width, bg_height))
         bg_surface.set_alpha(128)
         bg_surface.fill((0, 0, 0))  # 黑色半透明背景
@@ -137,7 +143,8 @@ class UI:
         pygame.draw.rect(self.screen, (100, 100, 100), border_rect, 1)
         
         # 绘制FPS文本
-        self.screen.blit(fps_surface, fps_rect)
+        for i, text_surface in enumerate(text_surfaces):
+            self.screen.blit(text_surface, (fps_x, fps_y + i * line_height))
         
     def _render_ammo_info(self, player):
         """渲染弹药信息
@@ -1,5 +1,5 @@
 import pygame
-import random
+from .core.game_random import rng
 from enum import Enum
 from .resource_manager import resource_manager
 from .weapons.weapon_stats import WeaponStatType
@@ -449,7 +449,7 @@ class UpgradeManager:
         # 保持候选池原样
 
         # 从候选池中随机选择指定数量的选项
-        selected_upgrades = random.sample(
+        selected_upgrades = rng.sample(
             candidate_pool,
             min(len(candidate_pool), count)
         )
@@ -1,5 +1,6 @@
 import pygame
 import os
+from .outline import build_outline_layer, outline_cache
 
 class FontManager:
     @staticmethod
@@ -166,38 +167,8 @@ def extract_sprite_outline(surface, outline_color=(255, 0, 0), outline_thickness
     Returns:
         pygame.Surface: 包含原始图像和其轮廓的新Surface
     """
-    # 创建一个与原始Surface相同大小的新Surface(带透明通道)
-    if surface.get_alpha() is None:
-        outline_surface = pygame.Surface(surface.get_size()).convert_alpha()
-        outline_surface.fill((0, 0, 0, 0))
-    else:
-        outline_surface = pygame.Surface(surface.get_size(), pygame.SRCALPHA).convert_alpha()
-        outline_surface.fill((0, 0, 0, 0))
-    
-    # 创建遮罩并提取轮廓
-    mask = create_mask_from_surface(surface)
-    outline_mask = pygame.mask.Mask(mask.get_size())
-    
-    # 扩大遮罩以创建轮廓
-    for x in range(mask.get_size()[0]):
-        for y in range(mask.get_size()[1]):
-            if mask.get_at((x, y)):
-                for dx in range(-outline_thickness, outline_thickness + 1):
-                    for dy in range(-outline_thickness, outline_thickness + 1):
-                        nx, ny = x + dx, y + dy
-                        if 0 <= nx < mask.get_size()[0] and 0 <= ny < mask.get_size()[1]:
-                            outline_mask.set_at((nx, ny), 1)
-    
-    # 保留轮廓而移除原始形状区域
-    for x in range(mask.get_size()[0]):
-        for y in range(mask.get_size()[1]):
-            if mask.get_at((x, y)):
-                outline_mask.set_at((x, y), 0)
-    
-    # 将轮廓绘制到新表面
-    outline_surface_tmp = outline_mask.to_surface(setcolor=outline_color)
-    outline_surface_tmp.set_colorkey((0, 0, 0))
-    outline_surface.blit(outline_surface_tmp, (0, 0))
+    # 通过遮罩卷积生成轮廓层
+    outline_surface = build_outline_layer(surface, outline_color, outline_thickness)
     
     # 将原始图像绘制在轮廓上方
     outline_surface.blit(surface, (0, 0))
@@ -206,25 +177,25 @@ def extract_sprite_outline(surface, outline_color=(255, 0, 0), outline_thickness
 
 def create_outlined_sprite(sprite, outline_color=(255, 0, 0), outline_thickness=1):
     """
-    为精灵添加可见轮廓
+    为精灵添加可见轮廓（结果会被缓存）
     
     Args:
-        sprite: 精灵对象(需要有image属性)
+        sprite: 精灵对象(需要有image属性)，或直接传入Surface
         outline_color: 轮廓颜色(R,G,B)
         outline_thickness: 轮廓粗细，以像素为单位
         
     Returns:
         pygame.Surface: 带有轮廓的图像
     """
+    image = sprite if isinstance(sprite, pygame.Surface) else getattr(sprite, 'image', None)
+    
     # 确保精灵有图像
-    if not hasattr(sprite, 'image') or sprite.image is None:
+    if image is None:
         return None
     
-    # 创建轮廓图像
-    outlined_image = extract_sprite_outline(
-        sprite.image,
+    # 从缓存获取轮廓图像
+    return outline_cache.get_outlined(
+        image,
         outline_color=outline_color,
         outline_thickness=outline_thickness
     )
-    
-    return outlined_image 
\ No newline at end of file
@@ -3,6 +3,9 @@ import math
 import numpy as np
 import time
 
+# 扇形视野默认使用的光线数量（未通过 set_ray_count 调整时）
+DEFAULT_RAY_COUNT = 64
+
 class VisionSystem:
     def __init__(self, radius=300, angle=90, color=(255, 255, 200, 100), 
                  circle_radius=80, circle_color=(255, 255, 200, 100), ray_count=24):
@@ -112,17 +115,20 @@ class VisionSystem:
         if self.direction < 0:
             self.direction += 2 * math.pi
             
-    def create_vision_mask(self, screen_width, screen_height):
+    def create_vision_mask(self, screen_width, screen_height, scale=1.0):
         """
         创建视野遮罩（消除黑暗区域）- 高度优化版本
         
         Args:
             screen_width (int): 屏幕宽度
             screen_height (int): 屏幕高度
+            scale (float): 遮罩分辨率相对屏幕的比例，小于1时生成缩小的遮罩（降低画质时使用）
             
         Returns:
             pygame.Surface: 视野遮罩
         """
+        mask_size = (int(screen_width * scale), int(screen_height * scale))
+        
         # 性能优化：检查缓存是否有效
         current_time = time.time()
         if (self._cache_vertices and 
@@ -134,31 +140,19 @@ class VisionSystem:
             
             self._performance_stats['cache_hits'] += 1
             # 使用缓存的遮罩
-            mask_surface = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
+            mask_surface = pygame.Surface(mask_size, pygame.SRCALPHA)
             mask_surface.fill((0, 0, 0, 0))
-            
-            # 绘制圆形光圈
-            pygame.draw.circle(mask_surface, (255, 255, 255, 255), 
-                             (self.center_x, self.center_y), self.circle_radius)
-            
-            # 绘制扇形视野
-            if len(self._cache_vertices) >= 3:
-                pygame.draw.polygon(mask_surface, (255, 255, 255, 255), self._cache_vertices)
-            
+            self._draw_mask_shapes(mask_surface, self._cache_vertices, scale, smooth_edges=False)
             return mask_surface
         
         self._performance_stats['cache_misses'] += 1
         self._last_update_time = current_time
         
         # 创建新的遮罩表面
-        mask_surface = pygame.Surface((screen_width, screen_height), pygame.SRCALPHA)
+        mask_surface = pygame.Surface(mask_size, pygame.SRCALPHA)
         mask_surface.fill((0, 0, 0, 0))
         
-        # 绘制圆形光圈（始终显示）
-        pygame.draw.circle(mask_surface, (255, 255, 255, 255), 
-                         (self.center_x, self.center_y), self.circle_radius)
-        
-        # 计算视野顶点
+        # 计算视野顶点（始终使用屏幕坐标）
         if self.walls:
             vertices = self._calculate_vision_vertices_with_raycast(screen_width, screen_height)
         else:
@@ -171,22 +165,42 @@ class VisionSystem:
         self._cache_radius = self.radius
         self._cache_angle = self.angle
         
-        # 绘制扇形视野（抗锯齿处理）
+        self._draw_mask_shapes(mask_surface, vertices, scale, smooth_edges=True)
+        return mask_surface
+        
+    def _draw_mask_shapes(self, mask_surface, vertices, scale, smooth_edges):
+        """
+        在遮罩上绘制圆形光圈和扇形视野
+        
+        Args:
+            mask_surface (pygame.Surface): 遮罩表面
+            vertices (list): 扇形顶点（屏幕坐标）
+            scale (float): 遮罩分辨率比例
+            smooth_edges (bool): 是否在扇形边缘绘制小圆做平滑处理
+        """
+        if scale != 1.0:
+            center = (self.center_x * scale, self.center_y * scale)
+            circle_radius = self.circle_radius * scale
+            vertices = [(x * scale, y * scale) for x, y in vertices]
+        else:
+            center = (self.center_x, self.center_y)
+            circle_radius = self.circle_radius
+        
+        # 绘制圆形光圈（始终显示）
+        pygame.draw.circle(mask_surface, (255, 255, 255, 255), center, circle_radius)
+        
+        # 绘制扇形视野
         if len(vertices) >= 3:
-            # 使用更平滑的绘制方式
             pygame.draw.polygon(mask_surface, (255, 255, 255, 255), vertices, 0)
             
             # 添加边缘平滑处理
-            if len(vertices) > 3:
+            if smooth_edges and len(vertices) > 3:
                 # 在边缘点绘制小圆来平滑边界
+                edge_radius = max(1, int(3 * scale))
                 for vertex in vertices[1:]:  # 跳过中心点
                     pygame.draw.circle(mask_surface, (255, 255, 255, 255), 
-                                     (int(vertex[0]), int(vertex[1])), 3)
-            
-        return mask_surface
+                                     (int(vertex[0]), int(vertex[1])), edge_radius)
         
-
-    
     def _calculate_vision_vertices(self, screen_width, screen_height):
         """
         计算视野扇形的顶点
@@ -204,7 +218,7 @@ class VisionSystem:
         end_angle = self.direction + self.half_angle
         
         # 生成扇形边缘的点
-        num_points = getattr(self, 'ray_count', 64)  # 使用配置的光线数量
+        num_points = getattr(self, 'ray_count', DEFAULT_RAY_COUNT)  # 使用配置的光线数量
         angles = np.linspace(start_angle, end_angle, num_points)
         
         for angle in angles:
@@ -318,7 +332,7 @@ class VisionSystem:
         end_angle = self.direction + self.half_angle
         
         # 使用配置的光线数量来确保平滑的扇形
-        num_points = getattr(self, 'ray_count', 64)  # 使用配置的光线数量
+        num_points = getattr(self, 'ray_count', DEFAULT_RAY_COUNT)  # 使用配置的光线数量
         
         # 使用更高效的角度生成
         angles = []
@@ -463,6 +477,13 @@ class VisionSystem:
         self.circle_color = color
         self.config["circle"]["color"] = color
         
+    def set_ray_count(self, ray_count):
+        """设置扇形光线数量（画质调节时使用），并使缓存的顶点失效"""
+        ray_count = max(2, int(ray_count))
+        if ray_count != getattr(self, 'ray_count', DEFAULT_RAY_COUNT):
+            self._cache_vertices = None
+        self.ray_count = ray_count
+        
     def toggle_enabled(self):
         """切换启用状态"""
         self.config["enabled"] = not self.config["enabled"]
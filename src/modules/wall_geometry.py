@@ -0,0 +1,148 @@
+"""
+墙体几何
+把碰撞层上的阻挡格子编译成两种紧凑的几何数据，每张地图加载时只计算一次：
+- 贪心合并后的最大矩形（代替每个墙格一个 1x1 矩形，供碰撞、小地图和出生点校验使用）
+- 去重并合并共线后的边界线段（墙体与地面之间的边，目前只用于统计；视野的光线追踪不做墙体遮挡）
+"""
+
+import pygame
+
+
+def merge_rects(blocked, columns, rows):
+    """把阻挡格子贪心合并成矩形
+
+    按行扫描，遇到未覆盖的阻挡格子时先向右扩展到最宽，再整行向下扩展到最高。
+
+    Args:
+        blocked: 每个格子是否被阻挡，长度为 columns * rows（按行存储）
+        columns: 格子列数
+        rows: 格子行数
+
+    Returns:
+        list: (列, 行, 宽, 高) 列表，单位为格子，矩形互不重叠且恰好覆盖所有阻挡格子
+    """
+    blocked = bytes(1 if cell else 0 for cell in blocked)
+    covered = bytearray(len(blocked))
+    rects = []
+    for row in range(rows):
+        base = row * columns
+        col = 0
+        while col < columns:
+            index = base + col
+            if not blocked[index] or covered[index]:
+                col += 1
+                continue
+
+            width = 1
+            while col + width < columns and blocked[index + width] and not covered[index + width]:
+                width += 1
+            solid = b"\x01" * width
+            height = 1
+            while row + height < rows:
+                start = index + height * columns
+                if blocked[start:start + width] != solid or any(covered[start:start + width]):
+                    break
+                height += 1
+
+            for offset in range(height):
+                start = index + offset * columns
+                covered[start:start + width] = solid
+            rects.append((col, row, width, height))
+            col += width
+    return rects
+
+
+def boundary_segments(blocked, columns, rows):
+    """计算阻挡格子与可通行格子（或地图外）之间的边界线段
+
+    每条格子边只出现一次，同一直线上相邻且朝向相同的边合并成一条线段。
+
+    Args:
+        blocked: 每个格子是否被阻挡，长度为 columns * rows（按行存储）
+        columns: 格子列数
+        rows: 格子行数
+
+    Returns:
+        tuple: (线段列表, 合并前的格子边数量)。线段为 ((x1, y1), (x2, y2))，单位为格子
+    """
+    def solid(col, row):
+        return 0 <= col < columns and 0 <= row < rows and bool(blocked[row * columns + col])
+
+    segments = []
+    edge_count = 0
+
+    # 水平边：第 line 行格子的上边界，朝向区分墙在上方还是下方
+    for line in range(rows + 1):
+        run_start, run_facing = None, 0
+        for col in range(columns + 1):
+            facing = 0
+            if col < columns:
+                above, below = solid(col, line - 1), solid(col, line)
+                if above != below:
+                    facing = 1 if above else -1
+                    edge_count += 1
+            if facing != run_facing:
+                if run_facing:
+                    segments.append(((run_start, line), (col, line)))
+                run_start, run_facing = col, facing
+
+    # 垂直边：第 line 列格子的左边界
+    for line in range(columns + 1):
+        run_start, run_facing = None, 0
+        for row in range(rows + 1):
+            facing = 0
+            if row < rows:
+                left, right = solid(line - 1, row), solid(line, row)
+                if left != right:
+                    facing = 1 if left else -1
+                    edge_count += 1
+            if facing != run_facing:
+                if run_facing:
+                    segments.append(((line, run_start), (line, row)))
+                run_start, run_facing = row, facing
+
+    return segments, edge_count
+
+
+class WallGeometry:
+    """一张地图碰撞层的墙体几何（世界坐标）
+
+    Attributes:
+        rects: 合并后的墙体矩形列表（pygame.Rect）
+        segments: 合并后的边界线段列表 ((x1, y1), (x2, y2))
+        tile_count: 阻挡格子数量（合并前每个格子一个矩形）
+        edge_count: 合并前的边界格子边数量
+    """
+
+    def __init__(self, blocked, columns, rows, tile_width, tile_height):
+        """
+        Args:
+            blocked: 每个格子是否被阻挡，长度为 columns * rows（按行存储）
+            columns: 格子列数
+            rows: 格子行数
+            tile_width: 格子宽度（像素）
+            tile_height: 格子高度（像素）
+        """
+        self.tile_count = sum(1 for cell in blocked if cell)
+        self.rects = [
+            pygame.Rect(col * tile_width, row * tile_height, width * tile_width, height * tile_height)
+            for col, row, width, height in merge_rects(blocked, columns, rows)
+        ]
+        segments, self.edge_count = boundary_segments(blocked, columns, rows)
+        self.segments = [
+            ((x1 * tile_width, y1 * tile_height), (x2 * tile_width, y2 * tile_height))
+            for (x1, y1), (x2, y2) in segments
+        ]
+
+    def stats(self):
+        """合并前后的数量对比
+
+        Returns:
+            dict: tiles（合并前矩形数）、rects（合并后矩形数）、edges（合并前边数）、segments（合并后线段数）
+        """
+        return {
+            "tiles": self.tile_count,
+            "rects": len(self.rects),
+            "edges": self.edge_count,
+            "segments": len(self.segments),
+        }
@@ -1,6 +1,6 @@
 import pygame
 import math
-from ..resource_manager import resource_manager
+from ..effect_library import effect_library
 
 class AttackEffect:
     """攻击特效类"""
@@ -15,13 +15,23 @@ class AttackEffect:
             frame_height: 单帧高度
             frame_count: 总帧数
         """
+        self.reset(image_path, frame_width, frame_height, frame_count)
+        
+        # 特效位置和方向
+        self.x = 0
+        self.y = 0
+        self.direction_x = 0
+        self.direction_y = 0
+        
+    def reset(self, image_path, frame_width=64, frame_height=64, frame_count=10):
+        """重置为刚创建的状态（从特效库的对象池复用时调用），参数与 __init__ 相同"""
         self.image_path = image_path
         self.frame_width = frame_width
         self.frame_height = frame_height
         self.frame_count = frame_count
         
-        # 加载并分割图片
-        self.frames = self._load_and_split_frames()
+        # 从特效库获取分割好的帧（同一张图片只分割一次）
+        self.frames = effect_library.frames('attack_effect', image_path, frame_width, frame_height, frame_count)
         
         # 动画状态
         self.is_playing = False
@@ -29,38 +39,6 @@ class AttackEffect:
         self.animation_timer = 0
         self.frame_duration = 0.03  # 每帧持续时间（秒）
         self.total_duration = self.frame_duration * frame_count
-        
-        # 特效位置和方向
-        self.x = 0
-        self.y = 0
-        self.direction_x = 0
-        self.direction_y = 0
-        
-    def _load_and_split_frames(self):
-        """加载图片并分割成帧"""
-        try:
-            # 加载原始图片
-            original_image = resource_manager.load_image('attack_effect', self.image_path)
-            if not original_image:
-                
-                return []
-            
-            frames = []
-            # 分割图片为多个帧
-            for i in range(self.frame_count):
-                # 计算当前帧在原始图片中的位置
-                frame_x = i * self.frame_width
-                frame_y = 0
-                
-                # 提取当前帧
-                frame_rect = pygame.Rect(frame_x, frame_y, self.frame_width, self.frame_height)
-                frame = original_image.subsurface(frame_rect)
-                frames.append(frame)
-            
-            return frames
-        except Exception as e:
-            
-            return []
     
     def play(self, x, y, direction_x, direction_y):
         """
@@ -145,12 +123,7 @@ class AttackEffectManager:
     
     def create_knife_effect(self, x, y, direction_x, direction_y):
         """创建刀攻击特效"""
-        effect = AttackEffect(
-            'images/attcak/hit_animations/swing02.png',
-            frame_width=64,
-            frame_height=64,
-            frame_count=10
-        )
+        effect = effect_library.spawn(AttackEffect, 'images/attcak/hit_animations/swing02.png', 64, 64, 10)
         effect.play(x, y, direction_x, direction_y)
         self.effects.append(effect)
     
@@ -161,6 +134,7 @@ class AttackEffectManager:
             effect.update(dt)
             if effect.is_finished():
                 self.effects.remove(effect)
+                effect_library.release(effect)
     
     def render(self, screen, camera_x=0, camera_y=0):
         """渲染所有特效"""
@@ -1,6 +1,8 @@
 import pygame
 import math
 from ...resource_manager import resource_manager
+from ...core import input_source
+from ...render_queue import RenderQueue, LAYER_PROJECTILES
 from ..weapon import Weapon
 from ..weapon_stats import WeaponStatType, WeaponStatsDict
 
@@ -123,6 +125,12 @@ class BulletProjectile(pygame.sprite.Sprite):
         # 渲染子弹
         screen.blit(self.image, (screen_x - self.image.get_width() // 2, 
                                  screen_y - self.image.get_height() // 2))
+        
+    def submit_render(self, render_queue):
+        """把子弹提交到渲染队列（屏幕外的子弹被剔除）"""
+        screen_x, screen_y = render_queue.to_screen(self.world_x, self.world_y)
+        render_queue.submit_culled(self.image, screen_x - self.image.get_width() // 2,
+                                   screen_y - self.image.get_height() // 2, LAYER_PROJECTILES)
 
 class BulletWeapon(Weapon):
     """子弹武器类"""
@@ -260,9 +268,11 @@ class BulletWeapon(Weapon):
     
     def render(self, screen, camera_x, camera_y, attack_direction_x=None, attack_direction_y=None):
         """渲染武器和投射物"""
-        # 渲染所有子弹
+        # 渲染所有子弹：剔除屏幕外的子弹后一次性批量绘制
+        render_queue = RenderQueue.started(screen, camera_x, camera_y)
         for projectile in self.projectiles:
-            projectile.render(screen, camera_x, camera_y)
+            projectile.submit_render(render_queue)
+        render_queue.flush()
         
         # 渲染武器（如果正在攻击）
         if self.is_attacking:
@@ -279,7 +289,7 @@ class BulletWeapon(Weapon):
             return
         
         # 获取鼠标位置
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = input_source.get_mouse_pos()
         screen_center_x = screen.get_width() // 2
         screen_center_y = screen.get_height() // 2
         
@@ -313,7 +323,7 @@ class BulletWeapon(Weapon):
             direction_y = attack_direction_y
         else:
             # 获取鼠标位置
-            mouse_x, mouse_y = pygame.mouse.get_pos()
+            mouse_x, mouse_y = input_source.get_mouse_pos()
             
             # 计算鼠标相对于玩家的方向
             direction_x = mouse_x - player_screen_x
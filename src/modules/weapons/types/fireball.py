@@ -1,6 +1,8 @@
 import pygame
 import math
 from ...resource_manager import resource_manager
+from ...effect_library import effect_library
+from ...render_queue import RenderQueue, LAYER_PROJECTILES
 from ..weapon import Weapon
 from ..weapon_stats import WeaponStatType, WeaponStatsDict
 
@@ -8,28 +10,27 @@ class ExplosionEffect(pygame.sprite.Sprite):
     """火球爆炸特效"""
     def __init__(self, x, y, radius):
         super().__init__()
-        self.world_x = x
-        self.world_y = y
-        self.radius = radius
         
-        # 使用资源管理器的spritesheet和animation功能
-        spritesheet = resource_manager.load_spritesheet('explosion', 'images/effects/explosion_64x64.png')
-        
-        # 创建爆炸动画帧
-        animation = resource_manager.create_animation(
-            'explosion_anim', spritesheet, 
+        # 从特效库获取缩放到128x128的爆炸动画帧（所有爆炸共享）
+        self.frames = effect_library.frames(
+            'explosion', 'images/effects/explosion_64x64.png',
             frame_width=64, frame_height=64,
-            frame_count=8, row=0,
-            frame_duration=0.033
+            frame_count=8, row=0, size=(128, 128)
         )
-        
-        self.frames = animation.frames
         self.total_frames = len(self.frames)
-        self.animation_speed = animation.frame_duration
+        self.animation_speed = 0.033
+        self.rect = self.frames[0].get_rect()
+        self.reset(x, y, radius)
+        
+    def reset(self, x, y, radius):
+        """重置为刚生成的状态（从特效库的对象池复用时调用）"""
+        self.world_x = x
+        self.world_y = y
+        self.radius = radius
         
         self.current_frame = 0
-        self.image = pygame.transform.scale(self.frames[0], (128, 128))
-        self.rect = self.image.get_rect(center=(int(x), int(y)))
+        self.image = self.frames[0]
+        self.rect.center = (int(x), int(y))
         
         # 动画控制
         self.animation_timer = 0
@@ -41,14 +42,13 @@ class ExplosionEffect(pygame.sprite.Sprite):
             self.animation_timer = 0
             self.current_frame += 1
             if self.current_frame >= len(self.frames):
-                # 动画结束，移除特效
+                # 动画结束，移除特效并放回对象池
                 self.kill()
+                effect_library.release(self)
                 return
             
             # 更新当前帧
             self.image = self.frames[self.current_frame]
-            self.image = pygame.transform.scale(self.image, (128, 128))
-            self.rect = self.image.get_rect(center=(int(self.world_x), int(self.world_y)))
     
     def render(self, screen, camera_x, camera_y, attack_direction_x=None, attack_direction_y=None):
         # 计算屏幕位置
@@ -58,6 +58,12 @@ class ExplosionEffect(pygame.sprite.Sprite):
         # 渲染爆炸效果
         screen.blit(self.image, (screen_x - self.image.get_width() // 2, 
                                  screen_y - self.image.get_height() // 2))
+    
+    def submit_render(self, render_queue):
+        """把爆炸特效提交到渲染队列"""
+        screen_x, screen_y = render_queue.to_screen(self.world_x, self.world_y)
+        render_queue.submit_culled(self.image, screen_x - self.image.get_width() // 2,
+                                   screen_y - self.image.get_height() // 2, LAYER_PROJECTILES)
 
 class FireballProjectile(pygame.sprite.Sprite):
     def __init__(self, x, y, direction_x, direction_y, stats):
@@ -148,7 +154,7 @@ class FireballProjectile(pygame.sprite.Sprite):
         
         # 总是创建爆炸特效，无论effects_group是否设置
         if self.effects_group is not None:
-            explosion = ExplosionEffect(explosion_x, explosion_y, self.explosion_radius)
+            explosion = effect_library.spawn(ExplosionEffect, explosion_x, explosion_y, self.explosion_radius)
             self.effects_group.add(explosion)
         
         # 如果有敌人列表，对范围内敌人造成伤害（优化性能）
@@ -205,6 +211,19 @@ class FireballProjectile(pygame.sprite.Sprite):
         draw_x = screen_x - scaled_image.get_width() / 2
         draw_y = screen_y - scaled_image.get_height() / 2
         screen.blit(scaled_image, (draw_x, draw_y))
+        
+    def submit_render(self, render_queue):
+        """把投射物提交到渲染队列，屏幕外时跳过缩放"""
+        screen_x, screen_y = render_queue.to_screen(self.world_x, self.world_y)
+        
+        scaled_size = (int(self.image.get_width() * self.scale),
+                      int(self.image.get_height() * self.scale))
+        draw_x = screen_x - scaled_size[0] / 2
+        draw_y = screen_y - scaled_size[1] / 2
+        if not render_queue.is_visible(draw_x, draw_y, *scaled_size):
+            return
+        render_queue.submit(pygame.transform.scale(self.image, scaled_size), (draw_x, draw_y),
+                            LAYER_PROJECTILES)
 
     def on_collision(self, enemy, enemies=None):
         """
@@ -222,6 +241,8 @@ class FireballProjectile(pygame.sprite.Sprite):
         return True
 
 class Fireball(Weapon):
+    targets_enemies = True
+    
     def __init__(self, player):
         super().__init__(player, 'fireball')
         
@@ -262,8 +283,10 @@ class Fireball(Weapon):
                     
         return nearest_enemy
         
-    def update(self, dt):
+    def update(self, dt, enemies=None):
         super().update(dt)
+        if enemies is not None:
+            self.enemy_query = enemies
         
         # 移除自动发射逻辑，改为手动发射
         # 更新所有火球
@@ -338,11 +361,10 @@ class Fireball(Weapon):
         if not self.player.game or not self.player.game.enemy_manager:
             return
             
-        enemies = self.player.game.enemy_manager.enemies
         attack_range = 100  # 扩大攻击范围
         attack_damage = self.current_stats.get(WeaponStatType.DAMAGE, 10) * 2.0  # 2.0倍伤害
         
-        for enemy in enemies:
+        for enemy in self._enemies_near(self.player.world_x, self.player.world_y, attack_range):
             # 计算到敌人的距离
             dx = enemy.rect.x - self.player.world_x
             dy = enemy.rect.y - self.player.world_y
@@ -356,14 +378,14 @@ class Fireball(Weapon):
                 # 计算点积，判断敌人是否在攻击方向的前方
                 dot_product = direction_x * enemy_dir_x + direction_y * enemy_dir_y
                 
-                # 扩大攻击角度范围（从60度扩大到120度）
-                if dot_product > -0.5:  # 从0.5改为-0.5，扩大攻击角度
+                # 扩大攻击角度范围（从60度扩大到120度），隔着墙的敌人打不到
+                if dot_product > -0.5 and self._has_line_of_sight(*enemy.rect.center):  # 从0.5改为-0.5，扩大攻击角度
                     # 对敌人造成伤害
                     enemy.take_damage(attack_damage)
                     
                     # 应用燃烧效果
                     if hasattr(enemy, 'apply_burn_effect'):
-                        enemy.apply_burn_effect(3, 5)  # 3秒燃烧，每秒5点伤害
+                        enemy.apply_burn_effect(5, 3)  # 3秒燃烧，每秒5点伤害
                     
                     # 播放攻击音效
                     from ...resource_manager import resource_manager
@@ -414,9 +436,11 @@ class Fireball(Weapon):
         
     def render(self, screen, camera_x, camera_y, attack_direction_x=None, attack_direction_y=None):
         # 渲染所有火球
+        render_queue = RenderQueue.started(screen, camera_x, camera_y)
         for fireball in self.projectiles:
-            fireball.render(screen, camera_x, camera_y, attack_direction_x, attack_direction_y)
+            fireball.submit_render(render_queue)
             
         # 渲染爆炸特效
         for effect in self.explosion_effects:
-            effect.render(screen, camera_x, camera_y, attack_direction_x, attack_direction_y) 
\ No newline at end of file
+            effect.submit_render(render_queue)
+        render_queue.flush() 
\ No newline at end of file
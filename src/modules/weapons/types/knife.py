@@ -5,6 +5,7 @@ from ..weapon import Weapon
 from ..weapon_stats import WeaponStatType, WeaponStatsDict
 from ..weapons_data import get_weapon_base_stats
 from ..attack_effect import AttackEffect
+from ...effect_library import effect_library
 
 class ThrownKnife(pygame.sprite.Sprite):
     """飞刀投射物类"""
@@ -98,6 +99,8 @@ class ThrownKnife(pygame.sprite.Sprite):
             screen.blit(self.image, (screen_x - self.rect.width/2, screen_y - self.rect.height/2))
 
 class Knife(Weapon):
+    targets_enemies = True
+    
     def __init__(self, player):
         super().__init__(player, 'knife')
         
@@ -111,14 +114,17 @@ class Knife(Weapon):
         self.attack_effect = None
         self.effect_playing = False
         
-    def update(self, dt):
+    def update(self, dt, enemies=None):
         super().update(dt)
+        if enemies is not None:
+            self.enemy_query = enemies
         
         # 更新攻击特效
         if self.attack_effect and self.effect_playing:
             self.attack_effect.update(dt)
             if self.attack_effect.is_finished():
                 self.effect_playing = False
+                effect_library.release(self.attack_effect)
                 self.attack_effect = None
         
         # 刀武器只更新近战攻击特效，不更新投射物
@@ -187,7 +193,6 @@ class Knife(Weapon):
         if not self.player.game or not self.player.game.enemy_manager:
             return
             
-        enemies = self.player.game.enemy_manager.enemies
         attack_range = 95  # 扩大攻击范围（增加15像素）
         attack_damage = self.current_stats.get(WeaponStatType.DAMAGE, 10) * 1.5  # 1.5倍伤害
         
@@ -205,13 +210,10 @@ class Knife(Weapon):
         effect_x = self.player.world_x + direction_x * 32
         effect_y = self.player.world_y + direction_y * 32
         
-        # 创建攻击特效
-        self.attack_effect = AttackEffect(
-            'images/attcak/hit_animations/swing02.png',
-            frame_width=64,
-            frame_height=64,
-            frame_count=10
-        )
+        # 创建攻击特效（从特效库的对象池复用，上一次还没播放完的特效放回池中）
+        if self.attack_effect:
+            effect_library.release(self.attack_effect)
+        self.attack_effect = effect_library.spawn(AttackEffect, 'images/attcak/hit_animations/swing02.png', 64, 64, 10)
         self.attack_effect.play(effect_x, effect_y, direction_x, direction_y)
         self.effect_playing = True
         
@@ -221,9 +223,7 @@ class Knife(Weapon):
         attack_x = self.player.world_x
         attack_y = self.player.world_y
 
-
-
-        for enemy in enemies:
+        for enemy in self._enemies_near(attack_x, attack_y, attack_range):
             # 计算到攻击位置的距离（而不是到玩家的距离）
             dx = enemy.rect.x - attack_x
             dy = enemy.rect.y - attack_y
@@ -237,8 +237,8 @@ class Knife(Weapon):
                 # 计算点积，判断敌人是否在攻击方向的前方
                 dot_product = direction_x * enemy_dir_x + direction_y * enemy_dir_y
                 
-                # 扩大攻击角度范围（从60度扩大到120度）
-                if dot_product > -0.5:  # 从0.5改为-0.5，扩大攻击角度
+                # 扩大攻击角度范围（从60度扩大到120度），隔着墙的敌人打不到
+                if dot_product > -0.5 and self._has_line_of_sight(*enemy.rect.center):  # 从0.5改为-0.5，扩大攻击角度
                     # 对敌人造成伤害
                     enemy.take_damage(attack_damage)
         
@@ -1,5 +1,6 @@
 import pygame
 from ..resource_manager import resource_manager
+from ..core import input_source
 from enum import Enum, auto
 from .weapon_stats import WeaponStatType, DEFAULT_WEAPON_STATS
 import math
@@ -10,6 +11,9 @@ class WeaponType(Enum):
     PROJECTILE = auto() # 投射物武器
     
 class Weapon(pygame.sprite.Sprite):
+    # 需要查找敌人的武器设为True，WeaponManager 会在更新时传入敌人空间查询句柄
+    targets_enemies = False
+
     def __init__(self, player, weapon_type):
         super().__init__()
         self.player = player
@@ -52,6 +56,9 @@ class Weapon(pygame.sprite.Sprite):
         # 投射物列表（如果是投射物类型的武器）
         self.projectiles = pygame.sprite.Group()
         
+        # 敌人空间查询句柄（EnemyQuery），由 update(dt, enemies) 传入
+        self.enemy_query = None
+        
         # 加载配置中的图标路径
         weapon_config = get_weapon_config(weapon_type)
         if weapon_config and 'icon_path' in weapon_config:
@@ -147,7 +154,7 @@ class Weapon(pygame.sprite.Sprite):
             tuple: (direction_x, direction_y) 标准化后的方向向量
         """
         # 获取鼠标位置
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = input_source.get_mouse_pos()
         
         # 获取屏幕中心（玩家在屏幕上的位置）
         screen_center_x = screen.get_width() // 2
@@ -171,7 +178,7 @@ class Weapon(pygame.sprite.Sprite):
         Returns:
             tuple: (direction_x, direction_y) 标准化后的方向向量
         """
-        keys = pygame.key.get_pressed()
+        keys = input_source.get_pressed()
         
         # 初始化方向向量
         direction_x = 0
@@ -293,6 +300,27 @@ class Weapon(pygame.sprite.Sprite):
         """
         pass
         
+    def _enemies_near(self, x, y, radius):
+        """获取 (x, y) 附近 radius 范围内的候选敌人
+        
+        有空间查询句柄时只返回附近网格中的敌人，否则退回到完整的敌人列表。
+        调用方仍需做精确的距离判断。
+        
+        Args:
+            x: 世界坐标X
+            y: 世界坐标Y
+            radius: 查询半径
+            
+        Returns:
+            list: 候选敌人列表
+        """
+        if self.enemy_query is not None:
+            return self.enemy_query.near(x, y, radius)
+        game = getattr(self.player, 'game', None)
+        if game and game.enemy_manager:
+            return game.enemy_manager.enemies
+        return []
+        
     def _perform_attack(self, direction_x, direction_y):
         """执行攻击的具体实现，由子类重写
         
@@ -411,6 +439,19 @@ class Weapon(pygame.sprite.Sprite):
         """缓动函数，让动画更自然"""
         return t * (2 - t)
     
+    def _get_line_of_sight(self):
+        """获取当前地图的视线检测服务，没有游戏实例或地图时返回None"""
+        game = getattr(self.player, 'game', None)
+        map_manager = getattr(game, 'map_manager', None) if game else None
+        if not map_manager:
+            return None
+        return map_manager.get_line_of_sight()
+        
+    def _has_line_of_sight(self, x, y):
+        """玩家位置到 (x, y) 之间是否没有被墙挡住（没有地图时视为没有遮挡）"""
+        line_of_sight = self._get_line_of_sight()
+        return line_of_sight is None or line_of_sight.is_clear(self.player.world_x, self.player.world_y, x, y)
+        
     def _check_wall_collision(self, direction_x, direction_y):
         """检查攻击是否会穿墙
         
@@ -421,63 +462,11 @@ class Weapon(pygame.sprite.Sprite):
         Returns:
             bool: 如果不会穿墙返回True，否则返回False
         """
-        if not hasattr(self.player, 'game') or not self.player.game:
-            return True  # 如果没有游戏实例，允许攻击
-            
-        # 获取地图管理器
-        map_manager = getattr(self.player.game, 'map_manager', None)
-        if not map_manager or not hasattr(map_manager, 'collision_tiles'):
-            return True  # 如果没有地图管理器，允许攻击
-            
-        # 计算攻击起点（玩家位置）
-        start_x = self.player.world_x
-        start_y = self.player.world_y
-        
         # 计算攻击终点（假设攻击距离为100像素）
         attack_distance = 100
-        end_x = start_x + direction_x * attack_distance
-        end_y = start_y + direction_y * attack_distance
-        
-        # 检查从起点到终点的路径是否与墙壁碰撞
-        return self._check_line_collision(start_x, start_y, end_x, end_y, map_manager.collision_tiles)
-        
-    def _check_line_collision(self, start_x, start_y, end_x, end_y, collision_tiles):
-        """检查线段是否与碰撞图块相交
+        end_x = self.player.world_x + direction_x * attack_distance
+        end_y = self.player.world_y + direction_y * attack_distance
         
-        Args:
-            start_x, start_y: 线段起点
-            end_x, end_y: 线段终点
-            collision_tiles: 碰撞图块列表
-            
-        Returns:
-            bool: 如果没有碰撞返回True，否则返回False
-        """
-        # 使用Bresenham算法检查线段上的每个点
-        dx = abs(end_x - start_x)
-        dy = abs(end_y - start_y)
-        x, y = start_x, start_y
-        n = 1 + dx + dy
-        x_inc = 1 if end_x > start_x else -1
-        y_inc = 1 if end_y > start_y else -1
-        error = dx - dy
-        dx *= 2
-        dy *= 2
-        
-        for _ in range(n):
-            # 检查当前点是否与任何碰撞图块重叠
-            for tile in collision_tiles:
-                if tile.collidepoint(x, y):
-                    return False  # 发生碰撞
-            
-            if x == end_x and y == end_y:
-                break
-                
-            if error > 0:
-                x += x_inc
-                error -= dy
-            else:
-                y += y_inc
-                error += dx
-                
-        return True  # 没有碰撞
+        # 检查从玩家位置到终点的路径是否被墙挡住
+        return self._has_line_of_sight(end_x, end_y)
     
\ No newline at end of file
@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.profiler import PhaseTimer
+from benchmarks.run_benchmarks import compare
+from benchmarks.scenarios import build_scenarios, SHIPPED_MAPS
+from src.modules.enemies.enemy_config import ENEMY_CONFIGS
+
+
+class TestPhaseTimer(unittest.TestCase):
+    def test_disabled_timer_records_nothing(self):
+        """测试未启用时不记录任何阶段"""
+        timer = PhaseTimer()
+        timer.start()
+        timer.lap("map")
+        self.assertIsNone(timer.end_frame())
+        self.assertEqual(timer.averages_ms(), {})
+
+    def test_laps_accumulate_per_phase(self):
+        """测试同一阶段多次打点会累加，并按帧求平均"""
+        timer = PhaseTimer(enabled=True)
+        for _ in range(2):
+            timer.start()
+            timer.lap("entities")
+            timer.lap("lighting")
+            timer.lap("entities")
+            frame = timer.end_frame()
+            self.assertEqual(set(frame), {"entities", "lighting"})
+        self.assertEqual(timer.frames, 2)
+        self.assertEqual(set(timer.averages_ms()), {"entities", "lighting"})
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_scenarios_cover_enemy_types_and_maps(self):
+        """测试默认场景覆盖所有敌人类型和关卡地图"""
+        names = {scenario.name for scenario in build_scenarios()}
+        for enemy_type in ENEMY_CONFIGS:
+            self.assertIn(f"enemies_{enemy_type}", names)
+        for map_name in SHIPPED_MAPS:
+            self.assertIn(f"map_{map_name}", names)
+        self.assertTrue({"lighting_off", "lighting_on", "lighting_dual", "mass_kill"} <= names)
+
+    def test_compare_detects_regressions(self):
+        """测试超过阈值且超过最小差值的增长才视为回退"""
+        baseline = {
+            "enemies_ghost": {"frame_ms": 10.0, "subsystems": {"update": 2.0, "lighting": 0.01}},
+        }
+        results = {
+            "enemies_ghost": {"frame_ms": 10.5, "subsystems": {"update": 3.0, "lighting": 0.03}},
+            "new_scenario": {"frame_ms": 99.0, "subsystems": {}},
+        }
+        regressions = compare(results, baseline, threshold=0.15, min_delta=0.05)
+        self.assertEqual(regressions, [("enemies_ghost", "update", 2.0, 3.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import sys
+import os
+
+import pygame
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.collision_pipeline import (CollisionPipeline, PROJECTILE_HIT, ENEMY_CONTACT,
+                                            ENEMY_PROJECTILE_HIT)
+from src.modules.enemies.enemy_manager import EnemyManager
+
+
+def solid_image(size, hole=False):
+    """实心方块图像；hole为True时只有右下角1/4不透明"""
+    image = pygame.Surface(size, pygame.SRCALPHA)
+    if hole:
+        image.fill((255, 255, 255, 255), pygame.Rect(size[0] // 2, size[1] // 2, size[0] // 2, size[1] // 2))
+    else:
+        image.fill((255, 255, 255, 255))
+    return image
+
+
+class FakeEnemy:
+    def __init__(self, x, y, enemy_type='ghost', mask_collision=False, hole=False, health=10):
+        self.rect = pygame.Rect(x, y, 80, 80)
+        self.type = enemy_type
+        self.config = {'mask_collision': mask_collision}
+        self.image = solid_image(self.rect.size, hole)
+        self.mask = None
+        self.health = health
+
+
+class FakeProjectile:
+    def __init__(self, x, y, size=16):
+        self.world_x = x
+        self.world_y = y
+        self.rect = pygame.Rect(0, 0, size, size)
+        self.image = solid_image(self.rect.size)
+        self.mask = None
+        self.killed = False
+
+    def kill(self):
+        self.killed = True
+
+
+class FakeWeapon:
+    def __init__(self, projectiles, pierce=False, damage=5):
+        self.projectiles = projectiles
+        self.pierce = pierce
+        self.damage = damage
+        self.calls = []
+
+    def get_projectiles(self):
+        return list(self.projectiles)
+
+    def handle_collision(self, projectile, enemy, enemies=None):
+        self.calls.append((projectile, enemy))
+        enemy.health -= self.damage
+        return not self.pierce
+
+
+class FakePlayer:
+    def __init__(self, x, y, invincible=False):
+        self.world_x = x
+        self.world_y = y
+        self.rect = pygame.Rect(0, 0, 40, 40)
+        self.image = solid_image(self.rect.size)
+        self.mask = None
+        self.invincible = invincible
+
+
+class TestCollisionPipeline(unittest.TestCase):
+    def setUp(self):
+        self.manager = EnemyManager()
+        self.pipeline = CollisionPipeline()
+
+    def test_projectile_hits_each_pair_once_and_stops_when_destroyed(self):
+        """测试投射物与每个敌人最多检查一次，被销毁后不再命中后面的敌人，远处的敌人不参与检测"""
+        first, second = FakeEnemy(0, 0), FakeEnemy(10, 0)
+        far = FakeEnemy(2000, 2000)
+        self.manager.enemies.extend([first, second, far])
+        bullet = FakeProjectile(45, 40)
+        weapon = FakeWeapon([bullet], damage=20)
+
+        events = self.pipeline.run(self.manager, [FakePlayer(1000, 1000)], [weapon])
+
+        self.assertEqual([(e.kind, e.target) for e in events], [(PROJECTILE_HIT, first)])
+        self.assertTrue(events[0].killed and events[0].destroy_source and bullet.killed)
+        self.assertEqual(len(weapon.calls), 1)
+
+        # 穿透的投射物依次命中两个敌人，已经死亡的敌人不会再被命中
+        piercing = FakeWeapon([FakeProjectile(45, 40)], pierce=True, damage=3)
+        events = self.pipeline.run(self.manager, [FakePlayer(1000, 1000)], [piercing])
+        self.assertEqual([e.target for e in events], [second])
+        self.assertNotIn(far, [enemy for _, enemy in piercing.calls])
+
+    def test_mask_test_only_for_configured_types(self):
+        """测试只有配置了遮罩检测的敌人类型才做像素级判断"""
+        # 圆形判断相交，但敌人图像只有右下角不透明，投射物落在左上角
+        masked = FakeEnemy(0, 0, 'slime', mask_collision=True, hole=True)
+        plain = FakeEnemy(0, 200, 'ghost', mask_collision=False, hole=True)
+        self.manager.enemies.extend([masked, plain])
+        weapon = FakeWeapon([FakeProjectile(15, 15), FakeProjectile(15, 215)], pierce=True)
+
+        events = self.pipeline.run(self.manager, [FakePlayer(1000, 1000)], [weapon])
+
+        self.assertEqual([e.target for e in events], [plain])
+        self.assertTrue(self.pipeline.uses_mask(masked))
+        self.assertFalse(self.pipeline.uses_mask(plain))
+
+    def test_contacts_and_enemy_projectiles_target_nearest_player(self):
+        """测试接触和敌人子弹只针对最近的玩家，无敌的玩家不产生接触事件"""
+        ninja, mystic = FakePlayer(100, 100), FakePlayer(400, 100)
+        near_ninja, near_mystic = FakeEnemy(70, 70), FakeEnemy(370, 70)
+        self.manager.enemies.extend([near_ninja, near_mystic])
+        bullet = FakeProjectile(420, 120)
+        self.manager.enemy_projectiles.append(bullet)
+        self.pipeline.enemy_projectile_radius = 50
+
+        events = self.pipeline.run(self.manager, [ninja, mystic], [])
+        self.assertEqual([(e.kind, e.source, e.target) for e in events],
+                         [(ENEMY_CONTACT, near_ninja, ninja),
+                          (ENEMY_CONTACT, near_mystic, mystic),
+                          (ENEMY_PROJECTILE_HIT, bullet, mystic)])
+
+        mystic.invincible = True
+        events = self.pipeline.run(self.manager, [ninja, mystic], [])
+        self.assertEqual([e.source for e in events if e.kind == ENEMY_CONTACT], [near_ninja])
+
+
+if __name__ == '__main__':
+    unittest.main()
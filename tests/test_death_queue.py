@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+import pygame
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.death_queue import DeathQueue
+from src.modules.enemies.enemy_manager import EnemyManager
+from src.modules.items import item_manager as item_manager_module
+from src.modules.items.item_manager import ItemManager
+from src.modules.core import game_random
+
+
+class FakeEnemy:
+    def __init__(self, x, enemy_type='ghost', exp_value=10, health=10):
+        self.rect = pygame.Rect(x, 0, 80, 80)
+        self.type = enemy_type
+        self.config = {'exp_value': exp_value}
+        self.health = health
+
+    def alive(self):
+        return self.health > 0
+
+
+class FakeItem:
+    def __init__(self, x, y, item_type):
+        self.world_x = x
+        self.world_y = y
+        self.item_type = item_type
+
+
+class FakePlayer:
+    luck = 3.0
+
+
+class TestDeathQueue(unittest.TestCase):
+    def setUp(self):
+        self.manager = EnemyManager()
+        self.queue = DeathQueue()
+
+    def test_push_and_collect_register_each_enemy_once(self):
+        """测试命中事件和范围伤害的击杀重复登记时只结算一次"""
+        hit, burned, alive = FakeEnemy(0, health=0), FakeEnemy(100, health=-5), FakeEnemy(200)
+        self.manager.enemies.extend([hit, burned, alive])
+
+        self.assertTrue(self.queue.push(hit))
+        self.assertFalse(self.queue.push(hit))
+        self.queue.collect(self.manager.enemies)
+        self.assertEqual(len(self.queue), 2)
+
+    def test_flush_aggregates_and_compacts_once(self):
+        """测试结算时经验值汇总、掉落批量生成、敌人列表只压缩一次、音效按类型去重"""
+        dead = [FakeEnemy(i * 10, 'ghost' if i % 2 else 'radish', exp_value=5) for i in range(30)]
+        survivors = [FakeEnemy(1000), FakeEnemy(2000, 'bat')]
+        self.manager.enemies.extend(dead[:15] + survivors[:1] + dead[15:] + survivors[1:])
+        for enemy in dead:
+            self.queue.push(enemy)
+        items = mock.Mock()
+        version = self.manager.version
+
+        summary = self.queue.flush(self.manager, items, FakePlayer)
+
+        self.assertEqual((summary.count, summary.experience), (30, 150))
+        self.assertEqual(summary.enemy_types, ['radish', 'ghost'])
+        self.assertEqual(self.manager.enemies, survivors)
+        self.assertEqual(self.manager.version, version + 1)
+        items.spawn_items.assert_called_once()
+        drops, target = items.spawn_items.call_args.args
+        self.assertEqual(drops[:2], [(0, 0, 'radish'), (10, 0, 'ghost')])
+        self.assertIs(target, FakePlayer)
+        # 结算后队列清空
+        self.assertEqual(self.queue.flush(self.manager).count, 0)
+
+    def test_spawn_items_matches_individual_drops(self):
+        """测试批量生成的掉落物与逐个调用 spawn_item 的结果相同"""
+        drops = [(i * 50, i * 20, 'ghost') for i in range(40)]
+        results = []
+        with mock.patch.object(item_manager_module, 'Item', FakeItem):
+            for batched in (False, True):
+                game_random.seed(7)
+                manager = ItemManager()
+                if batched:
+                    manager.spawn_items(drops, FakePlayer())
+                else:
+                    for x, y, enemy_type in drops:
+                        manager.spawn_item(x, y, enemy_type, FakePlayer())
+                orbs = manager.exp_orbs
+                results.append(([(item.world_x, item.world_y, item.item_type) for item in manager.items],
+                                list(zip(orbs.x[:orbs.count], orbs.y[:orbs.count]))))
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(len(results[0][1]), len(drops))
+        self.assertTrue(results[0][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import pygame
+import sys
+import os
+from unittest import mock
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.core import display, input_source
+from src.modules.core.display import ScaledDisplay
+
+
+class TestScaledDisplay(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        # 用普通表面代替窗口
+        self.window = pygame.Surface((1920, 1280))
+        patcher = mock.patch.multiple("src.modules.core.display.pygame.display",
+                                      flip=mock.DEFAULT, update=mock.DEFAULT)
+        self.pygame_display = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(display.set_display, None)
+
+    def test_same_size_draws_directly_to_window(self):
+        """测试内部分辨率与窗口相同时不缩放、坐标不变"""
+        output = ScaledDisplay((1920, 1280), window=self.window)
+        self.assertIs(output.surface, self.window)
+        self.assertEqual(output.to_render_pos((300, 200)), (300, 200))
+        output.present([pygame.Rect(0, 0, 10, 10)])
+        self.pygame_display["update"].assert_called_once_with([pygame.Rect(0, 0, 10, 10)])
+
+    def test_fit_scaling_maps_pixels_and_mouse(self):
+        """测试按比例缩放：画面铺满窗口，鼠标坐标往返换算一致"""
+        output = ScaledDisplay((1920, 1280), (1280, 853), window=self.window)
+        self.assertEqual(output.dest_rect, pygame.Rect(0, 0, 1920, 1280))
+
+        output.surface.fill((0, 0, 0))
+        output.surface.fill((255, 0, 0), pygame.Rect(100, 100, 10, 10))
+        output.present()
+        self.pygame_display["flip"].assert_called_once()
+        self.assertEqual(self.window.get_at((157, 157))[:3], (255, 0, 0))
+        self.assertEqual(self.window.get_at((140, 140))[:3], (0, 0, 0))
+
+        self.assertEqual(output.to_render_pos((960, 640)), (640, 426))
+        self.assertEqual(output.to_render_pos(output.to_window_pos((400, 300))), (400, 300))
+
+        display.set_display(output)
+        source = input_source.InputSource()
+        with mock.patch("pygame.mouse.get_pos", return_value=(1500, 900)):
+            self.assertEqual(source.get_mouse_pos(), (1000, 600))
+        self.assertEqual(display.get_render_size(), (1280, 853))
+
+        # 局部更新时把脏矩形换算到窗口坐标
+        output.present([pygame.Rect(100, 100, 10, 10)])
+        self.pygame_display["update"].assert_called_once_with([pygame.Rect(150, 150, 15, 15)])
+
+    def test_integer_scale_letterboxes(self):
+        """测试整数倍缩放：居中显示，黑边区域的鼠标限制在画面边缘"""
+        output = ScaledDisplay((1920, 1280), (800, 600), integer_scale=True, window=self.window)
+        self.assertEqual(output.dest_rect, pygame.Rect(160, 40, 1600, 1200))
+
+        output.surface.fill((0, 255, 0))
+        output.present()
+        self.assertEqual(self.window.get_at((160, 40))[:3], (0, 255, 0))
+        self.assertEqual(self.window.get_at((100, 640))[:3], (0, 0, 0))
+
+        self.assertEqual(output.to_render_pos((161, 41)), (0, 0))
+        self.assertEqual(output.to_render_pos((0, 1279)), (0, 599))
+        self.assertEqual(output.to_window_pos((400, 300)), (960, 640))
+
+    def test_parse_resolution(self):
+        """测试分辨率字符串解析"""
+        self.assertEqual(display.parse_resolution("1280x853"), (1280, 853))
+        self.assertIsNone(display.parse_resolution(None))
+        with mock.patch("builtins.print"):
+            self.assertIsNone(display.parse_resolution("big"))
+            self.assertIsNone(display.parse_resolution("0x10"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+
+import pygame
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.effect_library import EffectLibrary, effect_library
+from src.modules.enemies.spawn_marker import SpawnMarker
+from src.modules.weapons.types.fireball import ExplosionEffect
+
+
+class Spark:
+    """最简单的可放入对象池的特效"""
+
+    def __init__(self, x, y):
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class TestEffectLibrary(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+
+    def test_pool_reuses_released_effects(self):
+        """测试放回池中的特效被重置后复用，重复放回不会让同一实例被取出两次"""
+        library = EffectLibrary(pool_limit=1)
+        first = library.spawn(Spark, 1, 2)
+        library.release(first)
+        library.release(first)
+        library.release(Spark(0, 0))  # 超出上限，丢弃
+
+        again = library.spawn(Spark, 3, 4)
+        self.assertIs(again, first)
+        self.assertEqual((again.x, again.y), (3, 4))
+        self.assertIsNot(library.spawn(Spark, 5, 6), first)
+        self.assertEqual((library.created, library.reused), (2, 1))
+
+    def test_explosion_frames_are_shared_and_prescaled(self):
+        """测试爆炸帧只缩放一次并被所有爆炸共享，播放结束后实例回到池中"""
+        group = pygame.sprite.Group()
+        explosion = effect_library.spawn(ExplosionEffect, 100, 200, 50)
+        group.add(explosion)
+        self.assertEqual(explosion.image.get_size(), (128, 128))
+        self.assertEqual(explosion.rect.center, (100, 200))
+
+        for _ in range(explosion.total_frames):
+            explosion.update(0.05)
+        self.assertFalse(explosion.alive())
+
+        reused = effect_library.spawn(ExplosionEffect, 10, 20, 50)
+        self.assertIs(reused, explosion)
+        self.assertIs(reused.frames, ExplosionEffect(0, 0, 50).frames)
+        self.assertEqual((reused.current_frame, reused.rect.center), (0, (10, 20)))
+
+    def test_spawn_marker_uses_prebaked_fade_steps(self):
+        """测试出生点标记淡出时切换预先画好的透明度档位，而不是重新绘制"""
+        marker = SpawnMarker(0, 0, duration=1.0)
+        opaque = marker.surface
+        self.assertEqual(opaque.get_at((20, 20)).a, 255)
+
+        marker.update(0.85)
+        self.assertIsNot(marker.surface, opaque)
+        self.assertIs(marker.surface, marker.fade_frames[effect_library.fade_step(marker.alpha)])
+        self.assertAlmostEqual(marker.surface.get_at((20, 20)).a, marker.alpha, delta=5)
+        self.assertIs(SpawnMarker(5, 5).fade_frames, marker.fade_frames)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import math
+import sys
+import os
+from unittest import mock
+
+import pygame
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.enemies.enemy_manager import EnemyManager
+from src.modules.enemies.types import Ghost
+
+
+class FakePlayer:
+    def __init__(self, x, y):
+        self.world_x = x
+        self.world_y = y
+
+
+def distance_to(enemy, player):
+    return math.hypot(enemy.rect.centerx - player.world_x, enemy.rect.centery - player.world_y)
+
+
+class TestEnemyLod(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        with mock.patch("builtins.print"):
+            self.near = Ghost(100, 100)
+            self.mid = Ghost(1500, 0)
+            self.far = Ghost(4000, 0)
+        self.manager = EnemyManager()
+        self.manager.enemies.extend([self.near, self.mid, self.far])
+        self.player = FakePlayer(0, 0)
+
+    def test_tiers_update_at_reduced_rate(self):
+        """测试近处每帧更新，中距离半速、远处降频且不推进动画，并统计各层数量"""
+        calls = []
+        for enemy in self.manager.enemies:
+            original = enemy.update
+            enemy.update = mock.Mock(side_effect=original)
+            calls.append(enemy.update)
+
+        for _ in range(8):
+            self.manager._update_enemies(1 / 60, self.player)
+
+        self.assertEqual([call.call_count for call in calls], [8, 4, 2])
+        self.assertEqual(self.manager.lod_counts, {"near": 1, "mid": 1, "far": 1})
+        # 降频更新时传入累积的时间
+        self.assertAlmostEqual(calls[2].call_args.args[0], 4 / 60)
+        self.assertFalse(calls[2].call_args.kwargs["animate"])
+        self.assertTrue(calls[1].call_args.kwargs["animate"])
+
+    def test_governor_interval_stretches_offscreen_tiers(self):
+        """测试画质调节器的屏幕外更新间隔会拉长中、远层的间隔"""
+        self.manager.offscreen_update_interval = 4
+        with mock.patch.object(self.far, "update") as far_update, \
+                mock.patch.object(self.mid, "update") as mid_update:
+            for _ in range(16):
+                self.manager._update_enemies(1 / 60, self.player)
+        self.assertEqual((mid_update.call_count, far_update.call_count), (4, 2))
+
+    def test_far_enemy_converges_on_player(self):
+        """测试远处敌人降频更新仍然持续靠近玩家，进入近处后恢复完整更新"""
+        self.manager.enemies = [self.far]
+        start = distance_to(self.far, self.player)
+        for _ in range(60 * 30):
+            self.manager._update_enemies(1 / 60, self.player)
+        self.assertLess(distance_to(self.far, self.player), 100)
+        self.assertLess(distance_to(self.far, self.player), start)
+        self.assertEqual(self.manager.lod_counts["near"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
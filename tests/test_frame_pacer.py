@@ -0,0 +1,41 @@
+import unittest
+import sys
+import os
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.core.frame_pacer import FramePacer
+
+
+class TestFramePacer(unittest.TestCase):
+    def setUp(self):
+        self.pacer = FramePacer(active_fps=120, idle_fps=30, keepalive_interval=1.0)
+
+    def test_active_play_renders_every_frame(self):
+        """测试战斗进行时每帧渲染并使用满帧率"""
+        self.assertEqual(self.pacer.target_fps(None), 120)
+        self.assertTrue(all(self.pacer.should_render(1 / 120, None) for _ in range(10)))
+
+    def test_static_screen_renders_on_change_only(self):
+        """测试静态界面只在首次、输入、状态变化和保活时渲染"""
+        state = ("frozen", (True, False, False), False)
+        self.assertEqual(self.pacer.target_fps(state), 30)
+        self.assertTrue(self.pacer.should_render(1 / 30, state))
+        self.assertFalse(self.pacer.should_render(1 / 30, state))
+
+        self.pacer.request_redraw()
+        self.assertTrue(self.pacer.should_render(1 / 30, state))
+        self.assertFalse(self.pacer.should_render(1 / 30, state))
+
+        # 结算界面显示按钮等不经过输入的变化
+        self.assertTrue(self.pacer.should_render(1 / 30, ("frozen", (False, False, True), True)))
+
+        # 保活：长时间无变化也会重绘一次
+        rendered = [self.pacer.should_render(0.1, ("main_menu", False, False)) for _ in range(25)]
+        self.assertEqual(rendered.count(True), 3)
+        self.assertGreater(self.pacer.skipped_frames, 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import pygame
+import sys
+import os
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.core import input_source
+from src.modules.core.input_source import ScriptedInputSource, KeyState
+from src.modules.simulation import ScriptedController
+
+
+class MockUpgradeMenu:
+    def __init__(self):
+        self.is_active = False
+
+
+class MockGame:
+    """只记录收到的按键事件的模拟Game对象"""
+    def __init__(self):
+        self.upgrade_menu = MockUpgradeMenu()
+        self.keydowns = []
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.keydowns.append(event.key)
+
+
+class TestInputSource(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+
+    def tearDown(self):
+        input_source.set_input_source(None)
+
+    def test_key_state_indexing(self):
+        """测试KeyState支持与get_pressed相同的下标访问"""
+        keys = KeyState([pygame.K_w, pygame.K_LEFT])
+        self.assertTrue(keys[pygame.K_w])
+        self.assertTrue(keys[pygame.K_LEFT])
+        self.assertFalse(keys[pygame.K_s])
+
+    def test_scripted_source_replaces_live_input(self):
+        """测试设置脚本化输入源后，模块级读取函数返回脚本状态"""
+        source = ScriptedInputSource((100, 200))
+        source.press(pygame.K_d)
+        input_source.set_input_source(source)
+
+        self.assertTrue(input_source.get_pressed()[pygame.K_d])
+        self.assertEqual(input_source.get_mouse_pos(), (100, 200))
+
+        input_source.set_mouse_pos(5.7, 6.2)
+        self.assertEqual(source.mouse_pos, (5, 6))
+
+        input_source.set_input_source(None)
+        self.assertNotIsInstance(input_source.get_input_source(), ScriptedInputSource)
+
+
+class TestScriptedController(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.game = MockGame()
+        self.source = ScriptedInputSource()
+
+    def test_script_timeline(self):
+        """测试脚本控制器按时间轴切换按住的按键并循环"""
+        controller = ScriptedController([
+            {"duration": 1.0, "hold": ["d"]},
+            {"duration": 1.0, "hold": ["a"]},
+        ])
+        controller.step(self.game, self.source, 0.5)
+        self.assertEqual(self.source.pressed_keys, {pygame.K_d})
+        controller.step(self.game, self.source, 1.0)
+        self.assertEqual(self.source.pressed_keys, {pygame.K_a})
+        controller.step(self.game, self.source, 1.0)
+        self.assertEqual(self.source.pressed_keys, {pygame.K_d})
+
+    def test_taps_respect_interval(self):
+        """测试点按按键按间隔触发"""
+        controller = ScriptedController([{"duration": 10.0, "tap": ["l"]}], tap_interval=0.5)
+        for _ in range(10):
+            controller.step(self.game, self.source, 0.25)
+        self.assertEqual(self.game.keydowns, [pygame.K_l] * 5)
+
+    def test_upgrade_menu_is_confirmed(self):
+        """测试升级菜单弹出时自动确认"""
+        controller = ScriptedController()
+        self.game.upgrade_menu.is_active = True
+        controller.step(self.game, self.source, 1 / 60)
+        self.assertEqual(self.game.keydowns, [pygame.K_RETURN])
+
+
+if __name__ == '__main__':
+    unittest.main()
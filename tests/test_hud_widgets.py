@@ -0,0 +1,103 @@
+import unittest
+import pygame
+import sys
+import os
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.hud_widgets import (surface_counter, TextLabel, EnergyBarWidget,
+                                     BulletShotsWidget, CooldownIconWidget, DashedLineWidget)
+
+
+def make_icon():
+    icon = pygame.Surface((10, 10), pygame.SRCALPHA)
+    icon.fill((0, 0, 0, 0))
+    pygame.draw.circle(icon, (200, 220, 40, 255), (5, 5), 4)
+    return icon
+
+
+def legacy_energy_bar(screen, bar_x, bar_y, icon, energy):
+    """原来每帧新建表面的电量条绘制（不含文字），作为对照"""
+    bar_width, bar_height, icon_size = 50, 8, 16
+    light_icon = pygame.transform.scale(icon, (icon_size, icon_size))
+    screen.blit(light_icon, (bar_x - icon_size - 5, bar_y - (icon_size - bar_height) // 2))
+    background_surface = pygame.Surface((bar_width, bar_height), pygame.SRCALPHA)
+    pygame.draw.rect(background_surface, (50, 50, 50, 180), (0, 0, bar_width, bar_height))
+    screen.blit(background_surface, (bar_x, bar_y))
+    energy_ratio = energy / 100.0
+    energy_width = int(bar_width * energy_ratio)
+    if energy_ratio > 0.6:
+        energy_color = (0, 255, 0, 200)
+    elif energy_ratio > 0.3:
+        energy_color = (255, 255, 0, 200)
+    else:
+        energy_color = (255, 0, 0, 200)
+    if energy_width > 0:
+        energy_surface = pygame.Surface((energy_width, bar_height), pygame.SRCALPHA)
+        pygame.draw.rect(energy_surface, energy_color, (0, 0, energy_width, bar_height))
+        screen.blit(energy_surface, (bar_x, bar_y))
+    border_surface = pygame.Surface((bar_width, bar_height), pygame.SRCALPHA)
+    pygame.draw.rect(border_surface, (255, 255, 255, 150), (0, 0, bar_width, bar_height), 1)
+    screen.blit(border_surface, (bar_x, bar_y))
+
+
+class TestHudWidgets(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        surface_counter.reset()
+        self.screen = pygame.Surface((200, 120))
+        self.icon = make_icon()
+
+    def test_energy_bar_matches_legacy_drawing(self):
+        """测试缓存的电量条与原来的逐帧绘制结果一致"""
+        widget = EnergyBarWidget(lambda: self.icon)
+        for energy in (100, 75, 55):  # 50%以上不显示文字
+            expected = pygame.Surface((200, 120))
+            expected.fill((30, 60, 90))
+            legacy_energy_bar(expected, 60, 50, self.icon, energy)
+
+            self.screen.fill((30, 60, 90))
+            widget.render(self.screen, 60, 50, 75, energy)
+            self.assertEqual(pygame.image.tobytes(self.screen, "RGB"),
+                             pygame.image.tobytes(expected, "RGB"), energy)
+
+    def test_no_allocations_when_values_unchanged(self):
+        """测试数值不变时每帧不再新建表面"""
+        energy_bar = EnergyBarWidget(lambda: self.icon)
+        shots = BulletShotsWidget(lambda: self.icon)
+        cooldown = CooldownIconWidget(48)
+        label = TextLabel(16)
+
+        def frame(energy, remaining, timer):
+            energy_bar.render(self.screen, 60, 50, 75, energy)
+            shots.render(self.screen, 100, 20, remaining, remaining == 0)
+            cooldown.render(self.screen, 10, 10, self.icon, timer)
+            self.screen.blit(label.get("传送道具"), (0, 0))
+            return surface_counter.end_frame()
+
+        self.assertGreater(frame(40, 0, 3.0), 0)
+        for _ in range(5):
+            self.assertEqual(frame(40, 0, 3.0), 0)
+
+        # 只有变化的数值重新绘制：电量文字 + 电量条
+        self.assertEqual(frame(30, 0, 3.0), 2)
+        # 冷却时间文字
+        self.assertEqual(frame(30, 0, 2.9), 1)
+        # 射击次数变化只切换已缓存的图标
+        self.assertEqual(frame(30, 4, 2.9), 0)
+
+    def test_dashed_line_reuses_segments(self):
+        """测试端点不变时复用虚线线段"""
+        widget = DashedLineWidget()
+        widget.render(self.screen, 10, 10, 150, 90)
+        widget.render(self.screen, 10, 10, 150, 90)
+        self.assertEqual(widget.rebuilds, 1)
+        # 最后一段画到终点
+        self.assertEqual(widget._segments[-1][1], (150, 90))
+        widget.render(self.screen, 10, 10, 10, 10)
+        self.assertEqual(widget._segments, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
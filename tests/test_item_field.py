@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.items.item_field import ItemField
+from src.modules.items.item_manager import ItemManager
+
+
+class FakePlayer:
+    def __init__(self, x, y, pickup_range=50):
+        self.world_x = x
+        self.world_y = y
+        self.pickup_range = pickup_range
+        self.experience_calls = []
+
+    def add_experience(self, amount):
+        self.experience_calls.append(amount)
+
+
+class TestItemField(unittest.TestCase):
+    def test_orbs_fly_to_and_are_picked_up_by_nearest_player(self):
+        """测试经验球只飞向最近的玩家，范围外的不动，近到一定距离时被该玩家拾取"""
+        field = ItemField(merge_threshold=None)
+        ninja, mystic = FakePlayer(0, 0), FakePlayer(400, 0)
+        # 靠近忍者蛙、靠近神秘剑士、两人拾取范围外、已经贴着神秘剑士
+        field.spawn_many([30, 370, 200, 402], [0, 0, 0, 0], [1, 2, 4, 8])
+
+        collected = field.update(0.01, [ninja, mystic])
+
+        self.assertEqual(collected, [(0, 0.0), (1, 8.0)])
+        self.assertEqual(len(field), 3)
+        self.assertAlmostEqual(field.x[0], 30 - 3.5)
+        self.assertAlmostEqual(field.x[1], 370 + 3.5)
+        self.assertEqual(field.x[2], 200)
+
+    def test_merge_bounds_count_and_preserves_value(self):
+        """测试超过阈值时合并相邻经验球，数量不超过阈值且总经验值和原始数量不变"""
+        field = ItemField(merge_threshold=50, merge_radius=32, capacity=4)
+        xs = [1000 + (i % 40) * 5 for i in range(400)]
+        ys = [1000 + (i // 40) * 5 for i in range(400)]
+        field.spawn_many(xs, ys, [3] * 400)
+        self.assertEqual(len(field), 400)
+
+        field.update(1 / 60, [FakePlayer(-5000, -5000)])
+
+        self.assertLessEqual(len(field), 50)
+        self.assertAlmostEqual(field.total_value(), 1200)
+        self.assertEqual(int(field.merged[:len(field)].sum()), 400)
+        # 合并后的经验球仍在原来的范围内
+        self.assertTrue((field.x[:len(field)] >= 1000).all() and (field.x[:len(field)] <= 1195).all())
+
+    def test_manager_adds_experience_once_per_player(self):
+        """测试物品管理器一次更新处理所有玩家，每名玩家的经验只添加一次"""
+        manager = ItemManager()
+        manager.exp_orb_value = 5
+        ninja, mystic = FakePlayer(0, 0), FakePlayer(400, 0)
+        for x in (1, 2, 3, 398):
+            manager.exp_orbs.spawn(x, 0, manager.exp_orb_value)
+
+        manager.update(1 / 60, [ninja, mystic])
+
+        self.assertEqual(ninja.experience_calls, [15])
+        self.assertEqual(mystic.experience_calls, [5])
+        self.assertEqual(len(manager.exp_orbs), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
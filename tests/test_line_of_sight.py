@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.line_of_sight import LineOfSight
+
+
+def build(rows, cache_size=1024):
+    """按字符画创建视线检测（#为墙，格子边长10像素）"""
+    blocked = [1 if ch == "#" else 0 for line in rows for ch in line]
+    return LineOfSight(blocked, len(rows[0]), len(rows), 10, 10, cache_size=cache_size)
+
+
+class TestLineOfSight(unittest.TestCase):
+    def test_walls_block_sight(self):
+        """测试墙挡住视线，绕开墙的连线不受影响，起点所在的墙格子不参与判断"""
+        line_of_sight = build([
+            ".....",
+            "..#..",
+            ".....",
+        ])
+        self.assertFalse(line_of_sight.is_clear(5, 15, 45, 15))
+        self.assertTrue(line_of_sight.is_clear(5, 5, 45, 5))
+        self.assertTrue(line_of_sight.is_clear(5, 25, 45, 25))
+        # 贴墙站在墙格子里时仍能向外看
+        self.assertTrue(line_of_sight.is_clear(25, 15, 45, 5))
+        # 地图外视为墙
+        self.assertFalse(line_of_sight.is_clear(5, 5, -15, 5))
+
+    def test_cannot_see_through_diagonal_gap(self):
+        """测试连线恰好穿过两堵墙相接的角点时视为被挡住"""
+        line_of_sight = build([
+            ".#",
+            "#.",
+        ])
+        self.assertFalse(line_of_sight.is_clear(5, 5, 15, 15))
+        self.assertFalse(line_of_sight.is_clear(15, 15, 5, 5))
+
+        open_corner = build([
+            "..",
+            "..",
+        ])
+        self.assertTrue(open_corner.is_clear(5, 5, 15, 15))
+
+    def test_results_are_cached_by_tile_pair(self):
+        """测试结果按 (起点格子, 终点格子) 缓存，超出容量时淘汰最久未使用的条目"""
+        line_of_sight = build([
+            "......",
+            "......",
+        ], cache_size=2)
+        line_of_sight.is_clear(1, 1, 51, 1)
+        line_of_sight.is_clear(9, 9, 59, 9)   # 同一对格子
+        self.assertEqual((line_of_sight.hits, line_of_sight.misses), (1, 1))
+
+        line_of_sight.is_clear(1, 1, 41, 11)
+        line_of_sight.is_clear(1, 1, 31, 11)  # 淘汰 ((0, 0), (5, 0))
+        line_of_sight.is_clear(1, 1, 51, 1)
+        self.assertEqual((line_of_sight.hits, line_of_sight.misses), (1, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
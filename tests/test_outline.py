@@ -0,0 +1,100 @@
+import unittest
+import pygame
+import sys
+import os
+from unittest import mock
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.outline import dilate_mask, build_outline_layer, OutlineCache
+from src.modules.utils import extract_sprite_outline, create_outlined_sprite
+from src.modules.outline import outline_cache
+from src.modules.enemies.types import Ghost
+
+
+def naive_dilate(mask, thickness):
+    """原来的逐像素膨胀实现，作为对照"""
+    width, height = mask.get_size()
+    result = pygame.mask.Mask((width, height))
+    for x in range(width):
+        for y in range(height):
+            if mask.get_at((x, y)):
+                for dx in range(-thickness, thickness + 1):
+                    for dy in range(-thickness, thickness + 1):
+                        nx, ny = x + dx, y + dy
+                        if 0 <= nx < width and 0 <= ny < height:
+                            result.set_at((nx, ny), 1)
+    return result
+
+
+class TestOutline(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.surface = pygame.Surface((20, 16), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 0))
+        pygame.draw.rect(self.surface, (200, 200, 200, 255), (0, 5, 6, 4))
+        pygame.draw.circle(self.surface, (100, 150, 200, 255), (13, 8), 4)
+
+    def test_dilation_matches_naive(self):
+        """测试遮罩卷积膨胀与逐像素实现结果一致（包括贴边裁剪）"""
+        mask = pygame.mask.from_surface(self.surface)
+        for thickness in (0, 1, 2, 3):
+            expected = naive_dilate(mask, thickness)
+            actual = dilate_mask(mask, thickness)
+            self.assertEqual(actual.get_size(), mask.get_size())
+            self.assertEqual(actual.count(), expected.count())
+            self.assertEqual(actual.overlap_area(expected, (0, 0)), expected.count())
+
+    def test_outline_layer_excludes_sprite(self):
+        """测试轮廓层只包含外圈像素"""
+        layer = build_outline_layer(self.surface, (255, 0, 0), 1)
+        self.assertEqual(layer.get_at((13, 8)).a, 0)      # 精灵内部透明
+        self.assertEqual(layer.get_at((13, 3)), (255, 0, 0, 255))  # 圆的上方一圈
+        self.assertEqual(layer.get_at((19, 0)).a, 0)      # 远处透明
+
+    def test_extract_sprite_outline_composite(self):
+        """测试带轮廓图像保留原图像素"""
+        outlined = extract_sprite_outline(self.surface, (0, 255, 0), 1)
+        self.assertEqual(outlined.get_at((13, 8)), self.surface.get_at((13, 8)))
+        self.assertEqual(outlined.get_at((13, 3)), (0, 255, 0, 255))
+
+    def test_cache_reuses_layers(self):
+        """测试同一帧、颜色和粗细只生成一次轮廓"""
+        cache = OutlineCache(max_entries=2)
+        first = cache.get_layer(self.surface, (255, 0, 0), 1)
+        self.assertIs(cache.get_layer(self.surface, (255, 0, 0), 1), first)
+        self.assertIsNot(cache.get_layer(self.surface, (0, 255, 0), 1), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        flipped = cache.get_layer(self.surface, (255, 0, 0), 1, flip_x=True)
+        self.assertEqual(flipped.get_at((19 - 13, 3)), (255, 0, 0, 255))
+        self.assertEqual(len(cache._layers), 2)  # 超出上限时淘汰最久未用的条目
+
+    def test_create_outlined_sprite_accepts_surface(self):
+        """测试create_outlined_sprite同时支持精灵对象和Surface"""
+        class Sprite:
+            pass
+        sprite = Sprite()
+        sprite.image = self.surface
+        self.assertIs(create_outlined_sprite(sprite), create_outlined_sprite(self.surface))
+        self.assertIsNone(create_outlined_sprite(Sprite()))
+
+    def test_enemies_of_same_type_share_outline_layers(self):
+        """测试同类型敌人共用帧变体，整波敌人开启轮廓时每个不同的帧只生成一次轮廓层"""
+        with mock.patch("builtins.print"):
+            ghosts = [Ghost(100 * i, 0) for i in range(20)]
+        for ghost in ghosts:
+            ghost.show_outline = True
+            ghost.update_image()
+        outline_cache.clear()
+        misses = outline_cache.misses
+        layers = {id(ghost.get_outline_layer()) for ghost in ghosts}
+
+        self.assertEqual(len({id(ghost.image) for ghost in ghosts}), 1)
+        self.assertEqual(len(layers), 1)
+        self.assertEqual(outline_cache.misses - misses, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
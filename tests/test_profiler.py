@@ -0,0 +1,128 @@
+import unittest
+import sys
+import os
+import csv
+import json
+import tempfile
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.profiler import (FrameProfiler, CaptureProfiler, AllocationTracker,
+                                  UPDATE_PHASES, RENDER_PHASES, COUNTERS)
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def _fill(self, profiler, frame_values):
+        for value in frame_values:
+            profiler.record({"map": 1_000_000})
+            profiler.samples[-1]["frame_ms"] = value
+
+    def test_percentiles_use_nearest_rank(self):
+        """测试百分位数按最近秩法计算"""
+        profiler = FrameProfiler(window=100)
+        self._fill(profiler, range(1, 101))
+        self.assertEqual(profiler.percentiles(), {50: 50, 95: 95, 99: 99})
+
+    def test_window_is_rolling(self):
+        """测试滚动窗口只保留最近的样本"""
+        profiler = FrameProfiler(window=10)
+        self._fill(profiler, [100.0] * 10 + [1.0] * 10)
+        self.assertEqual(len(profiler.samples), 10)
+        self.assertEqual(profiler.percentiles()[99], 1.0)
+        self.assertEqual(profiler.frame_index, 20)
+
+    def test_phase_averages(self):
+        """测试阶段平均值以毫秒为单位，缺失阶段记为0"""
+        profiler = FrameProfiler()
+        profiler.record({"enemies": 2_000_000})
+        profiler.record({"enemies": 4_000_000, "map": 1_000_000})
+        averages = profiler.phase_averages_ms()
+        self.assertAlmostEqual(averages["enemies"], 3.0)
+        self.assertAlmostEqual(averages["map"], 0.5)
+        self.assertEqual(averages["lighting"], 0.0)
+
+    def test_empty_window(self):
+        """测试没有样本时返回空结果"""
+        profiler = FrameProfiler()
+        self.assertEqual(profiler.percentiles(), {})
+        self.assertEqual(profiler.phase_averages_ms(), {})
+
+    def test_stream_jsonl_and_csv(self):
+        """测试样本可以写入JSONL和CSV文件"""
+        with tempfile.TemporaryDirectory() as tmp:
+            jsonl_path = os.path.join(tmp, "frames.jsonl")
+            csv_path = os.path.join(tmp, "frames.csv")
+
+            profiler = FrameProfiler()
+            profiler.open_stream(jsonl_path)
+            profiler.record({"enemies": 2_000_000})
+            profiler.open_stream(csv_path)  # 重新打开会先关闭之前的文件
+            profiler.record({"map": 1_000_000}, {"enemies_far": 3})
+            profiler.close_stream()
+            self.assertFalse(profiler.is_streaming)
+
+            with open(jsonl_path, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual(len(lines), 1)
+            self.assertAlmostEqual(lines[0]["enemies"], 2.0)
+
+            with open(csv_path, encoding="utf-8") as f:
+                reader = csv.DictReader(f)
+                self.assertEqual(reader.fieldnames,
+                                 ["frame", "frame_ms"] + list(UPDATE_PHASES) + list(RENDER_PHASES)
+                                 + list(COUNTERS))
+                rows = list(reader)
+            self.assertEqual(len(rows), 1)
+            self.assertAlmostEqual(float(rows[0]["map"]), 1.0)
+            self.assertEqual(float(rows[0]["lighting"]), 0.0)
+            self.assertEqual(int(rows[0]["enemies_far"]), 3)
+
+
+class TestCaptureProfiler(unittest.TestCase):
+    def test_capture_stops_after_frames(self):
+        """测试cProfile采集在指定帧数后自动停止并写出结果"""
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = CaptureProfiler(output_dir=tmp, top_n=5)
+            self.assertTrue(profiler.start(frames=3))
+            self.assertFalse(profiler.start())  # 采集中不能重复开始
+
+            self.assertIsNone(profiler.frame_end())
+            self.assertIsNone(profiler.frame_end())
+            prof_path, summary_path = profiler.frame_end()
+
+            self.assertFalse(profiler.is_active)
+            self.assertTrue(os.path.exists(prof_path))
+            with open(summary_path, encoding="utf-8") as f:
+                self.assertIn("3 帧", f.read())
+
+    def test_stop_without_capture(self):
+        """测试没有采集时停止返回None"""
+        self.assertIsNone(CaptureProfiler().stop())
+        self.assertIsNone(CaptureProfiler().frame_end())
+
+
+class TestAllocationTracker(unittest.TestCase):
+    def test_snapshot_diff(self):
+        """测试第一张快照作为基准，第二张快照生成对比报告"""
+        with tempfile.TemporaryDirectory() as tmp:
+            tracker = AllocationTracker(output_dir=tmp, top_n=5)
+            try:
+                self.assertIsNone(tracker.snapshot())
+                kept = [bytearray(1024) for _ in range(100)]
+                tracker.frame_end()
+                tracker.frame_end()
+                report = tracker.snapshot()
+                self.assertTrue(os.path.exists(report))
+                with open(report, encoding="utf-8") as f:
+                    content = f.read()
+                self.assertIn("间隔 2 帧", content)
+                self.assertIn("test_profiler.py", content)
+                del kept
+            finally:
+                tracker.stop()
+            self.assertFalse(tracker.is_tracing)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import io
+import sys
+import os
+from contextlib import redirect_stdout
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.core.quality_governor import QualityGovernor, QUALITY_TIERS
+
+
+class TestQualityGovernor(unittest.TestCase):
+    def setUp(self):
+        # 目标60FPS：平均帧时间超过19.2ms降档，低于13.3ms升档
+        self.governor = QualityGovernor(target_fps=60, window=30, degrade_hold=1.0, upgrade_hold=3.0)
+
+    def run_frames(self, frame_time, seconds):
+        """以固定帧时间运行一段时间，返回档位变化次数"""
+        changes = 0
+        with redirect_stdout(io.StringIO()):
+            for _ in range(int(seconds / frame_time)):
+                changes += self.governor.record_frame(frame_time)
+        return changes
+
+    def test_sustained_slow_frames_step_down_one_tier_at_a_time(self):
+        """测试持续掉帧时逐档降低画质，并记录日志"""
+        self.assertEqual(self.run_frames(1 / 60, 5), 0)
+        self.assertEqual(self.governor.tier_name, "高")
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            changed = [self.governor.record_frame(1 / 30) for _ in range(30 + 30)]
+        self.assertEqual(changed.count(True), 1)
+        self.assertEqual(self.governor.tier, 1)
+        self.assertIn("高 -> 中", output.getvalue())
+
+        # 一直掉帧最终停在最低档
+        self.run_frames(1 / 30, 30)
+        self.assertEqual(self.governor.tier, len(QUALITY_TIERS) - 1)
+        self.assertFalse(self.governor.settings["enemy_details"])
+
+    def test_hysteresis_band_keeps_tier(self):
+        """测试帧时间处于两个阈值之间时保持档位，升档比降档需要更久"""
+        self.run_frames(1 / 30, 2.5)
+        self.assertEqual(self.governor.tier, 1)
+
+        # 55FPS：既不够慢也不够快，不变化
+        self.assertEqual(self.run_frames(1 / 55, 10), 0)
+
+        # 短暂的流畅不足以升档
+        self.assertEqual(self.run_frames(1 / 90, 2.5), 0)
+        self.assertEqual(self.governor.tier, 1)
+        self.assertEqual(self.run_frames(1 / 90, 2), 1)
+        self.assertEqual(self.governor.tier, 0)
+        self.assertEqual([(old, new) for old, new, _ in self.governor.changes], [(0, 1), (1, 0)])
+
+    def test_long_frames_are_clamped_and_reset_restores_top_tier(self):
+        """测试加载地图等单个长帧不会触发降档，reset 恢复最高画质"""
+        self.run_frames(1 / 60, 1)
+        self.assertEqual(self.run_frames(5.0, 5.0), 0)
+        self.run_frames(1 / 60, 1)
+        self.assertEqual(self.governor.tier, 0)
+
+        self.run_frames(1 / 20, 3)
+        self.assertGreater(self.governor.tier, 0)
+        self.governor.reset()
+        self.assertEqual((self.governor.tier, self.governor.average_frame_time), (0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import pygame
+import sys
+import os
+from unittest import mock
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.core.render_manager import RenderManager
+
+
+class FakeScene:
+    """一个静态背景层加一个可移动方块的动态层"""
+
+    def __init__(self):
+        self.static_calls = 0
+        self.box = pygame.Rect(10, 10, 20, 20)
+
+    def draw_world(self, screen, camera_x, camera_y):
+        self.static_calls += 1
+        screen.fill((40, 80, 120))
+        pygame.draw.line(screen, (255, 255, 255), (0, 0), (199, 149))
+
+    def draw_box(self, screen, camera_x, camera_y):
+        return screen.fill((255, 0, 0), self.box)
+
+
+class TestRenderManagerCompositor(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.Surface((200, 150))
+        self.manager = RenderManager(self.screen, default_layers=False)
+        self.scene = FakeScene()
+        self.manager.add_layer("world", 0, static=True)
+        self.manager.add_layer("menus", 1)
+        self.manager.add_to_layer("world", self.scene.draw_world)
+        self.manager.add_to_layer("menus", self.scene.draw_box)
+
+        patcher = mock.patch.multiple("src.modules.core.render_manager.pygame.display",
+                                      flip=mock.DEFAULT, update=mock.DEFAULT)
+        self.display = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def full_redraw(self):
+        """不使用快照重新绘制一帧，作为对照"""
+        expected = pygame.Surface(self.screen.get_size())
+        self.scene.draw_world(expected, 0, 0)
+        self.scene.draw_box(expected, 0, 0)
+        self.scene.static_calls -= 1
+        return pygame.image.tobytes(expected, "RGB")
+
+    def test_live_frames_flip_once(self):
+        """测试未冻结时每帧整屏重绘并只flip一次"""
+        for _ in range(3):
+            self.assertEqual(self.manager.render_frame(), [])
+        self.assertEqual(self.scene.static_calls, 3)
+        self.assertEqual(self.display["flip"].call_count, 3)
+        self.assertEqual(self.display["update"].call_count, 0)
+        self.assertEqual(self.manager.presents, 3)
+
+    def test_frozen_frames_update_dirty_rects_only(self):
+        """测试冻结期间复用静态层快照，只局部更新动态层区域"""
+        self.manager.render_frame("paused")
+        self.assertEqual(self.display["flip"].call_count, 1)
+
+        self.scene.box.topleft = (100, 60)
+        rects = self.manager.render_frame("paused")
+        self.assertEqual(self.scene.static_calls, 1)
+        self.assertEqual(self.display["update"].call_count, 1)
+        # 同时更新旧位置（擦除）和新位置
+        self.assertEqual(sorted(map(tuple, rects)), [(10, 10, 20, 20), (100, 60, 20, 20)])
+        self.assertEqual(pygame.image.tobytes(self.screen, "RGB"), self.full_redraw())
+
+        # 冻结状态改变时整屏重绘
+        self.manager.render_frame("upgrade")
+        self.assertEqual(self.scene.static_calls, 2)
+        self.assertEqual(self.display["flip"].call_count, 2)
+        self.assertEqual(self.manager.presents, 3)
+
+    def test_unknown_dirty_region_falls_back_to_flip(self):
+        """测试动态层没有返回绘制区域时整屏刷新"""
+        self.manager.add_to_layer("menus", lambda screen, camera_x, camera_y: None)
+        self.manager.render_frame("paused")
+        self.manager.render_frame("paused")
+        self.assertEqual(self.display["flip"].call_count, 2)
+        self.assertEqual(self.display["update"].call_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
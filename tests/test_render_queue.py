@@ -0,0 +1,122 @@
+import unittest
+import pygame
+import sys
+import os
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.render_queue import RenderQueue, LAYER_ENEMIES, LAYER_ITEMS
+from src.modules.enemies.enemy import Enemy
+
+
+def solid(color, size=(10, 10)):
+    surface = pygame.Surface(size)
+    surface.fill(color)
+    return surface
+
+
+class FakeEnemy:
+    """只包含血条绘制所需属性的敌人"""
+    _health_bar_geometry = Enemy._health_bar_geometry
+    _health_bar_items = Enemy._health_bar_items
+
+    def __init__(self, health, max_health, scale=1.0):
+        self.health = health
+        self.max_health = max_health
+        self.scale = scale
+        self._health_bar_key = None
+        self._health_bar_surface = None
+
+
+def legacy_health_bar(screen, enemy, screen_x, screen_y):
+    """原来每帧直接在屏幕上绘制的血条，作为对照"""
+    health_bar_width = 32 * enemy.scale
+    health_bar_height = 5 * enemy.scale
+    health_ratio = max(0, enemy.health / enemy.max_health)
+    bar_x = screen_x - health_bar_width // 2+20
+    bar_y = screen_y - 20 * enemy.scale
+    if health_ratio > 0.8:
+        health_color = (0, 255, 0)
+    elif health_ratio > 0.2:
+        health_color = (255, 255, 0)
+    else:
+        health_color = (255, 0, 0)
+    pygame.draw.rect(screen, (100, 0, 0), (bar_x, bar_y, health_bar_width, health_bar_height))
+    if health_ratio > 0:
+        pygame.draw.rect(screen, health_color, (bar_x, bar_y, health_bar_width * health_ratio, health_bar_height))
+    pygame.draw.rect(screen, (255, 255, 255), (bar_x, bar_y, health_bar_width, health_bar_height), 1)
+    health_text = f"{int(enemy.health)}/{int(enemy.max_health)}"
+    health_font = pygame.font.SysFont('simHei', max(8, int(10 * enemy.scale)))
+    health_text_surface = health_font.render(health_text, True, (255, 255, 255))
+    health_text_rect = health_text_surface.get_rect()
+    health_text_rect.centerx = bar_x + health_bar_width // 2
+    health_text_rect.centery = bar_y + health_bar_height // 2
+    shadow_surface = health_font.render(health_text, True, (0, 0, 0))
+    shadow_rect = shadow_surface.get_rect()
+    shadow_rect.centerx = health_text_rect.centerx + 1
+    shadow_rect.centery = health_text_rect.centery + 1
+    screen.blit(shadow_surface, shadow_rect)
+    screen.blit(health_text_surface, health_text_rect)
+
+
+class TestRenderQueue(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.Surface((200, 100))
+        self.queue = RenderQueue(margin=20)
+        # 相机位于世界坐标 (1000, 500)，对应屏幕中心
+        self.queue.begin(self.screen, 1000, 500)
+
+    def test_flush_sorts_by_layer_and_keeps_submission_order(self):
+        """测试按图层排序，同层保持提交顺序"""
+        self.queue.submit(solid((255, 0, 0)), (0, 0), LAYER_ITEMS)
+        self.queue.submit(solid((0, 255, 0)), (5, 5), LAYER_ENEMIES)
+        self.queue.submit(solid((0, 0, 255)), (8, 8), LAYER_ENEMIES)
+        self.queue.submit(solid((255, 255, 0), (4, 4)), (20, 20), LAYER_ENEMIES)
+
+        self.assertEqual(self.queue.flush(), 4)
+        # 物品层最后绘制，覆盖敌人层
+        self.assertEqual(self.screen.get_at((6, 6))[:3], (255, 0, 0))
+        # 同层后提交的覆盖先提交的
+        self.assertEqual(self.screen.get_at((12, 12))[:3], (0, 0, 255))
+        self.assertEqual(self.screen.get_at((11, 6))[:3], (0, 255, 0))
+        self.assertEqual(self.screen.get_at((21, 21))[:3], (255, 255, 0))
+        self.assertEqual(len(self.queue), 0)
+
+    def test_culling_uses_camera_rect_with_margin(self):
+        """测试视野剔除以相机矩形加边距为准"""
+        surface = solid((255, 255, 255))
+        self.assertTrue(self.queue.submit_culled(surface, -25, 50))    # 与边距区域相交
+        self.assertFalse(self.queue.submit_culled(surface, -31, 50))   # 完全在边距之外
+        self.assertFalse(self.queue.submit_culled(surface, 50, 121))
+        self.assertEqual((self.queue.submitted, self.queue.culled), (3, 2))
+
+        self.assertEqual(self.queue.to_screen(1000, 500), (100, 50))
+        self.assertEqual(self.queue.world_view, pygame.Rect(880, 430, 240, 140))
+
+    def test_health_bar_matches_legacy_drawing(self):
+        """测试缓存的血条与原来的逐帧绘制结果一致"""
+        for health, scale, position in ((100, 1.0, (60, 50)), (55, 1.5, (70.5, 60.25)),
+                                        (10, 2.0, (40, 70)), (0, 1.0, (80, 40))):
+            enemy = FakeEnemy(health, 100, scale)
+            expected = pygame.Surface((200, 100))
+            expected.fill((30, 60, 90))
+            legacy_health_bar(expected, enemy, *position)
+
+            self.screen.fill((30, 60, 90))
+            self.screen.blits(enemy._health_bar_items(*position), False)
+            self.assertEqual(pygame.image.tobytes(self.screen, "RGB"),
+                             pygame.image.tobytes(expected, "RGB"), (health, scale))
+
+    def test_health_bar_redrawn_only_when_health_changes(self):
+        """测试血量不变时复用血条表面"""
+        enemy = FakeEnemy(80, 100)
+        first = enemy._health_bar_items(50, 50)[0][0]
+        self.assertIs(enemy._health_bar_items(90, 30)[0][0], first)
+        enemy.health = 40
+        self.assertIsNot(enemy._health_bar_items(50, 50)[0][0], first)
+
+
+if __name__ == '__main__':
+    unittest.main()
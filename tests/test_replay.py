@@ -0,0 +1,139 @@
+import unittest
+import pygame
+import sys
+import os
+import tempfile
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.core import input_source, game_random
+from src.modules.core.input_source import ScriptedInputSource
+from src.modules.replay import ReplayRecorder, ReplayController, load_replay, CHECKSUM_INTERVAL
+
+
+class MockUpgradeMenu:
+    def __init__(self):
+        self.is_active = False
+
+
+class MockGame:
+    """记录收到的事件的模拟Game对象"""
+    def __init__(self):
+        self.upgrade_menu = MockUpgradeMenu()
+        self.game_time = 0.0
+        self.kill_num = 0
+        self.dual_player_system = None
+        self.player = None
+        self.enemy_manager = None
+        self.events = []
+
+    def handle_event(self, event):
+        self.events.append((event.type, getattr(event, "key", None), getattr(event, "pos", None)))
+
+
+class TestGameRandom(unittest.TestCase):
+    def test_same_seed_same_sequence(self):
+        """测试相同种子产生相同的随机序列"""
+        game_random.seed(42)
+        first = [game_random.rng.random() for _ in range(5)]
+        self.assertEqual(game_random.seed(42), 42)
+        second = [game_random.rng.random() for _ in range(5)]
+        self.assertEqual(first, second)
+
+    def test_random_seed_is_returned(self):
+        """测试未指定种子时返回实际使用的种子"""
+        used = game_random.seed()
+        value = game_random.rng.random()
+        game_random.seed(used)
+        self.assertEqual(game_random.rng.random(), value)
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session.replay")
+
+    def tearDown(self):
+        input_source.set_input_source(None)
+        self.tmp.cleanup()
+
+    def _record(self, game):
+        source = ScriptedInputSource((10, 20))
+        input_source.set_input_source(source)
+        game_random.seed(1234)
+        recorder = ReplayRecorder(self.path, {"seed": 1234, "map": "small_map", "hero": "ninja_frog",
+                                              "difficulty": "normal", "global_level": 1,
+                                              "screen": [1920, 1280]})
+        for tick in range(CHECKSUM_INTERVAL + 5):
+            if tick == 3:
+                source.press(pygame.K_w)
+                recorder.record_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_j, mod=0))
+            if tick == 10:
+                source.set_mouse_pos(300, 400)
+                recorder.record_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(300, 400)))
+            if tick == 20:
+                source.release(pygame.K_w)
+            dt = 1 / 60 if tick < 30 else 1 / 30
+            recorder.record_tick(game, dt)
+            game.game_time += dt
+            game_random.rng.random()
+        recorder.close()
+        return recorder
+
+    def test_recording_is_compact(self):
+        """测试未变化的字段不会重复写入"""
+        recorder = self._record(MockGame())
+        header, ticks = load_replay(self.path)
+        self.assertEqual(header["seed"], 1234)
+        self.assertIn("weapon_rolls", header)
+        self.assertEqual(len(ticks), recorder.ticks)
+        self.assertEqual(ticks[5], {})
+        self.assertEqual(sum(1 for record in ticks if "d" in record), 2)
+        self.assertEqual(sum(1 for record in ticks if "c" in record), 2)
+
+    def test_playback_reproduces_inputs(self):
+        """测试回放逐tick还原按键、鼠标、事件和dt，并且校验值一致"""
+        self._record(MockGame())
+
+        game = MockGame()
+        source = ScriptedInputSource()
+        controller = ReplayController.from_file(self.path)
+        self.assertAlmostEqual(controller.duration, 30 / 60 + 35 / 30)
+
+        game_random.seed(controller.header["seed"])
+        dts = []
+        pressed_w = []
+        while not controller.finished:
+            dt = controller.step(game, source, 1 / 60)
+            dts.append(dt)
+            pressed_w.append(source.get_pressed()[pygame.K_w])
+            game.game_time += dt
+            game_random.rng.random()
+
+        self.assertEqual(dts[29], 1 / 60)
+        self.assertEqual(dts[30], 1 / 30)
+        self.assertEqual(pressed_w[2:4], [False, True])
+        self.assertEqual(pressed_w[19:21], [True, False])
+        self.assertEqual(source.get_mouse_pos(), (300, 400))
+        self.assertEqual(game.events, [(pygame.KEYDOWN, pygame.K_j, None),
+                                       (pygame.MOUSEBUTTONDOWN, None, (300, 400))])
+        self.assertEqual(controller.checksums_checked, 2)
+        self.assertIsNone(controller.divergence_tick)
+        self.assertIsNone(controller.step(game, source, 1 / 60))
+
+    def test_playback_detects_divergence(self):
+        """测试状态不一致时记录出现偏差的tick"""
+        self._record(MockGame())
+
+        game = MockGame()
+        game.kill_num = 1
+        controller = ReplayController.from_file(self.path)
+        game_random.seed(controller.header["seed"])
+        controller.step(game, ScriptedInputSource(), 1 / 60)
+        self.assertEqual(controller.divergence_tick, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import math
+import sys
+import os
+from unittest import mock
+
+import pygame
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.enemies.separation import SeparationSteering
+from src.modules.enemies.enemy_manager import EnemyManager
+from src.modules.enemies.types import Ghost
+
+
+class Agent:
+    """只有位置和分离参数的敌人替身"""
+
+    def __init__(self, x, y, weight=1.0, radius=50):
+        self.rect = pygame.Rect(0, 0, 10, 10)
+        self.rect.center = (x, y)
+        self.separation_weight = weight
+        self.separation_radius = radius
+
+
+class FakePlayer:
+    def __init__(self, x, y):
+        self.world_x = x
+        self.world_y = y
+
+
+class TestSeparationSteering(unittest.TestCase):
+    def test_neighbours_push_apart(self):
+        """测试半径内的邻居互相推开，越近推力越大，半径外和权重为0的敌人不受影响"""
+        agents = [Agent(100, 100), Agent(120, 100), Agent(100, 140), Agent(300, 300),
+                  Agent(110, 110, weight=0.0)]
+        pushes = SeparationSteering().compute(agents)
+
+        self.assertLess(pushes[0][0], 0)      # 被右边的邻居往左推
+        self.assertLess(pushes[0][1], 0)      # 被下面的邻居往上推
+        self.assertLess(abs(pushes[0][1]), abs(pushes[0][0]))
+        self.assertGreater(pushes[1][0], 0)
+        self.assertEqual(pushes[3], (0.0, 0.0))
+        self.assertEqual(pushes[4], (0.0, 0.0))
+        for push_x, push_y in pushes:
+            self.assertLessEqual(math.hypot(push_x, push_y), 1.0 + 1e-9)
+
+    def test_stacked_crowd_is_bounded_and_spreads(self):
+        """测试完全重合的一群敌人：每个敌人检查的候选有上限，且被推向各不相同的方向"""
+        steering = SeparationSteering(max_neighbors=4, max_per_cell=3)
+        agents = [Agent(500, 500) for _ in range(200)]
+        pushes = steering.compute(agents)
+
+        self.assertLessEqual(steering.pairs_checked, 200 * 4 * 3)
+        self.assertEqual(len(set(pushes)), len(pushes))
+        for push_x, push_y in pushes:
+            self.assertAlmostEqual(math.hypot(push_x, push_y), 1.0)
+        # 结果与计算次数无关
+        self.assertEqual(steering.compute(agents), pushes)
+
+    def test_manager_applies_separation_while_seeking(self):
+        """测试敌人追击玩家时叠加分离转向，重叠的敌人逐渐分开"""
+        pygame.init()
+        with mock.patch("builtins.print"):
+            first = Ghost(100, 100)
+            second = Ghost(100, 100)
+        manager = EnemyManager()
+        manager.enemies.extend([first, second])
+        player = FakePlayer(first.rect.centerx + 20, 2000)
+
+        for _ in range(30):
+            manager._update_enemies(1 / 60, player)
+
+        self.assertGreater(abs(first.rect.centerx - second.rect.centerx), 20)
+        # 追击方向不受影响
+        self.assertGreater(first.rect.y, 100)
+        self.assertGreater(second.rect.y, 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
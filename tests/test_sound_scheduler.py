@@ -0,0 +1,185 @@
+import unittest
+import sys
+import os
+from types import SimpleNamespace
+from unittest import mock
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.sound_scheduler import (SoundScheduler, SoundRule, PRIORITY_CRITICAL, PRIORITY_HIGH,
+                                         PRIORITY_LOW)
+
+
+class FakeChannel:
+    def __init__(self, log=None, busy=False, label="reserved"):
+        self.log = log
+        self.busy = busy
+        self.label = label
+
+    def get_busy(self):
+        return self.busy
+
+    def play(self, sound):
+        self.busy = True
+        self.log.append(f"{sound.name}@{self.label}")
+
+
+class FakeSound:
+    """记录播放顺序的音效替身，free_channels 为0时模拟没有空闲声道"""
+
+    def __init__(self, name, log, mixer, length=1.0):
+        self.name = name
+        self.log = log
+        self.mixer = mixer
+        self.length = length
+
+    def play(self):
+        if self.mixer["free_channels"] <= 0:
+            return None
+        self.mixer["free_channels"] -= 1
+        self.log.append(self.name)
+        return FakeChannel()
+
+    def get_length(self):
+        return self.length
+
+
+class FakeMixer:
+    """只有保留声道的混音器替身，steal 为True时 find_channel(True) 返回一个正在播放的声道供抢占"""
+
+    def __init__(self, log, reserved_busy=(), steal=False):
+        self.channels = [FakeChannel(log, busy) for busy in reserved_busy]
+        self.stolen = FakeChannel(log, busy=True, label="stolen") if steal else None
+        self.reserved = None
+
+    def get_init(self):
+        return bool(self.channels)
+
+    def set_reserved(self, count):
+        self.reserved = count
+
+    def get_num_channels(self):
+        return 8
+
+    def Channel(self, index):
+        return self.channels[index]
+
+    def find_channel(self, force=False):
+        return self.stolen if force else None
+
+
+RULES = {
+    "player_hurt": SoundRule(PRIORITY_CRITICAL, 0.1, 2),
+    "level_up": SoundRule(PRIORITY_HIGH, 0.2, 1),
+    "hit": SoundRule(PRIORITY_LOW, 0.05, 2),
+}
+
+
+def build(free_channels=8, reserved_busy=(), steal=False):
+    log = []
+    mixer = {"free_channels": free_channels}
+    sounds = {name: FakeSound(name, log, mixer) for name in ("player_hurt", "level_up", "hit", "menu_move")}
+    scheduler = SoundScheduler(sounds.get, rules=RULES, reserved_channels=len(reserved_busy),
+                               mixer=FakeMixer(log, reserved_busy, steal))
+    return scheduler, log
+
+
+def tick(scheduler, dt, *names):
+    """推进一个tick并在其中请求音效"""
+    scheduler.begin_tick(dt)
+    for name in names:
+        scheduler.request(name)
+    scheduler.end_tick()
+
+
+class TestSoundScheduler(unittest.TestCase):
+    def test_requests_in_a_tick_are_coalesced_and_played_by_priority(self):
+        """测试tick内的重复请求合并为一次，tick结束时按优先级播放，声道不够时先放弃低优先级"""
+        scheduler, log = build(free_channels=2)
+        scheduler.begin_tick()
+        for _ in range(20):
+            scheduler.request("hit")
+        scheduler.request("level_up")
+        scheduler.request("player_hurt")
+        scheduler.request("missing")  # 未加载的音效直接忽略
+        self.assertEqual(log, [])
+        scheduler.end_tick()
+
+        self.assertEqual(log, ["player_hurt", "level_up"])
+        self.assertEqual(scheduler.stats(), {
+            "requested": 22,
+            "played": 2,
+            "coalesced": 19,
+            "dropped": 1,
+            "dropped_by_sound": {"hit": 1},
+        })
+
+    def test_rate_limit_and_max_voices_use_simulated_time(self):
+        """测试同一音效受最短播放间隔和同时发声数量限制，两者都按tick推进的模拟时间计算"""
+        scheduler, log = build()
+        tick(scheduler, 0.0, "hit")
+        tick(scheduler, 0.01, "hit")   # 间隔不足
+        tick(scheduler, 0.09, "hit")
+        tick(scheduler, 0.1, "hit")    # 已有2个同时发声（每次播放1秒）
+        self.assertEqual(log, ["hit", "hit"])
+        self.assertEqual(scheduler.dropped_by_sound, {"hit": 2})
+
+        # 模拟时间不推进时，墙钟时间流逝不影响调度
+        for _ in range(100):
+            tick(scheduler, 0.0, "hit")
+        self.assertEqual(log, ["hit", "hit"])
+
+        tick(scheduler, 0.9, "hit")    # 第一次播放已结束
+        self.assertEqual(log, ["hit", "hit", "hit"])
+        self.assertAlmostEqual(scheduler.time, 1.1)
+
+    def test_requests_outside_a_tick_play_immediately(self):
+        """测试不在tick内的请求（菜单等）立即播放，没有规则的音效使用默认规则"""
+        scheduler, log = build()
+        scheduler.request("menu_move")
+        scheduler.request("menu_move")
+        self.assertEqual(log, ["menu_move", "menu_move"])
+        self.assertEqual((scheduler.played, scheduler.coalesced, scheduler.dropped), (2, 0, 0))
+
+    def test_critical_cues_use_reserved_channels(self):
+        """测试关键音效优先使用空闲的保留声道，普通声道被占满时仍能播放"""
+        scheduler, log = build(free_channels=0, reserved_busy=(True, False))
+        scheduler.request("hit")
+        scheduler.request("player_hurt")
+        self.assertEqual(log, ["player_hurt@reserved"])
+        self.assertEqual(scheduler.mixer.reserved, 2)
+        self.assertEqual(scheduler.dropped_by_sound, {"hit": 1})
+
+        # 保留声道都在使用且没有可抢占的声道时放弃
+        tick(scheduler, 1.0, "player_hurt")
+        self.assertEqual(scheduler.dropped_by_sound, {"hit": 1, "player_hurt": 1})
+
+    def test_menu_sounds_keep_playing_while_paused(self):
+        """测试暂停期间 Game.update 照常推进调度时间，菜单音效的发声到期，连续按键不会被丢弃"""
+        from src.modules import game
+
+        scheduler, log = build()
+        paused_game = SimpleNamespace(paused=False, _update=lambda dt: None)
+        with mock.patch.object(game.resource_manager, "sound_scheduler", scheduler):
+            game.Game.update(paused_game, 1 / 60)
+            paused_game.paused = True
+            for _ in range(8):
+                # 暂停菜单：每帧照常更新，按键音效在tick之外立即播放
+                for _ in range(60):
+                    game.Game.update(paused_game, 1 / 60)
+                scheduler.request("menu_move")
+        self.assertEqual(log, ["menu_move"] * 8)
+        self.assertEqual((scheduler.played, scheduler.dropped), (8, 0))
+
+    def test_critical_cue_steals_a_busy_channel(self):
+        """测试保留声道都在使用时，关键音效抢占 find_channel(True) 返回的正在播放的声道"""
+        scheduler, log = build(free_channels=0, reserved_busy=(True, True), steal=True)
+        tick(scheduler, 0.0, "hit", "player_hurt")
+        self.assertEqual(log, ["player_hurt@stolen"])
+        self.assertEqual(scheduler.dropped_by_sound, {"hit": 1})
+        self.assertEqual(scheduler.played, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+import random
+import sys
+import os
+from unittest import mock
+
+import pygame
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.spatial import SpatialHash
+from src.modules.enemies.enemy_manager import EnemyManager
+from src.modules.components import weapon_manager as weapon_manager_module
+from src.modules.components.weapon_manager import WeaponManager
+
+
+class FakeEntity:
+    def __init__(self, x, y, size=32):
+        self.rect = pygame.Rect(x, y, size, size)
+
+
+class FakeWeapon:
+    """只记录update调用参数的武器"""
+
+    def __init__(self, weapon_type, targets_enemies):
+        self.type = weapon_type
+        self.targets_enemies = targets_enemies
+        self.calls = []
+
+    def update(self, dt, enemies=None):
+        self.calls.append((dt, enemies))
+
+
+class LegacyWeapon:
+    """没有 targets_enemies 声明的旧式武器"""
+
+    def __init__(self, weapon_type):
+        self.type = weapon_type
+        self.calls = []
+
+    def update(self, dt):
+        self.calls.append(dt)
+
+
+class TestSpatialHash(unittest.TestCase):
+    def setUp(self):
+        rand = random.Random(7)
+        self.entities = [FakeEntity(rand.uniform(-500, 1500), rand.uniform(-500, 1500),
+                                    rand.randint(8, 200))
+                         for _ in range(300)]
+        self.grid = SpatialHash(cell_size=64)
+        self.grid.rebuild(self.entities)
+
+    def test_radius_query_contains_all_hits_in_order(self):
+        """测试半径查询不漏掉范围内的实体，并保持插入顺序"""
+        rand = random.Random(11)
+        for _ in range(50):
+            x, y = rand.uniform(-400, 1400), rand.uniform(-400, 1400)
+            radius = rand.uniform(10, 300)
+            candidates = self.grid.query_radius(x, y, radius)
+            expected = [e for e in self.entities
+                        if (e.rect.x - x) ** 2 + (e.rect.y - y) ** 2 <= radius ** 2]
+            self.assertTrue(set(map(id, expected)) <= set(map(id, candidates)))
+            order = [self.entities.index(e) for e in candidates]
+            self.assertEqual(order, sorted(order))
+
+    def test_rect_query_contains_all_overlaps(self):
+        """测试矩形查询不漏掉相交的实体"""
+        area = pygame.Rect(100, 200, 300, 150)
+        candidates = self.grid.query_rect(area)
+        for entity in self.entities:
+            if entity.rect.colliderect(area):
+                self.assertIn(entity, candidates)
+        self.assertEqual(len(set(map(id, candidates))), len(candidates))
+
+
+class TestEnemyQuery(unittest.TestCase):
+    def setUp(self):
+        self.manager = EnemyManager()
+        self.manager.enemies.extend([FakeEntity(0, 0), FakeEntity(1000, 1000)])
+
+    def test_near_filters_distant_enemies(self):
+        """测试附近查询只返回附近网格中的敌人"""
+        near = self.manager.query.near(10, 10, 50)
+        self.assertEqual(near, [self.manager.enemies[0]])
+
+    def test_index_rebuilt_after_change(self):
+        """测试敌人移动或增删后索引会重建"""
+        query = self.manager.query
+        self.assertEqual(query.near(1000, 1000, 50), [self.manager.enemies[1]])
+
+        self.manager.enemies[0].rect.topleft = (1010, 990)
+        self.manager.version += 1
+        self.assertEqual(len(query.near(1000, 1000, 50)), 2)
+
+        self.manager.remove_enemy(self.manager.enemies[1])
+        self.assertEqual(query.near(1000, 1000, 50), [self.manager.enemies[0]])
+        self.assertEqual(len(query), 1)
+
+
+class TestWeaponDispatch(unittest.TestCase):
+    def setUp(self):
+        self.manager = WeaponManager(owner=None)
+        self.query = object()
+
+    def test_enemies_passed_only_to_targeting_weapons(self):
+        """测试敌人查询句柄只传给声明需要的武器"""
+        targeting = FakeWeapon('knife', True)
+        passive = FakeWeapon('bullet', False)
+        self.manager.weapons.extend([targeting, passive])
+
+        self.manager.update(0.1, self.query)
+
+        self.assertEqual(targeting.calls, [(0.1, self.query)])
+        self.assertEqual(passive.calls, [(0.1, None)])
+
+    def test_signature_inspected_once_per_weapon(self):
+        """测试旧式武器只在绑定时检查一次签名，之后每帧直接调用"""
+        legacy = LegacyWeapon('legacy')
+        self.manager.weapons.append(legacy)
+
+        with mock.patch.object(weapon_manager_module.inspect, 'signature',
+                               wraps=weapon_manager_module.inspect.signature) as signature:
+            for _ in range(10):
+                self.manager.update(1 / 60, self.query)
+        self.assertEqual(signature.call_count, 1)
+        self.assertEqual(len(legacy.calls), 10)
+
+    def test_removed_weapon_unbound(self):
+        """测试移除武器后清除其缓存的调用方式"""
+        weapon = FakeWeapon('knife', True)
+        self.manager.weapons.append(weapon)
+        self.manager.update(0.1, self.query)
+        self.assertTrue(self.manager.remove_weapon('knife'))
+        self.manager.update(0.1, self.query)
+        self.assertEqual(len(weapon.calls), 1)
+        self.assertEqual(self.manager._dispatch, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
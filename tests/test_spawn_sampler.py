@@ -0,0 +1,113 @@
+import unittest
+import random
+import math
+import sys
+import os
+from unittest import mock
+
+import pygame
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.spawn_sampler import SpawnSampler, REGION_CORNER, REGION_MIDDLE, REGION_ANY
+from src.modules.enemies.enemy_manager import EnemyManager
+from src.modules.core import game_random
+
+# 9x6 的地图：中间一堵竖墙把地图分成左右两个互不连通的区域
+GRID = [
+    "....#....",
+    "....#....",
+    ".##.#....",
+    "....#.##.",
+    "....#....",
+    "....#....",
+]
+TILE = 10
+
+
+class FakePlayer:
+    def __init__(self, x, y):
+        self.world_x = x
+        self.world_y = y
+
+
+def make_sampler(**kwargs):
+    blocked = [char == "#" for row in GRID for char in row]
+    return SpawnSampler(blocked, len(GRID[0]), len(GRID), TILE, TILE, spawn_size=TILE, **kwargs)
+
+
+def cell_of(position):
+    x, y = position
+    return GRID[int(y // TILE)][int(x // TILE)]
+
+
+class TestSpawnSampler(unittest.TestCase):
+    def setUp(self):
+        self.sampler = make_sampler()
+        self.rand = random.Random(3)
+
+    def test_samples_stay_on_floor_in_player_component(self):
+        """测试出生点只落在与玩家连通的地面格子上"""
+        self.assertEqual(len(self.sampler), sum(row.count(".") for row in GRID))
+        left_player = FakePlayer(5, 5)
+        right_player = FakePlayer(85, 55)
+        self.assertNotEqual(self.sampler.component_at(5, 5), self.sampler.component_at(85, 55))
+        self.assertIsNone(self.sampler.component_at(45, 5))
+
+        for player, side in ((left_player, lambda x: x < 40), (right_player, lambda x: x >= 50)):
+            for _ in range(200):
+                position = self.sampler.sample(self.rand, {REGION_ANY: 1}, [player])
+                self.assertEqual(cell_of(position), ".")
+                self.assertTrue(side(position[0]))
+
+    def test_region_weights_and_fallback(self):
+        """测试按区域抽样，区域内不可达时退回到任意可达位置"""
+        player = FakePlayer(5, 5)
+        for _ in range(100):
+            x, y = self.sampler.sample(self.rand, {REGION_CORNER: 1}, [player])
+            self.assertTrue(x < 15 and (y < 10 or y >= 50))
+
+        # 中央区域只在墙和右半边，左边的玩家抽不到，退回到左半边任意位置
+        for _ in range(50):
+            x, _ = self.sampler.sample(self.rand, {REGION_MIDDLE: 1}, [player])
+            self.assertLess(x, 40)
+
+    def test_min_distance_from_players(self):
+        """测试出生点离玩家足够远，实在抽不到时返回最远的候选点"""
+        player = FakePlayer(5, 5)
+        for _ in range(100):
+            x, y = self.sampler.sample(self.rand, {REGION_ANY: 1}, [player], min_distance=20)
+            self.assertGreaterEqual(math.hypot(x - 5, y - 5), 20)
+
+        position = self.sampler.sample(self.rand, {REGION_ANY: 1}, [player], min_distance=1000)
+        self.assertEqual(cell_of(position), ".")
+
+        # 没有任何可出生格子
+        bounded = make_sampler(bounds=(0, 0, 5, 5))
+        self.assertEqual(len(bounded), 0)
+        self.assertIsNone(bounded.sample(self.rand, {REGION_ANY: 1}, [player]))
+
+    def test_enemy_manager_keeps_spawns_away_from_both_players(self):
+        """测试双人模式下敌人和蝙蝠的出生点离两个玩家都足够远"""
+        pygame.init()
+        game_random.seed(7)
+        manager = EnemyManager()
+        manager.set_map_boundaries(0, 0, 300, 300)
+        # 30x30 的空地，角落区域为四角各 50x50 像素，两个玩家分别站在左上角和右下角
+        manager.set_spawn_sampler(SpawnSampler([False] * 900, 30, 30, TILE, TILE, spawn_size=TILE))
+        manager.min_spawn_distance = 100
+        player, second_player = FakePlayer(25, 25), FakePlayer(275, 275)
+
+        with mock.patch("builtins.print"):
+            for _ in range(20):
+                manager.random_spawn_enemy(player, second_player=second_player)
+                manager.spawn_bat(player, second_player)
+        self.assertEqual(len(manager.enemies), 40)
+        for enemy in manager.enemies:
+            for hero in (player, second_player):
+                self.assertGreaterEqual(math.hypot(enemy.rect.x - hero.world_x, enemy.rect.y - hero.world_y), 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+import pygame
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.enemies.status_effects import StatusEffectSystem, EFFECT_BURN, EFFECT_SLOW
+from src.modules.enemies.enemy_manager import EnemyManager
+
+
+class Target:
+    """只有生命值和速度的敌人替身"""
+
+    def __init__(self, health=100, speed=100):
+        self.health = health
+        self.speed = speed
+        self.original_speed = speed
+        self.slowed = False
+        self.hits = []
+
+    def take_status_damage(self, damage):
+        self.health -= damage
+        self.hits.append(damage)
+
+
+def run(system, seconds, dt=0.125):
+    events = []
+    for _ in range(round(seconds / dt)):
+        events.extend(system.update(dt))
+    return events
+
+
+class TestStatusEffectSystem(unittest.TestCase):
+    def test_burn_ticks_and_emits_damage_events(self):
+        """测试燃烧每0.5秒结算一次伤害并产生事件，重复施加取较大的伤害且不重新计时"""
+        system = StatusEffectSystem(capacity=1)
+        first, second = Target(), Target()
+        system.apply_burn(first, 10, 1.0)
+        system.apply_burn(second, 4, 2.0)
+        system.apply_burn(first, 20, 0.5)
+
+        events = run(system, 1.0)
+        self.assertEqual([(event.enemy, event.kind, event.damage) for event in events],
+                         [(first, EFFECT_BURN, 10.0), (second, EFFECT_BURN, 2.0),
+                          (first, EFFECT_BURN, 10.0), (second, EFFECT_BURN, 2.0)])
+        self.assertFalse(system.has_effect(first, EFFECT_BURN))
+        self.assertTrue(system.has_effect(second, EFFECT_BURN))
+
+        run(system, 1.0)
+        self.assertEqual(second.hits, [2.0] * 4)
+        self.assertEqual(len(system), 0)
+
+    def test_slow_applies_immediately_and_restores_speed(self):
+        """测试减速立即生效、取较强的减速，到期后恢复原始速度"""
+        system = StatusEffectSystem()
+        target = Target(speed=100)
+        system.apply_slow(target, 0.25, 1.0)
+        self.assertEqual(target.speed, 75)
+        self.assertTrue(target.slowed)
+
+        system.apply_slow(target, 0.5, 0.5)
+        system.apply_slow(target, 0.1, 0.5)
+        self.assertEqual(target.speed, 50)
+
+        run(system, 0.9)
+        self.assertEqual(target.speed, 50)
+        run(system, 0.2)
+        self.assertEqual(target.speed, 100)
+        self.assertFalse(target.slowed)
+
+    def test_manager_ticks_effects_and_drops_removed_enemies(self):
+        """测试管理器统一推进敌人的燃烧，燃烧致死的敌人交给死亡队列，移除敌人时清理其效果"""
+        pygame.init()
+        manager = EnemyManager()
+        with mock.patch("builtins.print"):
+            burning = manager.spawn_enemy('ghost', 100, 100)
+            slowed = manager.spawn_enemy('ghost', 300, 300)
+        burning.health = 5
+        burning.apply_burn_effect(20, 3)
+        slowed.apply_slow_effect(0.5, 3)
+        self.assertEqual(len(manager.status_effects), 2)
+        self.assertTrue(manager.status_effects.has_effect(slowed, EFFECT_SLOW))
+        self.assertEqual(slowed.speed, slowed.original_speed * 0.5)
+
+        for _ in range(40):
+            manager.status_events = manager.status_effects.update(1 / 60)
+            if manager.status_events:
+                break
+        self.assertEqual([event.enemy for event in manager.status_events], [burning])
+        self.assertFalse(burning.alive())
+        self.assertGreater(burning.burn_flash_timer, 0)
+
+        manager.remove_enemies([burning, slowed])
+        self.assertEqual(len(manager.status_effects), 0)
+        self.assertEqual(manager.enemies, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
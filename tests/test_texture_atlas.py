@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest import mock
+
+import pygame
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.texture_atlas import TextureAtlas, build_atlases, pack_rects
+from src.modules.resource_manager import ResourceManager
+
+
+def save_image(resource_dir, path, size, color):
+    full_path = os.path.join(resource_dir, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill(color)
+    pygame.image.save(surface, full_path)
+    return full_path
+
+
+class TestTextureAtlas(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.resource_dir = self.temp_dir.name
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_pack_rects_does_not_overlap(self):
+        """测试装箱结果互不重叠且不超出图集，放不下时换一张图集"""
+        sizes = [(30, 20), (50, 50), (64, 10), (20, 64), (40, 40), (64, 64)]
+        placements = pack_rects(sizes, page_size=64)
+        rects = {}
+        for (width, height), (page, x, y) in zip(sizes, placements):
+            rect = pygame.Rect(x, y, width, height)
+            self.assertTrue(pygame.Rect(0, 0, 64, 64).contains(rect))
+            for other in rects.get(page, []):
+                self.assertFalse(rect.colliderect(other))
+            rects.setdefault(page, []).append(rect)
+        self.assertGreater(len(rects), 1)
+
+    def test_atlas_returns_subsurfaces_with_original_pixels(self):
+        """测试打包后按原路径取出的子表面与原图一致，过大的图片和过期的图片不从图集读取"""
+        red = save_image(self.resource_dir, "images/enemy/red.png", (16, 8), (255, 0, 0, 255))
+        blue = save_image(self.resource_dir, "images/ui/blue.png", (8, 8), (0, 0, 255, 128))
+        save_image(self.resource_dir, "images/maps/big.png", (40, 40), (0, 255, 0, 255))
+
+        summary = build_atlases(self.resource_dir, max_image_size=32)
+        self.assertEqual((summary["images"], summary["skipped"]), (2, ["images/maps/big.png"]))
+
+        atlas = TextureAtlas.load(self.resource_dir)
+        image = atlas.get(red)
+        self.assertEqual(image.get_size(), (16, 8))
+        self.assertIsNotNone(image.get_parent())
+        self.assertEqual(tuple(image.get_at((15, 7))), (255, 0, 0, 255))
+        self.assertEqual(tuple(atlas.get(blue).get_at((0, 0))), (0, 0, 255, 128))
+        self.assertIsNone(atlas.get(os.path.join(self.resource_dir, "images/maps/big.png")))
+
+        # 源文件被修改（大小变化）后不再使用图集
+        save_image(self.resource_dir, "images/enemy/red.png", (32, 8), (255, 0, 0, 255))
+        self.assertIsNone(atlas.get(red))
+
+    def test_resource_manager_loads_from_atlas(self):
+        """测试资源管理器存在图集时从图集取图片，不在图集中的图片仍单独加载"""
+        save_image(self.resource_dir, "images/items/coin.png", (8, 8), (255, 255, 0, 255))
+        build_atlases(self.resource_dir)
+        save_image(self.resource_dir, "images/items/new.png", (4, 4), (0, 255, 0, 255))
+
+        manager = ResourceManager()
+        manager.resource_dir = self.resource_dir
+        coin = manager.load_image("coin", "images/items/coin.png")
+        new = manager.load_image("new", "images/items/new.png")
+        self.assertIsNotNone(coin.get_parent())
+        self.assertIsNone(new.get_parent())
+        self.assertEqual((manager.atlas.hits, manager.atlas.pages_loaded), (1, 1))
+
+        manager.use_atlas = False
+        manager.clear()
+        self.assertIsNone(manager.load_image("coin", "images/items/coin.png").get_parent())
+
+    def test_resource_manager_falls_back_when_page_is_missing(self):
+        """测试清单引用的图集文件被删除时回退为单独加载，而不是抛出异常"""
+        save_image(self.resource_dir, "images/items/coin.png", (8, 8), (255, 255, 0, 255))
+        build_atlases(self.resource_dir)
+        os.remove(os.path.join(self.resource_dir, "atlases", "atlas_0.png"))
+
+        manager = ResourceManager()
+        manager.resource_dir = self.resource_dir
+        with mock.patch("builtins.print"):
+            coin = manager.load_image("coin", "images/items/coin.png")
+        self.assertIsNone(coin.get_parent())
+        self.assertEqual(tuple(coin.get_at((0, 0))), (255, 255, 0, 255))
+        self.assertEqual(manager.atlas.hits, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
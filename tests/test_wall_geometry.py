@@ -0,0 +1,74 @@
+import unittest
+import random
+import sys
+import os
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.modules.wall_geometry import WallGeometry, merge_rects, boundary_segments
+
+
+def parse(rows):
+    """把字符画转换为 (阻挡标记, 列数, 行数)，#为墙"""
+    return [1 if ch == "#" else 0 for line in rows for ch in line], len(rows[0]), len(rows)
+
+
+class TestWallGeometry(unittest.TestCase):
+    def test_merged_rects_cover_exactly_the_blocked_cells(self):
+        """测试合并后的矩形互不重叠，且恰好覆盖所有阻挡格子"""
+        rand = random.Random(3)
+        columns, rows = 37, 23
+        blocked = [1 if rand.random() < 0.45 else 0 for _ in range(columns * rows)]
+
+        coverage = [0] * (columns * rows)
+        rects = merge_rects(blocked, columns, rows)
+        for col, row, width, height in rects:
+            for y in range(row, row + height):
+                for x in range(col, col + width):
+                    coverage[y * columns + x] += 1
+
+        self.assertEqual(coverage, blocked)
+        self.assertLess(len(rects), sum(blocked))
+
+    def test_boundary_segments_are_merged_and_deduplicated(self):
+        """测试边界线段只包含墙与地面之间的边，共线相邻的边合并为一条"""
+        blocked, columns, rows = parse([
+            "....",
+            ".##.",
+            ".##.",
+            "....",
+        ])
+        segments, edge_count = boundary_segments(blocked, columns, rows)
+        self.assertEqual(edge_count, 8)
+        self.assertEqual(sorted(segments), sorted([
+            ((1, 1), (3, 1)), ((1, 3), (3, 3)),
+            ((1, 1), (1, 3)), ((3, 1), (3, 3)),
+        ]))
+
+        # 两块墙只在一个角相接：相接处的边朝向相反，不能合并
+        blocked, columns, rows = parse([
+            "#.",
+            ".#",
+        ])
+        segments, edge_count = boundary_segments(blocked, columns, rows)
+        self.assertEqual(edge_count, 8)
+        self.assertEqual(len(segments), 8)
+
+    def test_world_geometry_and_stats(self):
+        """测试墙体几何按格子大小转换为世界坐标，并统计合并前后的数量"""
+        blocked, columns, rows = parse([
+            "#####",
+            "#...#",
+            "#####",
+        ])
+        geometry = WallGeometry(blocked, columns, rows, 80, 80)
+
+        self.assertEqual(geometry.stats(), {"tiles": 12, "rects": 4, "edges": 24, "segments": 8})
+        self.assertEqual([tuple(rect) for rect in geometry.rects],
+                         [(0, 0, 400, 80), (0, 80, 80, 160), (320, 80, 80, 160), (80, 160, 240, 80)])
+        self.assertIn(((80, 80), (320, 80)), geometry.segments)
+
+
+if __name__ == '__main__':
+    unittest.main()